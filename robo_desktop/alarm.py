@@ -1,121 +1,371 @@
-import subprocess
-import time
+"""
+Robô desktop que configura alarmes no aplicativo Relógio do Windows.
+
+Uso:
+    python alarm.py [run]                      # abre o Relógio, cria os alarmes e agenda as tarefas (padrão)
+    python alarm.py --file alarmes.csv         # cria em lote os alarmes de um arquivo JSON ou CSV
+    python alarm.py --dry-run [--file ...]     # valida e mostra os alarmes, os planos de teclas e as tarefas agendadas, sem abrir o Relógio
+    python alarm.py report         # p50/p95 de cada etapa nas últimas execuções (histórico de métricas)
+
+As operações na interface passam por um backend (ui_backend.py): o pywinauto só é importado
+quando o Relógio do Windows é aberto, e o Relógio simulado (simulated_clock.py) permite testar
+e medir o robô em qualquer sistema. O robô não usa pausas fixas: cada etapa espera o estado da
+interface (janela aberta, campo do diálogo com o foco, botão habilitado, diálogo fechado), com tempos
+limite ajustados pelas latências das execuções anteriores (data/ui_timeouts.json). Cada alarme
+é compilado em um plano de teclas (compilar_plano), enviado com um send_keys por seção do
+diálogo, e os campos são conferidos antes de salvar. A tarefa agendada de cada alarme é uma
+única definição, e as tarefas dos alarmes criados são registradas juntas ao final do lote
+(scheduler.register_all: um único daemon-reload e enable no systemd); só os alarmes cuja
+tarefa não foi registrada são marcados com erro. Os diretórios e
+handlers de log só são criados na execução.
+"""
+import argparse
+import csv
+import sys
 import logging
 import os
-from pywinauto import Application, Desktop
-from pywinauto.keyboard import send_keys
-from datetime import datetime, timedelta
+from datetime import datetime
+
+# Pacote compartilhado entre os robôs (rpa_common, na raiz do repositório)
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIRECTORY not in sys.path:
+    sys.path.insert(0, ROOT_DIRECTORY)
+from rpa_common import setup_logging as setup_log_pipeline, ErrorReport, Metrics, save_run, print_report
+from alarm_config import alarm_sounds, snooze_times, SONECA_PADRAO, carregar_alarmes, validar_alarmes
+from ui_backend import AdaptiveTimeouts, UIError, UITimeoutError, CONTROLES_DIALOGO, parse_keys
+from scheduler import ScheduledTask, default_scheduler
 
 # Configurar diretórios de logs e reports
 log_directory = 'logs'
 reports_directory = 'reports'
 
-if not os.path.exists(log_directory):
-    os.makedirs(log_directory)
+# Configurar logging (JSON lines em logs/alarms_log.jsonl, escrito em segundo plano)
+log_file_path = os.path.join(log_directory, 'alarms_log')
 
-if not os.path.exists(reports_directory):
-    os.makedirs(reports_directory)
+# Métricas das etapas: arquivo do Prometheus (textfile collector) e histórico das execuções
+metrics_textfile_path = os.path.join(reports_directory, 'rpa_desktop.prom')
+run_history_path = os.path.join('data', 'run_history.db')
 
-# Configurar logging
-log_file_path = os.path.join(log_directory, 'alarms_log.log')
+# Latências observadas nas esperas da interface, usadas para ajustar os tempos limite
+ui_timeouts_path = os.path.join('data', 'ui_timeouts.json')
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(log_file_path),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger()
 
-# Variável global para armazenar erros
-error_reports = []
+def setup_logging():
+    """
+    Cria os diretórios de logs e reports e configura o log em arquivo e no console.
+    """
+    for directory in (log_directory, reports_directory):
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+
+    return setup_log_pipeline(logger, log_file_path)
+
+# Relatório de erros, gravado em reports/ à medida que os erros acontecem
+error_reports = ErrorReport(reports_directory)
+
+# Duração, resultado e contagens de cada etapa (rpa_common.metrics)
+metrics = Metrics('desktop')
 
 def save_error_report():
     """
-    Salva as mensagens de erro acumuladas em um arquivo de relatório na pasta reports.
+    Conclui o relatório de erros na pasta reports.
     """
-    timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-    report_filename = os.path.join(reports_directory, f'report_{timestamp}.report')
-    
-    with open(report_filename, 'w') as file:
-        if error_reports:
-            for error in error_reports:
-                file.write(error + '\n')
-        else:
-            file.write("Nenhum erro encontrado durante a execução.\n")
+    return error_reports.close()
 
 def add_error_report(error_message):
     """
-    Adiciona uma mensagem de erro à lista de erros.
+    Adiciona uma mensagem de erro ao relatório (gravada em segundo plano).
 
     Args:
         error_message (str): Mensagem de erro a ser adicionada.
     """
-    error_reports.append(error_message)
+    error_reports.add(error_message)
+    # As etapas tratam os próprios erros: o erro marca as etapas abertas
+    metrics.mark_error()
+
+# Alarmes criados pelo robô quando nenhum arquivo é informado (--file)
+ALARMS = [
+    dict(hora=8, minuto=0, nome="Tenha um excelente dia de trabalho!", dias=[2, 3, 4, 5, 6], soneca="5 minutos"),
+    dict(hora=7, minuto=45, nome="Curtir o final de semana", dias=[1, 7], soneca="30 minutos", repetir=True, campainha="Jingle"),
+]
+
+# Dias da semana (1 = domingo)
+dias_semana = ["SUN", "MON", "TUE", "WED", "THU", "FRI", "SAT"]
+
+# Backend de automação (ui_backend.PywinautoBackend por padrão, criado em run) e janela do Relógio
+backend = None
+clock = None
+
+# Agendador das tarefas dos alarmes (scheduler.default_scheduler por padrão, criado em run)
+scheduler = None
+
+# Controles do Relógio já localizados, reaproveitados por todos os alarmes do lote
+controles = {}
+
+# Tempo limite padrão (segundos) de cada espera, até haver latências observadas
+TEMPOS_LIMITE_PADRAO = {
+    'janela': 30,    # janela do Relógio aberta
+    'dialogo': 10,   # diálogo do alarme aberto, com o foco no campo da hora
+    'horario': 5,    # hora e minuto aceitos (botão Salvar habilitado)
+    'foco': 5,       # teclas de uma seção processadas (foco no campo seguinte)
+    'salvar': 10,    # diálogo do alarme fechado depois de salvo
+}
+timeouts = AdaptiveTimeouts(TEMPOS_LIMITE_PADRAO)
+
+# Caracteres com significado especial no send_keys do pywinauto
+TECLAS_ESPECIAIS = '+^%~(){}[]'
+
+def texto_send_keys(texto):
+    """
+    Escapa um texto para ser digitado literalmente pelo send_keys (espaços e caracteres especiais).
+    """
+    return ''.join('{SPACE}' if caractere == ' ' else f'{{{caractere}}}' if caractere in TECLAS_ESPECIAIS else caractere
+                   for caractere in texto)
+
+# Valores do diálogo de um alarme novo, usados quando o backend não consegue lê-los
+ESTADO_NOVO_ALARME = dict(hora=None, minuto=None, nome="", repetir=False, dias=[], campainha=alarm_sounds[0], soneca=SONECA_PADRAO)
+
+# Seções do diálogo do alarme, na ordem do plano de teclas
+SECOES_DIALOGO = ["horario", "nome", "dias", "campainha", "soneca", "salvar"]
+
+def tecla(nome, vezes=1):
+    """
+    Tecla nomeada do send_keys repetida (ex.: {DOWN 3}); vazio se vezes for 0.
+    """
+    if vezes <= 0:
+        return ""
+    return f"{{{nome}}}" if vezes == 1 else f"{{{nome} {vezes}}}"
+
+def navegacao_lista(opcoes, atual, desejado):
+    """
+    Teclas mais curtas para selecionar uma opção de uma lista a partir da opção atual: só
+    DOWN/UP, ou HOME/END seguido de DOWN/UP.
+
+    Args:
+        opcoes (list): Opções da lista, na ordem do aplicativo.
+        atual (str): Opção selecionada no momento.
+        desejado (str): Opção a selecionar.
+    """
+    de, para = opcoes.index(atual), opcoes.index(desejado)
+    caminhos = [
+        tecla("DOWN", para - de) + tecla("UP", de - para),
+        tecla("HOME") + tecla("DOWN", para),
+        tecla("END") + tecla("UP", len(opcoes) - 1 - para),
+    ]
+    return min(caminhos, key=lambda caminho: len(parse_keys(caminho)))
+
+def valores_esperados(alarme, atual=None):
+    """
+    Valores que os campos do diálogo devem ter antes de salvar o alarme.
+    """
+    atual = atual or ESTADO_NOVO_ALARME
+    return dict(hora=alarme['hora'], minuto=alarme['minuto'], nome=alarme['nome'], repetir=alarme.get('repetir', True),
+                dias=sorted(alarme['dias']), campainha=alarme.get('campainha') or atual['campainha'], soneca=alarme['soneca'])
+
+def compilar_plano(alarme, atual=None):
+    """
+    Compila a configuração de um alarme no plano de teclas do diálogo: um texto do send_keys
+    por seção, com a menor quantidade de teclas a partir dos valores atuais dos campos.
+
+    Args:
+        alarme (dict): Alarme no formato de alarm_config.validar_alarmes.
+        atual (dict, optional): Valores atuais do diálogo (padrão: ESTADO_NOVO_ALARME).
+
+    Returns:
+        list: Pares (seção, teclas), na ordem de SECOES_DIALOGO.
+    """
+    atual = atual or ESTADO_NOVO_ALARME
+    esperado = valores_esperados(alarme, atual)
+    digitos = lambda valor: "".join(f"{{VK_NUMPAD{digito}}}" for digito in f"{valor:02d}")
+
+    # Repetir e dias: alterna apenas os dias diferentes dos atuais, de domingo a sábado
+    dias = tecla("SPACE") if esperado['repetir'] != atual['repetir'] else ""
+    dias += tecla("TAB")
+    posicao = 1
+    for dia in sorted(set(esperado['dias']) ^ set(atual['dias'])):
+        dias += tecla("RIGHT", dia - posicao) + tecla("SPACE")
+        posicao = dia
+
+    return [
+        ("horario", digitos(alarme['hora']) + tecla("TAB") + digitos(alarme['minuto']) + tecla("TAB")),
+        ("nome", tecla("BACKSPACE", len(atual['nome'])) + texto_send_keys(alarme['nome']) + tecla("TAB")),
+        ("dias", dias + tecla("TAB")),
+        ("campainha", navegacao_lista(alarm_sounds, atual['campainha'], esperado['campainha']) + tecla("TAB")),
+        ("soneca", navegacao_lista(snooze_times, atual['soneca'], esperado['soneca']) + tecla("TAB")),
+        ("salvar", tecla("SPACE")),
+    ]
+
+def contar_teclas(plano):
+    """
+    Quantidade de teclas de um plano de teclas.
+    """
+    return sum(len(parse_keys(teclas)) for _, teclas in plano)
+
+def ler_dialogo(dialogo):
+    """
+    Lê os valores atuais dos campos do diálogo do alarme.
+
+    Returns:
+        dict: Valores dos campos, ou None se o backend não conseguir lê-los.
+    """
+    try:
+        return backend.read_values(dialogo)
+    except (NotImplementedError, UIError) as e:
+        logger.warning(f"Campos do diálogo do alarme não lidos; usando os valores de um alarme novo, sem conferência: {e}")
+        return None
+
+def conferir_dialogo(dialogo, esperado):
+    """
+    Confere os campos do diálogo do alarme com os valores esperados antes de salvar.
+
+    Raises:
+        UIError: Se algum campo estiver diferente.
+    """
+    valores = backend.read_values(dialogo)
+    diferencas = [f"{campo}: esperado {valor!r}, lido {valores.get(campo)!r}"
+                  for campo, valor in esperado.items() if valores.get(campo) != valor]
+    if diferencas:
+        raise UIError(f"Campos do alarme diferentes do configurado: {'; '.join(diferencas)}")
+
+def controle(titulo, tipo, timeout=10):
+    """
+    Retorna um controle da janela do Relógio, localizado na árvore de automação (UIA) apenas
+    na primeira vez. A busca é refeita se o controle guardado não estiver mais disponível.
+
+    Args:
+        titulo (str): Título do controle.
+        tipo (str): Tipo do controle (control_type), ex.: "Button".
+        timeout (int): Segundos de espera até o controle ficar visível.
+    """
+    chave = (titulo, tipo)
+    wrapper = controles.get(chave)
+    if wrapper is not None:
+        try:
+            if wrapper.is_visible():
+                return wrapper
+        except Exception:
+            pass
+    wrapper = controles[chave] = backend.find(clock, titulo, tipo, timeout=timeout)
+    return wrapper
+
+def esperar(etapa, condicao, descricao):
+    """
+    Espera a condição da interface com o tempo limite adaptativo da etapa e registra a
+    latência observada (também no span espera_<etapa> das métricas).
+
+    Args:
+        etapa (str): Nome da espera em TEMPOS_LIMITE_PADRAO.
+        condicao (callable): Função que retorna True quando a interface está pronta.
+        descricao (str): Descrição da condição, para a mensagem de erro.
+
+    Raises:
+        UITimeoutError: Se a condição não for atendida no tempo limite.
+    """
+    tempo_limite = timeouts.timeout(etapa)
+    try:
+        segundos = backend.wait_until(condicao, tempo_limite, description=descricao)
+    except UITimeoutError:
+        timeouts.observe(etapa, tempo_limite)
+        metrics.record(f'espera_{etapa}', tempo_limite, outcome='error')
+        raise
+    timeouts.observe(etapa, segundos)
+    metrics.record(f'espera_{etapa}', segundos)
+    return segundos
+
+def dialogo_alarme():
+    """
+    Retorna o diálogo do alarme, sem esperar (UIError se ainda não estiver visível).
+    """
+    return controle("Editar alarme", "Window", timeout=0)
 
-# Arrays para as opções de alarme e soneca
-alarm_sounds = ["Alarms", "Xilofone", "Acordes", "Toque", "Jingle", "Transição", "Decrescente", "Quique", "Eco"]
-snooze_times = ["Desativado", "5 minutos", "10 minutos", "20 minutos", "30 minutos", "1 hora"]
+def campo_com_foco(campo):
+    """
+    Indica se o campo do diálogo do alarme (CONTROLES_DIALOGO) tem o foco do teclado. No UI
+    Automation, só o elemento focado tem HasKeyboardFocus, nunca a janela do diálogo.
+    """
+    titulo, tipo = CONTROLES_DIALOGO[campo]
+    return controle(titulo, tipo, timeout=0).has_keyboard_focus()
+
+def dialogo_fechado():
+    """
+    Indica se o diálogo do alarme já fechou (o controle guardado não está mais disponível).
+    """
+    try:
+        return not controles[("Editar alarme", "Window")].is_visible()
+    except Exception:
+        return True
+
+def use_scheduler(novo_scheduler):
+    """
+    Define o agendador das tarefas dos alarmes (ex.: scheduler.RecordingScheduler).
+    """
+    global scheduler
+    scheduler = novo_scheduler
+
+def use_backend(novo_backend):
+    """
+    Define o backend de automação usado pelo robô (ex.: simulated_clock.SimulatedBackend).
+    """
+    global backend, clock
+    backend = novo_backend
+    clock = None
+    controles.clear()
 
 # Função para abrir o relógio do Windows
+@metrics.timed()
 def open_clock():
     try:
         logger.info("Abrindo o aplicativo de Relógio do Windows...")
-        subprocess.Popen(['start', 'ms-clock:'], shell=True)
-        time.sleep(5)  # Esperar alguns segundos para garantir que o aplicativo abriu
+        backend.launch('ms-clock:')
+        # Esperar a janela do Relógio aparecer
+        esperar('janela', lambda: any("Relógio" in titulo for titulo in backend.windows()), 'janela do Relógio aberta')
     except Exception as e:
         error_message = f"Erro ao abrir o aplicativo de Relógio do Windows: {e}"
         logger.error(error_message)
         add_error_report(error_message)
 
 # Função para fechar o relógio do Windows
+@metrics.timed()
 def close_clock():
     try:
         logger.info("Fechando o aplicativo de Relógio do Windows...")
-        app.kill()
+        backend.kill()
         logger.info("Aplicativo de Relógio do Windows fechado com sucesso.")
     except Exception as e:
         error_message = f"Erro ao fechar o aplicativo de Relógio do Windows: {e}"
         logger.error(error_message)
         add_error_report(error_message)
 
-# Função para criar tarefas agendadas
-def criar_tarefa_agendada(nome_tarefa, script_path, hora, minuto, dias, repetir=True):
+# Função para criar a tarefa agendada de um alarme, sem registrá-la
+def tarefa_agendada(alarme):
+    # Uma única definição com todos os dias (o registro substitui a tarefa existente)
+    script_path = os.path.abspath('register_alarm.py')
+    return ScheduledTask(alarme['nome'], script_path, alarme['hora'], alarme['minuto'], alarme['dias'],
+                         alarme.get('repetir', True))
+
+# Função para registrar as tarefas agendadas de um lote de alarmes (retorna a mensagem de erro
+# de cada tarefa não registrada, pelo nome do alarme)
+@metrics.timed()
+def criar_tarefas_agendadas(tarefas):
+    if not tarefas:
+        return {}
     try:
-        # Excluir tarefa existente
-        comando_excluir = f'schtasks /delete /tn "{nome_tarefa}" /f'
-        logger.info(f"Excluindo tarefa agendada existente: {comando_excluir}")
-        subprocess.run(comando_excluir, shell=True)
-        
-        if repetir:
-            comando_base = f'schtasks /create /tn "{nome_tarefa}" /tr "python \\"{script_path}\\"" /sc weekly /st {hora:02d}:{minuto:02d} /f'
-            for dia in dias:
-                comando = f'{comando_base} /d {dia}'
-                logger.info(f"Criando tarefa agendada: {comando}")
-                result = subprocess.run(comando, shell=True, capture_output=True, text=True)
-                if result.returncode != 0:
-                    logger.error(f"Erro ao criar tarefa agendada: {result.stderr}")
-                    add_error_report(f"Erro ao criar tarefa agendada: {result.stderr}")
-                else:
-                    logger.info(f"Tarefa agendada criada com sucesso: {comando}")
-        else:
-            data_alarme = datetime.now().replace(hour=hora, minute=minuto, second=0, microsecond=0)
-            if data_alarme < datetime.now():
-                data_alarme += timedelta(days=1)
-            comando = f'schtasks /create /tn "{nome_tarefa}" /tr "python \\"{script_path}\\"" /sc once /st {data_alarme.strftime("%H:%M")} /sd {data_alarme.strftime("%d/%m/%Y")} /f'
-            logger.info(f"Criando tarefa agendada: {comando}")
-            result = subprocess.run(comando, shell=True, capture_output=True, text=True)
-            if result.returncode != 0:
-                logger.error(f"Erro ao criar tarefa agendada: {result.stderr}")
-                add_error_report(f"Erro ao criar tarefa agendada: {result.stderr}")
-            else:
-                logger.info(f"Tarefa agendada criada com sucesso: {comando}")
+        for tarefa in tarefas:
+            logger.info(f"Registrando a tarefa agendada: {'; '.join(scheduler.describe(tarefa))}")
+        # Todas as tarefas em uma chamada ao agendador (no systemd, um único daemon-reload e enable)
+        falhas = scheduler.register_all(tarefas)
     except Exception as e:
-        error_message = f"Erro ao criar tarefa agendada: {e}"
+        falhas = {tarefa.name: str(e) for tarefa in tarefas}
+    erros = {}
+    for nome, erro in falhas.items():
+        error_message = f"Erro ao criar a tarefa agendada do alarme {nome}: {erro}"
         logger.error(error_message)
         add_error_report(error_message)
+        erros[nome] = error_message
+    metrics.add('tasks', len(tarefas) - len(falhas))
+    logger.info(f"{len(tarefas) - len(falhas)} de {len(tarefas)} tarefas agendadas criadas com sucesso")
+    return erros
 
 # Função para criar diretório e arquivo histórico, se não existirem
 def criar_diretorio_historico():
@@ -132,139 +382,266 @@ def criar_diretorio_historico():
             f.write("Histórico de Execução dos Alarmes\n")
         logger.info(f"Criado arquivo: {arquivo_historico}")
 
-# Criar diretório e arquivo histórico antes de criar alarmes
-criar_diretorio_historico()
-
-# Abrir o aplicativo de Relógio do Windows
-open_clock()
-
-# Listar todas as janelas para verificar o título correto
-try:
-    logger.info("Listando janelas abertas para verificar o título correto...")
-    windows = Desktop(backend="uia").windows()
-    for win in windows:
-        logger.info(f"Janela encontrada: {win.window_text()}")
-except Exception as e:
-    error_message = f"Erro ao listar janelas abertas: {e}"
-    logger.error(error_message)
-    add_error_report(error_message)
-
-# Tente conectar ao aplicativo de Relógio do Windows
-try:
-    logger.info("Conectando ao aplicativo de Relógio do Windows...")
-    app = Application(backend="uia").connect(title_re="Relógio")
-    clock = app.window(title_re="Relógio")
-    logger.info("Conexão estabelecida com sucesso.")
-except Exception as e:
-    error_message = f"Erro ao conectar ao aplicativo de Relógio do Windows: {e}"
-    logger.error(error_message)
-    add_error_report(error_message)
-    save_error_report()
-    exit()
-
-# Acessar a aba "Alarme" na esquerda
-try:
-    logger.info("Acessando a aba Alarme...")
-    alarm_tab = clock.child_window(title="Alarme", control_type="ListItem")
-    alarm_tab.wait('visible', timeout=10).select()
-    logger.info("Aba Alarme acessada com sucesso.")
-except Exception as e:
-    error_message = f"Erro ao acessar a aba Alarme: {e}"
-    logger.error(error_message)
-    add_error_report(error_message)
-    save_error_report()
-    exit()
+# Função para conectar ao Relógio do Windows e acessar a aba "Alarme"
+@metrics.timed()
+def connect_clock():
+    """
+    Conecta ao aplicativo Relógio já aberto e acessa a aba "Alarme".
+
+    Returns:
+        bool: True se a aba "Alarme" foi acessada.
+    """
+    global clock
+
+    # Uma nova conexão invalida os controles localizados na anterior
+    controles.clear()
 
+    # Listar todas as janelas para verificar o título correto
+    try:
+        logger.info("Listando janelas abertas para verificar o título correto...")
+        for titulo in backend.windows():
+            logger.info(f"Janela encontrada: {titulo}")
+    except Exception as e:
+        error_message = f"Erro ao listar janelas abertas: {e}"
+        logger.error(error_message)
+        add_error_report(error_message)
+
+    # Tente conectar ao aplicativo de Relógio do Windows
+    try:
+        logger.info("Conectando ao aplicativo de Relógio do Windows...")
+        clock = backend.connect(title_re="Relógio")
+        logger.info("Conexão estabelecida com sucesso.")
+    except Exception as e:
+        error_message = f"Erro ao conectar ao aplicativo de Relógio do Windows: {e}"
+        logger.error(error_message)
+        add_error_report(error_message)
+        return False
+
+    # Acessar a aba "Alarme" na esquerda
+    try:
+        logger.info("Acessando a aba Alarme...")
+        controle("Alarme", "ListItem").select()
+        logger.info("Aba Alarme acessada com sucesso.")
+    except Exception as e:
+        error_message = f"Erro ao acessar a aba Alarme: {e}"
+        logger.error(error_message)
+        add_error_report(error_message)
+        return False
+    return True
+
+@metrics.timed()
 def criar_alarme(hora, minuto, nome, dias, soneca, repetir=True, campainha=None):
+    """
+    Cria um alarme na janela do Relógio já conectada. A tarefa agendada do alarme é
+    registrada por criar_alarmes, com as dos demais alarmes do lote.
+
+    Returns:
+        bool: True se o alarme foi criado.
+    """
+    send_keys = backend.send_keys
     try:
         logger.info("Clicando no botão + para adicionar um novo alarme...")
-        add_alarm_button = clock.child_window(title="Adicionar um alarme", control_type="Button")
-        add_alarm_button.wait('visible', timeout=10).click()
-        time.sleep(2)  # Adicionar um delay para garantir que a janela está pronta
+        controle("Adicionar um alarme", "Button").click()
+        # Esperar o diálogo do alarme abrir com o foco no campo da hora: teclas enviadas antes são perdidas
+        esperar('dialogo', lambda: campo_com_foco('hora'), 'campo da hora com o foco')
         
-        logger.info("Configurando o novo alarme...")
+        # Compilar o plano de teclas a partir dos valores atuais do diálogo
+        dialogo = dialogo_alarme()
+        atual = ler_dialogo(dialogo)
+        alarme = dict(hora=hora, minuto=minuto, nome=nome, dias=dias, soneca=soneca, repetir=repetir, campainha=campainha)
+        plano = dict(compilar_plano(alarme, atual))
+        logger.info(f"Configurando o novo alarme ({contar_teclas(plano.items())} teclas)...")
         
         # Configurar a hora e minutos do alarme usando teclado
         logger.info("Inserindo hora e minutos...")
-        for digit in f"{hora:02d}":
-            send_keys(f"{{VK_NUMPAD{digit}}}")
-        send_keys("{TAB}")
-        for digit in f"{minuto:02d}":
-            send_keys(f"{{VK_NUMPAD{digit}}}")
-        send_keys("{TAB}")
-        time.sleep(1)
+        send_keys(plano["horario"])
+        esperar('horario', lambda: controle("Salvar", "Button", timeout=0).is_enabled(), 'botão Salvar habilitado')
         
         # Configurar o nome do alarme
         logger.info("Configurando o nome do alarme...")
-        send_keys(f"{nome.replace(' ', '{SPACE}')}")
-        time.sleep(1)
-        
-        # Verificar se a próxima seção é "Repetir alarme"
-        logger.info("Verificando a próxima seção...")
-        send_keys("{TAB}")
-        if repetir:
-            send_keys("{SPACE}")
-        send_keys("{TAB}")
+        send_keys(plano["nome"])
+        # O TAB do fim de cada seção leva o foco ao campo seguinte quando as teclas foram processadas
+        esperar('foco', lambda: campo_com_foco('repetir'), 'campo de repetição com o foco')
         
-        # Configurar os dias da semana
-        logger.info("Configurando os dias da semana...")
-        for dia in range(1, 8):  # Navegar pelos dias de Domingo a Sábado
-            if dia in dias:
-                send_keys("{SPACE}")
-            send_keys("{RIGHT}")
-            time.sleep(0.5)
+        # Configurar a repetição e os dias da semana
+        logger.info("Configurando a repetição e os dias da semana...")
+        send_keys(plano["dias"])
+        esperar('foco', lambda: campo_com_foco('campainha'), 'campo do som do alarme com o foco')
         
-        # Configurar o som do alarme
-        if campainha:
-            logger.info("Configurando o som do alarme...")
-            send_keys("{TAB}")
-            index = alarm_sounds.index(campainha)
-            for _ in range(index):
-                send_keys("{DOWN}")
-            send_keys("{TAB}")
-        else:
-            send_keys("{TAB}")
-            send_keys("{TAB}")
-
-        # Configurar soneca
+        # Configurar o som do alarme e a soneca
+        logger.info("Configurando o som do alarme...")
+        send_keys(plano["campainha"])
         logger.info("Configurando a soneca...")
-        current_index = snooze_times.index("10 minutos")
-        desired_index = snooze_times.index(soneca)
-        steps = desired_index - current_index
-        if steps > 0:
-            for _ in range(steps):
-                send_keys("{DOWN}")
-        elif steps < 0:
-            for _ in range(-steps):
-                send_keys("{UP}")
-        send_keys("{TAB}")
+        send_keys(plano["soneca"])
+        # O diálogo só tem os valores finais depois que o aplicativo processou as teclas
+        esperar('foco', lambda: controle("Salvar", "Button", timeout=0).has_keyboard_focus(), 'botão Salvar com o foco')
+        
+        # Conferir os campos antes de salvar (um alarme diferente do configurado não é salvo)
+        if atual is not None:
+            logger.info("Conferindo os campos do alarme...")
+            conferir_dialogo(dialogo, valores_esperados(alarme, atual))
         
         # Salvar o alarme
         logger.info("Salvando o alarme...")
-        send_keys("{SPACE}")
-        time.sleep(2)
+        send_keys(plano["salvar"])
+        esperar('salvar', dialogo_fechado, 'diálogo do alarme fechado')
         
         logger.info("Alarme criado com sucesso.")
-        
-        # Criar tarefa agendada no Windows
-        script_path = os.path.abspath('register_alarm.py')
-        dias_semana = ["SUN", "MON", "TUE", "WED", "THU", "FRI", "SAT"]
-        dias_agendados = [dias_semana[dia - 1] for dia in dias]
-        criar_tarefa_agendada(nome, script_path, hora, minuto, dias_agendados, repetir)
+        return True
         
     except Exception as e:
-        error_message = f"Erro ao criar o alarme: {e}"
+        error_message = f"Erro ao criar o alarme {nome}: {e}"
         logger.error(error_message)
         add_error_report(error_message)
+        # Fecha o diálogo do alarme, se ficou aberto, para o próximo alarme do lote começar da lista
+        try:
+            send_keys("{ESC}")
+        except Exception:
+            pass
+        return False
 
-# Criar o primeiro alarme
-criar_alarme(hora=8, minuto=0, nome="Tenha um excelente dia de trabalho!", dias=[2, 3, 4, 5, 6], soneca="5 minutos")
+# Função para mostrar os alarmes, os planos de teclas e as tarefas agendadas sem abrir o Relógio
+def dry_run(alarms):
+    print(f"Simulação: {len(alarms)} alarmes válidos; o Relógio não será aberto e nenhuma tarefa será agendada")
+    total_teclas = total_chamadas = 0
+    agendador = scheduler or default_scheduler()
+    for alarme in alarms:
+        dias = [dias_semana[dia - 1] for dia in alarme['dias']]
+        repetir = alarme.get('repetir', True)
+        campainha = alarme.get('campainha') or alarm_sounds[0]
+        print(f"\nAlarme {alarme['hora']:02d}:{alarme['minuto']:02d} \"{alarme['nome']}\": "
+              f"dias {', '.join(dias)}, {'repetir' if repetir else 'uma vez'}, soneca {alarme['soneca']}, campainha {campainha}")
+        tarefa = tarefa_agendada(alarme)
+        plano = compilar_plano(alarme)
+        total_teclas += contar_teclas(plano)
+        total_chamadas += len(plano)
+        print(f"  Plano de teclas ({contar_teclas(plano)} teclas em {len(plano)} chamadas send_keys):")
+        for secao, teclas in plano:
+            print(f"    {secao:<10} {teclas}")
+        print("  Tarefa agendada:")
+        for linha in agendador.describe(tarefa):
+            print(f"    {linha}")
+    print(f"\nTotal: {total_teclas} teclas em {total_chamadas} chamadas send_keys")
+    return 0
 
-# Criar o segundo alarme
-criar_alarme(hora=7, minuto=45, nome="Curtir o final de semana", dias=[1, 7], soneca="30 minutos", repetir=True, campainha="Jingle")
+# Função para criar os alarmes em uma única sessão do Relógio e registrar as suas tarefas
+# agendadas ao final do lote, com o resultado de cada alarme
+def criar_alarmes(alarms):
+    resultados = []
+    tarefas = []
+    inicio_lote = backend.monotonic()
+    for posicao, alarme in enumerate(alarms, start=1):
+        logger.info(f"Alarme {posicao} de {len(alarms)}: {alarme['nome']}")
+        erros_antes = len(error_reports)
+        inicio = backend.monotonic()
+        sucesso = criar_alarme(**alarme)
+        erro = error_reports.recent[-1] if len(error_reports) > erros_antes else ''
+        resultados.append(dict(nome=alarme['nome'], hora=alarme['hora'], minuto=alarme['minuto'],
+                               status='ok' if sucesso else 'erro', duracao=round(backend.monotonic() - inicio, 3), erro=erro))
+        if sucesso:
+            tarefas.append(tarefa_agendada(alarme))
 
-# Fecha o relógio
-close_clock()
+    # Sem a tarefa agendada, o alarme criado não é considerado ok
+    falhas = criar_tarefas_agendadas(tarefas)
+    for resultado in resultados:
+        if resultado['status'] == 'ok' and resultado['nome'] in falhas:
+            resultado.update(status='erro', erro=falhas[resultado['nome']])
+    decorrido = backend.monotonic() - inicio_lote
+    criados = sum(1 for resultado in resultados if resultado['status'] == 'ok')
+    if alarms:
+        logger.info(f"{criados} de {len(alarms)} alarmes criados em {decorrido:.1f} s "
+                    f"({len(alarms) / decorrido * 60:.1f} alarmes por minuto)")
+    return resultados
+
+# Função para gravar o resultado de cada alarme do lote em reports/alarmes_<data>.csv
+def salvar_resultados(resultados):
+    caminho = os.path.join(reports_directory, f"alarmes_{datetime.now().strftime('%Y-%m-%d_%H-%M-%S')}.csv")
+    with open(caminho, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=['nome', 'hora', 'minuto', 'status', 'duracao', 'erro'])
+        writer.writeheader()
+        writer.writerows(resultados)
+    logger.info(f"Resultado dos alarmes gravado em {caminho}")
+    return caminho
+
+def run(alarms):
+    metrics.start_run()
+    if backend is None:
+        from ui_backend import PywinautoBackend
+        use_backend(PywinautoBackend())
+    if scheduler is None:
+        use_scheduler(default_scheduler())
+    carregar_tempos_limite()
+
+    # Criar diretório e arquivo histórico antes de criar alarmes
+    criar_diretorio_historico()
+
+    # Abrir o aplicativo de Relógio do Windows
+    open_clock()
+
+    # Uma única conexão com o Relógio para todo o lote
+    if connect_clock():
+        salvar_resultados(criar_alarmes(alarms))
+
+        # Fecha o relógio
+        close_clock()
+
+    # Salvar relatório de erros, se houver
+    save_error_report()
+    salvar_tempos_limite()
+    save_metrics(not error_reports)
+    return 1 if error_reports else 0
+
+# Funções para carregar e gravar as latências das esperas (falhas usam os tempos limite padrão)
+def carregar_tempos_limite():
+    try:
+        timeouts.load(ui_timeouts_path)
+    except Exception as e:
+        logger.warning(f"Erro ao carregar os tempos limite das esperas, usando os padrões: {e}")
+
+def salvar_tempos_limite():
+    try:
+        timeouts.save(ui_timeouts_path)
+        logger.info("Tempos limite das esperas: " + ", ".join(
+            f"{etapa} {timeouts.timeout(etapa):.1f} s" for etapa in TEMPOS_LIMITE_PADRAO))
+    except Exception as e:
+        logger.warning(f"Erro ao gravar os tempos limite das esperas: {e}")
+
+# Função para gravar as métricas da execução (falhas na gravação não afetam o resultado)
+def save_metrics(success):
+    metrics.finish_run(success)
+    try:
+        paths = save_run(metrics, textfile_path=metrics_textfile_path, history_path=run_history_path)
+        logger.info(f"Métricas das etapas gravadas em {', '.join(paths)}")
+    except Exception as e:
+        logger.warning(f"Erro ao gravar as métricas das etapas: {e}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', nargs='?', choices=['run', 'report'], default='run',
+                        help='run cria os alarmes (padrão); report mostra p50/p95 das etapas nas últimas execuções')
+    parser.add_argument('--file', help='Arquivo JSON ou CSV com os alarmes (padrão: ALARMS)')
+    parser.add_argument('--dry-run', action='store_true', help='Valida e mostra os alarmes, os planos de teclas e as tarefas agendadas, sem executar')
+    parser.add_argument('--runs', type=int, default=20, help='Execuções consideradas pelo report')
+    args = parser.parse_args(argv)
+
+    if args.command == 'report':
+        return print_report(run_history_path, 'desktop', args.runs)
+
+    # Todos os alarmes são validados antes de abrir o Relógio
+    try:
+        alarms = carregar_alarmes(args.file) if args.file else validar_alarmes(ALARMS)
+    except (OSError, ValueError) as e:
+        print(f"Alarmes inválidos: {e}")
+        return 2
+
+    if args.dry_run:
+        return dry_run(alarms)
+
+    pipeline = setup_logging()
+    try:
+        return run(alarms)
+    finally:
+        pipeline.stop()
 
-# Salvar relatório de erros, se houver
-save_error_report()
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Leitura e validação dos alarmes criados pelo robô desktop.
+
+Os alarmes podem vir de um arquivo JSON (lista de objetos com as mesmas chaves de
+alarm.ALARMS) ou CSV (colunas hora, minuto, nome, dias, soneca, repetir e campainha).
+Todos os alarmes são validados antes de abrir o Relógio: um arquivo com erros não cria
+nenhum alarme, e todos os problemas encontrados são listados de uma vez.
+"""
+import csv
+import json
+
+# Opções de campainha e soneca, na ordem em que aparecem no Relógio
+alarm_sounds = ["Alarms", "Xilofone", "Acordes", "Toque", "Jingle", "Transição", "Decrescente", "Quique", "Eco"]
+snooze_times = ["Desativado", "5 minutos", "10 minutos", "20 minutos", "30 minutos", "1 hora"]
+
+# Soneca selecionada pelo Relógio em um alarme novo
+SONECA_PADRAO = "10 minutos"
+
+CAMPOS = ('hora', 'minuto', 'nome', 'dias', 'soneca', 'repetir', 'campainha')
+
+# Caracteres que não podem aparecer no nome (o nome também é o da tarefa agendada)
+CARACTERES_INVALIDOS = '<>:"/\\|?*'
+
+VERDADEIRO = ('1', 'true', 'sim', 's', 'yes')
+FALSO = ('0', 'false', 'não', 'nao', 'n', 'no')
+
+class AlarmConfigError(ValueError):
+    """
+    Alarmes inválidos no arquivo de configuração.
+
+    Attributes:
+        erros (list): Mensagens de todos os problemas encontrados.
+    """
+    def __init__(self, erros):
+        self.erros = erros
+        super().__init__(f"{len(erros)} problema(s) nos alarmes:\n" + "\n".join(f"- {erro}" for erro in erros))
+
+def _inteiro(valor, minimo, maximo):
+    if isinstance(valor, bool):
+        raise ValueError
+    numero = int(str(valor).strip())
+    if not minimo <= numero <= maximo:
+        raise ValueError
+    return numero
+
+def _dias(valor):
+    """
+    Converte os dias da semana (1 = domingo a 7 = sábado) em uma lista ordenada.
+
+    Aceita uma lista de números ou um texto com números e intervalos separados por vírgula
+    ou ponto e vírgula (ex.: "2-6", "1;7").
+    """
+    if isinstance(valor, str):
+        itens = [item.strip() for item in valor.replace(';', ',').split(',') if item.strip()]
+    elif isinstance(valor, (list, tuple)):
+        itens = list(valor)
+    else:
+        raise ValueError
+    dias = []
+    for item in itens:
+        if isinstance(item, str) and '-' in item:
+            inicio, fim = (_inteiro(parte, 1, 7) for parte in item.split('-', 1))
+            if inicio > fim:
+                raise ValueError
+            dias.extend(range(inicio, fim + 1))
+        else:
+            dias.append(_inteiro(item, 1, 7))
+    if not dias or len(set(dias)) != len(dias):
+        raise ValueError
+    return sorted(dias)
+
+def _booleano(valor):
+    if isinstance(valor, bool):
+        return valor
+    texto = str(valor).strip().lower()
+    if texto in VERDADEIRO:
+        return True
+    if texto in FALSO:
+        return False
+    raise ValueError
+
+def validar_alarmes(registros):
+    """
+    Valida e normaliza os alarmes.
+
+    Args:
+        registros (list): Dicionários com hora, minuto, nome e dias (obrigatórios) e soneca,
+            repetir e campainha (opcionais; padrão "10 minutos", True e a campainha atual).
+
+    Returns:
+        list: Alarmes normalizados, no formato dos argumentos de alarm.criar_alarme.
+
+    Raises:
+        AlarmConfigError: Com todos os problemas encontrados, se algum alarme for inválido.
+    """
+    alarmes = []
+    erros = []
+    nomes = set()
+    for posicao, registro in enumerate(registros, start=1):
+        if not isinstance(registro, dict):
+            erros.append(f"Alarme {posicao}: deve ser um objeto com os campos {', '.join(CAMPOS)}")
+            continue
+        nome = str(registro.get('nome') or '').strip()
+        rotulo = f'Alarme {posicao} ("{nome}")' if nome else f"Alarme {posicao}"
+        problemas = []
+
+        desconhecidos = sorted(str(campo) for campo in set(registro) - set(CAMPOS))
+        if desconhecidos:
+            problemas.append(f"campos desconhecidos: {', '.join(desconhecidos)}")
+
+        alarme = {'nome': nome}
+        for campo, minimo, maximo in (('hora', 0, 23), ('minuto', 0, 59)):
+            try:
+                alarme[campo] = _inteiro(registro.get(campo), minimo, maximo)
+            except (TypeError, ValueError):
+                problemas.append(f"{campo} deve ser um número de {minimo} a {maximo}: {registro.get(campo)!r}")
+
+        if not nome:
+            problemas.append("nome vazio")
+        elif any(caractere in nome for caractere in CARACTERES_INVALIDOS):
+            problemas.append(f"o nome não pode conter os caracteres {CARACTERES_INVALIDOS}")
+        elif nome.lower() in nomes:
+            problemas.append("nome repetido (o nome identifica a tarefa agendada)")
+        nomes.add(nome.lower())
+
+        try:
+            alarme['dias'] = _dias(registro.get('dias'))
+        except (TypeError, ValueError):
+            problemas.append(f"dias deve listar dias de 1 (domingo) a 7 (sábado), sem repetição: {registro.get('dias')!r}")
+
+        soneca = registro.get('soneca') or SONECA_PADRAO
+        if soneca not in snooze_times:
+            problemas.append(f"soneca deve ser uma de {', '.join(snooze_times)}: {soneca!r}")
+        alarme['soneca'] = soneca
+
+        try:
+            alarme['repetir'] = _booleano(registro.get('repetir', True))
+        except ValueError:
+            problemas.append(f"repetir deve ser verdadeiro ou falso: {registro.get('repetir')!r}")
+
+        campainha = registro.get('campainha') or None
+        if campainha is not None and campainha not in alarm_sounds:
+            problemas.append(f"campainha deve ser uma de {', '.join(alarm_sounds)}: {campainha!r}")
+        alarme['campainha'] = campainha
+
+        if problemas:
+            erros.extend(f"{rotulo}: {problema}" for problema in problemas)
+        else:
+            alarmes.append(alarme)
+    if erros:
+        raise AlarmConfigError(erros)
+    return alarmes
+
+def carregar_alarmes(path):
+    """
+    Lê e valida os alarmes de um arquivo JSON ou CSV.
+
+    Args:
+        path (str): Arquivo .json (lista de objetos) ou .csv (uma linha por alarme).
+
+    Returns:
+        list: Alarmes normalizados (ver validar_alarmes).
+
+    Raises:
+        ValueError: Se o formato não for suportado ou o arquivo não puder ser lido.
+        AlarmConfigError: Se algum alarme for inválido.
+    """
+    with open(path, encoding='utf-8-sig', newline='') as file:
+        if path.lower().endswith('.json'):
+            try:
+                registros = json.load(file)
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Arquivo de alarmes {path} inválido: {e}")
+            if not isinstance(registros, list):
+                raise ValueError(f"O arquivo de alarmes {path} deve conter uma lista de alarmes")
+        elif path.lower().endswith('.csv'):
+            # Colunas vazias equivalem a campos não informados
+            registros = [{campo: valor for campo, valor in linha.items() if valor not in (None, '')}
+                         for linha in csv.DictReader(file)]
+        else:
+            raise ValueError(f"Formato do arquivo de alarmes não suportado: {path}")
+    return validar_alarmes(registros)
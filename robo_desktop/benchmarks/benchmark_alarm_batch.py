@@ -0,0 +1,141 @@
+"""
+Mede a vazão (alarmes por minuto) da criação de alarmes em lote com o Relógio simulado.
+
+O robô usa o backend simulated_clock.SimulatedBackend, em tempo simulado: cada busca de
+controle na árvore de automação (UIA) custa --find-ms, cada conexão ao aplicativo
+--connect-ms e as pausas do robô avançam o relógio sem esperar. O agendador das tarefas é
+substituído por um scheduler.RecordingScheduler em que cada tarefa registrada custa --schtasks-ms
+(um processo schtasks, também quando as tarefas do lote são registradas juntas). O
+benchmark compara:
+
+- um processo por alarme: abre e conecta o Relógio a cada alarme (o script original
+  executado uma vez por alarme);
+- lote sem cache: uma conexão, mas os controles são localizados de novo a cada alarme;
+- lote com cache: uma conexão e os controles localizados uma única vez (alarm.controle).
+
+Também mede a validação do arquivo de alarmes (alarm_config.carregar_alarmes) e confere
+os alarmes salvos no Relógio simulado.
+
+Uso:
+    python benchmarks/benchmark_alarm_batch.py [--alarms 300] [--find-ms 400] [--connect-ms 300]
+"""
+import argparse
+import csv
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+DESKTOP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DESKTOP)
+
+import alarm
+from alarm_config import alarm_sounds, snooze_times, carregar_alarmes
+from simulated_clock import SimulatedClockApp, SimulatedBackend
+from scheduler import RecordingScheduler
+
+class SimulatedScheduler(RecordingScheduler):
+    """
+    Agendador em memória em que cada registro (um processo schtasks) avança o relógio simulado.
+    """
+    def __init__(self, app, seconds):
+        super().__init__()
+        self.app = app
+        app.latencies['schtasks'] = seconds
+
+    def register(self, task):
+        self.app.spend('schtasks')
+        super().register(task)
+
+    def register_all(self, tasks):
+        self.app.spend('schtasks', len(tasks))
+        return super().register_all(tasks)
+
+def random_alarms(count, rng):
+    alarms = []
+    for index in range(count):
+        first = rng.randint(1, 7)
+        alarms.append({
+            'hora': rng.randint(0, 23),
+            'minuto': rng.randint(0, 59),
+            'nome': f'Alarme {index + 1:04d}',
+            'dias': f'{first}-{rng.randint(first, 7)}',
+            'soneca': rng.choice(snooze_times),
+            'repetir': rng.choice(['sim', 'não']),
+            'campainha': rng.choice(alarm_sounds + ['']),
+        })
+    return alarms
+
+def expected(alarme):
+    return dict(alarme, campainha=alarme['campainha'] or alarm_sounds[0])
+
+def run_mode(alarms, mode, latencies, schtasks_seconds):
+    """
+    Cria os alarmes no modo indicado em um novo Relógio simulado.
+
+    Returns:
+        tuple: Segundos simulados, resultados de alarm.criar_alarmes e o aplicativo simulado.
+    """
+    app = SimulatedClockApp(latencies)
+    alarm.use_backend(SimulatedBackend(app))
+    alarm.use_scheduler(SimulatedScheduler(app, schtasks_seconds))
+    if mode == 'um processo por alarme':
+        results = []
+        for alarme in alarms:
+            alarm.open_clock()
+            alarm.connect_clock()
+            results.extend(alarm.criar_alarmes([alarme]))
+            alarm.close_clock()
+    elif mode == 'lote sem cache':
+        alarm.open_clock()
+        alarm.connect_clock()
+        results = []
+        for alarme in alarms:
+            alarm.controles.clear()
+            results.extend(alarm.criar_alarmes([alarme]))
+    else:
+        alarm.open_clock()
+        alarm.connect_clock()
+        results = alarm.criar_alarmes(alarms)
+    return app.now, results, app
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--alarms', type=int, default=300, help='Alarmes do lote')
+    parser.add_argument('--find-ms', type=float, default=400, help='Custo de uma busca de controle (UIA)')
+    parser.add_argument('--connect-ms', type=float, default=300, help='Custo de uma conexão ao Relógio')
+    parser.add_argument('--schtasks-ms', type=float, default=150, help='Custo de cada registro de tarefa (um processo schtasks)')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    latencies = {'find': args.find_ms / 1000, 'connect': args.connect_ms / 1000}
+
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'alarmes.csv')
+        with open(path, 'w', encoding='utf-8', newline='') as file:
+            writer = csv.DictWriter(file, fieldnames=['hora', 'minuto', 'nome', 'dias', 'soneca', 'repetir', 'campainha'])
+            writer.writeheader()
+            writer.writerows(random_alarms(args.alarms, rng))
+        start = time.perf_counter()
+        alarms = carregar_alarmes(path)
+        validation = time.perf_counter() - start
+    print(f'Validação de {len(alarms)} alarmes (CSV): {validation * 1000:.1f} ms\n')
+
+    print(f'{"modo":<24}{"tempo simulado (min)":>22}{"alarmes/min":>13}{"buscas UIA":>12}{"conexões":>10}'
+          f'{"schtasks":>10}{"ok":>6}{"corretos":>10}')
+    for mode in ('um processo por alarme', 'lote sem cache', 'lote com cache'):
+        start = time.perf_counter()
+        elapsed, results, app = run_mode(alarms, mode, latencies, args.schtasks_ms / 1000)
+        wall = time.perf_counter() - start
+        ok = sum(1 for result in results if result['status'] == 'ok')
+        correct = sum(1 for alarme, saved in zip(alarms, app.alarms) if expected(alarme) == saved)
+        print(f'{mode:<24}{elapsed / 60:>22.1f}{len(alarms) / elapsed * 60:>13.2f}{app.counts.get("find", 0):>12}'
+              f'{app.counts.get("connect", 0):>10}{app.counts.get("schtasks", 0):>10}{ok:>6}{correct:>10}'
+              f'   ({wall:.2f} s reais)')
+        assert correct == len(alarms), f'{mode}: {len(alarms) - correct} alarmes salvos com valores diferentes'
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""
+Teste de regressão de tempo e correção do criar_alarme com o Relógio simulado (roda em Linux).
+
+Cria no Relógio simulado (simulated_clock.py) um conjunto de alarmes que cobre todas as
+campainhas e sonecas, dias isolados e a semana inteira, horários extremos, alarmes sem
+repetição e nomes com caracteres especiais do send_keys. Depois confere, campo a campo, o
+alarme salvo com a configuração e mede o tempo simulado por alarme, as chamadas send_keys e
+teclas do plano de teclas (alarm.compilar_plano) e os tempos limite das esperas ajustados
+pelas latências observadas (alarm.timeouts). Os alarmes também são criados em um Relógio cujo
+diálogo de alarme novo já vem preenchido (nome, repetição, dias, campainha e soneca), para
+conferir que o plano parte dos valores lidos do diálogo.
+
+Falha (código de saída 1) se algum alarme for salvo com valores diferentes, se alguma tecla
+for perdida ou se o tempo médio por alarme passar de --budget-s. Por fim, mostra como o
+tempo e a correção variam com a latência de abertura do diálogo do alarme.
+
+Uso:
+    python benchmarks/benchmark_criar_alarme.py [--dialog-ms 1200] [--budget-s 5]
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+
+DESKTOP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DESKTOP)
+
+import alarm
+from alarm_config import alarm_sounds, snooze_times, validar_alarmes
+from simulated_clock import SimulatedClockApp, SimulatedBackend
+from scheduler import RecordingScheduler
+
+def cases():
+    """
+    Alarmes que cobrem as opções do diálogo.
+    """
+    alarms = []
+    for index, sound in enumerate(alarm_sounds):
+        alarms.append(dict(hora=index, minuto=index * 7, nome=f"Campainha {sound}", dias=[index % 7 + 1], campainha=sound))
+    for index, snooze in enumerate(snooze_times):
+        alarms.append(dict(hora=12 + index, minuto=59 - index, nome=f"Soneca {snooze}", dias=[1, 7], soneca=snooze))
+    alarms += [
+        dict(hora=0, minuto=0, nome="Meia-noite", dias=[1, 2, 3, 4, 5, 6, 7]),
+        dict(hora=23, minuto=59, nome="Último minuto", dias=[7], repetir=False),
+        dict(hora=6, minuto=5, nome="Café (cedo) + pão {ok} [sim] ~50% ^^", dias=[2, 4, 6], campainha="Eco"),
+        dict(hora=9, minuto=30, nome="Só domingo", dias=[1], soneca="Desativado", campainha="Alarms"),
+    ]
+    return validar_alarmes(alarms)
+
+def expected(alarme, new_alarm=None):
+    # Sem campainha configurada, o alarme fica com a campainha do diálogo de alarme novo
+    return dict(alarme, campainha=alarme['campainha'] or (new_alarm or {}).get('campainha', alarm_sounds[0]))
+
+# Diálogo de alarme novo já preenchido (o plano não pode supor os valores padrão)
+NOVO_ALARME_PREENCHIDO = dict(nome="Alarme", repetir=True, dias=[1, 4], campainha="Decrescente", soneca="1 hora")
+
+def run(alarms, latencies, new_alarm=None):
+    """
+    Cria os alarmes em um novo Relógio simulado.
+
+    Returns:
+        tuple: Tempos por alarme (s), alarmes incorretos (configurado, salvo) e o aplicativo simulado.
+    """
+    app = SimulatedClockApp(latencies, new_alarm)
+    alarm.use_backend(SimulatedBackend(app))
+    alarm.timeouts.observed.clear()
+    alarm.use_scheduler(RecordingScheduler())
+    alarm.open_clock()
+    alarm.connect_clock()
+    results = alarm.criar_alarmes(alarms)
+    saved = app.alarms + [None] * (len(alarms) - len(app.alarms))
+    wrong = [(expected(alarme, new_alarm), values) for alarme, values in zip(alarms, saved) if expected(alarme, new_alarm) != values]
+    return [result['duracao'] for result in results], wrong, app
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dialog-ms', type=float, default=1200, help='Latência de abertura do diálogo do alarme')
+    parser.add_argument('--budget-s', type=float, default=5, help='Tempo médio máximo por alarme (simulado)')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.CRITICAL)
+    alarms = cases()
+    durations, wrong, app = run(alarms, {'dialog': args.dialog_ms / 1000})
+    print(f'{len(alarms)} alarmes, diálogo com {args.dialog_ms:.0f} ms de latência: '
+          f'{statistics.mean(durations):.2f} s por alarme (p50 {statistics.median(durations):.2f} s, máx. {max(durations):.2f} s), '
+          f'{app.counts.get("send_keys", 0) / len(alarms):.0f} chamadas send_keys e {app.counts.get("key", 0) / len(alarms):.0f} teclas por alarme')
+
+    print('Tempos limite ajustados: ' + ', '.join(
+        f'{etapa} {alarm.timeouts.timeout(etapa):.1f} s' for etapa in alarm.TEMPOS_LIMITE_PADRAO))
+
+    failures = []
+    for configured, saved in wrong:
+        failures.append(f'alarme "{configured["nome"]}": configurado {configured}, salvo {saved}')
+    if app.dropped_keys:
+        failures.append(f'{app.dropped_keys} teclas perdidas (enviadas antes de o diálogo abrir)')
+
+    _, prefilled_wrong, prefilled_app = run(alarms, {'dialog': args.dialog_ms / 1000}, NOVO_ALARME_PREENCHIDO)
+    print(f'Diálogo já preenchido: {len(alarms) - len(prefilled_wrong)} de {len(alarms)} alarmes corretos, '
+          f'{prefilled_app.counts.get("key", 0) / len(alarms):.0f} teclas por alarme')
+    for configured, saved in prefilled_wrong:
+        failures.append(f'diálogo já preenchido, alarme "{configured["nome"]}": configurado {configured}, salvo {saved}')
+    if statistics.mean(durations) > args.budget_s:
+        failures.append(f'{statistics.mean(durations):.2f} s por alarme (orçamento {args.budget_s:.1f} s)')
+
+    print(f'\n{"latência do diálogo (s)":<26}{"s por alarme":>14}{"corretos":>10}{"teclas perdidas":>17}')
+    for dialog in (0.5, 1.0, 2.0, 3.0, 4.0):
+        sweep_durations, sweep_wrong, sweep_app = run(alarms, {'dialog': dialog})
+        print(f'{dialog:<26.1f}{statistics.mean(sweep_durations):>14.2f}{len(alarms) - len(sweep_wrong):>10}'
+              f'{sweep_app.dropped_keys:>17}')
+
+    if failures:
+        print('\nRegressões:\n' + '\n'.join(f'- {failure}' for failure in failures))
+        sys.exit(1)
+    print('\nTodos os alarmes salvos com os valores configurados.')
+
+if __name__ == '__main__':
+    main()
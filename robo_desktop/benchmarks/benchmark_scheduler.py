@@ -0,0 +1,149 @@
+"""
+Mede o tempo de registro das tarefas agendadas de um lote de alarmes (roda em Linux).
+
+Compara o registro original (um `schtasks /delete` e um `schtasks /create` por dia da
+semana, com shell=True), o registro com um único `/d` com todos os dias (exclusão e
+criação) e os agendadores de scheduler.py: SchtasksScheduler (uma definição XML e um único
+processo por alarme), SystemdScheduler (unidades .timer/.service e um único systemctl para o
+lote) e RecordingScheduler (em memória).
+
+Os comandos schtasks e systemctl não existem aqui: cada um é substituído pela execução de
+`true`, para medir o custo de criar os processos, e o resultado é conferido em um registro
+simulado (para os comandos originais, /f substitui a tarefa de mesmo nome) ou nas próprias
+definições geradas (XML e unidades do systemd): cada tarefa deve ter todos os dias do alarme.
+
+Uso:
+    python benchmarks/benchmark_scheduler.py [--alarms 100]
+"""
+import argparse
+import os
+import random
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import xml.etree.ElementTree as ET
+
+DESKTOP = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, DESKTOP)
+
+from scheduler import (ScheduledTask, SchtasksScheduler, SystemdScheduler, RecordingScheduler,
+                       DIAS_TASK_SCHEDULER, DIAS_SYSTEMD, TASK_NAMESPACE)
+
+DIAS_SCHTASKS = ["SUN", "MON", "TUE", "WED", "THU", "FRI", "SAT"]
+TRUE = shutil.which('true') or 'true'
+
+class Spawner:
+    """
+    Executa `true` no lugar de cada comando e conta os processos criados.
+    """
+    def __init__(self):
+        self.processes = 0
+
+    def run(self, command, shell=False, **kwargs):
+        self.processes += 1
+        return subprocess.run(TRUE if shell else [TRUE], shell=shell, **kwargs)
+
+class CheckedSchtasksScheduler(SchtasksScheduler):
+    """
+    SchtasksScheduler que guarda as definições XML registradas, para conferir os dias.
+    """
+    def __init__(self, run):
+        super().__init__(run)
+        self.definitions = {}
+
+    def definition(self, task):
+        xml = self.definitions[task.name] = super().definition(task)
+        return xml
+
+def random_tasks(count, rng, script_path):
+    tasks = []
+    for index in range(count):
+        first = rng.randint(1, 7)
+        tasks.append(ScheduledTask(f'Alarme {index + 1:04d}', script_path, rng.randint(0, 23), rng.randint(0, 59),
+                                   range(first, rng.randint(first, 7) + 1)))
+    return tasks
+
+def legacy_commands(task, one_command):
+    """
+    Comandos schtasks do registro anterior: exclusão e uma criação por dia (one_command=False)
+    ou uma única criação com todos os dias (one_command=True).
+    """
+    create = (f'schtasks /create /tn "{task.name}" /tr "python \\"{task.script_path}\\"" /sc weekly '
+              f'/st {task.hour:02d}:{task.minute:02d} /f')
+    days = [DIAS_SCHTASKS[dia - 1] for dia in task.days]
+    creates = [f'{create} /d {",".join(days)}'] if one_command else [f'{create} /d {day}' for day in days]
+    return [f'schtasks /delete /tn "{task.name}" /f'] + creates
+
+def register_legacy(tasks, spawner, one_command):
+    """
+    Returns:
+        dict: Dias registrados de cada tarefa (cada /create com /f substitui a tarefa de mesmo nome).
+    """
+    registered = {}
+    for task in tasks:
+        for command in legacy_commands(task, one_command):
+            spawner.run(command, shell=True, capture_output=True, text=True)
+            if command.startswith('schtasks /delete'):
+                registered.pop(task.name, None)
+            else:
+                registered[task.name] = [DIAS_SCHTASKS.index(day) + 1 for day in command.rsplit('/d ', 1)[1].split(',')]
+    return registered
+
+def xml_days(definition):
+    root = ET.fromstring(definition.split('\n', 1)[1])
+    names = [day.tag.split('}')[1] for days in root.iter(f'{{{TASK_NAMESPACE}}}DaysOfWeek') for day in days]
+    return sorted(DIAS_TASK_SCHEDULER.index(name) + 1 for name in names)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--alarms', type=int, default=100, help='Alarmes do lote')
+    args = parser.parse_args()
+
+    tasks = random_tasks(args.alarms, random.Random(7), os.path.join(DESKTOP, 'register_alarm.py'))
+    configured = {task.name: task.days for task in tasks}
+
+    print(f'Registro de {len(tasks)} tarefas agendadas ({sum(len(task.days) for task in tasks)} gatilhos semanais)\n')
+    print(f'{"modo":<44}{"tempo (ms)":>12}{"ms/alarme":>11}{"processos":>11}{"dias corretos":>15}')
+
+    def report(mode, elapsed, processes, registered):
+        correct = sum(1 for name, days in configured.items() if registered.get(name) == days)
+        print(f'{mode:<44}{elapsed * 1000:>12.1f}{elapsed * 1000 / len(tasks):>11.2f}{processes:>11}{correct:>15}')
+
+    for mode, one_command in (('schtasks, uma criação por dia (original)', False),
+                              ('schtasks, /d com todos os dias (2 processos)', True)):
+        spawner = Spawner()
+        start = time.perf_counter()
+        registered = register_legacy(tasks, spawner, one_command)
+        report(mode, time.perf_counter() - start, spawner.processes, registered)
+
+    spawner = Spawner()
+    scheduler = CheckedSchtasksScheduler(run=spawner.run)
+    start = time.perf_counter()
+    scheduler.register_all(tasks)
+    elapsed = time.perf_counter() - start
+    report('SchtasksScheduler (XML, 1 processo)', elapsed, spawner.processes,
+           {name: xml_days(xml) for name, xml in scheduler.definitions.items()})
+
+    with tempfile.TemporaryDirectory() as directory:
+        spawner = Spawner()
+        scheduler = SystemdScheduler(unit_directory=directory, run=spawner.run)
+        start = time.perf_counter()
+        scheduler.register_all(tasks)
+        elapsed = time.perf_counter() - start
+        registered = {}
+        for task in tasks:
+            with open(os.path.join(directory, f'{scheduler.unit_name(task)}.timer'), encoding='utf-8') as file:
+                registered[task.name] = sorted(DIAS_SYSTEMD.index(day) + 1 for day in re.findall(r'^OnCalendar=(\w+) ', file.read(), re.M))
+        report('SystemdScheduler (register_all)', elapsed, spawner.processes, registered)
+
+    scheduler = RecordingScheduler()
+    start = time.perf_counter()
+    scheduler.register_all(tasks)
+    elapsed = time.perf_counter() - start
+    report('RecordingScheduler (em memória)', elapsed, 0, {task.name: xml_days(xml) for task, xml in scheduler.registered})
+
+if __name__ == '__main__':
+    main()
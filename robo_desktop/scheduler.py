@@ -0,0 +1,292 @@
+"""
+Agendadores das tarefas que registram a execução de cada alarme (register_alarm.py).
+
+Cada alarme vira uma única definição de tarefa (ScheduledTask), com um gatilho por dia da
+semana, registrada com uma única chamada ao agendador do sistema:
+
+- SchtasksScheduler (Windows): grava a definição em XML do Agendador de Tarefas e executa
+  um único `schtasks /create /xml ... /f`, que substitui a tarefa existente;
+- SystemdScheduler (Linux): grava as unidades .service e .timer do systemd do usuário e as
+  ativa com `systemctl --user`;
+- RecordingScheduler: apenas guarda as tarefas e as definições, para testes e benchmarks.
+
+default_scheduler escolhe o agendador do sistema. Nenhum agendador executa comandos ou grava
+arquivos antes de register. register_all não para na primeira falha: devolve o erro de cada
+tarefa que não foi registrada, para que apenas os alarmes correspondentes sejam marcados.
+"""
+import hashlib
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import unicodedata
+import xml.etree.ElementTree as ET
+from datetime import datetime, timedelta
+
+# Dias da semana (1 = domingo) no Agendador de Tarefas e no OnCalendar do systemd
+DIAS_TASK_SCHEDULER = ["Sunday", "Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]
+DIAS_SYSTEMD = ["Sun", "Mon", "Tue", "Wed", "Thu", "Fri", "Sat"]
+
+TASK_NAMESPACE = "http://schemas.microsoft.com/windows/2004/02/mit/task"
+
+class SchedulerError(Exception):
+    """
+    Falha ao registrar uma tarefa no agendador.
+    """
+
+class ScheduledTask:
+    """
+    Definição da tarefa agendada de um alarme.
+
+    Args:
+        name (str): Nome da tarefa (o nome do alarme).
+        script_path (str): Caminho do script executado pela tarefa.
+        hour (int): Hora do alarme.
+        minute (int): Minuto do alarme.
+        days (list): Dias da semana (1 = domingo a 7 = sábado).
+        repeat (bool): True para repetir toda semana nos dias indicados; False para uma única execução.
+    """
+    __slots__ = ('name', 'script_path', 'hour', 'minute', 'days', 'repeat')
+
+    def __init__(self, name, script_path, hour, minute, days, repeat=True):
+        self.name = name
+        self.script_path = script_path
+        self.hour = hour
+        self.minute = minute
+        self.days = sorted(set(days))
+        self.repeat = repeat
+
+    def next_run(self, now=None):
+        """
+        Próxima execução de uma tarefa sem repetição (hoje, se o horário ainda não passou, ou amanhã).
+        """
+        now = now or datetime.now()
+        run = now.replace(hour=self.hour, minute=self.minute, second=0, microsecond=0)
+        return run if run >= now else run + timedelta(days=1)
+
+    def summary(self):
+        """
+        Descrição curta dos gatilhos da tarefa.
+        """
+        if self.repeat:
+            return f"semanal ({', '.join(DIAS_SYSTEMD[dia - 1] for dia in self.days)}) às {self.hour:02d}:{self.minute:02d}"
+        return f"uma vez em {self.next_run().strftime('%d/%m/%Y %H:%M')}"
+
+class Scheduler:
+    """
+    Interface dos agendadores: definition monta a definição da tarefa, register a registra
+    (substituindo uma tarefa de mesmo nome) e describe mostra o que seria executado, sem
+    efeitos colaterais. register_all registra várias tarefas; por padrão, uma a uma.
+    """
+    def definition(self, task):
+        raise NotImplementedError
+
+    def register(self, task):
+        raise NotImplementedError
+
+    def register_all(self, tasks):
+        """
+        Registra cada tarefa separadamente; a falha de uma não impede o registro das demais.
+
+        Returns:
+            dict: Mensagem de erro de cada tarefa não registrada, pelo nome da tarefa (vazio se todas foram registradas).
+        """
+        errors = {}
+        for task in tasks:
+            try:
+                self.register(task)
+            except (SchedulerError, OSError) as e:
+                errors[task.name] = str(e)
+        return errors
+
+    def describe(self, task):
+        """
+        Linhas com os comandos de registro da tarefa e os seus gatilhos.
+        """
+        raise NotImplementedError
+
+def _run(run, command):
+    result = run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SchedulerError(f"{' '.join(command)}: {(result.stderr or result.stdout or '').strip()}")
+    return result
+
+def _element(parent, tag, text=None):
+    element = ET.SubElement(parent, tag)
+    if text is not None:
+        element.text = text
+    return element
+
+class SchtasksScheduler(Scheduler):
+    """
+    Agendador de Tarefas do Windows: uma definição XML por alarme, com um CalendarTrigger
+    semanal por dia, registrada com um único processo schtasks (sem shell).
+
+    Args:
+        run (callable, optional): Função que executa o comando (padrão: subprocess.run).
+    """
+    def __init__(self, run=None):
+        self.run = run or subprocess.run
+
+    def definition(self, task):
+        ET.register_namespace('', TASK_NAMESPACE)
+        element = lambda parent, tag, text=None: _element(parent, f'{{{TASK_NAMESPACE}}}{tag}', text)
+
+        root = ET.Element(f'{{{TASK_NAMESPACE}}}Task', version="1.2")
+        info = element(root, 'RegistrationInfo')
+        element(info, 'Description', f'Alarme "{task.name}" (robô desktop)')
+
+        triggers = element(root, 'Triggers')
+        if task.repeat:
+            start = datetime.now().replace(hour=task.hour, minute=task.minute, second=0, microsecond=0)
+            for dia in task.days:
+                trigger = element(triggers, 'CalendarTrigger')
+                element(trigger, 'StartBoundary', start.isoformat())
+                weekly = element(trigger, 'ScheduleByWeek')
+                element(element(weekly, 'DaysOfWeek'), DIAS_TASK_SCHEDULER[dia - 1])
+                element(weekly, 'WeeksInterval', '1')
+        else:
+            trigger = element(triggers, 'TimeTrigger')
+            element(trigger, 'StartBoundary', task.next_run().isoformat())
+
+        settings = element(root, 'Settings')
+        element(settings, 'MultipleInstancesPolicy', 'IgnoreNew')
+        element(settings, 'DisallowStartIfOnBatteries', 'false')
+        element(settings, 'StopIfGoingOnBatteries', 'false')
+        element(settings, 'StartWhenAvailable', 'false')
+
+        execute = element(element(root, 'Actions'), 'Exec')
+        element(execute, 'Command', 'python')
+        element(execute, 'Arguments', f'"{task.script_path}"')
+        return '<?xml version="1.0" encoding="UTF-16"?>\n' + ET.tostring(root, encoding='unicode')
+
+    def command(self, task, xml_path):
+        return ['schtasks', '/create', '/tn', task.name, '/xml', xml_path, '/f']
+
+    def register(self, task):
+        # O schtasks lê a definição de um arquivo em UTF-16
+        descriptor, xml_path = tempfile.mkstemp(suffix='.xml')
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-16') as file:
+                file.write(self.definition(task))
+            _run(self.run, self.command(task, xml_path))
+        finally:
+            os.remove(xml_path)
+
+    def describe(self, task):
+        return [subprocess.list2cmdline(self.command(task, '<definição>.xml')), f"gatilhos: {task.summary()}"]
+
+class SystemdScheduler(Scheduler):
+    """
+    Timers do systemd do usuário: uma unidade .timer (com um OnCalendar por dia) e uma
+    .service por alarme, gravadas em unit_directory e ativadas com systemctl --user.
+
+    register_all grava todas as unidades e as ativa com um único daemon-reload e um único
+    enable --now; se a ativação falhar, todas as tarefas gravadas são dadas como não registradas.
+
+    Args:
+        unit_directory (str, optional): Diretório das unidades (padrão: ~/.config/systemd/user).
+        run (callable, optional): Função que executa o comando (padrão: subprocess.run).
+    """
+    def __init__(self, unit_directory=None, run=None):
+        self.unit_directory = unit_directory or os.path.join(os.path.expanduser('~'), '.config', 'systemd', 'user')
+        self.run = run or subprocess.run
+
+    def unit_name(self, task):
+        """
+        Nome das unidades da tarefa: o nome do alarme em ASCII e um hash que o identifica.
+        """
+        ascii_name = unicodedata.normalize('NFKD', task.name).encode('ascii', 'ignore').decode()
+        slug = re.sub(r'[^A-Za-z0-9]+', '-', ascii_name).strip('-').lower()[:40]
+        digest = hashlib.sha1(task.name.encode('utf-8')).hexdigest()[:8]
+        return f"rpa-alarme-{slug}-{digest}" if slug else f"rpa-alarme-{digest}"
+
+    def definition(self, task):
+        """
+        Returns:
+            dict: Conteúdo de cada arquivo de unidade, pelo nome do arquivo.
+        """
+        name = self.unit_name(task)
+        # % inicia os especificadores do systemd
+        escape = lambda text: text.replace('%', '%%')
+        description = escape(task.name)
+        if task.repeat:
+            calendars = [f"OnCalendar={DIAS_SYSTEMD[dia - 1]} *-*-* {task.hour:02d}:{task.minute:02d}:00" for dia in task.days]
+        else:
+            calendars = [f"OnCalendar={task.next_run().strftime('%Y-%m-%d %H:%M:00')}"]
+        service = (f"[Unit]\nDescription=Alarme \"{description}\" (robô desktop)\n\n"
+                   f"[Service]\nType=oneshot\nExecStart=\"{escape(sys.executable)}\" \"{escape(task.script_path)}\"\n")
+        timer = (f"[Unit]\nDescription=Alarme \"{description}\" (robô desktop)\n\n"
+                 f"[Timer]\n" + "\n".join(calendars) + "\n\n[Install]\nWantedBy=timers.target\n")
+        return {f"{name}.service": service, f"{name}.timer": timer}
+
+    def write_units(self, task):
+        os.makedirs(self.unit_directory, exist_ok=True)
+        for file_name, content in self.definition(task).items():
+            with open(os.path.join(self.unit_directory, file_name), 'w', encoding='utf-8') as file:
+                file.write(content)
+        return f"{self.unit_name(task)}.timer"
+
+    def register(self, task):
+        errors = self.register_all([task])
+        if errors:
+            raise SchedulerError(errors[task.name])
+
+    def register_all(self, tasks):
+        errors = {}
+        timers = {}
+        for task in tasks:
+            try:
+                timers[task.name] = self.write_units(task)
+            except OSError as e:
+                errors[task.name] = str(e)
+        if timers:
+            # A ativação é uma única chamada: se falhar, nenhuma das tarefas gravadas fica ativa
+            try:
+                _run(self.run, ['systemctl', '--user', 'daemon-reload'])
+                _run(self.run, ['systemctl', '--user', 'enable', '--now'] + list(timers.values()))
+            except (SchedulerError, OSError) as e:
+                errors.update((name, str(e)) for name in timers)
+        return errors
+
+    def describe(self, task):
+        return [f"{os.path.join(self.unit_directory, file_name)}" for file_name in self.definition(task)] + [
+            f"systemctl --user daemon-reload && systemctl --user enable --now {self.unit_name(task)}.timer",
+            f"gatilhos: {task.summary()}",
+        ]
+
+class RecordingScheduler(Scheduler):
+    """
+    Agendador que apenas guarda as tarefas registradas e as suas definições (de
+    SchtasksScheduler, por padrão), sem executar comandos.
+
+    Attributes:
+        registered (list): Pares (tarefa, definição), na ordem de registro.
+        calls (int): Chamadas de registro recebidas.
+    """
+    def __init__(self, definitions=None):
+        self.definitions = definitions or SchtasksScheduler(run=lambda *args, **kwargs: None)
+        self.registered = []
+        self.calls = 0
+
+    def definition(self, task):
+        return self.definitions.definition(task)
+
+    def register(self, task):
+        self.calls += 1
+        self.registered.append((task, self.definition(task)))
+
+    def register_all(self, tasks):
+        self.calls += 1
+        self.registered.extend((task, self.definition(task)) for task in tasks)
+        return {}
+
+    def describe(self, task):
+        return [f"registro em memória: {task.name}", f"gatilhos: {task.summary()}"]
+
+def default_scheduler():
+    """
+    Agendador do sistema: Agendador de Tarefas no Windows e timers do systemd nos demais.
+    """
+    return SchtasksScheduler() if os.name == 'nt' else SystemdScheduler()
@@ -0,0 +1,335 @@
+"""
+Relógio do Windows simulado no próprio processo, para testar e medir o robô desktop sem o Windows.
+
+SimulatedClockApp modela o que o robô usa do aplicativo: a janela "Relógio" (que aparece
+launch_latency segundos depois de aberta), a aba "Alarme", o botão "Adicionar um alarme" e o
+diálogo do alarme, que abre dialog_latency segundos depois do clique e fecha save_latency
+segundos depois de salvo. O botão "Salvar" do diálogo só fica habilitado depois que a hora e
+o minuto são preenchidos. O diálogo segue a ordem de foco do TAB do aplicativo:
+
+    hora → minuto → nome → repetir → dias da semana → campainha → soneca → salvar
+
+Os campos de hora e minuto aceitam dígitos, o nome aceita texto e BACKSPACE, SPACE marca
+"repetir", o dia atual (RIGHT/LEFT percorrem de domingo a sábado) ou salva o alarme, e
+DOWN/UP percorrem as listas de campainha e soneca (HOME/END vão para o primeiro/último
+item). Teclas enviadas antes de o diálogo abrir são perdidas, como no aplicativo real.
+
+Como no UI Automation, as teclas são processadas de forma assíncrona: cada tecla enviada só
+altera o diálogo LATENCIAS['input'] segundos depois, e uma leitura logo após o send_keys pode ver
+os valores anteriores.
+
+O tempo é simulado: cada operação avança o relógio do aplicativo pela latência configurada
+e SimulatedBackend.sleep avança o relógio sem esperar, então um lote de centenas de alarmes
+é medido em milissegundos de tempo real.
+"""
+import re
+
+from alarm_config import alarm_sounds, snooze_times, SONECA_PADRAO
+from ui_backend import UIBackend, UIError, CONTROLES_DIALOGO, parse_keys
+
+TITULO_JANELA = "Relógio"
+ABA_ALARME = "Alarme"
+BOTAO_ADICIONAR = "Adicionar um alarme"
+DIALOGO_ALARME = "Editar alarme"
+BOTAO_SALVAR = "Salvar"
+
+# Ordem de foco do TAB no diálogo do alarme
+CAMPOS_DIALOGO = ['hora', 'minuto', 'nome', 'repetir', 'dias', 'campainha', 'soneca', 'salvar']
+
+# Campo do diálogo de cada controle pelo título (ui_backend.CONTROLES_DIALOGO e o botão Salvar)
+CAMPOS_CONTROLES = {titulo: campo for campo, (titulo, _) in CONTROLES_DIALOGO.items()}
+CAMPOS_CONTROLES[BOTAO_SALVAR] = 'salvar'
+
+# Latências padrão (segundos)
+LATENCIAS = {
+    'launch': 3.0,      # abertura do aplicativo até a janela aparecer
+    'connect': 0.3,     # conexão ao aplicativo
+    'find': 0.4,        # busca de um controle na árvore de automação
+    'action': 0.05,     # clique ou seleção
+    'dialog': 1.2,      # clique em "Adicionar um alarme" até o diálogo aceitar teclas
+    'save': 0.8,        # salvar até o diálogo fechar e a lista voltar
+    'send_keys': 0.02,  # custo fixo de cada chamada send_keys (um lote SendInput)
+    'key': 0.005,       # custo de cada tecla
+    'input': 0.05,      # envio de uma tecla até o aplicativo processá-la
+}
+
+# Teclas nomeadas que o Relógio simulado entende (além de dígitos e caracteres)
+TECLAS = ('TAB', 'SPACE', 'RIGHT', 'LEFT', 'DOWN', 'UP', 'HOME', 'END', 'BACKSPACE', 'ESC', 'ENTER')
+
+class AlarmDialog:
+    """
+    Estado do diálogo de um alarme novo.
+
+    Args:
+        opens_at (float): Momento (simulado) em que o diálogo passa a aceitar teclas.
+        new_alarm (dict, optional): Valores iniciais de nome, repetir, dias, campainha e soneca.
+    """
+    def __init__(self, opens_at, new_alarm=None):
+        new_alarm = new_alarm or {}
+        self.opens_at = opens_at
+        self.closes_at = None
+        self.focus = 0
+        self.hora = ''
+        self.minuto = ''
+        self.nome = new_alarm.get('nome', '')
+        self.repetir = new_alarm.get('repetir', False)
+        self.dias = set(new_alarm.get('dias', []))
+        self.dia_atual = 1
+        self.campainha = alarm_sounds.index(new_alarm.get('campainha', alarm_sounds[0]))
+        self.soneca = snooze_times.index(new_alarm.get('soneca', SONECA_PADRAO))
+
+    def values(self):
+        """
+        Valores dos controles do diálogo, no formato de alarm_config.validar_alarmes.
+        """
+        return {
+            'hora': int(self.hora) if self.hora else None,
+            'minuto': int(self.minuto) if self.minuto else None,
+            'nome': self.nome,
+            'dias': sorted(self.dias),
+            'soneca': snooze_times[self.soneca],
+            'repetir': self.repetir,
+            'campainha': alarm_sounds[self.campainha],
+        }
+
+    def press(self, key):
+        """
+        Aplica uma tecla ao campo com o foco.
+
+        Returns:
+            bool: True se a tecla salvou o alarme.
+        """
+        campo = CAMPOS_DIALOGO[self.focus]
+        if key == 'TAB':
+            self.focus = min(self.focus + 1, len(CAMPOS_DIALOGO) - 1)
+        elif key == 'SPACE':
+            if campo == 'nome':
+                self.nome += ' '
+            elif campo == 'repetir':
+                self.repetir = not self.repetir
+            elif campo == 'dias':
+                self.dias ^= {self.dia_atual}
+            elif campo == 'salvar':
+                return True
+        elif key == 'BACKSPACE' and campo == 'nome':
+            self.nome = self.nome[:-1]
+        elif key in ('RIGHT', 'LEFT') and campo == 'dias':
+            self.dia_atual = min(7, self.dia_atual + 1) if key == 'RIGHT' else max(1, self.dia_atual - 1)
+        elif key in ('DOWN', 'UP', 'HOME', 'END') and campo in ('campainha', 'soneca'):
+            opcoes = alarm_sounds if campo == 'campainha' else snooze_times
+            if key in ('HOME', 'END'):
+                setattr(self, campo, 0 if key == 'HOME' else len(opcoes) - 1)
+            else:
+                passo = 1 if key == 'DOWN' else -1
+                setattr(self, campo, min(len(opcoes) - 1, max(0, getattr(self, campo) + passo)))
+        elif len(key) == 1:
+            if campo in ('hora', 'minuto') and key.isdigit():
+                # Campos de dois dígitos: o último par digitado vale
+                setattr(self, campo, (getattr(self, campo) + key)[-2:])
+            elif campo == 'nome':
+                self.nome += key
+        return False
+
+class SimulatedClockApp:
+    """
+    Relógio do Windows simulado, com tempo simulado.
+
+    Args:
+        latencies (dict, optional): Latências que substituem as de LATENCIAS.
+        new_alarm (dict, optional): Valores iniciais do diálogo de um alarme novo (ver AlarmDialog).
+
+    Attributes:
+        now (float): Relógio simulado (segundos).
+        alarms (list): Alarmes salvos, no formato de alarm_config.validar_alarmes.
+        dropped_keys (int): Teclas perdidas por terem chegado antes de o diálogo abrir.
+        pending (list): Teclas enviadas e ainda não processadas, com o momento do processamento.
+        counts (dict): Quantidade de cada operação recebida.
+    """
+    def __init__(self, latencies=None, new_alarm=None):
+        self.latencies = dict(LATENCIAS, **(latencies or {}))
+        self.new_alarm = new_alarm
+        self.now = 0.0
+        self.opened_at = None
+        self.tab = None
+        self.dialog = None
+        self.alarms = []
+        self.dropped_keys = 0
+        self.pending = []
+        self.counts = {}
+
+    def spend(self, operation, count=1):
+        self.counts[operation] = self.counts.get(operation, 0) + count
+        self.now += self.latencies[operation] * count
+
+    def is_open(self):
+        return self.opened_at is not None and self.now >= self.opened_at
+
+    def _update(self):
+        # Aplica as teclas cujo processamento já terminou, na ordem de envio
+        while self.pending and self.pending[0][0] <= self.now:
+            self._process(*self.pending.pop(0))
+        # O diálogo salvo deixa de existir quando termina de fechar
+        if self.dialog is not None and self.dialog.closes_at is not None and self.now >= self.dialog.closes_at:
+            self.dialog = None
+
+    def visible(self, title):
+        """
+        Indica se o controle está visível no momento atual.
+        """
+        self._update()
+        if not self.is_open():
+            return False
+        if title == ABA_ALARME:
+            return True
+        if title == BOTAO_ADICIONAR:
+            return self.tab == ABA_ALARME and self.dialog is None
+        if title in (DIALOGO_ALARME, BOTAO_SALVAR) or title in CAMPOS_CONTROLES:
+            # Depois de salvo, o diálogo continua visível (sem aceitar teclas) até terminar de fechar
+            return self.dialog is not None and self.now >= self.dialog.opens_at
+        return False
+
+    def enabled(self, title):
+        """
+        Indica se o controle está habilitado no momento atual.
+        """
+        if title == BOTAO_SALVAR:
+            return self.visible(title) and bool(self.dialog.hora) and bool(self.dialog.minuto)
+        return self.visible(title)
+
+    def focused(self, title):
+        """
+        Indica se o controle tem o foco do teclado. Como no UI Automation, só o campo do
+        diálogo com o foco o tem, e nunca a janela do diálogo.
+        """
+        campo = CAMPOS_CONTROLES.get(title)
+        if campo is None or not self.visible(title) or self.dialog.closes_at is not None:
+            return False
+        return CAMPOS_DIALOGO[self.dialog.focus] == campo
+
+    def act(self, title, action):
+        """
+        Clica ou seleciona um controle.
+
+        Raises:
+            UIError: Se o controle não estiver visível.
+        """
+        self.spend('action')
+        if not self.visible(title):
+            raise UIError(f'Controle "{title}" não está visível')
+        if title == ABA_ALARME:
+            self.tab = ABA_ALARME
+        elif title == BOTAO_ADICIONAR and action == 'click':
+            self.dialog = AlarmDialog(self.now + self.latencies['dialog'], self.new_alarm)
+
+    def type_keys(self, keys):
+        """
+        Recebe um lote de teclas (uma chamada send_keys).
+        """
+        self.spend('send_keys')
+        parsed = parse_keys(keys)
+        for key in parsed:
+            if len(key) > 1 and key not in TECLAS:
+                raise UIError(f'Tecla não suportada pelo Relógio simulado: {{{key}}}')
+        for key in parsed:
+            self.spend('key')
+            self.pending.append((self.now + self.latencies['input'], key))
+
+    def _process(self, at, key):
+        """
+        Aplica uma tecla ao diálogo no momento em que o aplicativo a processa.
+        """
+        if self.dialog is not None and self.dialog.closes_at is not None and at >= self.dialog.closes_at:
+            self.dialog = None
+        dialog = self.dialog
+        if dialog is None or at < dialog.opens_at or dialog.closes_at is not None:
+            self.dropped_keys += 1
+            return
+        if key == 'ESC':
+            self.dialog = None
+        elif dialog.press(key):
+            self.alarms.append(dialog.values())
+            dialog.closes_at = at + self.latencies['save']
+
+class SimulatedControl:
+    """
+    Controle do Relógio simulado, com os mesmos métodos dos wrappers UIA do pywinauto.
+    """
+    def __init__(self, app, title, control_type):
+        self.app = app
+        self.title = title
+        self.control_type = control_type
+
+    def is_visible(self):
+        return self.app.visible(self.title)
+
+    def is_enabled(self):
+        return self.app.enabled(self.title)
+
+    def has_keyboard_focus(self):
+        return self.app.focused(self.title)
+
+    def click(self):
+        self.app.act(self.title, 'click')
+
+    def select(self):
+        self.app.act(self.title, 'select')
+
+    def values(self):
+        """
+        Valores atuais dos campos do diálogo (apenas para o diálogo do alarme).
+        """
+        self.app._update()
+        if self.title != DIALOGO_ALARME or self.app.dialog is None:
+            raise UIError('Diálogo do alarme não está aberto')
+        return self.app.dialog.values()
+
+class SimulatedBackend(UIBackend):
+    """
+    Backend do robô desktop para o Relógio simulado.
+
+    Args:
+        app (SimulatedClockApp, optional): Aplicativo simulado. Por padrão, um novo com as latências padrão.
+    """
+    def __init__(self, app=None):
+        self.app = app or SimulatedClockApp()
+
+    def launch(self, target):
+        if self.app.opened_at is None:
+            self.app.opened_at = self.app.now + self.app.latencies['launch']
+
+    def windows(self):
+        return [TITULO_JANELA] if self.app.is_open() else []
+
+    def connect(self, title_re, timeout=0):
+        def found():
+            self.app.spend('connect')
+            return self.app.is_open() and re.search(title_re, TITULO_JANELA)
+        if not found():
+            self.wait_until(found, timeout, description=f'janela "{title_re}"')
+        return TITULO_JANELA
+
+    def find(self, window, title, control_type, timeout=10):
+        def found():
+            self.app.spend('find')
+            return self.app.visible(title)
+        if not found():
+            self.wait_until(found, timeout, description=f'controle "{title}" visível')
+        return SimulatedControl(self.app, title, control_type)
+
+    def send_keys(self, keys):
+        self.app.type_keys(keys)
+
+    def read_values(self, dialog):
+        return dialog.values()
+
+    def kill(self):
+        self.app.opened_at = None
+        self.app.tab = None
+        self.app.dialog = None
+        self.app.pending.clear()
+
+    def monotonic(self):
+        return self.app.now
+
+    def sleep(self, seconds):
+        self.app.now += seconds
@@ -0,0 +1,316 @@
+"""
+Backends de automação da interface usados pelo robô desktop.
+
+O robô (alarm.py) não chama o pywinauto diretamente: todas as operações na interface passam
+por um backend com a mesma interface de UIBackend. PywinautoBackend controla o Relógio do
+Windows; simulated_clock.SimulatedBackend controla um Relógio simulado no próprio processo,
+para testar e medir o robô em qualquer sistema.
+
+Os controles retornados por find têm os métodos click(), select(), is_visible(),
+is_enabled() e has_keyboard_focus(), como os wrappers UIA do pywinauto. read_values lê os
+valores dos campos do diálogo do alarme, para o robô conferir o que foi digitado.
+
+AdaptiveTimeouts guarda as latências observadas em cada espera e ajusta os tempos limite
+a partir delas, persistindo-as em JSON entre as execuções.
+"""
+import json
+import os
+import re
+import statistics
+import subprocess
+import time
+
+class UIError(Exception):
+    """
+    Falha em uma operação na interface (janela ou controle não encontrado, ação inválida).
+    """
+
+class UITimeoutError(UIError):
+    """
+    A interface não chegou ao estado esperado dentro do tempo limite.
+    """
+
+# Controles do diálogo do alarme no Relógio do Windows (título e tipo UIA), lidos por PywinautoBackend.read_values
+CONTROLES_DIALOGO = {
+    'hora': ("Horas", "ComboBox"),
+    'minuto': ("Minutos", "ComboBox"),
+    'nome': ("Nome do alarme", "Edit"),
+    'repetir': ("Repetir alarme", "CheckBox"),
+    'campainha': ("Som do alarme", "ComboBox"),
+    'soneca': ("Tempo de soneca", "ComboBox"),
+}
+DIAS_DIALOGO = ["domingo", "segunda-feira", "terça-feira", "quarta-feira", "quinta-feira", "sexta-feira", "sábado"]
+
+# Estados aceitos por UIBackend.wait e o método do controle que os verifica
+STATES = {
+    'visible': 'is_visible',
+    'enabled': 'is_enabled',
+    'focused': 'has_keyboard_focus',
+}
+
+_TOKEN = re.compile(r'\{([^{}]|[{}])\}|\{([A-Z_0-9]+)(?: (\d+))?\}|(.)', re.S)
+
+def parse_keys(keys):
+    """
+    Converte um texto no formato do send_keys do pywinauto em uma lista de teclas.
+
+    Caracteres são retornados como eles mesmos; teclas nomeadas ({TAB}, {DOWN 3}...) como
+    o nome, repetido pela contagem; {VK_NUMPADn} como o dígito n. Espaços fora de chaves são
+    ignorados, como no send_keys sem with_spaces.
+
+    Raises:
+        UIError: Com modificadores (+, ^, %) ou agrupamentos.
+    """
+    result = []
+    for match in _TOKEN.finditer(keys):
+        literal, name, count, char = match.groups()
+        if literal is not None:
+            result.append(literal)
+        elif name is not None:
+            key = name[-1] if name.startswith('VK_NUMPAD') and name[-1].isdigit() else name
+            result.extend([key] * int(count or 1))
+        elif char in '+^%~()':
+            raise UIError(f'Modificador ou agrupamento não suportado: {char!r} em {keys!r}')
+        elif char != ' ':
+            result.append(char)
+    return result
+
+class UIBackend:
+    """
+    Interface dos backends de automação.
+
+    As subclasses implementam launch, windows, connect, find, send_keys e kill; o tempo
+    (monotonic e sleep) também passa pelo backend, para que um backend simulado controle o
+    relógio. wait e wait_until verificam o estado a cada poll_interval segundos.
+    """
+    poll_interval = 0.1
+
+    def launch(self, target):
+        """
+        Abre o aplicativo (ex.: 'ms-clock:'), sem esperar a janela.
+        """
+        raise NotImplementedError
+
+    def windows(self):
+        """
+        Retorna os títulos das janelas abertas.
+        """
+        raise NotImplementedError
+
+    def connect(self, title_re, timeout=0):
+        """
+        Conecta ao aplicativo cuja janela tem o título indicado, esperando até timeout segundos.
+
+        Returns:
+            A janela principal do aplicativo.
+
+        Raises:
+            UIError: Se a janela não for encontrada.
+        """
+        raise NotImplementedError
+
+    def find(self, window, title, control_type, timeout=10):
+        """
+        Localiza um controle da janela, esperando até timeout segundos que ele fique visível.
+
+        Raises:
+            UITimeoutError: Se o controle não ficar visível.
+        """
+        raise NotImplementedError
+
+    def send_keys(self, keys):
+        """
+        Envia um lote de teclas no formato do pywinauto (ex.: '{VK_NUMPAD8}{TAB}').
+        """
+        raise NotImplementedError
+
+    def read_values(self, dialog):
+        """
+        Lê os valores dos campos do diálogo do alarme.
+
+        Returns:
+            dict: hora, minuto, nome, repetir, dias, campainha e soneca, no formato de
+            alarm_config.validar_alarmes.
+
+        Raises:
+            UIError: Se algum campo não puder ser lido.
+        """
+        raise NotImplementedError
+
+    def kill(self):
+        """
+        Encerra o aplicativo conectado.
+        """
+        raise NotImplementedError
+
+    def monotonic(self):
+        return time.perf_counter()
+
+    def sleep(self, seconds):
+        time.sleep(seconds)
+
+    def wait_until(self, predicate, timeout, description='condição'):
+        """
+        Espera até predicate() ser verdadeiro.
+
+        Returns:
+            float: Segundos de espera.
+
+        Raises:
+            UITimeoutError: Se a condição não for atendida em timeout segundos.
+        """
+        start = self.monotonic()
+        while True:
+            try:
+                if predicate():
+                    return self.monotonic() - start
+            except UIError:
+                pass
+            if self.monotonic() - start >= timeout:
+                raise UITimeoutError(f'{description} não atendida em {timeout:.1f} s')
+            self.sleep(self.poll_interval)
+
+    def wait(self, control, state, timeout=10):
+        """
+        Espera o controle chegar ao estado ('visible', 'enabled' ou 'focused').
+
+        Returns:
+            float: Segundos de espera.
+        """
+        check = getattr(control, STATES[state])
+        return self.wait_until(check, timeout, description=f'controle {state}')
+
+class AdaptiveTimeouts:
+    """
+    Tempos limite das esperas do robô, ajustados pelas latências observadas.
+
+    Enquanto não há latências observadas para uma espera, vale o tempo limite padrão. Depois,
+    o tempo limite é factor vezes o p95 das últimas `samples` latências, entre minimum e
+    maximum segundos e nunca abaixo de floor vezes o tempo limite padrão: uma abertura a frio
+    mais lenta depois de várias rápidas não estoura a espera. Uma espera que estoura o tempo limite é registrada com o próprio tempo
+    limite, o que aumenta o tempo limite da próxima.
+
+    Args:
+        defaults (dict): Tempo limite padrão (segundos) de cada espera.
+        factor (float): Margem sobre o p95 das latências observadas.
+        minimum (float): Tempo limite mínimo (segundos).
+        floor (float): Fração do tempo limite padrão abaixo da qual o tempo limite não cai.
+        maximum (float): Tempo limite máximo (segundos).
+        samples (int): Latências guardadas por espera.
+    """
+    def __init__(self, defaults, factor=3.0, minimum=1.0, floor=0.5, maximum=60.0, samples=50):
+        self.defaults = dict(defaults)
+        self.factor = factor
+        self.minimum = minimum
+        self.floor = floor
+        self.maximum = maximum
+        self.samples = samples
+        self.observed = {}
+
+    def timeout(self, name):
+        """
+        Tempo limite atual da espera (segundos).
+        """
+        observed = self.observed.get(name)
+        if not observed:
+            return self.defaults[name]
+        p95 = statistics.quantiles(observed, n=20, method='inclusive')[-1] if len(observed) > 1 else observed[0]
+        return min(self.maximum, max(self.minimum, self.floor * self.defaults.get(name, 0), self.factor * p95))
+
+    def observe(self, name, seconds):
+        """
+        Registra a latência observada em uma espera.
+        """
+        observed = self.observed.setdefault(name, [])
+        observed.append(round(seconds, 4))
+        del observed[:-self.samples]
+
+    def load(self, path):
+        """
+        Carrega as latências observadas nas execuções anteriores, se o arquivo existir.
+        """
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as file:
+                data = json.load(file)
+            self.observed = {name: [float(value) for value in values][-self.samples:]
+                             for name, values in data.get('observed', {}).items()}
+
+    def save(self, path):
+        """
+        Grava as latências observadas, substituindo o arquivo de forma atômica.
+
+        Returns:
+            str: Caminho do arquivo.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        data = {
+            'observed': self.observed,
+            'timeouts': {name: round(self.timeout(name), 3) for name in sorted(set(self.defaults) | set(self.observed))},
+        }
+        temporary_path = f'{path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+        os.replace(temporary_path, path)
+        return path
+
+class PywinautoBackend(UIBackend):
+    """
+    Backend do Relógio do Windows, com o pywinauto (UI Automation). O pywinauto só é
+    importado quando o backend é criado.
+    """
+    def __init__(self):
+        from pywinauto import Application, Desktop
+        from pywinauto.keyboard import send_keys
+        self._application = Application
+        self._desktop = Desktop
+        self._send_keys = send_keys
+        self.app = None
+
+    def launch(self, target):
+        subprocess.Popen(['start', target], shell=True)
+
+    def windows(self):
+        return [window.window_text() for window in self._desktop(backend="uia").windows()]
+
+    def connect(self, title_re, timeout=0):
+        try:
+            options = {'timeout': timeout} if timeout else {}
+            self.app = self._application(backend="uia").connect(title_re=title_re, **options)
+        except Exception as e:
+            raise UIError(f'Aplicativo com a janela "{title_re}" não encontrado: {e}')
+        return self.app.window(title_re=title_re)
+
+    def find(self, window, title, control_type, timeout=10):
+        specification = window.child_window(title=title, control_type=control_type)
+        try:
+            specification.wait('visible', timeout=timeout)
+        except Exception as e:
+            raise UITimeoutError(f'Controle "{title}" ({control_type}) não ficou visível em {timeout} s: {e}')
+        return specification.wrapper_object()
+
+    def send_keys(self, keys):
+        self._send_keys(keys)
+
+    def read_values(self, dialog):
+        def campo(nome):
+            title, control_type = CONTROLES_DIALOGO[nome]
+            return dialog.descendants(title=title, control_type=control_type)[0]
+        try:
+            return {
+                'hora': int(campo('hora').selected_text()),
+                'minuto': int(campo('minuto').selected_text()),
+                'nome': campo('nome').get_value(),
+                'repetir': campo('repetir').get_toggle_state() == 1,
+                'dias': [dia for dia, titulo in enumerate(DIAS_DIALOGO, start=1)
+                         if dialog.descendants(title=titulo, control_type="Button")[0].get_toggle_state() == 1],
+                'campainha': campo('campainha').selected_text(),
+                'soneca': campo('soneca').selected_text(),
+            }
+        except Exception as e:
+            raise UIError(f'Erro ao ler os campos do diálogo do alarme: {e}')
+
+    def kill(self):
+        if self.app is not None:
+            self.app.kill()
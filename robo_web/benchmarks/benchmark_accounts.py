@@ -0,0 +1,103 @@
+"""
+Mede a vazão da execução para várias contas (contas por minuto) com diferentes quantidades
+de navegadores, com e sem o limite de requisições, contra a cópia local do DemoQA.
+
+A vazão deve crescer com a quantidade de navegadores até atingir o limite de navegações
+por segundo (RATE_LIMIT / navegações por conta * 60 contas por minuto).
+
+Com --simulated, o Chrome e o servidor local são substituídos por um driver que leva
+--page-ms para carregar cada página do login e das seções (sem CPU, como a espera pela
+rede); útil para verificar o limitador isoladamente: sem limite, a vazão cresce com os
+navegadores, e com o limite (padrão 20/s no modo simulado) para no teto.
+
+Uso:
+    python benchmarks/benchmark_accounts.py [--accounts 12] [--workers 1 2 4 8] [--rate 4] [--simulated [--page-ms 200]]
+"""
+import argparse
+import time
+from functools import partial
+
+from fixture_server import start_fixture_server, create_headless_driver
+
+import web_automation
+from accounts import RateLimiter, run_accounts, throttle
+
+# Páginas abertas por conta no modo simulado (login, perfil e seções)
+SIMULATED_PAGES = ['/login', '/profile', '/elements', '/automation-practice-form', '/alertsWindows', '/widgets', '/interaction']
+
+class SimulatedDriver:
+    """
+    Driver simulado: cada navegação espera o tempo de carregamento de uma página.
+    """
+    def __init__(self, page_seconds):
+        self.page_seconds = page_seconds
+
+    def get(self, url):
+        time.sleep(self.page_seconds)
+
+    def quit(self):
+        pass
+
+def run_simulated_account(account, base_url, limiter, page_seconds):
+    driver = SimulatedDriver(page_seconds)
+    if limiter is not None:
+        throttle(driver, limiter)
+    results = {}
+    for page in SIMULATED_PAGES:
+        start = time.perf_counter()
+        driver.get(base_url + page)
+        results[page] = {'status': 'ok', 'duration': time.perf_counter() - start, 'error': None}
+    return results
+
+def measure(accounts, workers, rate, host_rate, base_url, page_seconds, steps):
+    """
+    Executa todas as contas e retorna a vazão, as navegações e o tempo de espera pelo limite.
+    Com page_seconds, as contas usam o driver simulado.
+    """
+    limiter = RateLimiter(rate, host_rate)
+    if page_seconds is not None:
+        run_account = partial(run_simulated_account, base_url=base_url, limiter=limiter, page_seconds=page_seconds)
+    else:
+        run_account = partial(web_automation.run_account, steps=steps, limiter=limiter, driver_factory=create_headless_driver)
+    start = time.perf_counter()
+    results = run_accounts(accounts, run_account, workers=workers)
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for steps in results.values() for result in steps.values() if result['status'] != 'ok')
+    return len(accounts) / elapsed * 60, limiter.requests, limiter.waited, failed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--accounts', type=int, default=12, help='Quantidade de contas')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8], help='Navegadores em cada medição')
+    parser.add_argument('--rate', type=float, help='Navegações por segundo no total (padrão 4, ou 20 com --simulated)')
+    parser.add_argument('--host-rate', type=float, default=0, help='Navegações por segundo por host (0 desativa)')
+    parser.add_argument('--steps', nargs='*', default=['elements', 'forms'], help='Etapas executadas após o login')
+    parser.add_argument('--simulated', action='store_true', help='Usa um driver simulado no lugar do Chrome')
+    parser.add_argument('--page-ms', type=float, default=200, help='Carregamento de cada página no modo simulado')
+    args = parser.parse_args()
+    if args.rate is None:
+        args.rate = 20 if args.simulated else 4
+    page_seconds = args.page_ms / 1000 if args.simulated else None
+
+    server, base_url = (None, 'http://simulado') if args.simulated else start_fixture_server()
+    web_automation.DEMOQA_BASE_URL = base_url
+    # Cada conta faz o login pela interface, sem reaproveitar a sessão em cache
+    web_automation.SESSION_CACHE = False
+    accounts = [{'username': f'conta{index}', 'password': 'fixture'} for index in range(1, args.accounts + 1)]
+    try:
+        print(f'{"navegadores":<12}{"limite":>8}{"contas/min":>12}{"navegações":>12}{"espera (s)":>12}{"falhas":>8}')
+        for workers in args.workers:
+            for rate in (0, args.rate):
+                per_minute, requests, waited, failed = measure(accounts, workers, rate, args.host_rate, base_url,
+                                                               page_seconds, args.steps)
+                label = f'{rate:g}/s' if rate else '-'
+                print(f'{workers:<12}{label:>8}{per_minute:>12.1f}{requests:>12}{waited:>12.1f}{failed:>8}')
+                if rate:
+                    ceiling = rate / (requests / len(accounts)) * 60
+                    print(f'{"":<12}{"teto":>8}{ceiling:>12.1f}')
+    finally:
+        if server:
+            server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+"""
+Compara o coletor direto (API JSON /BookStore/v1/Books) com a coleta pelo navegador,
+ambos contra um servidor local de fixture.
+
+Uso:
+    python benchmarks/benchmark_book_collectors.py [--repeat 5]
+"""
+import argparse
+import time
+
+from fixture_server import start_fixture_server, create_headless_driver
+
+import web_automation
+
+def best_of(repeat, func):
+    """
+    Executa a função várias vezes e retorna o resultado e o menor tempo em segundos.
+    """
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='Repetições por coletor')
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server()
+    web_automation.BOOKS_URL = f'{base_url}/books.html?books=8&size=10'
+    api_url = f'{base_url}/BookStore/v1/Books'
+    driver = create_headless_driver()
+    try:
+        direct_books, direct_time = best_of(args.repeat, lambda: web_automation.fetch_book_data_api(api_url))
+        browser_books, browser_time = best_of(args.repeat, lambda: web_automation.collect_book_data(driver))
+        print(f'{"coletor":<10}{"livros":>8}{"tempo (ms)":>12}')
+        print(f'{"direct":<10}{len(direct_books):>8}{direct_time * 1000:>12.1f}')
+        print(f'{"browser":<10}{len(browser_books):>8}{browser_time * 1000:>12.1f}')
+    finally:
+        driver.quit()
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
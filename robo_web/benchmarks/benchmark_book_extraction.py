@@ -0,0 +1,55 @@
+"""
+Compara os modos de extração da tabela de livros ('script' e 'element') em uma
+página de fixture local, medindo o número de round trips ao chromedriver e o tempo.
+
+Uso:
+    python benchmarks/benchmark_book_extraction.py [--books 200] [--size 10] [--repeat 3]
+"""
+import argparse
+import time
+
+from fixture_server import start_fixture_server, create_headless_driver, count_commands
+
+import web_automation
+
+def run_mode(driver, counter, url, mode):
+    """
+    Executa a coleta completa em um modo de extração.
+
+    Returns:
+        tuple: Quantidade de livros, comandos enviados e tempo em segundos.
+    """
+    web_automation.BOOKS_URL = url
+    counter['commands'] = 0
+    start = time.perf_counter()
+    books = web_automation.collect_book_data(driver, extraction_mode=mode)
+    elapsed = time.perf_counter() - start
+    return len(books), counter['commands'], elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--books', type=int, default=200, help='Quantidade de livros na fixture')
+    parser.add_argument('--size', type=int, default=10, help='Linhas por página')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetições por modo')
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server()
+    driver = create_headless_driver()
+    counter = count_commands(driver)
+    url = f'{base_url}/books.html?books={args.books}&size={args.size}'
+    try:
+        print(f'{"modo":<10}{"livros":>8}{"comandos":>10}{"tempo (s)":>12}')
+        for mode in ('element', 'script'):
+            best = None
+            for _ in range(args.repeat):
+                result = run_mode(driver, counter, url, mode)
+                if best is None or result[2] < best[2]:
+                    best = result
+            books, commands, elapsed = best
+            print(f'{mode:<10}{books:>8}{commands:>10}{elapsed:>12.3f}')
+    finally:
+        driver.quit()
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
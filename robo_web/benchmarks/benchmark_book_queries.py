@@ -0,0 +1,113 @@
+"""
+Mede a latência das consultas aos livros (por autor, por editora e por prefixo do título)
+em um banco SQLite com --rows livros, comparando o esquema migrado (índices e tabelas
+Authors e Publishers, módulo src/book_queries.py) com a tabela Books original, sem índices,
+em que cada consulta percorre a tabela inteira.
+
+Uso:
+    python benchmarks/benchmark_book_queries.py [--rows 1000000] [--queries 200]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from book_writer import create_backend, write_books
+from book_queries import books_by_author, books_by_publisher, search_titles
+from fixture_server import synthetic_books
+
+# Consultas equivalentes na tabela Books original (sem índices nem tabelas normalizadas)
+BASELINE_QUERIES = {
+    'author': 'SELECT * FROM Books WHERE author = ? ORDER BY title LIMIT ?',
+    'publisher': 'SELECT * FROM Books WHERE publisher = ? ORDER BY title LIMIT ?',
+    'title_prefix': 'SELECT * FROM Books WHERE title >= ? AND title < ? ORDER BY title LIMIT ?',
+}
+
+def build_databases(directory, rows, chunk=100000):
+    """
+    Cria o banco migrado (pelo write_books) e o banco com a tabela Books original.
+
+    Returns:
+        tuple: Backend do banco migrado e o caminho do banco original.
+    """
+    backend = create_backend('sqlite', path=os.path.join(directory, 'migrated.db'))
+    baseline_path = os.path.join(directory, 'baseline.db')
+    baseline = sqlite3.connect(baseline_path)
+    baseline.execute('CREATE TABLE Books (id INTEGER PRIMARY KEY AUTOINCREMENT, image TEXT, title TEXT, author TEXT, publisher TEXT)')
+    connection = backend.connect()
+    try:
+        for start in range(0, rows, chunk):
+            books = synthetic_books(start, min(chunk, rows - start))
+            write_books(backend, books, mode='batch', batch_size=5000, connection=connection)
+            baseline.executemany('INSERT INTO Books (image, title, author, publisher) VALUES (?, ?, ?, ?)',
+                                 [(book['image'], book['title'], book['author'], book['publisher']) for book in books])
+            baseline.commit()
+    finally:
+        connection.close()
+        baseline.close()
+    return backend, baseline_path
+
+def percentiles(times):
+    times = sorted(times)
+    return statistics.median(times) * 1000, times[int(len(times) * 0.95) - 1] * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000, help='Quantidade de livros')
+    parser.add_argument('--queries', type=int, default=200, help='Consultas por tipo no esquema migrado')
+    parser.add_argument('--baseline-queries', type=int, default=10, help='Consultas por tipo na tabela sem índices')
+    parser.add_argument('--limit', type=int, default=50, help='Livros por consulta')
+    args = parser.parse_args()
+
+    random.seed(1)
+    with tempfile.TemporaryDirectory() as directory:
+        start = time.perf_counter()
+        backend, baseline_path = build_databases(directory, args.rows)
+        print(f'Carga de {args.rows} livros nos dois bancos: {time.perf_counter() - start:.1f} s\n')
+
+        def arguments(kind):
+            if kind == 'author':
+                return (f'Author {random.randrange(5000)}',)
+            if kind == 'publisher':
+                return (f'Publisher {random.randrange(200)}',)
+            prefix = f'Book {random.randrange(args.rows):07d}'[:-2]
+            return (prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1))
+
+        functions = {
+            'author': books_by_author,
+            'publisher': books_by_publisher,
+            'title_prefix': lambda backend, prefix, upper_bound, limit, connection: search_titles(backend, prefix, limit, connection),
+        }
+
+        connection = backend.connect()
+        baseline = sqlite3.connect(baseline_path)
+        try:
+            print(f'{"consulta":<14}{"índices p50 (ms)":>18}{"p95":>8}{"sem índices p50 (ms)":>22}{"p95":>9}{"livros":>8}')
+            for kind, function in functions.items():
+                indexed = []
+                for _ in range(args.queries):
+                    query_arguments = arguments(kind)
+                    started = time.perf_counter()
+                    books = function(backend, *query_arguments, limit=args.limit, connection=connection)
+                    indexed.append(time.perf_counter() - started)
+                scanned = []
+                for _ in range(args.baseline_queries):
+                    query_arguments = arguments(kind)
+                    started = time.perf_counter()
+                    baseline.execute(BASELINE_QUERIES[kind], query_arguments + (args.limit,)).fetchall()
+                    scanned.append(time.perf_counter() - started)
+                indexed_p50, indexed_p95 = percentiles(indexed)
+                scanned_p50, scanned_p95 = percentiles(scanned)
+                print(f'{kind:<14}{indexed_p50:>18.3f}{indexed_p95:>8.3f}{scanned_p50:>22.1f}{scanned_p95:>9.1f}{len(books):>8}')
+        finally:
+            connection.close()
+            baseline.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Mede a latência entre o início da execução e a primeira ação no navegador (abrir a
+página de login da cópia local do DemoQA) em dois cenários:
+
+    - cold: inicia o ChromeDriver e o Chrome a cada execução;
+    - warm: pega emprestada uma sessão pré-iniciada do pool de navegadores.
+
+Também compara o login pela interface com a restauração da sessão a partir do cache.
+
+Uso:
+    python benchmarks/benchmark_browser_pool.py [--repeat 3]
+"""
+import argparse
+import os
+import secrets
+import statistics
+import tempfile
+import threading
+import time
+
+from fixture_server import start_fixture_server, create_headless_driver
+
+import web_automation
+from browser_pool import BrowserPoolServer, BrowserPoolClient
+from session_cache import SessionCache
+
+def measure(label, runs):
+    """
+    Exibe a mediana e o menor valor de uma lista de tempos em segundos.
+    """
+    print(f'{label:<34}{statistics.median(runs) * 1000:>12.0f}{min(runs) * 1000:>12.0f}')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3, help='Repetições por cenário')
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server()
+    web_automation.DEMOQA_BASE_URL = base_url
+    web_automation.session_cache = SessionCache(os.path.join(tempfile.mkdtemp(), 'sessions.json'))
+    login_url = f'{base_url}/login'
+
+    cold = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        driver = create_headless_driver()
+        driver.get(login_url)
+        cold.append(time.perf_counter() - start)
+        driver.quit()
+
+    # Chave própria: não sobrescreve a chave de um serviço em execução
+    authkey = secrets.token_bytes(32)
+    pool = BrowserPoolServer(size=1, address='127.0.0.1:0', authkey=authkey)
+    pool_start = time.perf_counter()
+    pool.start()
+    pool_startup = time.perf_counter() - pool_start
+    threading.Thread(target=pool.serve_forever, daemon=True).start()
+    host, port = pool.listener.address
+    client = BrowserPoolClient(f'{host}:{port}', authkey)
+
+    warm = []
+    ui_login = []
+    cached_login = []
+    try:
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            driver = client.lease()
+            driver.get(login_url)
+            warm.append(time.perf_counter() - start)
+
+            driver.delete_all_cookies()
+            web_automation.session_cache.invalidate('fixture')
+            start = time.perf_counter()
+            web_automation.login_demoqa(driver, 'fixture', 'fixture')
+            ui_login.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            web_automation.login_demoqa(driver, 'fixture', 'fixture')
+            cached_login.append(time.perf_counter() - start)
+            client.release(driver)
+    finally:
+        client.shutdown()
+        client.close()
+        server.shutdown()
+
+    print(f'{"cenário":<34}{"mediana (ms)":>12}{"mínimo (ms)":>12}')
+    measure('cold start até a primeira ação', cold)
+    measure('warm lease até a primeira ação', warm)
+    measure('login pela interface', ui_login)
+    measure('login com sessão em cache', cached_login)
+    print(f'\nInicialização do pool (paga uma única vez): {pool_startup * 1000:.0f} ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Mede o cache de capas dos livros contra um servidor local de arquivos estáticos, com
+imagens PNG, JPEG e GIF geradas no início e um atraso artificial por requisição.
+
+Cenários:
+    - primeira execução com 1 conexão e com --concurrency conexões (cache vazio);
+    - segunda execução (capas não alteradas: o servidor responde 304 pelo ETag);
+    - execução após alterar parte das capas no servidor;
+    - cache limitado a uma fração do tamanho das capas (remoção LRU).
+
+Também confere se as dimensões lidas do cabeçalho correspondem às das imagens geradas.
+
+Uso:
+    python benchmarks/benchmark_covers.py [--books 200] [--covers 40] [--concurrency 8] [--delay 0.02]
+"""
+import argparse
+import hashlib
+import os
+import shutil
+import struct
+import tempfile
+import time
+import zlib
+
+from fixture_server import QuietHandler, start_fixture_server
+
+from covers import CoverCache, attach_covers
+
+class CoverHandler(QuietHandler):
+    """
+    Servidor das capas com ETag (hash do arquivo), respostas 304 e atraso por requisição.
+    """
+    delay = 0.0
+
+    def do_GET(self):
+        time.sleep(self.delay)
+        path = self.translate_path(self.path)
+        self.etag = None
+        if os.path.isfile(path):
+            with open(path, 'rb') as file:
+                self.etag = f'"{hashlib.md5(file.read()).hexdigest()}"'
+            if self.headers.get('If-None-Match') == self.etag:
+                self.send_response(304)
+                self.end_headers()
+                return
+        super().do_GET()
+
+    def end_headers(self):
+        if getattr(self, 'etag', None):
+            self.send_header('ETag', self.etag)
+        super().end_headers()
+
+def png_image(width, height, seed):
+    rows = b''.join(b'\x00' + bytes([(seed + x) % 256 for x in range(width)]) * 3 for _ in range(height))
+    def chunk(kind, data):
+        return struct.pack('>I', len(data)) + kind + data + struct.pack('>I', zlib.crc32(kind + data))
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header) + chunk(b'IDAT', zlib.compress(rows)) + chunk(b'IEND', b'')
+
+def jpeg_image(width, height, seed):
+    # Cabeçalho JFIF, um segmento de comentário e o quadro SOF0; o conteúdo não é decodificado
+    app0 = b'\xff\xe0' + struct.pack('>H', 16) + b'JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00'
+    comment = f'capa {seed}'.encode()
+    com = b'\xff\xfe' + struct.pack('>H', len(comment) + 2) + comment
+    sof = b'\xff\xc0' + struct.pack('>HBHHB', 17, 8, height, width, 3) + b'\x01\x22\x00\x02\x11\x01\x03\x11\x01'
+    return b'\xff\xd8' + app0 + com + sof + bytes((seed * 7 + index) % 256 for index in range(2048)) + b'\xff\xd9'
+
+def gif_image(width, height, seed):
+    return b'GIF89a' + struct.pack('<HH', width, height) + b'\x00\x00\x00' + bytes([seed % 256]) * 1024 + b';'
+
+GENERATORS = [('png', png_image), ('jpg', jpeg_image), ('gif', gif_image)]
+
+def write_covers(directory, count, changed=0):
+    """
+    Gera as capas no diretório servido. As URLs da segunda metade repetem o conteúdo das
+    capas da primeira; as `changed` primeiras capas recebem um conteúdo novo.
+
+    Returns:
+        dict: Nome do arquivo → dimensões esperadas.
+    """
+    distinct = max(1, count // 2)
+    expected = {}
+    for index in range(count):
+        source = index % distinct
+        extension, generator = GENERATORS[source % len(GENERATORS)]
+        width, height = 100 + source % 50, 150 + source % 70
+        version = 1 if source < changed else 0
+        name = f'bookimage{index}.{extension}'
+        with open(os.path.join(directory, name), 'wb') as file:
+            file.write(generator(width, height, source + version * 1000))
+        expected[name] = (width, height)
+    return expected
+
+def run(books, cache, concurrency):
+    start = time.perf_counter()
+    stats = attach_covers(books, cache, concurrency=concurrency)
+    cache.save()
+    return time.perf_counter() - start, stats
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--books', type=int, default=200, help='Quantidade de livros')
+    parser.add_argument('--covers', type=int, default=40, help='Quantidade de URLs de capa distintas')
+    parser.add_argument('--concurrency', type=int, default=8, help='Downloads simultâneos')
+    parser.add_argument('--delay', type=float, default=0.02, help='Atraso de cada resposta do servidor (s)')
+    args = parser.parse_args()
+
+    served = tempfile.mkdtemp()
+    cache_directory = tempfile.mkdtemp()
+    CoverHandler.delay = args.delay
+    expected = write_covers(served, args.covers)
+    names = sorted(expected)
+    server, base_url = start_fixture_server(served, CoverHandler)
+
+    def make_books():
+        return [{'title': f'Livro {index}', 'image': f'{base_url}/{names[index % len(names)]}'} for index in range(args.books)]
+
+    try:
+        print(f'{"cenário":<34}{"tempo (s)":>10}{"baixadas":>10}{"304":>6}{"falhas":>8}{"arquivos":>10}')
+        def report(label, elapsed, stats, cache):
+            print(f'{label:<34}{elapsed:>10.2f}{stats["downloaded"]:>10}{stats["not_modified"]:>6}'
+                  f'{stats["failed"]:>8}{len(cache.files):>10}')
+
+        for concurrency in (1, args.concurrency):
+            shutil.rmtree(cache_directory)
+            cache = CoverCache(cache_directory)
+            elapsed, stats = run(make_books(), cache, concurrency)
+            report(f'cache vazio, {concurrency} conexões', elapsed, stats, cache)
+
+        cache = CoverCache(cache_directory)
+        books = make_books()
+        elapsed, stats = run(books, cache, args.concurrency)
+        report('segunda execução', elapsed, stats, cache)
+        wrong = [book['title'] for book in books
+                 if (book['cover_width'], book['cover_height']) != expected[book['image'].rsplit('/', 1)[1]]]
+        print(f'{"":<34}dimensões divergentes: {len(wrong)}')
+
+        changed = max(1, args.covers // 8)
+        write_covers(served, args.covers, changed=changed)
+        cache = CoverCache(cache_directory)
+        elapsed, stats = run(make_books(), cache, args.concurrency)
+        report(f'{changed} conteúdos alterados', elapsed, stats, cache)
+
+        total = cache.size()
+        shutil.rmtree(cache_directory)
+        cache = CoverCache(cache_directory, max_bytes=total // 4)
+        elapsed, stats = run(make_books(), cache, args.concurrency)
+        report('cache limitado a 1/4', elapsed, stats, cache)
+        print(f'{"":<34}capas removidas: {cache.evicted}; tamanho: {cache.size()} de {total // 4} bytes')
+    finally:
+        server.shutdown()
+        shutil.rmtree(served, ignore_errors=True)
+        shutil.rmtree(cache_directory, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+"""
+Compara a exportação de --rows livros sintéticos (1 milhão por padrão) pelo caminho antigo,
+que acumula a lista inteira e grava com pandas.DataFrame.to_csv, com os exportadores em
+streaming de src/exporters.py (CSV, CSV gzip, CSV zstd, Parquet e Arrow), medindo o tempo,
+o pico de memória (tracemalloc) e o tamanho do arquivo.
+
+Formatos cujas dependências não estão instaladas (pandas, zstandard, pyarrow) são pulados.
+Também verifica a quantidade de linhas relidas de cada arquivo e a partição por data da execução.
+
+Uso:
+    python benchmarks/benchmark_exporters.py [--rows 1000000] [--page-size 100]
+"""
+import argparse
+import csv
+import gzip
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from exporters import create_exporter, export_path, ExportError, _zstd_open
+from fixture_server import synthetic_pages
+
+def export_dataframe(directory, rows, page_size):
+    """
+    Caminho antigo: acumula todos os livros e grava o CSV com o pandas.
+    """
+    import pandas as pd
+    book_data = []
+    for _, page_books in synthetic_pages(rows, page_size, cover_columns=True):
+        book_data.extend(page_books)
+    path = os.path.join(directory, 'dataframe', 'books.csv')
+    os.makedirs(os.path.dirname(path))
+    pd.DataFrame(book_data).to_csv(path, index=False)
+    return path
+
+def export_list(directory, rows, page_size):
+    """
+    Acumula todos os livros como o caminho antigo, mas grava com o módulo csv (para comparar sem o pandas).
+    """
+    book_data = []
+    for _, page_books in synthetic_pages(rows, page_size, cover_columns=True):
+        book_data.extend(page_books)
+    path = os.path.join(directory, 'list', 'books.csv')
+    os.makedirs(os.path.dirname(path))
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.DictWriter(file, fieldnames=list(book_data[0]))
+        writer.writeheader()
+        writer.writerows(book_data)
+    return path
+
+def export_streaming(directory, rows, page_size, export_format, compression):
+    """
+    Grava os livros página a página com o exportador configurado.
+    """
+    exporter = create_exporter(export_format, os.path.join(directory, f'{export_format}-{compression}'),
+                               compression=compression)
+    try:
+        for _, page_books in synthetic_pages(rows, page_size, cover_columns=True):
+            exporter.write(page_books)
+    finally:
+        exporter.close()
+    return exporter.path
+
+def count_rows(path, export_format, compression):
+    """
+    Relê o arquivo exportado e retorna a quantidade de livros.
+    """
+    if export_format == 'parquet':
+        import pyarrow.parquet
+        return pyarrow.parquet.ParquetFile(path).metadata.num_rows
+    if export_format == 'arrow':
+        import pyarrow.ipc
+        with pyarrow.ipc.open_file(path) as reader:
+            return sum(reader.get_batch(index).num_rows for index in range(reader.num_record_batches))
+    if compression == 'gzip':
+        file = gzip.open(path, 'rt', encoding='utf-8', newline='')
+    elif compression == 'zstd':
+        file = _zstd_open(path, 'r')
+    else:
+        file = open(path, newline='', encoding='utf-8')
+    with file:
+        return sum(1 for _ in csv.reader(file)) - 1
+
+def measure(function, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    path = function(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return path, elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1000000, help='Quantidade de livros')
+    parser.add_argument('--page-size', type=int, default=100, help='Livros por página')
+    args = parser.parse_args()
+
+    cases = [
+        ('pandas DataFrame (antigo)', export_dataframe, ()),
+        ('lista completa + csv', export_list, ()),
+        ('csv', export_streaming, ('csv', 'none')),
+        ('csv gzip', export_streaming, ('csv', 'gzip')),
+        ('csv zstd', export_streaming, ('csv', 'zstd')),
+        ('parquet', export_streaming, ('parquet', 'none')),
+        ('arrow', export_streaming, ('arrow', 'none')),
+    ]
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f'{"formato":<28}{"tempo (s)":>10}{"pico (MiB)":>12}{"arquivo (MiB)":>15}{"linhas":>10}')
+        for label, function, options in cases:
+            try:
+                path, elapsed, peak = measure(function, directory, args.rows, args.page_size, *options)
+            except (ImportError, ExportError) as e:
+                print(f'{label:<28}pulado ({e})')
+                continue
+            export_format, compression = options or ('csv', 'none')
+            rows = count_rows(path, export_format, compression)
+            assert rows == args.rows, f'{label}: {rows} linhas relidas, {args.rows} esperadas'
+            print(f'{label:<28}{elapsed:>10.2f}{peak / 1024 / 1024:>12.1f}{os.path.getsize(path) / 1024 / 1024:>15.1f}{rows:>10}')
+
+        # Partição por data da execução: duas execuções no mesmo dia geram dois arquivos
+        partitions = os.path.join(directory, 'partitioned')
+        paths = []
+        for run_date in (datetime(2024, 5, 1, 8, 0, 0), datetime(2024, 5, 1, 20, 0, 0)):
+            exporter = create_exporter('csv', partitions, partitioned=True, run_date=run_date)
+            exporter.write(next(synthetic_pages(10, 10, cover_columns=True))[1])
+            exporter.close()
+            paths.append(exporter.path)
+        assert paths == [export_path(partitions, 'csv', partitioned=True, run_date=run_date)
+                         for run_date in (datetime(2024, 5, 1, 8), datetime(2024, 5, 1, 20))]
+        assert all(os.path.exists(path) for path in paths)
+        print(f'\nPartição por data da execução: {", ".join(os.path.relpath(path, partitions) for path in paths)}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+Relatório de tempo dos fluxos do robô (login e seções interact_*) contra uma cópia
+local do DemoQA servida a partir de benchmarks/fixtures.
+
+Para cada etapa é exibido o tempo medido com as esperas por condição e a estimativa
+do tempo anterior, que somava time.sleep(2) fixos entre as ações.
+
+Uso:
+    python benchmarks/benchmark_flows.py
+"""
+import time
+
+from fixture_server import start_fixture_server, create_headless_driver
+
+import web_automation
+
+# Quantidade de time.sleep(2) removidos de cada fluxo ao adotar as esperas por condição
+FIXED_SLEEPS_REMOVED = {
+    'login': 0,
+    'elements': 4,
+    'forms': 15,
+    'alerts_frames_windows': 5,
+    'widgets': 7,
+    'interactions': 6,
+}
+FIXED_SLEEP_SECONDS = 2
+
+def main():
+    server, base_url = start_fixture_server()
+    web_automation.DEMOQA_BASE_URL = base_url
+    driver = create_headless_driver()
+    steps = [
+        ('login', lambda: web_automation.login_demoqa(driver, 'fixture', 'fixture')),
+        ('elements', lambda: web_automation.interact_with_elements(driver)),
+        ('forms', lambda: web_automation.interact_with_forms(driver)),
+        ('alerts_frames_windows', lambda: web_automation.interact_with_alerts_frames_windows(driver)),
+        ('widgets', lambda: web_automation.interact_with_widgets(driver)),
+        ('interactions', lambda: web_automation.interact_with_interactions(driver)),
+    ]
+    total_after = 0.0
+    total_before = 0.0
+    try:
+        print(f'{"etapa":<24}{"depois (s)":>12}{"antes, estimado (s)":>22}')
+        for name, step in steps:
+            start = time.perf_counter()
+            step()
+            elapsed = time.perf_counter() - start
+            before = elapsed + FIXED_SLEEPS_REMOVED[name] * FIXED_SLEEP_SECONDS
+            total_after += elapsed
+            total_before += before
+            print(f'{name:<24}{elapsed:>12.2f}{before:>22.2f}')
+        print(f'{"total":<24}{total_after:>12.2f}{total_before:>22.2f}')
+        if web_automation.error_reports:
+            print('\nErros registrados durante a execução:')
+            for error in web_automation.error_reports:
+                print(f'- {error}')
+    finally:
+        driver.quit()
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Compara o preenchimento do formulário "Practice Form" campo a campo (FORM_FILL_MODE=keys)
+com o preenchimento em lote por execute_script (FORM_FILL_MODE=script) na cópia local
+do formulário, exibindo o número de comandos enviados ao ChromeDriver e o tempo.
+
+Os dois modos devem produzir a mesma tabela de confirmação após o envio.
+
+Uso:
+    python benchmarks/benchmark_form_fill.py [--repeat 3]
+"""
+import argparse
+import statistics
+import time
+
+from fixture_server import start_fixture_server, create_headless_driver, count_commands
+
+import web_automation
+
+def submitted_values(driver):
+    """
+    Lê a tabela de confirmação exibida após o envio do formulário.
+    """
+    return driver.execute_script(
+        'return Array.from(document.querySelectorAll("#result-table tr"))'
+        '.map(row => [row.cells[0].textContent, row.cells[1].textContent]);'
+    )
+
+def run_mode(driver, counter, mode, repeat):
+    web_automation.FORM_FILL_MODE = mode
+    times = []
+    commands = []
+    values = None
+    for _ in range(repeat):
+        counter['commands'] = 0
+        start = time.perf_counter()
+        web_automation.interact_with_forms(driver)
+        times.append(time.perf_counter() - start)
+        commands.append(counter['commands'])
+        values = submitted_values(driver)
+    return times, commands, values
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3, help='Repetições por modo')
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server()
+    web_automation.DEMOQA_BASE_URL = base_url
+    driver = create_headless_driver()
+    counter = count_commands(driver)
+    try:
+        results = {mode: run_mode(driver, counter, mode, args.repeat) for mode in ('keys', 'script')}
+    finally:
+        driver.quit()
+        server.shutdown()
+
+    print(f'{"modo":<10}{"comandos":>10}{"mediana (ms)":>14}{"mínimo (ms)":>14}')
+    for mode, (times, commands, _) in results.items():
+        print(f'{mode:<10}{statistics.median(commands):>10.0f}{statistics.median(times) * 1000:>14.0f}{min(times) * 1000:>14.0f}')
+
+    keys_values, script_values = results['keys'][2], results['script'][2]
+    print('\nValores enviados:')
+    for (label, value), (_, script_value) in zip(keys_values, script_values):
+        marker = '' if value == script_value else f'   <-- script: {script_value}'
+        print(f'  {label:<16}{value}{marker}')
+    if keys_values != script_values or web_automation.error_reports:
+        print('\nDivergências ou erros registrados:')
+        for error in web_automation.error_reports:
+            print(f'- {error}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,117 @@
+"""
+Mede o tempo de inicialização das linhas de comando dos robôs com `python -X importtime`
+e falha se algum subcomando leve passar do orçamento ou importar módulos pesados.
+
+Os subcomandos que não usam o navegador, o banco de dados nem a interface do Windows
+(--help, --dry-run, report) não podem importar o Selenium, web_automation, o pyodbc nem o pywinauto,
+nem criar os diretórios logs/, data/ e reports/. A importação de web_automation é medida
+como referência (se o Selenium estiver instalado).
+
+Uso:
+    python benchmarks/benchmark_import_time.py [--repeat 5] [--budget-ms 150]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CLI = os.path.join(ROOT, 'robo_web', 'src', 'cli.py')
+ALARM = os.path.join(ROOT, 'robo_desktop', 'alarm.py')
+
+# Módulos que os subcomandos leves não podem importar
+HEAVY_MODULES = ('selenium', 'web_automation', 'pyodbc', 'pywinauto', 'pandas', 'pyarrow')
+
+# Subcomandos leves: (nome, argumentos)
+LIGHT_COMMANDS = [
+    ('cli --help', [CLI, '--help']),
+    ('cli --dry-run run', [CLI, '--dry-run', 'run']),
+    ('cli --dry-run collect-only', [CLI, '--dry-run', 'collect-only']),
+    ('cli --dry-run export-only', [CLI, '--dry-run', 'export-only']),
+    ('cli report', [CLI, 'report']),
+    ('alarm --dry-run', [ALARM, '--dry-run']),
+    ('alarm report', [ALARM, 'report']),
+]
+
+IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+def parse_importtime(stderr):
+    """
+    Lê a saída de -X importtime.
+
+    Returns:
+        tuple: Tempo total de importação em ms (soma dos módulos de primeiro nível) e
+            dicionário módulo → tempo cumulativo em ms.
+    """
+    modules = {}
+    total = 0
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if not match:
+            continue
+        cumulative = int(match.group(2)) / 1000
+        modules[match.group(4)] = cumulative
+        if len(match.group(3)) == 1:
+            total += cumulative
+    return total, modules
+
+def measure(arguments, repeat, directory):
+    """
+    Executa o comando repeat vezes e retorna as medianas do tempo total e do tempo de
+    importação, os módulos importados na última execução e o código de saída.
+    """
+    walls, imports = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-X', 'importtime'] + arguments, cwd=directory,
+                                capture_output=True, text=True)
+        walls.append((time.perf_counter() - start) * 1000)
+        total, modules = parse_importtime(result.stderr)
+        imports.append(total)
+    return statistics.median(walls), statistics.median(imports), modules, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='Execuções por comando')
+    parser.add_argument('--budget-ms', type=float, default=150, help='Tempo máximo de importação dos subcomandos leves')
+    parser.add_argument('--top', type=int, default=5, help='Módulos mais lentos exibidos por comando')
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as directory:
+        print(f'{"comando":<30}{"total (ms)":>12}{"importação (ms)":>17}{"módulos":>9}')
+        for name, arguments in LIGHT_COMMANDS:
+            wall, imported, modules, result = measure(arguments, args.repeat, directory)
+            print(f'{name:<30}{wall:>12.1f}{imported:>17.1f}{len(modules):>9}')
+            slowest = sorted(((time_ms, module) for module, time_ms in modules.items() if '.' not in module), reverse=True)
+            print('    ' + ', '.join(f'{module} {time_ms:.1f}' for time_ms, module in slowest[:args.top]))
+
+            if result.returncode != 0:
+                failures.append(f'{name}: código de saída {result.returncode}: {result.stderr.splitlines()[-1:]}')
+            heavy = sorted({module.split('.')[0] for module in modules} & set(HEAVY_MODULES))
+            if heavy:
+                failures.append(f'{name}: importou {", ".join(heavy)}')
+            if imported > args.budget_ms:
+                failures.append(f'{name}: {imported:.1f} ms de importação (orçamento {args.budget_ms:.0f} ms)')
+            created = [entry for entry in os.listdir(directory) if entry in ('logs', 'data', 'reports')]
+            if created:
+                failures.append(f'{name}: criou {", ".join(created)}')
+
+        # Referência: importação completa do robô web (Selenium e todos os módulos)
+        wall, imported, modules, result = measure(['-c', 'import web_automation'], 1, os.path.join(ROOT, 'robo_web', 'src'))
+        if result.returncode == 0:
+            print(f'{"import web_automation":<30}{wall:>12.1f}{imported:>17.1f}{len(modules):>9}')
+        else:
+            print(f'{"import web_automation":<30}indisponível ({result.stderr.strip().splitlines()[-1]})')
+
+    if failures:
+        print('\nRegressões:\n' + '\n'.join(f'- {failure}' for failure in failures))
+        sys.exit(1)
+    print('\nNenhuma regressão no tempo de inicialização.')
+
+if __name__ == '__main__':
+    main()
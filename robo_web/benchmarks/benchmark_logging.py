@@ -0,0 +1,125 @@
+"""
+Compara o logging síncrono original (FileHandler no próprio thread e lista de erros gravada
+ao final) com o pipeline do pacote rpa_common (QueueHandler/QueueListener, JSON lines,
+campos limitados, amostragem dos erros repetidos e relatório gravado durante a execução).
+
+Simula uma coleta grande em que cada livro com falha registra o erro com o HTML do
+elemento (--html-size caracteres), medindo a latência de cada chamada no thread do robô,
+o pico de memória (tracemalloc) e o tamanho dos arquivos. Também verifica que os erros
+já estão no relatório quando o processo termina sem concluí-lo.
+
+Uso:
+    python benchmarks/benchmark_logging.py [--errors 100000] [--html-size 5000]
+"""
+import argparse
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+from rpa_common import setup_logging, ErrorReport, truncate
+
+def error_messages(count, html_size):
+    """
+    Gera os erros de uma coleta com falhas: poucas mensagens diferentes, repetidas em vários livros.
+    """
+    html = '<div class="rt-tr-group">' + 'x' * html_size + '</div>'
+    for index in range(count):
+        yield f'Erro ao coletar dados de um livro na página {index // 10}: no such element (tipo {index % 3})', html
+
+def run_original(directory, count, html_size):
+    """
+    Logging original: handlers síncronos e mensagens completas (com o HTML) acumuladas até o fim.
+    """
+    os.makedirs(directory)
+    logger = logging.getLogger('benchmark.original')
+    logger.propagate = False
+    handler = logging.FileHandler(os.path.join(directory, 'original.log'), encoding='utf-8')
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+    error_reports = []
+    latencies = []
+    for message, html in error_messages(count, html_size):
+        start = time.perf_counter()
+        error_message = f'{message}\nHTML do elemento: {html}'
+        logger.error(error_message)
+        error_reports.append(error_message)
+        latencies.append(time.perf_counter() - start)
+    report_path = os.path.join(directory, 'original.report')
+    with open(report_path, 'w', encoding='utf-8') as file:
+        for error in error_reports:
+            file.write(error + '\n')
+    logger.removeHandler(handler)
+    handler.close()
+    return latencies, [os.path.join(directory, 'original.log'), report_path]
+
+def run_pipeline(directory, count, html_size):
+    """
+    Pipeline novo: QueueHandler com campos limitados e amostragem, relatório gravado em segundo plano.
+    """
+    logger = logging.getLogger('benchmark.pipeline')
+    logger.propagate = False
+    pipeline = setup_logging(logger, os.path.join(directory, 'pipeline'), console=False)
+    report = ErrorReport(os.path.join(directory, 'reports'))
+    latencies = []
+    for message, html in error_messages(count, html_size):
+        start = time.perf_counter()
+        logger.error(message, extra={'html': truncate(html, 500)})
+        report.add(message)
+        latencies.append(time.perf_counter() - start)
+    report_path = report.close()
+    pipeline.stop()
+    return latencies, [os.path.join(directory, 'pipeline.jsonl'), report_path]
+
+CRASH_SCRIPT = '''
+import os, sys, time
+sys.path.insert(0, {root!r})
+from rpa_common import ErrorReport
+report = ErrorReport({directory!r}, sample_burst=0)
+for index in range(50):
+    report.add(f'erro {{index}}')
+time.sleep(0.5)
+print(report.path)
+os._exit(1)
+'''
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--errors', type=int, default=100000, help='Erros registrados')
+    parser.add_argument('--html-size', type=int, default=5000, help='Tamanho do HTML de cada elemento')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f'{"logging":<12}{"p50 (µs)":>10}{"p99 (µs)":>10}{"total (s)":>11}{"pico (MiB)":>12}{"log (MiB)":>11}{"relatório (MiB)":>17}')
+        for name, function in (('original', run_original), ('pipeline', run_pipeline)):
+            # Latência sem o tracemalloc; o pico de memória é medido em uma segunda execução
+            start = time.perf_counter()
+            latencies, (log_path, report_path) = function(os.path.join(directory, f'{name}-time'), args.errors, args.html_size)
+            elapsed = time.perf_counter() - start
+            tracemalloc.start()
+            function(os.path.join(directory, f'{name}-memory'), args.errors, args.html_size)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            latencies.sort()
+            print(f'{name:<12}{statistics.median(latencies) * 1e6:>10.1f}{latencies[int(len(latencies) * 0.99)] * 1e6:>10.1f}'
+                  f'{elapsed:>11.2f}{peak / 1024 / 1024:>12.1f}{os.path.getsize(log_path) / 1024 / 1024:>11.1f}'
+                  f'{os.path.getsize(report_path) / 1024 / 1024:>17.2f}')
+
+        # Processo encerrado sem concluir o relatório: os erros já devem estar no arquivo
+        crash_directory = os.path.join(directory, 'crash')
+        result = subprocess.run([sys.executable, '-c', CRASH_SCRIPT.format(root=ROOT, directory=crash_directory)],
+                                capture_output=True, text=True)
+        with open(result.stdout.strip(), encoding='utf-8') as file:
+            lines = file.read().splitlines()
+        assert len(lines) == 50, f'{len(lines)} erros gravados antes do encerramento, 50 esperados'
+        print(f'\nEncerramento sem concluir o relatório: {len(lines)} de 50 erros já gravados')
+
+if __name__ == '__main__':
+    main()
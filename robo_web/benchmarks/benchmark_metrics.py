@@ -0,0 +1,127 @@
+"""
+Mede o custo das métricas das etapas (rpa_common.metrics) e valida o relatório p50/p95.
+
+1. Custo por chamada de uma etapa medida com metrics.timed() e com metrics.add(),
+   comparado à chamada direta da função.
+2. Simula --runs execuções do robô web (etapas com durações aleatórias e uma coleta de
+   --pages páginas), gravando cada uma no arquivo do Prometheus e no histórico SQLite, e
+   mede o tempo de gravação e do relatório.
+3. Nas últimas --regressed execuções a etapa collect_book_data fica 50% mais lenta: o
+   relatório das últimas execuções deve mostrar o aumento do p95 em relação ao das anteriores.
+
+Uso:
+    python benchmarks/benchmark_metrics.py [--runs 200] [--pages 50] [--regressed 10]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+from rpa_common.metrics import Metrics, RunHistory, format_report, save_run
+
+# Duração média (s) de cada etapa simulada
+STAGES = {
+    'login_demoqa': 2.0,
+    'interact_with_elements': 6.0,
+    'interact_with_forms': 4.0,
+    'interact_with_alerts_frames_windows': 5.0,
+    'interact_with_widgets': 3.0,
+    'interact_with_interactions': 3.5,
+}
+
+def call_overhead(calls):
+    """
+    Custo médio (ns) de uma chamada direta, com metrics.timed() e com timed() + add().
+    """
+    metrics = Metrics('benchmark')
+
+    def stage(value):
+        return value + 1
+
+    timed = metrics.timed('stage')(stage)
+
+    @metrics.timed('stage_with_count')
+    def counted(value):
+        metrics.add('items', 10)
+        return value + 1
+
+    results = {}
+    for name, func in (('direta', stage), ('timed()', timed), ('timed() + add()', counted)):
+        start = time.perf_counter()
+        for index in range(calls):
+            func(index)
+        results[name] = (time.perf_counter() - start) / calls * 1e9
+    return results
+
+def simulate_run(metrics, pages, slowdown, rng):
+    """
+    Registra os spans de uma execução simulada (sem dormir: as durações são sorteadas).
+    """
+    metrics.start_run()
+    success = True
+    for name, mean in STAGES.items():
+        outcome = 'error' if rng.random() < 0.02 else 'ok'
+        success = success and outcome == 'ok'
+        metrics.record(name, rng.gauss(mean, mean * 0.1), outcome)
+    page_durations = [rng.gauss(0.4, 0.05) * slowdown for _ in range(pages)]
+    for duration in page_durations:
+        metrics.record('book_page', duration, books=10)
+    metrics.record('collect_book_data', sum(page_durations), pages=pages, books=pages * 10)
+    metrics.record('run_book_pipeline', sum(page_durations) + rng.gauss(1.0, 0.1), rows_database=pages * 10, rows_csv=pages * 10)
+    metrics.finish_run(success)
+    # A duração total simulada substitui a medida (que seria quase zero)
+    metrics.duration = sum(span.duration for span in metrics.spans if span.name != 'book_page')
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=200, help='Execuções simuladas')
+    parser.add_argument('--pages', type=int, default=50, help='Páginas de livros por execução')
+    parser.add_argument('--regressed', type=int, default=10, help='Últimas execuções com a coleta 50%% mais lenta')
+    parser.add_argument('--calls', type=int, default=200000, help='Chamadas na medição do custo por chamada')
+    args = parser.parse_args()
+
+    print(f'{"chamada":<20}{"ns por chamada":>16}')
+    for name, nanoseconds in call_overhead(args.calls).items():
+        print(f'{name:<20}{nanoseconds:>16.0f}')
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as directory:
+        textfile_path = os.path.join(directory, 'rpa_web.prom')
+        history_path = os.path.join(directory, 'run_history.db')
+        metrics = Metrics('web')
+        save_times = []
+        for run in range(args.runs):
+            slowdown = 1.5 if run >= args.runs - args.regressed else 1.0
+            simulate_run(metrics, args.pages, slowdown, rng)
+            start = time.perf_counter()
+            save_run(metrics, textfile_path=textfile_path, history_path=history_path)
+            save_times.append(time.perf_counter() - start)
+
+        history = RunHistory(history_path)
+        start = time.perf_counter()
+        recent = history.stage_report('web', runs=args.regressed)
+        report_time = time.perf_counter() - start
+        baseline = history.stage_report('web', runs=args.runs)
+        history.close()
+
+        print(f'\n{args.runs} execuções de {args.pages} páginas: gravação p50 {statistics.median(save_times) * 1000:.2f} ms '
+              f'(Prometheus e histórico), relatório {report_time * 1000:.1f} ms, '
+              f'histórico {os.path.getsize(history_path) / 1024:.0f} KiB, textfile {os.path.getsize(textfile_path) / 1024:.1f} KiB\n')
+        print(format_report(recent, 'web'))
+
+        stage_p95 = {stage['stage']: stage['p95'] for stage in baseline['stages']}
+        recent_p95 = {stage['stage']: stage['p95'] for stage in recent['stages']}
+        increase = recent_p95['collect_book_data'] / stage_p95['collect_book_data']
+        print(f'p95 de collect_book_data: {stage_p95["collect_book_data"]:.2f} s em {args.runs} execuções, '
+              f'{recent_p95["collect_book_data"]:.2f} s nas últimas {args.regressed} ({increase:.2f}x)')
+        assert increase > 1.2, 'a regressão simulada não aparece no relatório'
+        assert recent_p95['login_demoqa'] / stage_p95['login_demoqa'] < 1.2, 'etapa sem regressão marcada como mais lenta'
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Mede o tempo até o conteúdo de uma página ficar disponível para o robô, comparando a
+estratégia de carregamento 'normal' sem bloqueio de requisições com a estratégia 'eager'
+e o bloqueio de anúncios, rastreadores, fontes e imagens de capa (BLOCKED_URL_PATTERNS).
+
+A página servida localmente imita o DemoQA: o conteúdo vem no HTML, mas ela carrega um
+script de anúncio síncrono, scripts de rastreamento assíncronos, uma fonte e imagens de
+capa, todos respondidos com atraso (--asset-delay) para simular servidores de terceiros.
+
+Uso:
+    python benchmarks/benchmark_page_load.py [--repeat 5] [--asset-delay 0.5]
+"""
+import argparse
+import statistics
+import time
+
+from fixture_server import start_fixture_server, QuietHandler
+
+import web_automation
+from selenium.webdriver.common.by import By
+
+# Atraso aplicado a cada recurso de terceiros, em segundos (ajustado pela linha de comando)
+ASSET_DELAY = 0.5
+
+PAGE = '''<!DOCTYPE html>
+<html>
+<head>
+  <meta charset="utf-8">
+  <title>Book Store</title>
+  <style>
+    @font-face { font-family: Demo; src: url("/static/fonts/demo.woff2") format("woff2"); }
+    body { font-family: Demo, sans-serif; }
+  </style>
+  <script src="/ads/pagead2.googlesyndication.com/show_ads.js"></script>
+  <script async src="/ads/www.googletagmanager.com/gtag.js"></script>
+  <script async src="/ads/www.google-analytics.com/analytics.js"></script>
+</head>
+<body>
+  <div id="content">%s</div>
+</body>
+</html>
+'''
+
+ROW = '<div class="book"><img src="/images/bookimage/%d.jpg" width="50"><span>Livro %d</span></div>'
+
+class SlowAssetsHandler(QuietHandler):
+    """
+    Serve a página de livros imediatamente e todos os outros recursos com atraso.
+    """
+    def do_GET(self):
+        if self.path.startswith('/books'):
+            body = (PAGE % ''.join(ROW % (index, index) for index in range(10))).encode('utf-8')
+            content_type = 'text/html; charset=utf-8'
+        else:
+            time.sleep(ASSET_DELAY)
+            body = b'' if self.path.endswith('.js') else b'\0' * 20000
+            content_type = 'application/javascript' if self.path.endswith('.js') else 'application/octet-stream'
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+def time_to_content(driver, url):
+    """
+    Abre a página e retorna o tempo, em segundos, até os livros estarem disponíveis.
+    """
+    start = time.perf_counter()
+    web_automation.open_page(driver, url)
+    driver.find_element(By.CSS_SELECTOR, '#content .book')
+    return time.perf_counter() - start
+
+def run_scenario(url, repeat, page_load_strategy, blocked_url_patterns):
+    web_automation.PAGE_LOAD_STRATEGY = page_load_strategy
+    driver = web_automation.create_driver(headless=True, page_load_strategy=page_load_strategy,
+                                          blocked_url_patterns=blocked_url_patterns)
+    try:
+        # A primeira abertura aquece o navegador e não entra na medição
+        time_to_content(driver, url)
+        return [time_to_content(driver, f'{url}?run={run}') for run in range(repeat)]
+    finally:
+        driver.quit()
+
+def main():
+    global ASSET_DELAY
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='Aberturas medidas por cenário')
+    parser.add_argument('--asset-delay', type=float, default=ASSET_DELAY, help='Atraso dos recursos de terceiros, em segundos')
+    args = parser.parse_args()
+    ASSET_DELAY = args.asset_delay
+
+    server, base_url = start_fixture_server(handler_class=SlowAssetsHandler)
+    url = f'{base_url}/books'
+    scenarios = [
+        ('normal, sem bloqueio', 'normal', []),
+        ('normal, com bloqueio', 'normal', web_automation.DEFAULT_BLOCKED_URL_PATTERNS),
+        ('eager, sem bloqueio', 'eager', []),
+        ('eager, com bloqueio', 'eager', web_automation.DEFAULT_BLOCKED_URL_PATTERNS),
+        ('none, com bloqueio', 'none', web_automation.DEFAULT_BLOCKED_URL_PATTERNS),
+    ]
+    try:
+        results = [(label, run_scenario(url, args.repeat, strategy, patterns)) for label, strategy, patterns in scenarios]
+    finally:
+        server.shutdown()
+
+    baseline = statistics.median(results[0][1])
+    print(f'{"cenário":<24}{"mediana (ms)":>14}{"mínimo (ms)":>14}{"ganho":>8}')
+    for label, runs in results:
+        median = statistics.median(runs)
+        print(f'{label:<24}{median * 1000:>14.0f}{min(runs) * 1000:>14.0f}{baseline / median:>7.1f}x')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,38 @@
+"""
+Mede o tempo da coleta paralela de livros com diferentes quantidades de sessões
+headless, contra uma tabela de fixture paginada servida localmente.
+
+Uso:
+    python benchmarks/benchmark_parallel_collection.py [--books 2000] [--size 10] [--workers 1 2 4]
+"""
+import argparse
+import time
+
+from fixture_server import start_fixture_server
+
+import web_automation
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--books', type=int, default=2000, help='Quantidade de livros na fixture')
+    parser.add_argument('--size', type=int, default=10, help='Linhas por página')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='Quantidades de sessões a comparar')
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server()
+    web_automation.BOOKS_URL = f'{base_url}/books.html?books={args.books}&size={args.size}'
+    try:
+        print(f'{"sessões":<10}{"livros":>8}{"tempo (s)":>12}')
+        for workers in args.workers:
+            start = time.perf_counter()
+            books = web_automation.collect_book_data_parallel(workers=workers)
+            elapsed = time.perf_counter() - start
+            titles = [book['title'] for book in books]
+            if len(titles) != len(set(titles)) or len(titles) != args.books:
+                print(f'Aviso: esperados {args.books} livros únicos, coletados {len(set(titles))} de {len(titles)}')
+            print(f'{workers:<10}{len(books):>8}{elapsed:>12.3f}')
+    finally:
+        server.shutdown()
+
+if __name__ == '__main__':
+    main()
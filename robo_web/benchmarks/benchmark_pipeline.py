@@ -0,0 +1,77 @@
+"""
+Alimenta o pipeline de livros com um gerador sintético (100 mil linhas por padrão)
+e grava em um SQLite e um CSV temporários, medindo o tempo e o pico de memória.
+
+Também verifica a propagação de erros: uma falha no produtor ou em um consumidor
+deve interromper o pipeline e ser relatada como PipelineError.
+
+Uso:
+    python benchmarks/benchmark_pipeline.py [--rows 100000] [--page-size 100] [--queue-size 4]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from book_writer import create_backend
+from pipeline import run_pipeline, DatabaseSink, PipelineError
+from exporters import CsvExporter
+from fixture_server import synthetic_pages
+
+class FailingSink:
+    """
+    Consumidor que falha após receber algumas páginas.
+    """
+    name = 'failing'
+
+    def __init__(self, fail_after):
+        self.fail_after = fail_after
+        self.rows = 0
+
+    def write(self, page_books):
+        if self.fail_after == 0:
+            raise RuntimeError('falha simulada no consumidor')
+        self.fail_after -= 1
+        self.rows += len(page_books)
+
+    def close(self):
+        pass
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000, help='Quantidade de livros')
+    parser.add_argument('--page-size', type=int, default=100, help='Livros por página')
+    parser.add_argument('--queue-size', type=int, default=4, help='Páginas pendentes por consumidor')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        backend = create_backend('sqlite', path=os.path.join(directory, 'books.db'))
+        sinks = [DatabaseSink(backend, mode='batch'), CsvExporter(os.path.join(directory, 'books.csv'))]
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        stats = run_pipeline(synthetic_pages(args.rows, args.page_size, authors=500, publishers=20), sinks, queue_size=args.queue_size)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        print(f'Páginas: {stats["pages"]}, linhas no banco: {stats["database"]}, linhas no CSV: {stats["csv"]}')
+        print(f'Tempo: {elapsed:.2f} s ({args.rows / elapsed:.0f} linhas/s), pico de memória: {peak / 1024 / 1024:.1f} MiB')
+        assert stats['database'] == stats['csv'] == args.rows, 'Quantidade de linhas gravadas diferente da gerada'
+
+        for label, pages, pipeline_sinks in [
+            ('produtor', synthetic_pages(args.rows, args.page_size, fail_at=10, authors=500, publishers=20), [FailingSink(10 ** 9)]),
+            ('consumidor', synthetic_pages(args.rows, args.page_size, authors=500, publishers=20), [FailingSink(5), FailingSink(10 ** 9)]),
+        ]:
+            try:
+                run_pipeline(pages, pipeline_sinks, queue_size=args.queue_size)
+                raise AssertionError(f'Falha no {label} não foi propagada')
+            except PipelineError as e:
+                print(f'Falha no {label} propagada: {e}')
+
+if __name__ == '__main__':
+    main()
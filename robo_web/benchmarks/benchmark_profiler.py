@@ -0,0 +1,74 @@
+"""
+Mede o custo do profiler de comandos do WebDriver e gera um perfil de exemplo.
+
+    - Custo por comando: um driver simulado (sem rede) executa --commands comandos com o
+      profiler desativado e ativado, mostrando o custo adicional de cada registro.
+    - Perfil real: o login e as seções interact_* rodam contra a cópia local do DemoQA com
+      o profiler ativado; o relatório e o arquivo Chrome Trace são gravados em --output.
+
+Uso:
+    python benchmarks/benchmark_profiler.py [--commands 200000] [--output reports]
+"""
+import argparse
+import time
+
+from fixture_server import start_fixture_server, create_headless_driver
+
+import web_automation
+from profiler import CommandProfiler, DisabledProfiler
+
+class FakeDriver:
+    """
+    Driver simulado cujo execute responde imediatamente, para isolar o custo do profiler.
+    """
+    def execute(self, driver_command, params=None):
+        return {'value': None}
+
+def per_command_cost(profiler, commands):
+    driver = profiler.attach(FakeDriver())
+    params = {'using': 'css selector', 'value': '#userName', 'sessionId': 'abc'}
+    start = time.perf_counter()
+    with profiler.step('fake'):
+        for _ in range(commands):
+            driver.execute('findElement', params)
+    return (time.perf_counter() - start) / commands
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--commands', type=int, default=200000, help='Comandos simulados por cenário')
+    parser.add_argument('--output', default='reports', help='Diretório do relatório e do trace')
+    args = parser.parse_args()
+
+    disabled = per_command_cost(DisabledProfiler(), args.commands)
+    enabled = per_command_cost(CommandProfiler(), args.commands)
+    print(f'{"profiler":<14}{"µs por comando":>16}')
+    print(f'{"desativado":<14}{disabled * 1e6:>16.2f}')
+    print(f'{"ativado":<14}{enabled * 1e6:>16.2f}')
+    print(f'Custo adicional com o profiler ativado: {(enabled - disabled) * 1e6:.2f} µs por comando\n')
+
+    server, base_url = start_fixture_server()
+    web_automation.DEMOQA_BASE_URL = base_url
+    profiler = CommandProfiler()
+    driver = profiler.attach(create_headless_driver())
+    steps = [
+        ('login', lambda: web_automation.login_demoqa(driver, 'fixture', 'fixture')),
+        ('elements', lambda: web_automation.interact_with_elements(driver)),
+        ('forms', lambda: web_automation.interact_with_forms(driver)),
+        ('alerts_frames_windows', lambda: web_automation.interact_with_alerts_frames_windows(driver)),
+        ('widgets', lambda: web_automation.interact_with_widgets(driver)),
+        ('interactions', lambda: web_automation.interact_with_interactions(driver)),
+    ]
+    try:
+        for name, step in steps:
+            with profiler.step(name):
+                step()
+    finally:
+        driver.quit()
+        server.shutdown()
+
+    print(profiler.format_report())
+    report_path, trace_path = profiler.write(args.output)
+    print(f'Relatório: {report_path}\nTrace: {trace_path}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Compara os fluxos escritos em código (login_demoqa e interact_*) com os mesmos fluxos
+descritos nos arquivos de robo_web/scenarios e executados pelo motor de cenários, contra a
+cópia local do DemoQA. Para cada fluxo são exibidos o número de comandos enviados ao
+ChromeDriver, o tempo e o resumo do plano compilado (passos, operações, lotes de script e
+esperas removidas).
+
+Uso:
+    python benchmarks/benchmark_scenarios.py
+"""
+import os
+import time
+
+from fixture_server import start_fixture_server, create_headless_driver, count_commands
+
+import web_automation
+from scenario import load_plan
+
+FLOWS = [
+    ('login', lambda driver: web_automation.login_demoqa(driver, 'fixture', 'fixture')),
+    ('elements', web_automation.interact_with_elements),
+    ('forms', web_automation.interact_with_forms),
+    ('alerts_frames_windows', web_automation.interact_with_alerts_frames_windows),
+    ('widgets', web_automation.interact_with_widgets),
+    ('interactions', web_automation.interact_with_interactions),
+]
+
+def run_flows(engine):
+    """
+    Executa todos os fluxos com o motor indicado ('code' ou 'scenario') em um navegador novo.
+
+    Returns:
+        dict: Comandos e tempo de cada fluxo.
+    """
+    web_automation.FLOW_ENGINE = engine
+    driver = create_headless_driver()
+    counter = count_commands(driver)
+    results = {}
+    try:
+        for name, func in FLOWS:
+            counter['commands'] = 0
+            start = time.perf_counter()
+            web_automation.flow(name, func)(driver)
+            results[name] = (counter['commands'], time.perf_counter() - start)
+    finally:
+        driver.quit()
+    return results
+
+def main():
+    server, base_url = start_fixture_server()
+    web_automation.DEMOQA_BASE_URL = base_url
+    # O login pela interface é medido nos dois motores, sem reaproveitar a sessão em cache
+    web_automation.SESSION_CACHE = False
+    try:
+        code = run_flows('code')
+        scenario = run_flows('scenario')
+    finally:
+        server.shutdown()
+
+    print(f'{"fluxo":<24}{"comandos":>10}{"cenário":>9}{"tempo (s)":>11}{"cenário":>9}   plano')
+    for name, _ in FLOWS:
+        stats = load_plan(os.path.join(web_automation.SCENARIOS_DIRECTORY, f'{name}.json')).stats
+        print(f'{name:<24}{code[name][0]:>10}{scenario[name][0]:>9}{code[name][1]:>11.2f}{scenario[name][1]:>9.2f}   '
+              f'{stats["steps"]} passos, {stats["ops"]} operações, {stats["script_batches"]} lotes, '
+              f'{stats["skipped_waits"]} esperas removidas')
+    print(f'{"total":<24}{sum(value[0] for value in code.values()):>10}{sum(value[0] for value in scenario.values()):>9}'
+          f'{sum(value[1] for value in code.values()):>11.2f}{sum(value[1] for value in scenario.values()):>9.2f}')
+    if web_automation.error_reports:
+        print('\nErros registrados durante a execução:')
+        for error in web_automation.error_reports:
+            print(f'- {error}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Compara o tempo total do login e das seções interact_* contra a cópia local do DemoQA
+executados em sequência em um único navegador (workers=1) e pelo agendador de etapas,
+com as seções independentes em paralelo, cada uma em sua própria sessão headless.
+
+Uso:
+    python benchmarks/benchmark_sections.py [--workers 6]
+"""
+import argparse
+import time
+
+from fixture_server import start_fixture_server, create_headless_driver
+
+import web_automation
+from scheduler import Step, run_steps
+
+def build_steps():
+    return [
+        Step('login', lambda driver: web_automation.login_demoqa(driver, 'fixture', 'fixture'), session='main'),
+        Step('elements', web_automation.interact_with_elements),
+        Step('forms', web_automation.interact_with_forms),
+        Step('alerts_frames_windows', web_automation.interact_with_alerts_frames_windows),
+        Step('widgets', web_automation.interact_with_widgets),
+        Step('interactions', web_automation.interact_with_interactions),
+    ]
+
+def run(workers):
+    """
+    Executa as etapas com a quantidade de navegadores indicada.
+
+    Returns:
+        tuple: Tempo total em segundos e o resultado de cada etapa.
+    """
+    driver = create_headless_driver()
+    try:
+        start = time.perf_counter()
+        results = run_steps(build_steps(), create_headless_driver, workers=workers, sessions={'main': driver})
+        return time.perf_counter() - start, results
+    finally:
+        driver.quit()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=6, help='Navegadores usados no cenário paralelo')
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server()
+    web_automation.DEMOQA_BASE_URL = base_url
+    try:
+        sequential, sequential_results = run(1)
+        parallel, parallel_results = run(args.workers)
+    finally:
+        server.shutdown()
+
+    print(f'{"etapa":<24}{"sequencial (s)":>16}{"paralelo (s)":>14}')
+    for name in sequential_results:
+        print(f'{name:<24}{sequential_results[name]["duration"]:>16.2f}{parallel_results[name]["duration"]:>14.2f}')
+    print(f'{"total (relógio)":<24}{sequential:>16.2f}{parallel:>14.2f}')
+    print(f'\nEtapa mais longa: {max(result["duration"] for result in parallel_results.values()):.2f} s; '
+          f'ganho: {sequential / parallel:.1f}x com {args.workers} navegadores')
+    failures = {name: result for results in (sequential_results, parallel_results)
+                for name, result in results.items() if result['status'] != 'ok'}
+    if failures or web_automation.error_reports:
+        print('\nErros registrados durante a execução:')
+        for name, result in failures.items():
+            print(f'- {name}: {result["status"]} {result["error"]}')
+        for error in web_automation.error_reports:
+            print(f'- {error}')
+
+if __name__ == '__main__':
+    main()
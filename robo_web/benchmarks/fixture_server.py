@@ -0,0 +1,127 @@
+import os
+import sys
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+# Diretório com as páginas de fixture servidas localmente
+FIXTURES_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+# Diretório com os módulos do robô web
+SRC_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+if SRC_DIRECTORY not in sys.path:
+    sys.path.insert(0, SRC_DIRECTORY)
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    """
+    Handler de arquivos estáticos que não escreve cada requisição no console.
+
+    Caminhos sem extensão (ex.: /elements) são servidos a partir do arquivo .html
+    correspondente, reproduzindo as rotas do DemoQA.
+    """
+    def translate_path(self, path):
+        translated = super().translate_path(path)
+        if not os.path.exists(translated) and os.path.exists(translated + '.html'):
+            return translated + '.html'
+        return translated
+
+    def log_message(self, format, *args):
+        pass
+
+def start_fixture_server(directory=FIXTURES_DIRECTORY, handler_class=QuietHandler):
+    """
+    Inicia um servidor HTTP local em uma thread para servir as páginas de fixture.
+
+    Args:
+        directory (str): Diretório servido pelo servidor.
+        handler_class (type): Classe de handler baseada em SimpleHTTPRequestHandler.
+
+    Returns:
+        tuple: Servidor iniciado e a URL base (ex.: http://127.0.0.1:8000).
+    """
+    server = ThreadingHTTPServer(('127.0.0.1', 0), partial(handler_class, directory=directory))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    host, port = server.server_address
+    return server, f'http://{host}:{port}'
+
+def create_headless_driver():
+    """
+    Cria uma instância headless do WebDriver do Chrome para os benchmarks.
+
+    Returns:
+        webdriver.Chrome: Instância do WebDriver do Chrome.
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+    from selenium.webdriver.chrome.options import Options
+
+    chrome_options = Options()
+    chrome_options.add_argument('--headless=new')
+    chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    return webdriver.Chrome(service=Service(os.getenv('CHROME_DRIVER_PATH')), options=chrome_options)
+
+def count_commands(driver):
+    """
+    Conta os comandos enviados ao chromedriver (um round trip HTTP por comando).
+
+    Args:
+        driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+
+    Returns:
+        dict: Contador atualizado a cada comando, na chave 'commands'.
+    """
+    counter = {'commands': 0}
+    original_execute = driver.execute
+
+    def execute(driver_command, params=None):
+        counter['commands'] += 1
+        return original_execute(driver_command, params)
+
+    driver.execute = execute
+    return counter
+
+def synthetic_books(start, count, authors=5000, publishers=200, cover_columns=False):
+    """
+    Gera livros sintéticos com autores e editoras repetidos, como no catálogo real.
+
+    Args:
+        start (int): Índice do primeiro livro (o título de cada livro é único pelo índice).
+        count (int): Quantidade de livros.
+        authors (int): Quantidade de autores distintos.
+        publishers (int): Quantidade de editoras distintas.
+        cover_columns (bool): Inclui as colunas da capa (vazias), como depois do cache de capas.
+
+    Returns:
+        list: Dicionários com as colunas dos livros.
+    """
+    books = []
+    for index in range(start, start + count):
+        book = {
+            'image': f'https://demoqa.com/images/bookimage{index % 4}.jpg',
+            'title': f'Book {index:07d}',
+            'author': f'Author {index % authors}',
+            'publisher': f'Publisher {index % publishers}',
+        }
+        if cover_columns:
+            book.update(cover_hash=None, cover_width=None, cover_height=None)
+        books.append(book)
+    return books
+
+def synthetic_pages(rows, page_size, fail_at=None, **options):
+    """
+    Gera as páginas de livros sintéticos no formato do pipeline de livros.
+
+    Args:
+        rows (int): Quantidade total de livros.
+        page_size (int): Livros por página.
+        fail_at (int, optional): Página em que o gerador lança um erro, simulando uma falha na coleta.
+        **options: Opções de synthetic_books (authors, publishers e cover_columns).
+
+    Yields:
+        tuple: Número da página e livros da página.
+    """
+    for page, start in enumerate(range(0, rows, page_size), start=1):
+        if page == fail_at:
+            raise RuntimeError(f'falha simulada na página {page}')
+        yield page, synthetic_books(start, min(page_size, rows - start), **options)
@@ -0,0 +1,17 @@
+// Menu lateral compartilhado pelas páginas de fixture, no formato do DemoQA
+(function () {
+    const items = [
+        ['Text Box', '/text-box'], ['Browser Windows', '/browser-windows'],
+        ['Accordian', '/accordian'], ['Sortable', '/sortable'], ['Book Store', '/books']
+    ];
+    const menu = document.createElement('ul');
+    menu.className = 'menu-list';
+    for (const [label, href] of items) {
+        const item = document.createElement('li');
+        item.className = 'btn btn-light';
+        item.innerHTML = '<span class="text">' + label + '</span>';
+        item.addEventListener('click', () => { window.location.href = href; });
+        menu.appendChild(item);
+    }
+    document.body.insertBefore(menu, document.body.firstChild);
+})();
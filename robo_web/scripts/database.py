@@ -1,7 +1,13 @@
 import os
-import pyodbc
+import sys
 from dotenv import load_dotenv # type: ignore
 
+# Módulos do robô web (backends de banco de dados e migrações)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+from book_writer import create_backend
+from migrations import migrate, LATEST_VERSION
+
 # Carregar variáveis de ambiente do arquivo .env
 load_dotenv()
 
@@ -11,10 +17,15 @@ SQL_DATABASE = os.getenv('SQL_DATABASE')
 SQL_USERNAME = os.getenv('SQL_USERNAME')
 SQL_PASSWORD = os.getenv('SQL_PASSWORD')
 
+# Backend do banco de dados ('sqlserver' ou 'sqlite') e arquivo do SQLite
+DB_BACKEND = os.getenv('DB_BACKEND', 'sqlserver')
+SQLITE_PATH = os.getenv('SQLITE_PATH', os.path.join('data', 'books.db'))
+
 def create_database():
     """
     Cria o banco de dados DemoQA.
     """
+    import pyodbc
     try:
         # Conexão ao banco de dados master para criar o novo banco de dados
         conn = pyodbc.connect(
@@ -40,43 +51,23 @@ def create_database():
         else:
             print(f'Erro ao criar banco de dados: {e}')
 
-def create_table():
+def migrate_database():
     """
-    Cria a tabela Books no banco de dados DemoQA.
+    Cria ou atualiza as tabelas do banco de dados DemoQA aplicando as migrações pendentes
+    (tabela Books, chave natural única, tabelas Authors e Publishers, índices e AccountRuns).
     """
+    backend = create_backend(DB_BACKEND, server=SQL_SERVER, database='DemoQA',
+                             username=SQL_USERNAME, password=SQL_PASSWORD, path=SQLITE_PATH)
     try:
-        # Conexão ao novo banco de dados DemoQA para criar a tabela
-        conn = pyodbc.connect(
-            f'DRIVER={{ODBC Driver 18 for SQL Server}};'
-            f'SERVER={SQL_SERVER};'
-            f'DATABASE=DemoQA;'  # Conectando-se ao banco de dados DemoQA
-            f'UID={SQL_USERNAME};'  # Nome de usuário
-            f'PWD={SQL_PASSWORD};'  # Senha
-            'TrustServerCertificate=yes;'
-        )
-        cursor = conn.cursor()
-
-        # Criando a tabela Books
-        cursor.execute('''
-            CREATE TABLE Books (
-                id INT IDENTITY(1,1) PRIMARY KEY,
-                image NVARCHAR(MAX),
-                title NVARCHAR(255),
-                author NVARCHAR(255),
-                publisher NVARCHAR(255)
-            )
-        ''')
-
-        conn.commit()
-        cursor.close()
-        conn.close()
-        print('Tabela criada com sucesso')
-    except pyodbc.Error as e:
-        if '2714' in str(e):
-            print('A tabela já existe. Pulando a criação da tabela.')
+        applied = migrate(backend)
+        if applied:
+            print(f'Migrações aplicadas: {", ".join(str(version) for version in applied)} (versão atual: {LATEST_VERSION})')
         else:
-            print(f'Erro ao criar a tabela: {e}')
+            print(f'O banco de dados já está na versão {LATEST_VERSION}. Nenhuma migração pendente.')
+    except Exception as e:
+        print(f'Erro ao aplicar as migrações: {e}')
 
 if __name__ == "__main__":
-    create_database()
-    create_table()
+    if DB_BACKEND == 'sqlserver':
+        create_database()
+    migrate_database()
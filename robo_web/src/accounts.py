@@ -0,0 +1,178 @@
+"""
+Execução do robô web para várias contas.
+
+As credenciais são lidas de um arquivo JSON ou CSV e cada conta roda em seu próprio
+navegador, com no máximo `workers` contas ao mesmo tempo. As navegações (driver.get) de
+todos os navegadores passam por um limitador de taxa com token bucket, com um limite
+global e um limite por host, para que o aumento de workers não sobrecarregue o site.
+"""
+import csv
+import json
+import logging
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger('MeuSistemaLogger')
+
+def load_accounts(path):
+    """
+    Lê o arquivo de credenciais.
+
+    Args:
+        path (str): Arquivo .json (lista de objetos com 'username' e 'password') ou .csv
+            (colunas username e password).
+
+    Returns:
+        list: Dicionários com 'username' e 'password', na ordem do arquivo.
+
+    Raises:
+        ValueError: Se o formato não for suportado, faltar o usuário ou a senha de uma
+            conta ou um usuário aparecer mais de uma vez.
+    """
+    with open(path, encoding='utf-8', newline='') as file:
+        if path.lower().endswith('.json'):
+            records = json.load(file)
+        elif path.lower().endswith('.csv'):
+            records = list(csv.DictReader(file))
+        else:
+            raise ValueError(f'Formato do arquivo de contas não suportado: {path}')
+
+    accounts = []
+    seen = set()
+    for position, record in enumerate(records, start=1):
+        username = (record.get('username') or '').strip()
+        password = record.get('password')
+        if not username or not password:
+            raise ValueError(f'Conta {position} do arquivo {path} sem usuário ou senha')
+        if username in seen:
+            raise ValueError(f'Conta {username} repetida no arquivo {path}')
+        seen.add(username)
+        accounts.append({'username': username, 'password': password})
+    return accounts
+
+class TokenBucket:
+    """
+    Token bucket: libera `rate` requisições por segundo, com rajadas de até `burst`.
+
+    Cada reserva consome um token, mesmo que o saldo fique negativo; o saldo negativo é o
+    tempo que a requisição (e as seguintes) ainda precisam esperar.
+    """
+    def __init__(self, rate, burst=1, now=None):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic() if now is None else now
+
+    def reserve(self, now):
+        """
+        Consome um token e retorna quantos segundos esperar até poder usá-lo.
+        """
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+class RateLimiter:
+    """
+    Limitador de requisições compartilhado entre threads, com um limite global e um por host.
+
+    Args:
+        rate (float): Requisições por segundo no total (0 desativa o limite global).
+        host_rate (float): Requisições por segundo para cada host (0 desativa).
+        burst (int): Requisições liberadas de uma vez antes de aplicar o limite.
+    """
+    def __init__(self, rate=0, host_rate=0, burst=1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.host_rate = host_rate
+        self.burst = max(1, burst)
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = threading.Lock()
+        self.global_bucket = TokenBucket(rate, self.burst, clock()) if rate > 0 else None
+        self.host_buckets = {}
+        self.requests = 0
+        self.waited = 0.0
+
+    def acquire(self, url):
+        """
+        Espera até que uma requisição para a URL possa ser feita.
+
+        Returns:
+            float: Segundos de espera.
+        """
+        host = urllib.parse.urlsplit(url).netloc
+        with self.lock:
+            now = self.clock()
+            delay = self.global_bucket.reserve(now) if self.global_bucket else 0.0
+            if self.host_rate > 0:
+                bucket = self.host_buckets.get(host)
+                if bucket is None:
+                    bucket = self.host_buckets[host] = TokenBucket(self.host_rate, self.burst, now)
+                delay = max(delay, bucket.reserve(now))
+            self.requests += 1
+            self.waited += delay
+        if delay > 0:
+            self.sleep(delay)
+        return delay
+
+def throttle(driver, limiter):
+    """
+    Faz com que cada driver.get do driver espere pelo limitador de requisições.
+
+    Sem limites configurados, as navegações são apenas contadas.
+
+    Returns:
+        O próprio driver, para permitir o uso como driver = throttle(create_driver(), limiter).
+    """
+    original_get = driver.get
+
+    def get(url):
+        limiter.acquire(url)
+        return original_get(url)
+
+    driver.get = get
+    return driver
+
+def run_accounts(accounts, run_account, workers=1):
+    """
+    Executa run_account para cada conta, com no máximo `workers` contas ao mesmo tempo.
+
+    Args:
+        accounts (list): Contas retornadas por load_accounts.
+        run_account (callable): Função que recebe a conta e retorna o resultado de cada
+            etapa, no formato de scheduler.run_steps.
+        workers (int): Quantidade máxima de contas em execução ao mesmo tempo.
+
+    Returns:
+        dict: Resultado das etapas por usuário, na ordem das contas. Uma conta cuja execução
+            falhou antes das etapas (ex.: o navegador não iniciou) tem uma etapa 'account'
+            com status 'failed'.
+    """
+    def run(account):
+        start = time.perf_counter()
+        try:
+            return run_account(account)
+        except Exception as e:
+            logger.error(f'Erro na execução da conta {account["username"]}: {e}')
+            return {'account': {'status': 'failed', 'duration': time.perf_counter() - start, 'error': str(e)}}
+
+    if not accounts:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(accounts)))) as executor:
+        results = list(executor.map(run, accounts))
+    return {account['username']: result for account, result in zip(accounts, results)}
+
+def account_run_rows(results, run_at):
+    """
+    Converte o resultado de run_accounts em linhas da tabela AccountRuns.
+
+    Returns:
+        list: Tuplas (account, step, status, duration, error, run_at).
+    """
+    return [
+        (username, step, result['status'], round(result['duration'], 3), result['error'], run_at)
+        for username, steps in results.items()
+        for step, result in steps.items()
+    ]
@@ -0,0 +1,131 @@
+"""
+Consultas aos livros gravados, pelos índices criados nas migrações do banco de dados:
+
+- por autor e por editora: Authors/Publishers (nome único) e IX_Books_AuthorId/IX_Books_PublisherId,
+  que já entregam os livros ordenados pelo título;
+- por prefixo do título: UX_Books_Title_Author, cujo título é a primeira coluna.
+
+iter_all_books percorre a tabela inteira em lotes (subcomando export-only).
+"""
+from book_writer import BOOK_COLUMNS
+
+# Colunas retornadas pelas consultas
+RESULT_COLUMNS = ('id',) + BOOK_COLUMNS
+
+_SELECT = ', '.join(f'Books.{column}' for column in RESULT_COLUMNS)
+
+QUERIES = {
+    'sqlserver': {
+        'author': f'''
+            SELECT TOP (?) {_SELECT} FROM Authors JOIN Books ON Books.author_id = Authors.id
+            WHERE Authors.name = ? ORDER BY Books.title
+        ''',
+        'publisher': f'''
+            SELECT TOP (?) {_SELECT} FROM Publishers JOIN Books ON Books.publisher_id = Publishers.id
+            WHERE Publishers.name = ? ORDER BY Books.title
+        ''',
+        # LIKE com prefixo fixo é convertido em uma busca por intervalo no índice
+        'title_prefix': f'''
+            SELECT TOP (?) {_SELECT} FROM Books WHERE Books.title LIKE ? ESCAPE '\\' ORDER BY Books.title
+        ''',
+    },
+    'sqlite': {
+        'author': f'''
+            SELECT {_SELECT} FROM Authors JOIN Books ON Books.author_id = Authors.id
+            WHERE Authors.name = ? ORDER BY Books.title LIMIT ?
+        ''',
+        'publisher': f'''
+            SELECT {_SELECT} FROM Publishers JOIN Books ON Books.publisher_id = Publishers.id
+            WHERE Publishers.name = ? ORDER BY Books.title LIMIT ?
+        ''',
+        # O LIKE do SQLite não usa o índice (não diferencia maiúsculas), por isso o prefixo vira um intervalo
+        'title_prefix': f'''
+            SELECT {_SELECT} FROM Books WHERE Books.title >= ? AND Books.title < ? ORDER BY Books.title LIMIT ?
+        ''',
+    },
+}
+
+# Todos os livros, na ordem de gravação (mesmo comando nos dois backends)
+ALL_BOOKS_SQL = f'SELECT {", ".join(BOOK_COLUMNS)} FROM Books ORDER BY id'
+
+def _run(backend, query, parameters, limit, connection):
+    """
+    Executa a consulta do backend e retorna os livros como dicionários.
+    """
+    if backend.name == 'sqlserver':
+        parameters = (limit,) + parameters
+    else:
+        parameters = parameters + (limit,)
+    conn = connection or backend.connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(QUERIES[backend.name][query], parameters)
+        books = [dict(zip(RESULT_COLUMNS, row)) for row in cursor.fetchall()]
+        cursor.close()
+        return books
+    finally:
+        if connection is None:
+            conn.close()
+
+def books_by_author(backend, author, limit=100, connection=None):
+    """
+    Retorna os livros do autor, ordenados pelo título.
+
+    Args:
+        backend (SQLServerBackend | SQLiteBackend): Backend de banco de dados.
+        author (str): Nome exato do autor.
+        limit (int): Quantidade máxima de livros.
+        connection (optional): Conexão já aberta. Se informada, não é fechada ao final.
+
+    Returns:
+        list: Dicionários com as colunas de RESULT_COLUMNS.
+    """
+    return _run(backend, 'author', (author,), limit, connection)
+
+def books_by_publisher(backend, publisher, limit=100, connection=None):
+    """
+    Retorna os livros da editora, ordenados pelo título (ver books_by_author).
+    """
+    return _run(backend, 'publisher', (publisher,), limit, connection)
+
+def search_titles(backend, prefix, limit=100, connection=None):
+    """
+    Retorna os livros cujo título começa com o prefixo (diferencia maiúsculas no SQLite;
+    no SQL Server segue a collation da coluna), ordenados pelo título.
+
+    Raises:
+        ValueError: Se o prefixo for vazio.
+    """
+    if not prefix:
+        raise ValueError('Prefixo do título vazio')
+    if backend.name == 'sqlserver':
+        escaped = prefix.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_').replace('[', '\\[')
+        return _run(backend, 'title_prefix', (escaped + '%',), limit, connection)
+    upper_bound = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return _run(backend, 'title_prefix', (prefix, upper_bound), limit, connection)
+
+def iter_all_books(backend, batch_size=1000, connection=None):
+    """
+    Gera todos os livros gravados em lotes, sem carregar a tabela inteira em memória.
+
+    Args:
+        backend (SQLServerBackend | SQLiteBackend): Backend de banco de dados.
+        batch_size (int): Livros por lote.
+        connection (optional): Conexão já aberta. Se informada, não é fechada ao final.
+
+    Yields:
+        list: Dicionários com as colunas de BOOK_COLUMNS.
+    """
+    conn = connection or backend.connect()
+    try:
+        cursor = conn.cursor()
+        cursor.execute(ALL_BOOKS_SQL)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            yield [dict(zip(BOOK_COLUMNS, row)) for row in rows]
+        cursor.close()
+    finally:
+        if connection is None:
+            conn.close()
@@ -0,0 +1,457 @@
+import os
+import sqlite3
+
+from migrations import ensure_schema
+
+# Colunas gravadas na tabela Books e chave natural usada no modo upsert. As colunas da capa
+# (hash do arquivo no cache de capas e dimensões) ficam vazias quando COVER_CACHE está desativado.
+# No modo upsert, uma imagem ou capa vazia (ex.: livros da API, que não informa a imagem)
+# mantém a já gravada.
+BOOK_COLUMNS = ('image', 'title', 'author', 'publisher', 'cover_hash', 'cover_width', 'cover_height')
+COVER_COLUMNS = ('cover_hash', 'cover_width', 'cover_height')
+NATURAL_KEY = ('title', 'author')
+
+# Colunas da tabela AccountRuns (resultado de cada etapa por conta, na execução para várias contas)
+ACCOUNT_RUN_COLUMNS = ('account', 'step', 'status', 'duration', 'error', 'run_at')
+
+# Modos de escrita: 'row' (um INSERT por livro), 'batch' (INSERTs em lotes) e 'upsert' (insere ou atualiza pela chave natural)
+WRITE_MODES = ('row', 'batch', 'upsert')
+
+class SQLServerBackend:
+    """
+    Backend de gravação no SQL Server via pyodbc, com fast_executemany nos lotes
+    e MERGE a partir de uma tabela temporária no modo upsert.
+    """
+    name = 'sqlserver'
+
+    create_table_sql = '''
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='Books' and xtype='U')
+        CREATE TABLE Books (
+            id INT IDENTITY(1,1) PRIMARY KEY,
+            image NVARCHAR(MAX),
+            title NVARCHAR(255),
+            author NVARCHAR(255),
+            publisher NVARCHAR(255),
+            cover_hash CHAR(64),
+            cover_width INT,
+            cover_height INT
+        )
+    '''
+
+    # Acrescenta as colunas da capa em tabelas criadas antes do cache de capas
+    add_cover_columns_sql = '''
+        IF COL_LENGTH('Books', 'cover_hash') IS NULL
+        ALTER TABLE Books ADD cover_hash CHAR(64), cover_width INT, cover_height INT
+    '''
+
+    create_staging_sql = '''
+        CREATE TABLE #BooksStaging (
+            image NVARCHAR(MAX),
+            title NVARCHAR(255),
+            author NVARCHAR(255),
+            publisher NVARCHAR(255),
+            cover_hash CHAR(64),
+            cover_width INT,
+            cover_height INT
+        )
+    '''
+
+    staging_table = '#BooksStaging'
+
+    # Inserção dos modos 'row' e 'batch': livros já gravados são ignorados pelo índice único
+    # da chave natural (IGNORE_DUP_KEY, migração 2)
+    append_sql = 'INSERT INTO Books ({columns}) VALUES ({placeholders})'
+
+    # Inserção dos lotes do modo 'batch' a partir da tabela temporária: apenas os livros novos
+    append_staging_sql = '''
+        INSERT INTO Books (image, title, author, publisher, cover_hash, cover_width, cover_height)
+        SELECT source.image, source.title, source.author, source.publisher,
+               source.cover_hash, source.cover_width, source.cover_height
+        FROM #BooksStaging AS source
+        WHERE NOT EXISTS (
+            SELECT 1 FROM Books WHERE Books.title = source.title AND Books.author = source.author
+        )
+    '''
+
+    merge_sql = '''
+        MERGE Books AS target
+        USING #BooksStaging AS source
+        ON target.title = source.title AND target.author = source.author
+        WHEN MATCHED AND (
+            EXISTS (SELECT target.publisher EXCEPT SELECT source.publisher)
+            OR (source.image IS NOT NULL AND EXISTS (SELECT target.image EXCEPT SELECT source.image))
+            OR (source.cover_hash IS NOT NULL AND EXISTS (
+                SELECT target.cover_hash, target.cover_width, target.cover_height
+                EXCEPT SELECT source.cover_hash, source.cover_width, source.cover_height
+            ))
+        ) THEN
+            UPDATE SET image = COALESCE(source.image, target.image), publisher = source.publisher,
+                publisher_id = CASE WHEN target.publisher = source.publisher THEN target.publisher_id END,
+                cover_hash = COALESCE(source.cover_hash, target.cover_hash),
+                cover_width = COALESCE(source.cover_width, target.cover_width),
+                cover_height = COALESCE(source.cover_height, target.cover_height)
+        WHEN NOT MATCHED THEN
+            INSERT (image, title, author, publisher, cover_hash, cover_width, cover_height)
+            VALUES (source.image, source.title, source.author, source.publisher,
+                    source.cover_hash, source.cover_width, source.cover_height);
+    '''
+
+    drop_staging_sql = 'DROP TABLE #BooksStaging'
+
+    # Associa os livros gravados sem autor ou editora normalizados às tabelas Authors e Publishers
+    # (autor vazio é um livro sem autor)
+    link_sql = [
+        '''
+        INSERT INTO Authors (name)
+        SELECT DISTINCT author FROM Books
+        WHERE author_id IS NULL AND author <> ''
+          AND NOT EXISTS (SELECT 1 FROM Authors WHERE Authors.name = Books.author)
+        ''',
+        'UPDATE Books SET author_id = Authors.id FROM Books JOIN Authors ON Authors.name = Books.author WHERE Books.author_id IS NULL',
+        '''
+        INSERT INTO Publishers (name)
+        SELECT DISTINCT publisher FROM Books
+        WHERE publisher_id IS NULL AND publisher IS NOT NULL
+          AND NOT EXISTS (SELECT 1 FROM Publishers WHERE Publishers.name = Books.publisher)
+        ''',
+        'UPDATE Books SET publisher_id = Publishers.id FROM Books JOIN Publishers ON Publishers.name = Books.publisher WHERE Books.publisher_id IS NULL',
+    ]
+
+    create_account_runs_sql = '''
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='AccountRuns' and xtype='U')
+        CREATE TABLE AccountRuns (
+            id INT IDENTITY(1,1) PRIMARY KEY,
+            account NVARCHAR(255),
+            step NVARCHAR(100),
+            status NVARCHAR(20),
+            duration FLOAT,
+            error NVARCHAR(MAX),
+            run_at DATETIME2
+        )
+    '''
+
+    def __init__(self, server, database, username, password):
+        self.server = server
+        self.database = database
+        self.username = username
+        self.password = password
+
+    def connect(self):
+        """
+        Abre uma conexão com o banco de dados SQL Server.
+        """
+        import pyodbc
+        return pyodbc.connect(
+            f'DRIVER={{ODBC Driver 18 for SQL Server}};'
+            f'SERVER={self.server};'
+            f'DATABASE={self.database};'
+            f'UID={self.username};'
+            f'PWD={self.password};'
+            'TrustServerCertificate=yes;'
+        )
+
+    def add_cover_columns(self, cursor):
+        """
+        Acrescenta as colunas da capa em tabelas criadas antes do cache de capas.
+        """
+        cursor.execute(self.add_cover_columns_sql)
+
+    def prepare_cursor(self, cursor):
+        """
+        Ativa o envio dos parâmetros de executemany em um único pacote.
+        """
+        cursor.fast_executemany = True
+
+    def merge(self, cursor):
+        """
+        Aplica a tabela temporária sobre Books, retornando a quantidade de linhas alteradas.
+        """
+        cursor.execute(self.merge_sql)
+        return cursor.rowcount
+
+    def append(self, cursor, sql, batches):
+        """
+        Insere os lotes, retornando a quantidade de livros inseridos.
+        """
+        # Com fast_executemany o pyodbc não informa o rowcount: cada lote vai para a tabela
+        # temporária e um único INSERT ... SELECT grava os livros novos, com o rowcount da inserção
+        placeholders = ', '.join('?' for _ in BOOK_COLUMNS)
+        cursor.execute(self.create_staging_sql)
+        try:
+            inserted = 0
+            for batch in batches:
+                cursor.executemany(f'INSERT INTO {self.staging_table} ({", ".join(BOOK_COLUMNS)}) VALUES ({placeholders})', batch)
+                cursor.execute(self.append_staging_sql)
+                inserted += max(cursor.rowcount, 0)
+                cursor.execute(f'TRUNCATE TABLE {self.staging_table}')
+            return inserted
+        finally:
+            cursor.execute(self.drop_staging_sql)
+
+class SQLiteBackend:
+    """
+    Backend de gravação em SQLite, usado em execuções locais e nos benchmarks.
+    """
+    name = 'sqlite'
+
+    create_table_sql = '''
+        CREATE TABLE IF NOT EXISTS Books (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            image TEXT,
+            title TEXT,
+            author TEXT,
+            publisher TEXT,
+            cover_hash TEXT,
+            cover_width INTEGER,
+            cover_height INTEGER
+        )
+    '''
+
+    create_staging_sql = '''
+        CREATE TEMP TABLE BooksStaging (
+            image TEXT,
+            title TEXT,
+            author TEXT,
+            publisher TEXT,
+            cover_hash TEXT,
+            cover_width INTEGER,
+            cover_height INTEGER,
+            PRIMARY KEY (title, author)
+        )
+    '''
+
+    staging_table = 'BooksStaging'
+
+    # Inserção dos modos 'row' e 'batch': livros já gravados (índice único da chave natural) são ignorados
+    append_sql = 'INSERT OR IGNORE INTO Books ({columns}) VALUES ({placeholders})'
+
+    update_sql = '''
+        UPDATE Books
+        SET image = COALESCE(source.image, Books.image), publisher = source.publisher,
+            publisher_id = CASE WHEN Books.publisher IS source.publisher THEN Books.publisher_id END,
+            cover_hash = COALESCE(source.cover_hash, Books.cover_hash),
+            cover_width = COALESCE(source.cover_width, Books.cover_width),
+            cover_height = COALESCE(source.cover_height, Books.cover_height)
+        FROM BooksStaging AS source
+        WHERE Books.title = source.title AND Books.author = source.author
+          AND (Books.publisher IS NOT source.publisher
+               OR (source.image IS NOT NULL AND Books.image IS NOT source.image)
+               OR (source.cover_hash IS NOT NULL AND (Books.cover_hash IS NOT source.cover_hash
+                   OR Books.cover_width IS NOT source.cover_width OR Books.cover_height IS NOT source.cover_height)))
+    '''
+
+    insert_sql = '''
+        INSERT INTO Books (image, title, author, publisher, cover_hash, cover_width, cover_height)
+        SELECT source.image, source.title, source.author, source.publisher,
+               source.cover_hash, source.cover_width, source.cover_height
+        FROM BooksStaging AS source
+        WHERE NOT EXISTS (
+            SELECT 1 FROM Books WHERE Books.title = source.title AND Books.author = source.author
+        )
+    '''
+
+    drop_staging_sql = 'DROP TABLE BooksStaging'
+
+    # Associa os livros gravados sem autor ou editora normalizados às tabelas Authors e Publishers
+    # (autor vazio é um livro sem autor)
+    link_sql = [
+        "INSERT OR IGNORE INTO Authors (name) SELECT DISTINCT author FROM Books WHERE author_id IS NULL AND author <> ''",
+        '''
+        UPDATE Books SET author_id = (SELECT id FROM Authors WHERE Authors.name = Books.author)
+        WHERE author_id IS NULL AND author <> ''
+        ''',
+        'INSERT OR IGNORE INTO Publishers (name) SELECT DISTINCT publisher FROM Books WHERE publisher_id IS NULL AND publisher IS NOT NULL',
+        '''
+        UPDATE Books SET publisher_id = (SELECT id FROM Publishers WHERE Publishers.name = Books.publisher)
+        WHERE publisher_id IS NULL AND publisher IS NOT NULL
+        ''',
+    ]
+
+    create_account_runs_sql = '''
+        CREATE TABLE IF NOT EXISTS AccountRuns (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            account TEXT,
+            step TEXT,
+            status TEXT,
+            duration REAL,
+            error TEXT,
+            run_at TEXT
+        )
+    '''
+
+    def __init__(self, path):
+        self.path = path
+
+    def connect(self):
+        """
+        Abre uma conexão com o arquivo SQLite.
+        """
+        return sqlite3.connect(self.path)
+
+    def add_cover_columns(self, cursor):
+        """
+        Acrescenta as colunas da capa em tabelas criadas antes do cache de capas.
+        """
+        cursor.execute('PRAGMA table_info(Books)')
+        existing = {row[1] for row in cursor.fetchall()}
+        types = {'cover_hash': 'TEXT', 'cover_width': 'INTEGER', 'cover_height': 'INTEGER'}
+        for column in COVER_COLUMNS:
+            if column not in existing:
+                cursor.execute(f'ALTER TABLE Books ADD COLUMN {column} {types[column]}')
+
+    def prepare_cursor(self, cursor):
+        """
+        O sqlite3 já executa executemany sem round trips, nada a configurar.
+        """
+
+    def merge(self, cursor):
+        """
+        Aplica a tabela temporária sobre Books, retornando a quantidade de linhas alteradas.
+        """
+        cursor.execute(self.update_sql)
+        changed = cursor.rowcount
+        cursor.execute(self.insert_sql)
+        return changed + cursor.rowcount
+
+    def append(self, cursor, sql, batches):
+        """
+        Insere os lotes com executemany, retornando a quantidade de livros inseridos.
+        """
+        # O sqlite3 soma o rowcount das execuções; linhas ignoradas pelo INSERT OR IGNORE não contam
+        inserted = 0
+        for batch in batches:
+            cursor.executemany(sql, batch)
+            inserted += cursor.rowcount
+        return inserted
+
+def create_backend(name, **settings):
+    """
+    Cria o backend de banco de dados pelo nome.
+
+    Args:
+        name (str): 'sqlserver' ou 'sqlite'.
+        **settings: Parâmetros do backend (server, database, username e password para
+            o SQL Server; path para o SQLite).
+
+    Returns:
+        SQLServerBackend | SQLiteBackend: Backend configurado.
+
+    Raises:
+        ValueError: Se o backend não for suportado.
+    """
+    if name == 'sqlserver':
+        return SQLServerBackend(settings.get('server'), settings.get('database'),
+                                settings.get('username'), settings.get('password'))
+    if name == 'sqlite':
+        return SQLiteBackend(settings.get('path') or os.path.join('data', 'books.db'))
+    raise ValueError(f'Backend de banco de dados não suportado: {name}')
+
+def book_rows(book_data):
+    """
+    Converte os dicionários de livros em tuplas na ordem de BOOK_COLUMNS. Título e autor
+    ausentes viram texto vazio: NULL não é igual a NULL nas comparações nem no índice único
+    da chave natural, e o livro seria gravado de novo a cada execução.
+    """
+    return [tuple('' if book.get(column) is None and column in NATURAL_KEY else book.get(column) for column in BOOK_COLUMNS)
+            for book in book_data]
+
+def unique_by_natural_key(rows):
+    """
+    Mantém apenas a última ocorrência de cada chave natural, preservando a ordem.
+    """
+    key_indexes = [BOOK_COLUMNS.index(column) for column in NATURAL_KEY]
+    unique = {}
+    for row in rows:
+        unique[tuple(row[index] for index in key_indexes)] = row
+    return list(unique.values())
+
+def batches(rows, batch_size):
+    """
+    Divide as linhas em lotes de até batch_size elementos.
+    """
+    for start in range(0, len(rows), batch_size):
+        yield rows[start:start + batch_size]
+
+def write_books(backend, book_data, mode='upsert', batch_size=500, connection=None):
+    """
+    Grava os livros na tabela Books, aplicando antes as migrações pendentes do banco de dados.
+
+    Nos modos 'row' e 'batch', livros já gravados (mesmo título e autor) são ignorados.
+
+    Args:
+        backend (SQLServerBackend | SQLiteBackend): Backend de banco de dados.
+        book_data (list): Lista de dicionários contendo os dados dos livros.
+        mode (str): 'row', 'batch' ou 'upsert'.
+        batch_size (int): Quantidade de linhas enviadas por executemany.
+        connection (optional): Conexão já aberta. Se informada, não é fechada ao final.
+
+    Returns:
+        int: Quantidade de linhas inseridas ou alteradas.
+
+    Raises:
+        ValueError: Se o modo de escrita não for suportado.
+    """
+    if mode not in WRITE_MODES:
+        raise ValueError(f'Modo de escrita não suportado: {mode}')
+
+    conn = connection or backend.connect()
+    try:
+        ensure_schema(backend, conn)
+        cursor = conn.cursor()
+        rows = book_rows(book_data)
+        placeholders = ', '.join('?' for _ in BOOK_COLUMNS)
+        columns = ', '.join(BOOK_COLUMNS)
+        append_sql = backend.append_sql.format(columns=columns, placeholders=placeholders)
+
+        # Livros já gravados são ignorados pela inserção e não contam como gravados
+        if mode == 'row':
+            written = 0
+            for row in rows:
+                cursor.execute(append_sql, row)
+                written += max(cursor.rowcount, 0)
+        elif mode == 'batch':
+            backend.prepare_cursor(cursor)
+            written = backend.append(cursor, append_sql, batches(rows, batch_size))
+        else:
+            cursor.execute(backend.create_staging_sql)
+            backend.prepare_cursor(cursor)
+            for batch in batches(unique_by_natural_key(rows), batch_size):
+                cursor.executemany(f'INSERT INTO {backend.staging_table} ({columns}) VALUES ({placeholders})', batch)
+            written = backend.merge(cursor)
+            cursor.execute(backend.drop_staging_sql)
+
+        for statement in backend.link_sql:
+            cursor.execute(statement)
+        conn.commit()
+        cursor.close()
+        return written
+    finally:
+        if connection is None:
+            conn.close()
+
+def write_account_runs(backend, rows, connection=None):
+    """
+    Grava o resultado das etapas de cada conta na tabela AccountRuns.
+
+    Args:
+        backend (SQLServerBackend | SQLiteBackend): Backend de banco de dados.
+        rows (list): Tuplas na ordem de ACCOUNT_RUN_COLUMNS (ver accounts.account_run_rows).
+        connection (optional): Conexão já aberta. Se informada, não é fechada ao final.
+
+    Returns:
+        int: Quantidade de linhas gravadas.
+    """
+    conn = connection or backend.connect()
+    try:
+        ensure_schema(backend, conn)
+        cursor = conn.cursor()
+        if rows:
+            backend.prepare_cursor(cursor)
+            placeholders = ', '.join('?' for _ in ACCOUNT_RUN_COLUMNS)
+            cursor.executemany(f'INSERT INTO AccountRuns ({", ".join(ACCOUNT_RUN_COLUMNS)}) VALUES ({placeholders})', rows)
+        conn.commit()
+        cursor.close()
+        return len(rows)
+    finally:
+        if connection is None:
+            conn.close()
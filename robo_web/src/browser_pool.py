@@ -0,0 +1,372 @@
+"""
+Pool de navegadores pré-iniciados para o robô web.
+
+O serviço mantém N instâncias headless do Chrome (com depuração remota) e um ChromeDriver
+para cada uma. Uma execução do robô pega uma sessão emprestada (lease), usa e a devolve
+(release) limpa, sem pagar a inicialização do Chrome e do ChromeDriver a cada execução.
+
+Uso:
+    python src/browser_pool.py serve [--size 2] [--address 127.0.0.1:6000]
+    python src/browser_pool.py status
+    python src/browser_pool.py shutdown
+
+Listener e Client trocam objetos serializados com pickle: o serviço só aceita conexões
+autenticadas com a chave de BROWSER_POOL_AUTHKEY ou, sem ela, com uma chave aleatória gerada
+pelo serve e gravada, legível apenas pelo usuário atual, em BROWSER_POOL_KEY_PATH.
+"""
+import argparse
+import json
+import logging
+import os
+import secrets
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.request
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+
+logger = logging.getLogger('MeuSistemaLogger')
+
+# Endereço do serviço e caminhos do Chrome e do ChromeDriver: lidos a cada chamada, pois o
+# serve carrega o .env depois da importação deste módulo
+def pool_address():
+    return os.getenv('BROWSER_POOL_ADDRESS', '127.0.0.1:6000')
+
+def pool_key_path():
+    return os.getenv('BROWSER_POOL_KEY_PATH', os.path.join('data', 'browser_pool.key'))
+
+class BrowserPoolError(Exception):
+    """
+    Erro na comunicação com o pool de navegadores ou ao iniciar uma sessão.
+    """
+
+def create_authkey(path):
+    """
+    Gera uma chave de autenticação aleatória e a grava em path, com permissão apenas para o usuário atual.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    authkey = secrets.token_hex(32)
+    temporary_path = f'{path}.tmp'
+    with open(os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w', encoding='utf-8') as file:
+        file.write(authkey)
+    os.replace(temporary_path, path)
+    return authkey.encode()
+
+def load_authkey():
+    """
+    Chave de autenticação do serviço: BROWSER_POOL_AUTHKEY ou a chave gravada pelo serve.
+
+    Raises:
+        BrowserPoolError: Se a chave não estiver configurada nem gravada.
+    """
+    authkey = os.getenv('BROWSER_POOL_AUTHKEY')
+    if authkey:
+        return authkey.encode()
+    try:
+        with open(pool_key_path(), encoding='utf-8') as file:
+            return file.read().strip().encode()
+    except OSError:
+        raise BrowserPoolError(f'Chave do pool de navegadores não encontrada em {pool_key_path()}; '
+                               'inicie o serviço (serve) ou configure BROWSER_POOL_AUTHKEY')
+
+def parse_address(address):
+    """
+    Converte 'host:porta' em uma tupla (host, porta).
+    """
+    host, port = address.rsplit(':', 1)
+    return host, int(port)
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def _find_chrome():
+    candidates = [os.getenv('CHROME_BINARY_PATH'), shutil.which('google-chrome'), shutil.which('chromium'),
+                  shutil.which('chrome'), r'C:\Program Files\Google\Chrome\Application\chrome.exe']
+    for candidate in candidates:
+        if candidate and os.path.exists(candidate):
+            return candidate
+    raise BrowserPoolError('Chrome não encontrado; configure CHROME_BINARY_PATH')
+
+class BrowserSlot:
+    """
+    Uma instância do Chrome com depuração remota e o ChromeDriver que a controla.
+    """
+    def __init__(self, index, profile_directory):
+        self.index = index
+        self.debugger_port = _free_port()
+        self.profile_directory = profile_directory
+        self.chrome = None
+        self.service = None
+
+    def start(self, timeout=30):
+        from selenium.webdriver.chrome.service import Service
+
+        self.chrome = subprocess.Popen(
+            [_find_chrome(), '--headless=new', f'--remote-debugging-port={self.debugger_port}',
+             f'--user-data-dir={self.profile_directory}', '--no-first-run',
+             '--no-default-browser-check', 'about:blank'],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                urllib.request.urlopen(f'http://127.0.0.1:{self.debugger_port}/json/version', timeout=1).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline or self.chrome.poll() is not None:
+                    raise BrowserPoolError(f'Chrome da sessão {self.index} não respondeu na porta {self.debugger_port}')
+                time.sleep(0.1)
+
+        # A sessão só conta como pronta (service definido) depois de o ChromeDriver iniciar
+        service = Service(os.getenv('CHROME_DRIVER_PATH') or shutil.which('chromedriver'))
+        service.start()
+        self.service = service
+
+    def describe(self):
+        return {
+            'slot': self.index,
+            'debugger_address': f'127.0.0.1:{self.debugger_port}',
+            'executor_url': self.service.service_url,
+        }
+
+    def stop(self):
+        if self.service:
+            self.service.stop()
+        if self.chrome and self.chrome.poll() is None:
+            self.chrome.terminate()
+            try:
+                self.chrome.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.chrome.kill()
+
+class BrowserPoolServer:
+    """
+    Serviço que mantém as sessões pré-iniciadas e atende pedidos de lease/release.
+
+    Sem authkey nem BROWSER_POOL_AUTHKEY, start gera uma chave aleatória em BROWSER_POOL_KEY_PATH,
+    removida pelo stop.
+    """
+    def __init__(self, size, address=None, authkey=None):
+        self.size = size
+        self.address = parse_address(address or pool_address())
+        self.authkey = authkey or (os.getenv('BROWSER_POOL_AUTHKEY') or '').encode()
+        self.key_path = None
+        self.directory = tempfile.mkdtemp(prefix='browser_pool_')
+        self.slots = []
+        self.free = []
+        self.condition = threading.Condition()
+        self.stopping = threading.Event()
+        self.listener = None
+
+    def start(self):
+        """
+        Inicia as instâncias do Chrome em paralelo e abre o endereço do serviço.
+        """
+        self.slots = [BrowserSlot(index, os.path.join(self.directory, f'profile-{index}')) for index in range(self.size)]
+        threads = [threading.Thread(target=self._start_slot, args=(slot,)) for slot in self.slots]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Sessões que falharam já foram encerradas por _start_slot
+        self.slots = [slot for slot in self.slots if slot.service is not None]
+        self.free = list(self.slots)
+        if not self.free:
+            raise BrowserPoolError('Nenhuma sessão do navegador pôde ser iniciada')
+        if not self.authkey:
+            self.key_path = pool_key_path()
+            self.authkey = create_authkey(self.key_path)
+            logger.info(f'Chave do pool de navegadores gravada em {self.key_path}')
+        self.listener = Listener(self.address, authkey=self.authkey)
+        logger.info(f'Pool de navegadores pronto com {len(self.free)} sessões em {self.address[0]}:{self.address[1]}')
+
+    def _start_slot(self, slot):
+        try:
+            slot.start()
+        except Exception as e:
+            logger.error(f'Falha ao iniciar a sessão {slot.index} do pool de navegadores: {e}')
+            slot.stop()
+
+    def serve_forever(self):
+        """
+        Atende conexões até receber o comando shutdown.
+        """
+        while not self.stopping.is_set():
+            try:
+                connection = self.listener.accept()
+            except AuthenticationError:
+                logger.warning('Conexão recusada pelo pool de navegadores: chave de autenticação inválida')
+                continue
+            except OSError:
+                break
+            threading.Thread(target=self._handle, args=(connection,), daemon=True).start()
+
+    def _lease(self, timeout):
+        with self.condition:
+            if not self.condition.wait_for(lambda: self.free, timeout=timeout):
+                return None
+            return self.free.pop(0)
+
+    def _release(self, slot):
+        with self.condition:
+            if slot not in self.free:
+                self.free.append(slot)
+                self.condition.notify()
+
+    def _handle(self, connection):
+        leased = {}
+        try:
+            while True:
+                try:
+                    command, *args = connection.recv()
+                except (EOFError, OSError):
+                    break
+                if command == 'lease':
+                    slot = self._lease(args[0] if args else None)
+                    if slot:
+                        leased[slot.index] = slot
+                    connection.send(slot.describe() if slot else None)
+                elif command == 'release':
+                    slot = leased.pop(args[0], None)
+                    if slot:
+                        self._release(slot)
+                    connection.send(True)
+                elif command == 'status':
+                    connection.send({'size': len(self.slots), 'free': len(self.free)})
+                elif command == 'shutdown':
+                    connection.send(True)
+                    self.stop()
+                    break
+        finally:
+            # Sessões de um cliente que se desconectou sem devolvê-las voltam para o pool
+            for slot in leased.values():
+                self._release(slot)
+            connection.close()
+
+    def stop(self):
+        self.stopping.set()
+        if self.listener:
+            self.listener.close()
+        for slot in self.slots:
+            slot.stop()
+        shutil.rmtree(self.directory, ignore_errors=True)
+        if self.key_path:
+            try:
+                os.remove(self.key_path)
+            except OSError:
+                pass
+            self.key_path = None
+
+class BrowserPoolClient:
+    """
+    Cliente do pool: pega sessões emprestadas como instâncias do WebDriver e as devolve limpas.
+    """
+    def __init__(self, address=None, authkey=None):
+        address = address or pool_address()
+        try:
+            self.connection = Client(parse_address(address), authkey=authkey or load_authkey())
+        except (OSError, AuthenticationError) as e:
+            raise BrowserPoolError(f'Pool de navegadores indisponível em {address}: {e}')
+        self.leases = {}
+
+    def _call(self, *message):
+        self.connection.send(message)
+        return self.connection.recv()
+
+    def lease(self, timeout=60, page_load_strategy='normal'):
+        """
+        Pega uma sessão emprestada e conecta um WebDriver a ela.
+
+        Args:
+            timeout (float): Tempo máximo de espera por uma sessão livre, em segundos.
+            page_load_strategy (str): 'normal', 'eager' ou 'none'.
+
+        Returns:
+            webdriver.Remote: WebDriver conectado ao Chrome já iniciado.
+
+        Raises:
+            BrowserPoolError: Se nenhuma sessão ficar livre dentro do tempo.
+        """
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
+        slot = self._call('lease', timeout)
+        if slot is None:
+            raise BrowserPoolError('Nenhuma sessão livre no pool de navegadores')
+        options = Options()
+        options.debugger_address = slot['debugger_address']
+        options.page_load_strategy = page_load_strategy
+        try:
+            driver = webdriver.Remote(command_executor=slot['executor_url'], options=options)
+        except Exception:
+            self._call('release', slot['slot'])
+            raise
+        self.leases[id(driver)] = slot['slot']
+        return driver
+
+    def release(self, driver):
+        """
+        Limpa a sessão (fecha abas extras e volta para about:blank) e a devolve ao pool.
+        Os cookies são mantidos para que o login possa ser reaproveitado.
+        """
+        slot = self.leases.pop(id(driver), None)
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.get('about:blank')
+        finally:
+            # Em sessões anexadas via debuggerAddress, o quit encerra apenas a sessão do ChromeDriver
+            driver.quit()
+            if slot is not None:
+                self._call('release', slot)
+
+    def status(self):
+        return self._call('status')
+
+    def shutdown(self):
+        return self._call('shutdown')
+
+    def close(self):
+        self.connection.close()
+
+def main():
+    from dotenv import load_dotenv # type: ignore
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('command', choices=['serve', 'status', 'shutdown'])
+    parser.add_argument('--size', type=int, default=int(os.getenv('BROWSER_POOL_SIZE', '2')), help='Quantidade de sessões')
+    parser.add_argument('--address', default=pool_address(), help='Endereço host:porta do serviço')
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+        server = BrowserPoolServer(args.size, args.address)
+        try:
+            server.start()
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.stop()
+    else:
+        client = BrowserPoolClient(args.address)
+        try:
+            result = client.status() if args.command == 'status' else client.shutdown()
+            print(json.dumps(result))
+        finally:
+            client.close()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,169 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from datetime import datetime
+
+class CheckpointStore:
+    """
+    Armazena, em um arquivo SQLite local, o progresso da coleta de páginas e o hash do
+    conteúdo de cada página, permitindo retomar uma coleta interrompida e pular páginas
+    que não mudaram desde a última execução.
+    """
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # A confirmação das páginas acontece nas threads dos consumidores do pipeline
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.connection:
+            self.connection.execute('''
+                CREATE TABLE IF NOT EXISTS crawl_runs (
+                    crawl TEXT PRIMARY KEY,
+                    run_id TEXT NOT NULL,
+                    finished INTEGER NOT NULL,
+                    updated_at TEXT NOT NULL
+                )
+            ''')
+            self.connection.execute('''
+                CREATE TABLE IF NOT EXISTS crawl_pages (
+                    crawl TEXT NOT NULL,
+                    page INTEGER NOT NULL,
+                    hash TEXT,
+                    run_id TEXT,
+                    updated_at TEXT NOT NULL,
+                    PRIMARY KEY (crawl, page)
+                )
+            ''')
+
+    def start(self, crawl):
+        """
+        Inicia uma coleta ou retoma a última, se ela não foi concluída.
+
+        Args:
+            crawl (str): Nome da coleta (ex.: 'books').
+
+        Returns:
+            tuple: Identificador da execução e página a partir da qual a coleta deve seguir.
+        """
+        with self.lock, self.connection:
+            row = self.connection.execute(
+                'SELECT run_id, finished FROM crawl_runs WHERE crawl = ?', (crawl,)
+            ).fetchone()
+            if row and not row[1]:
+                run_id = row[0]
+                confirmed = [page for (page,) in self.connection.execute(
+                    'SELECT page FROM crawl_pages WHERE crawl = ? AND run_id = ? ORDER BY page', (crawl, run_id)
+                )]
+                # A coleta segue da primeira página não confirmada na execução interrompida
+                resume_page = 1
+                for page in confirmed:
+                    if page != resume_page:
+                        break
+                    resume_page += 1
+                return run_id, resume_page
+
+            run_id = uuid.uuid4().hex
+            self.connection.execute(
+                'INSERT OR REPLACE INTO crawl_runs (crawl, run_id, finished, updated_at) VALUES (?, ?, 0, ?)',
+                (crawl, run_id, datetime.now().isoformat())
+            )
+            return run_id, 1
+
+    def page_hash(self, crawl, page):
+        """
+        Retorna o hash gravado para a página, ou None se ela ainda não foi coletada.
+        """
+        with self.lock:
+            row = self.connection.execute(
+                'SELECT hash FROM crawl_pages WHERE crawl = ? AND page = ?', (crawl, page)
+            ).fetchone()
+        return row[0] if row else None
+
+    def confirm_page(self, crawl, run_id, page, content_hash):
+        """
+        Marca a página como concluída na execução, gravando o hash do seu conteúdo.
+        """
+        with self.lock, self.connection:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO crawl_pages (crawl, page, hash, run_id, updated_at) VALUES (?, ?, ?, ?, ?)',
+                (crawl, page, content_hash, run_id, datetime.now().isoformat())
+            )
+
+    def finish(self, crawl, run_id, last_page=None):
+        """
+        Marca a execução como concluída. Páginas além de last_page (que deixaram de existir)
+        são removidas do armazenamento.
+        """
+        with self.lock, self.connection:
+            if last_page is not None:
+                self.connection.execute('DELETE FROM crawl_pages WHERE crawl = ? AND page > ?', (crawl, last_page))
+            self.connection.execute(
+                'UPDATE crawl_runs SET finished = 1, updated_at = ? WHERE crawl = ? AND run_id = ?',
+                (datetime.now().isoformat(), crawl, run_id)
+            )
+
+    def close(self):
+        self.connection.close()
+
+def page_content_hash(page_books):
+    """
+    Calcula o hash SHA-256 do conteúdo de uma página de livros.
+    """
+    payload = json.dumps(page_books, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class CheckpointedCrawl:
+    """
+    Coleta com checkpoint: marca cada página como alterada ou não, comparando o hash do
+    conteúdo com o da execução anterior, e confirma as páginas quando todos os destinos
+    terminaram de gravá-las (callback on_page_written do pipeline).
+
+    Attributes:
+        start_page (int): Página a partir da qual a coleta deve seguir (maior que 1 ao retomar).
+    """
+    def __init__(self, store, crawl='books'):
+        self.store = store
+        self.crawl = crawl
+        self.run_id, self.start_page = store.start(crawl)
+        self.pending = {}
+        self.last_page = None
+        self.skipped = 0
+
+    @property
+    def resumed(self):
+        return self.start_page > 1
+
+    def mark(self, pages):
+        """
+        Acrescenta a cada página produzida a indicação de conteúdo alterado.
+
+        Args:
+            pages (iterable): Gerador de tuplas (número da página, livros da página).
+
+        Yields:
+            tuple: Número da página, livros da página e se o conteúdo mudou.
+        """
+        for page, page_books in pages:
+            content_hash = page_content_hash(page_books)
+            changed = self.store.page_hash(self.crawl, page) != content_hash
+            if not changed:
+                self.skipped += 1
+            self.pending[page] = content_hash
+            self.last_page = page
+            yield page, page_books, changed
+
+    def page_written(self, page):
+        """
+        Confirma a página no checkpoint após a gravação em todos os destinos.
+        """
+        self.store.confirm_page(self.crawl, self.run_id, page, self.pending.pop(page))
+
+    def finish(self):
+        """
+        Conclui a execução, para que a próxima comece novamente da primeira página.
+        """
+        self.store.finish(self.crawl, self.run_id, self.last_page)
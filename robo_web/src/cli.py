@@ -0,0 +1,189 @@
+"""
+Linha de comando do robô web.
+
+Uso:
+    python src/cli.py run               # login, seções interact_* e coleta dos livros (padrão)
+    python src/cli.py collect-only      # apenas a coleta dos livros (banco de dados e exportação)
+    python src/cli.py export-only       # exporta os livros já gravados no banco, sem o navegador
+    python src/cli.py report [--runs N] # p50/p95 de cada etapa nas últimas N execuções (histórico de métricas)
+    python src/cli.py --dry-run run     # mostra o que seria executado, sem abrir o navegador nem o banco
+
+Os módulos pesados (Selenium e web_automation, drivers de banco de dados) só são importados
+pelos subcomandos que precisam deles; os diretórios e os handlers de log só são criados
+quando algo é de fato executado.
+"""
+import argparse
+import logging
+import os
+import sys
+
+# Pacote compartilhado entre os robôs (rpa_common, na raiz do repositório)
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT_DIRECTORY not in sys.path:
+    sys.path.insert(0, ROOT_DIRECTORY)
+
+# Etapas de cada subcomando que abre o navegador (nomes de web_automation.build_steps)
+RUN_STEPS = ['login', 'elements', 'forms', 'alerts_frames_windows', 'widgets', 'interactions', 'books']
+COLLECT_STEPS = ['books']
+
+logger = logging.getLogger('MeuSistemaLogger')
+
+def initialize(settings):
+    """
+    Cria os diretórios do robô e configura o log em arquivo (logs/rpa_log.jsonl ou
+    logs/rpa_log.log) e no console, escrito em segundo plano (rpa_common.setup_logging).
+    """
+    for directory in settings.directories:
+        os.makedirs(directory, exist_ok=True)
+
+    from rpa_common import setup_logging
+    return setup_logging(logger, os.path.join(settings.log_directory, 'rpa_log'), log_format=settings.LOG_FORMAT,
+                         max_chars=settings.LOG_MAX_CHARS, queue_size=settings.LOG_QUEUE_SIZE,
+                         sample_burst=settings.LOG_SAMPLE_BURST, sample_every=settings.LOG_SAMPLE_EVERY)
+
+def create_backend(settings):
+    from book_writer import create_backend
+    return create_backend(settings.DB_BACKEND, server=settings.SQL_SERVER, database=settings.SQL_DATABASE,
+                          username=settings.SQL_USERNAME, password=settings.SQL_PASSWORD, path=settings.SQLITE_PATH)
+
+def create_exporter(settings, append=False):
+    from exporters import create_exporter
+    return create_exporter(settings.EXPORT_FORMAT, settings.EXPORT_DIRECTORY, compression=settings.EXPORT_COMPRESSION,
+                           partitioned=settings.EXPORT_PARTITIONED, append=append)
+
+def describe_database(settings):
+    if settings.DB_BACKEND == 'sqlite':
+        return f'SQLite em {settings.SQLITE_PATH}'
+    return f'SQL Server {settings.SQL_SERVER}, banco {settings.SQL_DATABASE}'
+
+def dry_run(command, settings):
+    """
+    Mostra o que o subcomando executaria, sem abrir o navegador, o banco de dados nem criar arquivos.
+
+    Returns:
+        int: Código de saída (1 se a configuração for inválida).
+    """
+    from exporters import export_path, EXPORT_FORMATS, COMPRESSIONS
+
+    print(f'Subcomando {command} (simulação: nada será executado)')
+    if settings.EXPORT_FORMAT not in EXPORT_FORMATS or settings.EXPORT_COMPRESSION not in COMPRESSIONS:
+        print(f'Exportação inválida: EXPORT_FORMAT={settings.EXPORT_FORMAT}, EXPORT_COMPRESSION={settings.EXPORT_COMPRESSION}')
+        return 1
+    target = export_path(settings.EXPORT_DIRECTORY, settings.EXPORT_FORMAT, settings.EXPORT_COMPRESSION,
+                         settings.EXPORT_PARTITIONED)
+
+    if command == 'export-only':
+        print(f'Origem: tabela Books ({describe_database(settings)})')
+        print(f'Destino: {target}')
+        return 0
+
+    if command == 'run' and settings.ACCOUNTS_FILE:
+        from accounts import load_accounts
+        try:
+            accounts = load_accounts(settings.ACCOUNTS_FILE)
+        except (OSError, ValueError) as e:
+            print(f'Arquivo de contas inválido: {e}')
+            return 1
+        print(f'Contas: {len(accounts)} de {settings.ACCOUNTS_FILE}, {settings.ACCOUNT_WORKERS} navegadores headless')
+        print(f'Etapas por conta: login, {", ".join(settings.ACCOUNT_STEPS)}')
+        limits = f'{settings.RATE_LIMIT:g}/s no total, {settings.HOST_RATE_LIMIT:g}/s por host' if settings.RATE_LIMIT or settings.HOST_RATE_LIMIT else 'sem limite'
+        print(f'Navegações: {limits}')
+        print(f'Resultado das contas: tabela AccountRuns ({describe_database(settings)})')
+        return 0
+
+    steps = RUN_STEPS if command == 'run' else COLLECT_STEPS
+    workers = min(os.cpu_count() or 1, len(steps)) if settings.SECTION_WORKERS == 'auto' else int(settings.SECTION_WORKERS)
+    browser = 'sessão do pool de navegadores' if settings.BROWSER_POOL else 'Chrome'
+    print(f'Navegador: {browser} (carregamento {settings.PAGE_LOAD_STRATEGY}, {len(settings.BLOCKED_URL_PATTERNS)} padrões de URL bloqueados)')
+    print(f'Etapas: {", ".join(steps)} (até {workers} navegadores, fluxos {settings.FLOW_ENGINE})')
+    print(f'Site: {settings.DEMOQA_BASE_URL}')
+    print(f'Coleta dos livros: {settings.BOOK_COLLECTOR}, {settings.BOOK_COLLECTION_WORKERS} sessões'
+          + (', com checkpoint' if settings.CRAWL_CHECKPOINT else '') + (', com cache das capas' if settings.COVER_CACHE else ''))
+    print(f'Banco de dados: {describe_database(settings)}, modo {settings.DB_WRITE_MODE}')
+    print(f'Exportação: {target}')
+    print(f'Métricas: {settings.METRICS_TEXTFILE or "desativado"} (Prometheus), histórico {settings.RUN_HISTORY_PATH or "desativado"}')
+    return 0
+
+def export_only(settings):
+    """
+    Exporta os livros já gravados no banco de dados no formato configurado, sem o navegador.
+
+    Returns:
+        int: Código de saída (1 em caso de erro).
+    """
+    from book_queries import iter_all_books
+
+    try:
+        exporter = create_exporter(settings)
+        try:
+            for page_books in iter_all_books(create_backend(settings)):
+                exporter.write(page_books)
+        finally:
+            exporter.close()
+        logger.info(f'{exporter.rows} livros exportados para {exporter.path}')
+        return 0
+    except Exception as e:
+        logger.error(f'Erro ao exportar os livros do banco de dados: {e}')
+        return 1
+
+def report(settings, runs=None):
+    """
+    Mostra p50/p95 da duração de cada etapa nas últimas execuções, a partir do histórico de métricas.
+
+    Returns:
+        int: Código de saída.
+    """
+    from rpa_common.metrics import print_report
+    if not settings.RUN_HISTORY_PATH:
+        print('Histórico de execuções desativado (RUN_HISTORY_PATH vazio)')
+        return 1
+    return print_report(settings.RUN_HISTORY_PATH, 'web', runs or settings.METRICS_REPORT_RUNS)
+
+def build_parser():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--dry-run', action='store_true', help='Mostra o que seria executado, sem executar')
+    # --dry-run também é aceito depois do subcomando, sem sobrescrever o valor informado antes dele
+    options = argparse.ArgumentParser(add_help=False)
+    options.add_argument('--dry-run', action='store_true', default=argparse.SUPPRESS, help=argparse.SUPPRESS)
+
+    commands = parser.add_subparsers(dest='command')
+    commands.add_parser('run', parents=[options], help='Login, seções interact_* e coleta dos livros (padrão)')
+    commands.add_parser('collect-only', parents=[options], help='Apenas a coleta dos livros')
+    commands.add_parser('export-only', parents=[options], help='Exporta os livros já gravados no banco de dados')
+    report_parser = commands.add_parser('report', help='p50/p95 de cada etapa nas últimas execuções')
+    report_parser.add_argument('--runs', type=int, help='Execuções consideradas (padrão METRICS_REPORT_RUNS)')
+    return parser
+
+def main(argv=None):
+    """
+    Ponto de entrada da linha de comando.
+
+    Returns:
+        int: Código de saída (0 sem erros).
+    """
+    args = build_parser().parse_args(argv)
+    command = args.command or 'run'
+
+    # O .env é carregado antes de ler as configurações
+    from dotenv import load_dotenv # type: ignore
+    load_dotenv()
+    import settings
+
+    if command == 'report':
+        return report(settings, args.runs)
+
+    if args.dry_run:
+        return dry_run(command, settings)
+
+    pipeline = initialize(settings)
+    try:
+        if command == 'export-only':
+            return export_only(settings)
+
+        import web_automation
+        return 0 if web_automation.run_robot(None if command == 'run' else COLLECT_STEPS) else 1
+    finally:
+        pipeline.stop()
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,287 @@
+"""
+Cache das capas dos livros.
+
+As capas são baixadas em paralelo (asyncio, com um limite de conexões simultâneas) e
+gravadas uma única vez em disco, com o nome do arquivo igual ao hash SHA-256 do conteúdo:
+livros com a mesma capa compartilham o arquivo. O índice do cache guarda, por URL, o hash,
+as dimensões da imagem e os validadores HTTP (ETag e Last-Modified), de modo que nas
+execuções seguintes a capa só é baixada de novo se o servidor informar que ela mudou.
+Quando o cache passa do tamanho máximo, as capas usadas há mais tempo são removidas.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import struct
+import threading
+import time
+import urllib.error
+import urllib.request
+
+logger = logging.getLogger('MeuSistemaLogger')
+
+# Marcadores JPEG de início de quadro (SOF), que trazem as dimensões da imagem
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+def image_size(data):
+    """
+    Identifica o formato e as dimensões de uma imagem PNG, JPEG ou GIF pelo cabeçalho.
+
+    Args:
+        data (bytes): Conteúdo da imagem.
+
+    Returns:
+        tuple: Formato ('png', 'jpeg' ou 'gif'), largura e altura; (None, None, None) se o
+            formato não for reconhecido.
+    """
+    if data[:8] == b'\x89PNG\r\n\x1a\n' and data[12:16] == b'IHDR':
+        width, height = struct.unpack('>II', data[16:24])
+        return 'png', width, height
+    if data[:6] in (b'GIF87a', b'GIF89a') and len(data) >= 10:
+        width, height = struct.unpack('<HH', data[6:10])
+        return 'gif', width, height
+    if data[:2] == b'\xff\xd8':
+        position = 2
+        while position + 4 <= len(data):
+            if data[position] != 0xFF:
+                break
+            marker = data[position + 1]
+            if marker == 0xFF:
+                position += 1
+                continue
+            if marker == 0x01 or 0xD0 <= marker <= 0xD9:
+                position += 2
+                continue
+            length = struct.unpack('>H', data[position + 2:position + 4])[0]
+            if marker in JPEG_SOF_MARKERS and position + 9 <= len(data):
+                height, width = struct.unpack('>HH', data[position + 5:position + 9])
+                return 'jpeg', width, height
+            position += 2 + length
+    return None, None, None
+
+class CoverCache:
+    """
+    Cache das capas em disco, endereçado pelo conteúdo, com limite de tamanho (LRU).
+
+    Args:
+        directory (str): Diretório do cache. Os arquivos ficam em <hash[:2]>/<hash>.<formato>
+            e o índice em index.json.
+        max_bytes (int): Tamanho máximo das capas em disco.
+    """
+    def __init__(self, directory, max_bytes=200 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(directory, 'index.json')
+        self.lock = threading.Lock()
+        self.evicted = 0
+        try:
+            with open(self.index_path, encoding='utf-8') as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            index = {}
+        self.urls = index.get('urls', {})
+        self.files = index.get('files', {})
+
+    def path(self, content_hash):
+        """
+        Caminho do arquivo da capa com o hash informado.
+        """
+        extension = self.files[content_hash]['format'] or 'bin'
+        return os.path.join(self.directory, content_hash[:2], f'{content_hash}.{extension}')
+
+    def lookup(self, url):
+        """
+        Retorna a entrada da URL no cache, se o arquivo da capa ainda existir.
+
+        Returns:
+            dict: 'hash', 'width', 'height', 'etag' e 'last_modified', ou None.
+        """
+        with self.lock:
+            entry = self.urls.get(url)
+            if entry is None or entry['hash'] not in self.files or not os.path.exists(self.path(entry['hash'])):
+                return None
+            return dict(entry)
+
+    def touch(self, url):
+        """
+        Marca a capa da URL como usada agora (capa não alterada no servidor).
+        """
+        with self.lock:
+            entry = self.urls.get(url)
+            if entry and entry['hash'] in self.files:
+                self.files[entry['hash']]['used'] = time.time()
+
+    def store(self, url, data, etag=None, last_modified=None):
+        """
+        Grava a capa baixada, se o conteúdo ainda não estiver no cache, e associa a URL a ela.
+        A capa gravada não é removida nesta chamada, mesmo que sozinha passe do tamanho máximo:
+        o hash devolvido continua válido para lookup até a próxima gravação.
+
+        Returns:
+            dict: Entrada da URL no cache.
+        """
+        content_hash = hashlib.sha256(data).hexdigest()
+        image_format, width, height = image_size(data)
+        with self.lock:
+            if content_hash not in self.files:
+                self.files[content_hash] = {'format': image_format, 'size': len(data), 'width': width, 'height': height}
+                path = self.path(content_hash)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                temporary = f'{path}.{threading.get_ident()}.tmp'
+                with open(temporary, 'wb') as file:
+                    file.write(data)
+                os.replace(temporary, path)
+            self.files[content_hash]['used'] = time.time()
+            entry = {'hash': content_hash, 'width': width, 'height': height, 'etag': etag, 'last_modified': last_modified}
+            self.urls[url] = entry
+            self._evict(keep=content_hash)
+            return dict(entry)
+
+    def _evict(self, keep=None):
+        """
+        Remove as capas usadas há mais tempo até o cache voltar ao tamanho máximo, exceto a
+        capa keep.
+        """
+        total = sum(file['size'] for file in self.files.values())
+        for content_hash in sorted(self.files, key=lambda content_hash: self.files[content_hash].get('used', 0)):
+            if total <= self.max_bytes:
+                break
+            if content_hash == keep:
+                continue
+            try:
+                os.remove(self.path(content_hash))
+            except OSError:
+                pass
+            total -= self.files.pop(content_hash)['size']
+            self.evicted += 1
+        for url in [url for url, entry in self.urls.items() if entry['hash'] not in self.files]:
+            del self.urls[url]
+
+    def size(self):
+        """
+        Tamanho total das capas em disco, em bytes.
+        """
+        with self.lock:
+            return sum(file['size'] for file in self.files.values())
+
+    def save(self):
+        """
+        Grava o índice do cache.
+        """
+        with self.lock:
+            os.makedirs(self.directory, exist_ok=True)
+            temporary = f'{self.index_path}.tmp'
+            with open(temporary, 'w', encoding='utf-8') as file:
+                json.dump({'urls': self.urls, 'files': self.files}, file)
+            os.replace(temporary, self.index_path)
+
+def _download(url, headers, timeout):
+    """
+    Baixa a URL com os cabeçalhos condicionais informados.
+
+    Returns:
+        tuple: Status HTTP, conteúdo (None se 304), ETag e Last-Modified.
+    """
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            return response.status, response.read(), response.headers.get('ETag'), response.headers.get('Last-Modified')
+    except urllib.error.HTTPError as e:
+        if e.code == 304:
+            return 304, None, None, None
+        raise
+
+async def _fetch_cover(url, cache, semaphore, timeout, stats):
+    cached = cache.lookup(url)
+    headers = {}
+    if cached and cached.get('etag'):
+        headers['If-None-Match'] = cached['etag']
+    if cached and cached.get('last_modified'):
+        headers['If-Modified-Since'] = cached['last_modified']
+
+    async with semaphore:
+        status, data, etag, last_modified = await asyncio.to_thread(_download, url, headers, timeout)
+    if status == 304 and cached:
+        cache.touch(url)
+        stats['not_modified'] += 1
+        return cached
+    if data is None:
+        # 304 sem entrada no cache (arquivo removido entre a consulta e a resposta): baixa de novo
+        status, data, etag, last_modified = await asyncio.to_thread(_download, url, {}, timeout)
+    entry = await asyncio.to_thread(cache.store, url, data, etag, last_modified)
+    stats['downloaded'] += 1
+    stats['bytes'] += len(data)
+    return entry
+
+async def _fetch_all(urls, cache, concurrency, timeout, stats):
+    semaphore = asyncio.Semaphore(concurrency)
+    results = await asyncio.gather(*(_fetch_cover(url, cache, semaphore, timeout, stats) for url in urls),
+                                   return_exceptions=True)
+    return dict(zip(urls, results))
+
+def fetch_covers(urls, cache, concurrency=8, timeout=10):
+    """
+    Baixa as capas que não estão no cache ou que mudaram no servidor.
+
+    Args:
+        urls (iterable): URLs das capas (repetições são baixadas uma única vez).
+        cache (CoverCache): Cache das capas.
+        concurrency (int): Quantidade máxima de downloads simultâneos.
+        timeout (float): Tempo máximo de cada download, em segundos.
+
+    Returns:
+        tuple: Dicionário URL → entrada do cache (ou a exceção do download que falhou) e a
+            contagem de capas baixadas, não alteradas e de bytes baixados.
+    """
+    urls = list(dict.fromkeys(url for url in urls if url))
+    stats = {'downloaded': 0, 'not_modified': 0, 'bytes': 0}
+    if not urls:
+        return {}, stats
+    return asyncio.run(_fetch_all(urls, cache, concurrency, timeout, stats)), stats
+
+def attach_covers(page_books, cache, concurrency=8, timeout=10):
+    """
+    Baixa as capas dos livros e acrescenta a cada livro o hash e as dimensões da capa
+    (chaves cover_hash, cover_width e cover_height; None se a capa não pôde ser baixada).
+
+    Returns:
+        dict: Contagem de capas baixadas, não alteradas, de bytes baixados e de falhas.
+    """
+    results, stats = fetch_covers((book.get('image') for book in page_books), cache, concurrency, timeout)
+    stats['failed'] = 0
+    for book in page_books:
+        entry = results.get(book.get('image'))
+        if isinstance(entry, Exception):
+            logger.warning(f'Falha ao baixar a capa de {book.get("title")}: {entry}')
+            stats['failed'] += 1
+            entry = None
+        book['cover_hash'] = entry['hash'] if entry else None
+        book['cover_width'] = entry['width'] if entry else None
+        book['cover_height'] = entry['height'] if entry else None
+    return stats
+
+def with_covers(pages, cache, concurrency=8, timeout=10):
+    """
+    Etapa do pipeline de livros: acrescenta as capas aos livros de cada página coletada.
+
+    Args:
+        pages (iterable): Gerador de tuplas (número da página, livros da página).
+        cache (CoverCache): Cache das capas.
+        concurrency (int): Quantidade máxima de downloads simultâneos.
+        timeout (float): Tempo máximo de cada download, em segundos.
+
+    Yields:
+        tuple: Número da página e livros da página com as colunas da capa.
+    """
+    totals = {'downloaded': 0, 'not_modified': 0, 'bytes': 0, 'failed': 0}
+    try:
+        for page, page_books in pages:
+            for key, value in attach_covers(page_books, cache, concurrency, timeout).items():
+                totals[key] += value
+            yield page, page_books
+    finally:
+        cache.save()
+        logger.info(f'Capas dos livros: {totals["downloaded"]} baixadas ({totals["bytes"]} bytes), '
+                    f'{totals["not_modified"]} sem alteração, {totals["failed"]} falhas, '
+                    f'{cache.evicted} removidas do cache')
@@ -0,0 +1,242 @@
+"""
+Exportadores dos livros coletados, usados como destinos do pipeline de livros.
+
+Todos recebem os livros página a página (write) e gravam em streaming, sem manter o
+catálogo em memória:
+
+- 'csv': módulo csv da biblioteca padrão, com compressão opcional gzip ou zstd;
+- 'parquet': Parquet com codificação de dicionário nas colunas repetidas (autor, editora,
+  imagem), em grupos de linhas (requer pyarrow);
+- 'arrow': arquivo Arrow IPC com as mesmas colunas de dicionário (requer pyarrow).
+
+Com saída particionada, cada execução grava um novo arquivo em
+<diretório>/run_date=<AAAA-MM-DD>/, sem reescrever as exportações anteriores.
+"""
+import csv
+import gzip
+import os
+from datetime import datetime
+
+from book_writer import BOOK_COLUMNS
+
+EXPORT_FORMATS = ('csv', 'parquet', 'arrow')
+COMPRESSIONS = ('none', 'gzip', 'zstd')
+
+# Colunas com poucos valores distintos, gravadas com codificação de dicionário
+DICTIONARY_COLUMNS = ('image', 'author', 'publisher')
+
+# Colunas inteiras (as demais são texto)
+INTEGER_COLUMNS = ('cover_width', 'cover_height')
+
+FILE_EXTENSIONS = {'csv': '.csv', 'parquet': '.parquet', 'arrow': '.arrow'}
+COMPRESSION_EXTENSIONS = {'none': '', 'gzip': '.gz', 'zstd': '.zst'}
+
+class ExportError(Exception):
+    """
+    Formato, compressão ou dependência de exportação indisponível.
+    """
+
+def _zstd_open(path, mode):
+    """
+    Abre um arquivo zstd em modo texto, pelo módulo compression.zstd (Python 3.14+) ou pelo pacote zstandard.
+    """
+    try:
+        from compression import zstd
+        return zstd.open(path, mode + 't', encoding='utf-8', newline='')
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise ExportError('Compressão zstd indisponível: instale o pacote zstandard')
+    return zstandard.open(path, mode + 't', encoding='utf-8', newline='')
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        raise ExportError('Exportação em Parquet/Arrow indisponível: instale o pacote pyarrow')
+
+def _arrow_schema(pa):
+    fields = []
+    for column in BOOK_COLUMNS:
+        if column in DICTIONARY_COLUMNS:
+            fields.append(pa.field(column, pa.dictionary(pa.int32(), pa.string())))
+        elif column in INTEGER_COLUMNS:
+            fields.append(pa.field(column, pa.int32()))
+        else:
+            fields.append(pa.field(column, pa.string()))
+    return pa.schema(fields)
+
+class CsvExporter:
+    """
+    Grava os livros em CSV à medida que as páginas chegam.
+    Com append=True (coleta retomada), as linhas são acrescentadas ao arquivo existente.
+
+    Args:
+        path (str): Arquivo de saída.
+        compression (str): 'none', 'gzip' ou 'zstd'.
+        append (bool): Acrescenta ao arquivo existente em vez de reescrevê-lo.
+    """
+    name = 'csv'
+    changed_only = False
+
+    def __init__(self, path, compression='none', append=False):
+        if compression not in COMPRESSIONS:
+            raise ExportError(f'Compressão não suportada: {compression}')
+        self.path = path
+        self.compression = compression
+        self.append = append
+        self.file = None
+        self.writer = None
+        self.rows = 0
+
+    def _open(self, mode):
+        if self.compression == 'gzip':
+            return gzip.open(self.path, mode + 't', encoding='utf-8', newline='')
+        if self.compression == 'zstd':
+            return _zstd_open(self.path, mode)
+        return open(self.path, mode, newline='', encoding='utf-8')
+
+    def write(self, page_books):
+        if self.file is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Em gzip e zstd, acrescentar cria um novo bloco (member/frame) no mesmo arquivo
+            append = self.append and os.path.exists(self.path)
+            self.file = self._open('a' if append else 'w')
+            self.writer = csv.DictWriter(self.file, fieldnames=BOOK_COLUMNS, extrasaction='ignore')
+            if not append:
+                self.writer.writeheader()
+        self.writer.writerows(page_books)
+        self.rows += len(page_books)
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+class _ArrowExporter:
+    """
+    Base dos exportadores pyarrow: acumula até row_group_rows livros e grava cada grupo
+    como um lote com as colunas de dicionário.
+    """
+    changed_only = False
+
+    def __init__(self, path, row_group_rows=100000, append=False):
+        self.pa = _import_pyarrow()
+        self.schema = _arrow_schema(self.pa)
+        self.path = path
+        self.row_group_rows = row_group_rows
+        self.buffer = []
+        self.writer = None
+        self.rows = 0
+        if append and os.path.exists(path):
+            # Parquet e Arrow não aceitam acréscimos: a coleta retomada grava um arquivo ao lado
+            root, extension = os.path.splitext(path)
+            self.path = f'{root}-{datetime.now().strftime("%H%M%S")}{extension}'
+
+    def write(self, page_books):
+        self.buffer.extend(page_books)
+        self.rows += len(page_books)
+        if len(self.buffer) >= self.row_group_rows:
+            self._flush()
+
+    def _flush(self):
+        if not self.buffer:
+            return
+        pa = self.pa
+        arrays = []
+        for field in self.schema:
+            values = [book.get(field.name) for book in self.buffer]
+            if pa.types.is_dictionary(field.type):
+                arrays.append(pa.array(values, type=pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(values, type=field.type))
+        batch = pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+        if self.writer is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self.writer = self._open_writer()
+        self._write_batch(batch)
+        self.buffer = []
+
+    def close(self):
+        self._flush()
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+
+class ParquetExporter(_ArrowExporter):
+    """
+    Grava os livros em Parquet, um grupo de linhas a cada row_group_rows livros.
+    """
+    name = 'parquet'
+
+    def _open_writer(self):
+        import pyarrow.parquet
+        return pyarrow.parquet.ParquetWriter(self.path, self.schema, compression='zstd',
+                                             use_dictionary=list(DICTIONARY_COLUMNS))
+
+    def _write_batch(self, batch):
+        self.writer.write_batch(batch)
+
+class ArrowExporter(_ArrowExporter):
+    """
+    Grava os livros em um arquivo Arrow IPC, um lote a cada row_group_rows livros.
+    """
+    name = 'arrow'
+
+    def _open_writer(self):
+        return self.pa.ipc.new_file(self.path, self.schema)
+
+    def _write_batch(self, batch):
+        self.writer.write_batch(batch)
+
+def export_path(directory, export_format, compression='none', partitioned=False, run_date=None, basename='books'):
+    """
+    Monta o caminho do arquivo exportado.
+
+    Sem partição: <diretório>/books.csv (ou .parquet, .arrow, com .gz/.zst na compressão).
+    Com partição: <diretório>/run_date=<AAAA-MM-DD>/books-<HHMMSS>.<extensão>, um arquivo por execução.
+    """
+    extension = FILE_EXTENSIONS[export_format] + (COMPRESSION_EXTENSIONS[compression] if export_format == 'csv' else '')
+    if not partitioned:
+        return os.path.join(directory, basename + extension)
+    run_date = run_date or datetime.now()
+    return os.path.join(directory, f'run_date={run_date:%Y-%m-%d}', f'{basename}-{run_date:%H%M%S}{extension}')
+
+def create_exporter(export_format='csv', directory='data', compression='none', partitioned=False, append=False,
+                    run_date=None, row_group_rows=100000):
+    """
+    Cria o exportador configurado.
+
+    Args:
+        export_format (str): 'csv', 'parquet' ou 'arrow'.
+        directory (str): Diretório de saída.
+        compression (str): Compressão do CSV ('none', 'gzip' ou 'zstd').
+        partitioned (bool): Grava um novo arquivo por execução em run_date=<data>/.
+        append (bool): Continua a exportação anterior (coleta retomada).
+        run_date (datetime, optional): Data da execução usada na partição. Por padrão, agora.
+        row_group_rows (int): Livros por grupo de linhas (Parquet) ou lote (Arrow).
+
+    Returns:
+        CsvExporter | ParquetExporter | ArrowExporter: Destino do pipeline de livros.
+
+    Raises:
+        ExportError: Se o formato ou a compressão não forem suportados ou o pyarrow não
+            estiver instalado.
+    """
+    if export_format not in EXPORT_FORMATS:
+        raise ExportError(f'Formato de exportação não suportado: {export_format}')
+    if compression not in COMPRESSIONS:
+        raise ExportError(f'Compressão não suportada: {compression}')
+    path = export_path(directory, export_format, compression, partitioned, run_date)
+    if export_format == 'csv':
+        return CsvExporter(path, compression=compression, append=append)
+    if export_format == 'parquet':
+        return ParquetExporter(path, row_group_rows=row_group_rows, append=append)
+    return ArrowExporter(path, row_group_rows=row_group_rows, append=append)
@@ -0,0 +1,155 @@
+"""
+Preenchimento de formulários em lote.
+
+Os campos são descritos por um mapa declarativo (id → valor, com o tipo do campo quando não
+for texto) e aplicados em uma única chamada execute_script, que dispara os eventos input e
+change esperados pelo React. Somente os campos que dependem do teclado (react-select) ou
+que não aceitaram o valor pelo script são preenchidos com send_keys.
+"""
+import logging
+from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
+
+logger = logging.getLogger('MeuSistemaLogger')
+
+# Tipos preenchidos pelo script e tipos que exigem digitação
+SCRIPT_TYPES = ('text', 'select', 'radio', 'checkbox', 'datepicker')
+KEYSTROKE_TYPES = ('react-select',)
+
+# Função JavaScript que aplica os campos e retorna os que não ficaram com o valor esperado, como pares
+# [id, valor atual]. O valor é gravado pelo setter nativo do elemento, para que o React perceba a
+# alteração no evento input. Também é usada pelo executor de cenários (scenario.py).
+FILL_FUNCTION = """
+function fillFields(fields) {
+    const setters = {
+        INPUT: Object.getOwnPropertyDescriptor(HTMLInputElement.prototype, 'value').set,
+        TEXTAREA: Object.getOwnPropertyDescriptor(HTMLTextAreaElement.prototype, 'value').set,
+        SELECT: Object.getOwnPropertyDescriptor(HTMLSelectElement.prototype, 'value').set
+    };
+    const failed = [];
+    for (const [id, type, value] of fields) {
+        const element = document.getElementById(id);
+        if (!element) {
+            failed.push([id, null]);
+            continue;
+        }
+        if (type === 'radio' || type === 'checkbox') {
+            if (element.checked !== value) {
+                element.click();
+            }
+            if (element.checked !== value) {
+                failed.push([id, element.checked]);
+            }
+            continue;
+        }
+        setters[element.tagName].call(element, value);
+        element.dispatchEvent(new Event('input', {bubbles: true}));
+        element.dispatchEvent(new Event('change', {bubbles: true}));
+        if (type === 'datepicker') {
+            // Confirma a data digitada e fecha o calendário
+            element.dispatchEvent(new KeyboardEvent('keydown', {key: 'Enter', bubbles: true}));
+        }
+        if (element.value !== value) {
+            failed.push([id, element.value]);
+        }
+    }
+    return failed;
+}
+"""
+
+FILL_SCRIPT = FILL_FUNCTION + 'return fillFields(arguments[0]);'
+
+def normalize_fields(fields):
+    """
+    Converte o mapa de campos em uma lista de tuplas (id, tipo, valor).
+
+    Args:
+        fields (dict): Mapa id → valor. Valores simples são campos de texto; os demais são
+            dicionários com 'type' ('text', 'select', 'radio', 'checkbox', 'datepicker' ou
+            'react-select') e 'value' (para radio e checkbox, o padrão é True).
+
+    Returns:
+        list: Tuplas (id, tipo, valor) na ordem do mapa.
+
+    Raises:
+        ValueError: Se um campo tiver um tipo desconhecido.
+    """
+    normalized = []
+    for field_id, spec in fields.items():
+        if not isinstance(spec, dict):
+            spec = {'type': 'text', 'value': spec}
+        field_type = spec.get('type', 'text')
+        if field_type not in SCRIPT_TYPES + KEYSTROKE_TYPES:
+            raise ValueError(f'Tipo de campo desconhecido em {field_id}: {field_type}')
+        value = spec.get('value', True if field_type in ('radio', 'checkbox') else '')
+        normalized.append((field_id, field_type, value))
+    return normalized
+
+def type_into(driver, field_id, field_type, value):
+    """
+    Preenche um campo pelo teclado (react-select ou campo que não aceitou o valor pelo script).
+    """
+    element = driver.find_element(By.ID, field_id)
+    if field_type in KEYSTROKE_TYPES:
+        element.send_keys(value, Keys.RETURN)
+    else:
+        element.clear()
+        element.send_keys(value)
+
+def fill_form(driver, fields):
+    """
+    Preenche um formulário com o mínimo de chamadas ao ChromeDriver.
+
+    Os campos de texto, seleção, radio, checkbox e data são aplicados em uma única chamada
+    execute_script. Campos react-select são digitados em seguida, na ordem do mapa, assim
+    como os campos de texto ou data que não ficaram com o valor esperado.
+
+    Args:
+        driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+        fields (dict): Mapa de campos (ver normalize_fields).
+
+    Returns:
+        dict: Quantidade de campos preenchidos pelo script e pelo teclado.
+
+    Raises:
+        ValueError: Se um campo não existir ou um radio/checkbox não puder ser marcado.
+    """
+    normalized = normalize_fields(fields)
+    scripted = [field for field in normalized if field[1] in SCRIPT_TYPES]
+    failed = driver.execute_script(FILL_SCRIPT, [list(field) for field in scripted]) if scripted else []
+    retyped = retype_failed_fields(driver, scripted, failed)
+
+    typed = [field for field in normalized if field[1] in KEYSTROKE_TYPES]
+    for field_id, field_type, value in typed:
+        type_into(driver, field_id, field_type, value)
+    return {'script': len(scripted) - retyped, 'keystrokes': len(typed) + retyped}
+
+def retype_failed_fields(driver, scripted, failed):
+    """
+    Digita pelo teclado os campos que não aceitaram o valor pelo script.
+
+    Args:
+        driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+        scripted (list): Tuplas (id, tipo, valor) enviadas ao script.
+        failed (list): Pares [id, valor atual] retornados pelo script.
+
+    Returns:
+        int: Quantidade de campos digitados.
+
+    Raises:
+        ValueError: Se um campo não existir ou um radio/checkbox não puder ser marcado.
+    """
+    failed = dict(failed)
+    missing = [field_id for field_id, current in failed.items() if current is None]
+    unchecked = [field_id for field_id, field_type, _ in scripted
+                 if field_id in failed and field_type in ('radio', 'checkbox')]
+    if missing or unchecked:
+        raise ValueError(f'Campos não preenchidos pelo script: {missing + unchecked}')
+
+    retyped = 0
+    for field_id, field_type, value in scripted:
+        if field_id in failed:
+            logger.warning(f'Campo {field_id} não aceitou o valor pelo script, digitando pelo teclado')
+            type_into(driver, field_id, field_type, value)
+            retyped += 1
+    return retyped
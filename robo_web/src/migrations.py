@@ -0,0 +1,177 @@
+"""
+Migrações versionadas do banco de dados do robô web (SQL Server e SQLite).
+
+Cada migração tem um número de versão, uma descrição e os comandos de cada backend. As
+versões aplicadas ficam na tabela SchemaVersion; migrate aplica, em ordem e cada uma em
+sua própria transação, as migrações ainda não registradas. O SQLite é usado nas execuções
+locais e nos benchmarks.
+"""
+import logging
+from datetime import datetime
+
+logger = logging.getLogger('MeuSistemaLogger')
+
+SCHEMA_VERSION_SQL = {
+    'sqlserver': '''
+        IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='SchemaVersion' and xtype='U')
+        CREATE TABLE SchemaVersion (
+            version INT PRIMARY KEY,
+            description NVARCHAR(255),
+            applied_at DATETIME2
+        )
+    ''',
+    'sqlite': '''
+        CREATE TABLE IF NOT EXISTS SchemaVersion (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TEXT
+        )
+    ''',
+}
+
+def _create_books(cursor, backend):
+    """
+    Cria a tabela Books (ou acrescenta as colunas da capa em tabelas criadas antes do cache).
+    """
+    cursor.execute(backend.create_table_sql)
+    backend.add_cover_columns(cursor)
+
+# Migrações: (versão, descrição, comandos por backend). Os comandos são uma lista de SQL ou
+# uma função que recebe o cursor e o backend.
+MIGRATIONS = [
+    (1, 'Tabela Books', {'sqlserver': _create_books, 'sqlite': _create_books}),
+    (2, 'Chave natural única (title, author), mantendo o registro mais recente de cada livro', {
+        'sqlserver': [
+            '''
+            WITH ranked AS (
+                SELECT ROW_NUMBER() OVER (PARTITION BY title, author ORDER BY id DESC) AS position FROM Books
+            )
+            DELETE FROM ranked WHERE position > 1
+            ''',
+            '''
+            IF EXISTS (SELECT * FROM sys.indexes WHERE name='IX_Books_Title_Author' AND object_id=OBJECT_ID('Books'))
+            DROP INDEX IX_Books_Title_Author ON Books
+            ''',
+            # Com IGNORE_DUP_KEY, os modos 'row' e 'batch' ignoram livros já gravados em vez de falhar
+            'CREATE UNIQUE INDEX UX_Books_Title_Author ON Books (title, author) WITH (IGNORE_DUP_KEY = ON)',
+        ],
+        'sqlite': [
+            'DELETE FROM Books WHERE id NOT IN (SELECT MAX(id) FROM Books GROUP BY title, author)',
+            'DROP INDEX IF EXISTS IX_Books_Title_Author',
+            'CREATE UNIQUE INDEX UX_Books_Title_Author ON Books (title, author)',
+        ],
+    }),
+    (3, 'Tabelas Authors e Publishers, referenciadas por Books, e índices de autor e editora', {
+        'sqlserver': [
+            'CREATE TABLE Authors (id INT IDENTITY(1,1) PRIMARY KEY, name NVARCHAR(255) NOT NULL UNIQUE)',
+            'CREATE TABLE Publishers (id INT IDENTITY(1,1) PRIMARY KEY, name NVARCHAR(255) NOT NULL UNIQUE)',
+            'ALTER TABLE Books ADD author_id INT REFERENCES Authors (id), publisher_id INT REFERENCES Publishers (id)',
+            'INSERT INTO Authors (name) SELECT DISTINCT author FROM Books WHERE author IS NOT NULL',
+            'INSERT INTO Publishers (name) SELECT DISTINCT publisher FROM Books WHERE publisher IS NOT NULL',
+            'UPDATE Books SET author_id = Authors.id FROM Books JOIN Authors ON Authors.name = Books.author',
+            'UPDATE Books SET publisher_id = Publishers.id FROM Books JOIN Publishers ON Publishers.name = Books.publisher',
+            # O título acompanha o id para que as consultas por autor e editora já saiam ordenadas
+            'CREATE INDEX IX_Books_AuthorId ON Books (author_id, title)',
+            'CREATE INDEX IX_Books_PublisherId ON Books (publisher_id, title)',
+        ],
+        'sqlite': [
+            'CREATE TABLE Authors (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE)',
+            'CREATE TABLE Publishers (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL UNIQUE)',
+            'ALTER TABLE Books ADD COLUMN author_id INTEGER REFERENCES Authors (id)',
+            'ALTER TABLE Books ADD COLUMN publisher_id INTEGER REFERENCES Publishers (id)',
+            'INSERT INTO Authors (name) SELECT DISTINCT author FROM Books WHERE author IS NOT NULL',
+            'INSERT INTO Publishers (name) SELECT DISTINCT publisher FROM Books WHERE publisher IS NOT NULL',
+            'UPDATE Books SET author_id = (SELECT id FROM Authors WHERE Authors.name = Books.author)',
+            'UPDATE Books SET publisher_id = (SELECT id FROM Publishers WHERE Publishers.name = Books.publisher)',
+            'CREATE INDEX IX_Books_AuthorId ON Books (author_id, title)',
+            'CREATE INDEX IX_Books_PublisherId ON Books (publisher_id, title)',
+        ],
+    }),
+    (4, 'Tabela AccountRuns', {
+        'sqlserver': lambda cursor, backend: cursor.execute(backend.create_account_runs_sql),
+        'sqlite': lambda cursor, backend: cursor.execute(backend.create_account_runs_sql),
+    }),
+    (5, 'Título e autor vazios em vez de NULL na chave natural, mantendo o registro mais recente de cada livro', {
+        'sqlserver': [
+            '''
+            WITH ranked AS (
+                SELECT ROW_NUMBER() OVER (PARTITION BY COALESCE(title, N''), COALESCE(author, N'') ORDER BY id DESC) AS position
+                FROM Books
+            )
+            DELETE FROM ranked WHERE position > 1
+            ''',
+            "UPDATE Books SET title = COALESCE(title, N''), author = COALESCE(author, N'') WHERE title IS NULL OR author IS NULL",
+        ],
+        'sqlite': [
+            "DELETE FROM Books WHERE id NOT IN (SELECT MAX(id) FROM Books GROUP BY COALESCE(title, ''), COALESCE(author, ''))",
+            "UPDATE Books SET title = COALESCE(title, ''), author = COALESCE(author, '') WHERE title IS NULL OR author IS NULL",
+        ],
+    }),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def applied_versions(cursor, backend):
+    """
+    Retorna as versões já aplicadas, criando a tabela SchemaVersion se necessário.
+    """
+    cursor.execute(SCHEMA_VERSION_SQL[backend.name])
+    cursor.execute('SELECT version FROM SchemaVersion')
+    return {row[0] for row in cursor.fetchall()}
+
+def migrate(backend, connection=None, target=None):
+    """
+    Aplica as migrações pendentes até a versão indicada.
+
+    Args:
+        backend (SQLServerBackend | SQLiteBackend): Backend de banco de dados.
+        connection (optional): Conexão já aberta. Se informada, não é fechada ao final.
+        target (int, optional): Última versão aplicada. Por padrão, LATEST_VERSION.
+
+    Returns:
+        list: Versões aplicadas nesta chamada.
+    """
+    target = LATEST_VERSION if target is None else target
+    conn = connection or backend.connect()
+    try:
+        cursor = conn.cursor()
+        applied = applied_versions(cursor, backend)
+        conn.commit()
+        migrated = []
+        for version, description, commands in MIGRATIONS:
+            if version in applied or version > target:
+                continue
+            logger.info(f'Aplicando a migração {version} do banco de dados: {description}')
+            try:
+                if backend.name == 'sqlite':
+                    # O sqlite3 só abre a transação antes de INSERT, UPDATE e DELETE; com BEGIN explícito,
+                    # os comandos DDL da migração também são desfeitos em caso de erro
+                    cursor.execute('BEGIN')
+                statements = commands[backend.name]
+                if callable(statements):
+                    statements(cursor, backend)
+                else:
+                    for statement in statements:
+                        cursor.execute(statement)
+                cursor.execute('INSERT INTO SchemaVersion (version, description, applied_at) VALUES (?, ?, ?)',
+                               (version, description, datetime.now().isoformat(sep=' ', timespec='seconds')))
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            migrated.append(version)
+        cursor.close()
+        return migrated
+    finally:
+        if connection is None:
+            conn.close()
+
+def ensure_schema(backend, connection=None):
+    """
+    Aplica as migrações pendentes uma única vez por backend (as gravações seguintes não
+    consultam SchemaVersion novamente).
+    """
+    if getattr(backend, 'schema_version', None) == LATEST_VERSION:
+        return
+    migrate(backend, connection)
+    backend.schema_version = LATEST_VERSION
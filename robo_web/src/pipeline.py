@@ -0,0 +1,175 @@
+import queue
+import threading
+
+from book_writer import write_books
+
+# Marca de fim de fluxo enviada às filas dos consumidores
+_END = object()
+
+class PipelineError(Exception):
+    """
+    Erro em uma etapa do pipeline (produtor ou consumidor).
+
+    Attributes:
+        stage (str): Nome da etapa que falhou.
+        error (Exception): Exceção original.
+    """
+    def __init__(self, stage, error):
+        super().__init__(f'Falha na etapa {stage}: {error}')
+        self.stage = stage
+        self.error = error
+
+class DatabaseSink:
+    """
+    Consumidor que grava cada página de livros no banco de dados usando uma única conexão.
+    Páginas marcadas como não alteradas (coleta incremental) não são gravadas.
+    """
+    name = 'database'
+    changed_only = True
+
+    def __init__(self, backend, mode='upsert', batch_size=500):
+        self.backend = backend
+        self.mode = mode
+        self.batch_size = batch_size
+        self.connection = None
+        self.rows = 0
+
+    def write(self, page_books):
+        if self.connection is None:
+            self.connection = self.backend.connect()
+        self.rows += write_books(self.backend, page_books, mode=self.mode,
+                                 batch_size=self.batch_size, connection=self.connection)
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+class _PageTracker:
+    """
+    Conta quantos consumidores já processaram cada página e avisa quando todos terminaram.
+    """
+    def __init__(self, consumers, on_page_written):
+        self.consumers = consumers
+        self.on_page_written = on_page_written
+        self.pending = {}
+        self.lock = threading.Lock()
+
+    def done(self, page):
+        if self.on_page_written is None:
+            return
+        with self.lock:
+            count = self.pending.get(page, 0) + 1
+            if count < self.consumers:
+                self.pending[page] = count
+                return
+            self.pending.pop(page, None)
+            self.on_page_written(page)
+
+def _consume(sink, pages, failures, failed, tracker):
+    """
+    Laço de um consumidor: grava as páginas recebidas até a marca de fim.
+    Em caso de erro, registra a falha e sinaliza o produtor para parar.
+    """
+    try:
+        while True:
+            item = pages.get()
+            if item is _END:
+                break
+            page, page_books, changed = item
+            if changed or not getattr(sink, 'changed_only', False):
+                sink.write(page_books)
+            tracker.done(page)
+    except Exception as e:
+        failures.append(PipelineError(sink.name, e))
+        failed.set()
+    finally:
+        try:
+            sink.close()
+        except Exception as e:
+            failures.append(PipelineError(sink.name, e))
+            failed.set()
+
+def _put(pages, item, failed):
+    """
+    Coloca um item na fila, bloqueando enquanto ela estiver cheia (backpressure).
+
+    Returns:
+        bool: False se algum consumidor falhou enquanto o produtor esperava.
+    """
+    while not failed.is_set():
+        try:
+            pages.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def run_pipeline(pages, sinks, queue_size=4, on_page_written=None):
+    """
+    Distribui as páginas de um gerador para vários consumidores que rodam em paralelo.
+
+    Cada consumidor tem sua própria fila limitada a queue_size páginas. Quando uma fila
+    está cheia, o produtor espera (backpressure), então a memória usada fica limitada
+    a queue_size páginas por consumidor, independentemente do tamanho do catálogo.
+
+    Propagação de erros:
+        - Se um consumidor falhar, o produtor para de consumir o gerador; os demais
+          consumidores gravam as páginas que já receberam e são fechados.
+        - Se o produtor (gerador) falhar, os consumidores gravam as páginas recebidas
+          até aquele ponto e são fechados.
+        Em ambos os casos, ao final é lançado PipelineError com a primeira falha.
+
+    Args:
+        pages (iterable): Gerador de tuplas (número da página, livros da página) ou
+            (número da página, livros da página, alterada). Páginas não alteradas são
+            ignoradas pelos consumidores com changed_only = True.
+        sinks (list): Consumidores com os métodos write(page_books) e close().
+        queue_size (int): Quantidade máxima de páginas pendentes por consumidor.
+        on_page_written (callable, optional): Chamada com o número da página quando
+            todos os consumidores terminaram de processá-la.
+
+    Returns:
+        dict: Quantidade de páginas produzidas e de linhas gravadas por consumidor.
+
+    Raises:
+        PipelineError: Se o produtor ou algum consumidor falhar.
+    """
+    failures = []
+    failed = threading.Event()
+    tracker = _PageTracker(len(sinks), on_page_written)
+    queues = [queue.Queue(maxsize=queue_size) for _ in sinks]
+    threads = [
+        threading.Thread(target=_consume, args=(sink, pages_queue, failures, failed, tracker),
+                         name=f'pipeline-{sink.name}', daemon=True)
+        for sink, pages_queue in zip(sinks, queues)
+    ]
+    for thread in threads:
+        thread.start()
+
+    produced = 0
+    try:
+        for item in pages:
+            page, page_books, changed = item if len(item) == 3 else (item[0], item[1], True)
+            if not all(_put(pages_queue, (page, page_books, changed), failed) for pages_queue in queues):
+                break
+            produced += 1
+    except Exception as e:
+        failures.insert(0, PipelineError('producer', e))
+    finally:
+        for pages_queue, thread in zip(queues, threads):
+            # A marca de fim é enviada mesmo com a fila cheia de um consumidor que já terminou
+            while thread.is_alive():
+                try:
+                    pages_queue.put(_END, timeout=0.1)
+                    break
+                except queue.Full:
+                    continue
+        for thread in threads:
+            thread.join()
+
+    if failures:
+        raise failures[0]
+    stats = {'pages': produced}
+    stats.update({sink.name: sink.rows for sink in sinks})
+    return stats
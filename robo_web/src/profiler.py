@@ -0,0 +1,227 @@
+"""
+Profiler dos comandos enviados ao ChromeDriver.
+
+Cada comando do WebDriver (find_element, click, send_keys, execute_script, get...) é um
+round trip HTTP ao ChromeDriver. O profiler envolve o método execute do driver e registra
+cada comando com a latência, a etapa do robô que o enviou e os argumentos. Ao final da
+execução grava um resumo por etapa, a lista dos comandos mais lentos e um arquivo no
+formato Chrome Trace (abre em chrome://tracing, Perfetto ou speedscope).
+
+Desativado (padrão), nenhum driver é envolvido e as etapas não fazem nada.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+
+# Comandos cujo texto digitado não é gravado (pode conter senhas)
+REDACTED_COMMANDS = ('sendKeysToElement', 'sendKeysToActiveElement')
+
+# Tamanho máximo de cada argumento gravado
+MAX_ARGUMENT_LENGTH = 120
+
+def _shorten(value):
+    text = value if isinstance(value, str) else json.dumps(value, default=str, ensure_ascii=False)
+    return text if len(text) <= MAX_ARGUMENT_LENGTH else text[:MAX_ARGUMENT_LENGTH] + '...'
+
+def summarize_params(command, params):
+    """
+    Resume os argumentos de um comando para o relatório.
+
+    Args:
+        command (str): Nome do comando do WebDriver (ex.: 'findElement').
+        params (dict): Parâmetros enviados ao ChromeDriver.
+
+    Returns:
+        dict: Argumentos encurtados, com o texto digitado substituído pelo seu tamanho.
+    """
+    summary = {}
+    for name, value in (params or {}).items():
+        if name == 'sessionId':
+            continue
+        if command in REDACTED_COMMANDS and name in ('text', 'value'):
+            length = len(value) if name == 'text' else len(''.join(value))
+            summary[name] = f'<{length} caracteres>'
+        elif isinstance(value, dict) and 'element-6066-11e4-a52e-4f735466cecf' in value:
+            summary[name] = '<elemento>'
+        else:
+            summary[name] = _shorten(value)
+    return summary
+
+class CommandProfiler:
+    """
+    Registra os comandos dos drivers anexados, agrupados pelas etapas do robô.
+
+    A etapa atual é mantida por thread; threads que não abriram uma etapa (ex.: sessões da
+    coleta paralela) usam a última etapa aberta.
+    """
+    enabled = True
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.commands = []
+        self.steps = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.last_step = None
+
+    def attach(self, driver):
+        """
+        Envolve o método execute do driver para registrar cada comando.
+
+        Returns:
+            O próprio driver, para permitir o uso como driver = profiler.attach(create_driver()).
+        """
+        original_execute = driver.execute
+
+        def execute(driver_command, params=None):
+            start = time.perf_counter()
+            try:
+                return original_execute(driver_command, params)
+            finally:
+                self._record(driver_command, params, start, time.perf_counter())
+
+        driver.execute = execute
+        return driver
+
+    def _current_step(self):
+        return getattr(self.local, 'step', None) or self.last_step or 'sem etapa'
+
+    def _record(self, command, params, start, end):
+        record = {
+            'step': self._current_step(),
+            'command': command,
+            'args': summarize_params(command, params),
+            'start': start - self.origin,
+            'duration': end - start,
+            'thread': threading.get_ident(),
+        }
+        with self.lock:
+            self.commands.append(record)
+
+    @contextmanager
+    def step(self, name):
+        """
+        Marca os comandos enviados dentro do bloco como pertencentes à etapa.
+        """
+        previous = getattr(self.local, 'step', None)
+        self.local.step = name
+        self.last_step = name
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            self.local.step = previous
+            with self.lock:
+                self.steps.append({'step': name, 'start': start - self.origin,
+                                   'duration': end - start, 'thread': threading.get_ident()})
+
+    def summary(self):
+        """
+        Resume os comandos por etapa.
+
+        Returns:
+            dict: Para cada etapa, duração total, quantidade de comandos, tempo gasto em
+                comandos e a contagem e o tempo por tipo de comando.
+        """
+        result = {}
+        for step in self.steps:
+            entry = result.setdefault(step['step'], {'duration': 0.0, 'commands': 0, 'command_time': 0.0, 'by_command': {}})
+            entry['duration'] += step['duration']
+        for record in self.commands:
+            entry = result.setdefault(record['step'], {'duration': 0.0, 'commands': 0, 'command_time': 0.0, 'by_command': {}})
+            entry['commands'] += 1
+            entry['command_time'] += record['duration']
+            by_command = entry['by_command'].setdefault(record['command'], {'count': 0, 'time': 0.0})
+            by_command['count'] += 1
+            by_command['time'] += record['duration']
+        return result
+
+    def slowest(self, count=10):
+        """
+        Retorna os comandos mais lentos, do mais lento para o mais rápido.
+        """
+        return sorted(self.commands, key=lambda record: record['duration'], reverse=True)[:count]
+
+    def format_report(self, top=10):
+        """
+        Monta o relatório em texto com o resumo por etapa e os comandos mais lentos.
+        """
+        lines = [f'{"etapa":<24}{"duração (s)":>12}{"comandos":>10}{"em comandos (s)":>17}']
+        for name, entry in self.summary().items():
+            lines.append(f'{name:<24}{entry["duration"]:>12.3f}{entry["commands"]:>10}{entry["command_time"]:>17.3f}')
+            for command, stats in sorted(entry['by_command'].items(), key=lambda item: item[1]['time'], reverse=True):
+                lines.append(f'    {command:<32}{stats["count"]:>8}{stats["time"]:>12.3f}')
+        lines.append('')
+        lines.append(f'{top} comandos mais lentos:')
+        for record in self.slowest(top):
+            lines.append(f'{record["duration"] * 1000:>10.1f} ms  {record["step"]:<16}{record["command"]:<28}'
+                         f'{json.dumps(record["args"], ensure_ascii=False)}')
+        return '\n'.join(lines) + '\n'
+
+    def trace_events(self):
+        """
+        Converte as etapas e os comandos em eventos do formato Chrome Trace (microssegundos).
+        """
+        threads = {}
+        events = []
+        for kind, records in (('etapa', self.steps), ('comando', self.commands)):
+            for record in records:
+                tid = threads.setdefault(record['thread'], len(threads) + 1)
+                event = {
+                    'name': record['step'] if kind == 'etapa' else record['command'],
+                    'cat': kind,
+                    'ph': 'X',
+                    'ts': round(record['start'] * 1e6, 3),
+                    'dur': round(record['duration'] * 1e6, 3),
+                    'pid': 1,
+                    'tid': tid,
+                }
+                if kind == 'comando':
+                    event['args'] = dict(record['args'], step=record['step'])
+                events.append(event)
+        return events
+
+    def write(self, directory, top=10):
+        """
+        Grava o relatório em texto e o arquivo de trace no diretório.
+
+        Returns:
+            tuple: Caminhos do relatório e do arquivo de trace.
+        """
+        os.makedirs(directory, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+        report_path = os.path.join(directory, f'profile_{timestamp}.txt')
+        trace_path = os.path.join(directory, f'profile_{timestamp}.trace.json')
+        with self.lock:
+            report = self.format_report(top)
+            trace = {'traceEvents': self.trace_events(), 'displayTimeUnit': 'ms'}
+        with open(report_path, 'w', encoding='utf-8') as file:
+            file.write(report)
+        with open(trace_path, 'w', encoding='utf-8') as file:
+            json.dump(trace, file, ensure_ascii=False)
+        return report_path, trace_path
+
+class DisabledProfiler:
+    """
+    Profiler desativado: não envolve os drivers e não registra nada.
+    """
+    enabled = False
+
+    def attach(self, driver):
+        return driver
+
+    def step(self, name):
+        return nullcontext()
+
+    def write(self, directory, top=10):
+        return None
+
+def create_profiler(enabled):
+    """
+    Cria o profiler ativo ou o desativado.
+    """
+    return CommandProfiler() if enabled else DisabledProfiler()
@@ -0,0 +1,535 @@
+"""
+Motor de cenários do robô web.
+
+Um cenário (arquivo JSON, ou YAML se o PyYAML estiver instalado) descreve os passos de um
+fluxo: navigate, wait_for, fill, click, scroll, drag, switch_window, close_window, extract e
+log. Antes da execução, o cenário é compilado em um plano otimizado:
+
+    - os localizadores são convertidos uma única vez para o formato do Selenium e do navegador;
+    - esperas redundantes são removidas (ex.: esperar o elemento antes de clicar nele, pois o
+      clique já espera o elemento ficar clicável, ou conferir o valor de um campo preenchido
+      pelo script, que já confere o valor gravado);
+    - operações de DOM vizinhas (esperas, cliques, rolagens, preenchimentos e extrações) são
+      unidas em um único execute_async_script, que faz as esperas dentro do navegador.
+
+Passos que dependem do ChromeDriver (navegação, digitação em react-select, arrastar e soltar,
+troca de janelas) continuam sendo comandos próprios e separam os lotes de script.
+"""
+import functools
+import json
+import logging
+import os
+import time
+import uuid
+from selenium.webdriver.common.by import By
+from selenium.webdriver import ActionChains
+from selenium.common.exceptions import WebDriverException
+
+import waits
+from waits import wait_for
+from form_fill import FILL_FUNCTION, SCRIPT_TYPES, KEYSTROKE_TYPES, normalize_fields, type_into, retype_failed_fields
+
+logger = logging.getLogger('MeuSistemaLogger')
+
+# Localizadores aceitos nos cenários e o equivalente no Selenium
+LOCATOR_STRATEGIES = {'id': By.ID, 'css': By.CSS_SELECTOR, 'xpath': By.XPATH}
+
+# Condições de espera resolvidas dentro do navegador
+PAGE_CONDITIONS = ('present', 'visible', 'invisible', 'clickable', 'selected', 'value', 'text', 'url', 'collapse', 'settled')
+
+# Condições implícitas: esperar a da esquerda garante as da direita
+IMPLIED_CONDITIONS = {
+    'clickable': ('clickable', 'visible', 'present'),
+    'visible': ('visible', 'present'),
+    'present': ('present',),
+}
+
+# Erros do ChromeDriver quando a página é trocada durante um lote; o lote é retomado na nova página
+NAVIGATION_ERRORS = ('unloaded', 'context was destroyed', 'detached', 'navigated')
+
+# Executor dos lotes de ações no navegador. O progresso é guardado no sessionStorage para que,
+# se um clique trocar a página no meio do lote, a nova chamada continue da ação seguinte.
+RUNNER_SCRIPT = FILL_FUNCTION + """
+const [token, actions, timeoutMs, pollMs] = arguments;
+const done = arguments[arguments.length - 1];
+let progress = {executed: 0, extracted: {}};
+try {
+    const saved = JSON.parse(sessionStorage.getItem('robo-scenario') || 'null');
+    if (saved && saved.token === token) {
+        progress = saved;
+    }
+} catch (error) {}
+
+function save() {
+    try {
+        sessionStorage.setItem('robo-scenario', JSON.stringify(Object.assign({token: token}, progress)));
+    } catch (error) {}
+}
+function find(locator) {
+    const [using, value] = locator;
+    if (using === 'id') {
+        return document.getElementById(value);
+    }
+    if (using === 'css') {
+        return document.querySelector(value);
+    }
+    return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+function findAll(locator) {
+    const [using, value] = locator;
+    if (using === 'id') {
+        const element = document.getElementById(value);
+        return element ? [element] : [];
+    }
+    if (using === 'css') {
+        return Array.from(document.querySelectorAll(value));
+    }
+    const result = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    const elements = [];
+    for (let index = 0; index < result.snapshotLength; index++) {
+        elements.push(result.snapshotItem(index));
+    }
+    return elements;
+}
+function isVisible(element) {
+    if (!element || !element.getClientRects().length) {
+        return false;
+    }
+    const style = getComputedStyle(element);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+}
+function condition(action) {
+    const locator = action.locator;
+    switch (action.kind) {
+        case 'present': return () => find(locator);
+        case 'visible': return () => isVisible(find(locator));
+        case 'invisible': return () => !isVisible(find(locator));
+        case 'clickable': return () => { const element = find(locator); return isVisible(element) && !element.disabled; };
+        case 'selected': return () => { const element = find(locator); return element && (element.checked || element.selected); };
+        case 'value': return () => { const element = find(locator); return element && element.value === action.value; };
+        case 'text': return () => findAll(locator).some(element => element.textContent.includes(action.value));
+        case 'url': return () => location.href.includes(action.value);
+        case 'fields': return () => action.value.every(id => document.getElementById(id));
+        case 'collapse': return () => {
+            const content = find(locator) && find(locator).nextElementSibling;
+            return content && !content.classList.contains('collapsing') && content.classList.contains('show') === action.value;
+        };
+        case 'settled': {
+            let previous = null;
+            return () => {
+                const current = JSON.stringify(findAll(locator).map(element => element.textContent));
+                const settled = current === previous;
+                previous = current;
+                return settled;
+            };
+        }
+    }
+    throw new Error('Condição desconhecida: ' + action.kind);
+}
+function waitUntil(check, description) {
+    return new Promise((resolve, reject) => {
+        const deadline = Date.now() + timeoutMs;
+        (function poll() {
+            let satisfied = false;
+            try {
+                satisfied = check();
+            } catch (error) {}
+            if (satisfied) {
+                resolve();
+            } else if (Date.now() > deadline) {
+                reject(new Error('Tempo esgotado esperando: ' + description));
+            } else {
+                setTimeout(poll, pollMs);
+            }
+        })();
+    });
+}
+async function run() {
+    for (let index = progress.executed; index < actions.length; index++) {
+        const action = actions[index];
+        if (action.op === 'wait') {
+            await waitUntil(condition(action), action.description);
+        } else if (action.op === 'click') {
+            await waitUntil(condition({kind: 'clickable', locator: action.locator}), action.description);
+            const element = find(action.locator);
+            element.scrollIntoView({block: 'center'});
+            element.click();
+        } else if (action.op === 'scroll') {
+            await waitUntil(condition({kind: 'present', locator: action.locator}), action.description);
+            find(action.locator).scrollIntoView(true);
+        } else if (action.op === 'fill') {
+            await waitUntil(condition({kind: 'fields', value: action.fields.map(field => field[0])}), action.description);
+            const failed = fillFields(action.fields);
+            if (failed.length) {
+                return {executed: index, failed: failed, extracted: progress.extracted};
+            }
+        } else if (action.op === 'extract') {
+            await waitUntil(condition({kind: 'present', locator: action.locator}), action.description);
+            const element = find(action.locator);
+            progress.extracted[action.name] = action.attribute in element ? element[action.attribute] : element.getAttribute(action.attribute);
+        }
+        progress.executed = index + 1;
+        save();
+    }
+    return {executed: actions.length, extracted: progress.extracted};
+}
+run().then(done, error => done({executed: progress.executed, error: error.message, extracted: progress.extracted}));
+"""
+
+class ScenarioError(Exception):
+    """
+    Erro ao carregar, compilar ou executar um cenário.
+
+    Attributes:
+        scenario (str): Nome do cenário.
+        step (str): Descrição do passo que falhou, se houver.
+    """
+    def __init__(self, scenario, message, step=None):
+        super().__init__(f'Cenário {scenario}: {message}' + (f' (passo: {step})' if step else ''))
+        self.scenario = scenario
+        self.step = step
+
+class Plan:
+    """
+    Plano de execução compilado de um cenário.
+
+    Attributes:
+        name (str): Nome do cenário.
+        ops (list): Operações na ordem de execução. Cada operação é um dicionário com a chave
+            'kind' ('script', 'navigate', 'keys', 'drag', 'switch_window', 'close_window',
+            'wait_windows' ou 'log').
+        stats (dict): Quantidade de passos, de operações, de lotes de script e de esperas removidas.
+    """
+    def __init__(self, name, ops, stats):
+        self.name = name
+        self.ops = ops
+        self.stats = stats
+
+def load_scenario(path):
+    """
+    Lê um arquivo de cenário em JSON ou YAML.
+
+    Returns:
+        dict: Cenário com as chaves 'name' e 'steps'.
+    """
+    with open(path, encoding='utf-8') as file:
+        if path.endswith(('.yaml', '.yml')):
+            try:
+                import yaml
+            except ImportError:
+                raise ScenarioError(os.path.basename(path), 'cenários em YAML exigem o pacote PyYAML')
+            scenario = yaml.safe_load(file)
+        else:
+            scenario = json.load(file)
+    scenario.setdefault('name', os.path.splitext(os.path.basename(path))[0])
+    return scenario
+
+def compile_locator(scenario, spec):
+    """
+    Converte um localizador do cenário ({'id': ...}, {'css': ...} ou {'xpath': ...}) em uma tupla (estratégia, valor).
+    """
+    if not isinstance(spec, dict) or len(spec) != 1 or next(iter(spec)) not in LOCATOR_STRATEGIES:
+        raise ScenarioError(scenario, f'localizador inválido: {spec}')
+    return next(iter(spec.items()))
+
+def _describe(step, default):
+    return step.get('description') or default
+
+def _expand_step(name, step):
+    """
+    Converte um passo do cenário em ações do navegador ('page') e operações do ChromeDriver ('driver').
+    """
+    if 'navigate' in step:
+        return [('driver', {'kind': 'navigate', 'url': step['navigate']})]
+    if 'log' in step:
+        return [('log', {'kind': 'log', 'message': step['log']})]
+    if 'click' in step:
+        locator = compile_locator(name, step['click'])
+        return [('page', {'op': 'click', 'locator': locator, 'description': _describe(step, f'clique em {locator[1]}')})]
+    if 'scroll' in step:
+        locator = compile_locator(name, step['scroll'])
+        return [('page', {'op': 'scroll', 'locator': locator, 'description': _describe(step, f'rolagem até {locator[1]}')})]
+    if 'extract' in step:
+        locator = compile_locator(name, step['extract'])
+        return [('page', {'op': 'extract', 'locator': locator, 'name': step.get('name', locator[1]),
+                          'attribute': step.get('attribute', 'textContent'),
+                          'description': _describe(step, f'extração de {locator[1]}')})]
+    if 'fill' in step:
+        try:
+            fields = normalize_fields(step['fill'])
+        except ValueError as e:
+            raise ScenarioError(name, str(e))
+        items = []
+        scripted = [list(field) for field in fields if field[1] in SCRIPT_TYPES]
+        typed = [field for field in fields if field[1] in KEYSTROKE_TYPES]
+        if scripted:
+            items.append(('page', {'op': 'fill', 'fields': scripted,
+                                   'description': _describe(step, 'campos ' + ', '.join(field[0] for field in scripted))}))
+        if typed:
+            items.append(('driver', {'kind': 'keys', 'fields': typed}))
+        return items
+    if 'drag' in step:
+        return [('driver', {'kind': 'drag', 'locator': compile_locator(name, step['drag']),
+                            'moves': [{'from': step['from'], 'to': step['to'], 'settle': []}]})]
+    if 'switch_window' in step:
+        return [('driver', {'kind': 'switch_window', 'index': step['switch_window']})]
+    if 'close_window' in step:
+        return [('driver', {'kind': 'close_window'})]
+    if 'wait_for' in step:
+        kind = step['wait_for']
+        if kind == 'windows':
+            return [('driver', {'kind': 'wait_windows', 'count': step['count'],
+                                'description': _describe(step, f'{step["count"]} janelas abertas')})]
+        if kind not in PAGE_CONDITIONS:
+            raise ScenarioError(name, f'condição de espera desconhecida: {kind}')
+        action = {'op': 'wait', 'kind': kind, 'locator': None, 'value': None}
+        if kind != 'url':
+            action['locator'] = compile_locator(name, step['locator'])
+        if kind == 'value':
+            action['value'] = step['equals']
+        elif kind in ('text', 'url'):
+            action['value'] = step['contains']
+        elif kind == 'collapse':
+            action['value'] = step['expanded']
+        target = action['value'] if kind == 'url' else action['locator'][1]
+        action['description'] = _describe(step, f'{kind} {target}')
+        return [('page', action)]
+    raise ScenarioError(name, f'passo desconhecido: {step}')
+
+def _targets(action):
+    """
+    Localizadores dos elementos usados por uma ação do navegador (que ela mesma espera existir).
+    """
+    if action['op'] == 'fill':
+        return {('id', field[0]) for field in action['fields']}
+    if action['op'] in ('click', 'scroll', 'extract'):
+        return {action['locator']}
+    return set()
+
+def _is_redundant(items, index, filled):
+    """
+    Indica se a espera na posição index é redundante.
+    """
+    action = items[index][1]
+    kind, locator = action['kind'], action['locator']
+
+    # O valor gravado pelo script de preenchimento (ou a marcação de radio e checkbox) já é conferido por ele
+    if kind == 'value' and locator in filled and filled[locator] == action['value']:
+        return True
+    if kind == 'selected' and filled.get(locator) is True:
+        return True
+
+    neighbours = [items[position] for position in range(len(items)) if items[position][0] != 'log' or position == index]
+    position = next(position for position, item in enumerate(neighbours) if item is items[index])
+    previous = neighbours[position - 1][1] if position > 0 and neighbours[position - 1][0] == 'page' else None
+    following = neighbours[position + 1][1] if position + 1 < len(neighbours) and neighbours[position + 1][0] == 'page' else None
+
+    # A espera anterior pelo mesmo elemento já garante esta condição
+    if previous and previous['op'] == 'wait' and previous['locator'] == locator:
+        if previous['kind'] == kind and previous['value'] == action['value'] and kind != 'settled':
+            return True
+        if kind in IMPLIED_CONDITIONS.get(previous['kind'], ()):
+            return True
+
+    # A próxima ação espera o próprio elemento (o clique espera ele ficar clicável)
+    if following and locator in _targets(following):
+        if following['op'] == 'click' and kind in IMPLIED_CONDITIONS['clickable']:
+            return True
+        if kind == 'present':
+            return True
+    return False
+
+def compile_scenario(scenario):
+    """
+    Compila um cenário em um plano de execução.
+
+    Args:
+        scenario (dict): Cenário com 'name' e 'steps'.
+
+    Returns:
+        Plan: Plano com as operações otimizadas.
+
+    Raises:
+        ScenarioError: Se o cenário tiver passos, esperas ou localizadores inválidos.
+    """
+    name = scenario.get('name', 'cenário')
+    items = []
+    for step in scenario.get('steps', []):
+        items.extend(_expand_step(name, step))
+
+    # Remoção das esperas redundantes
+    optimized = []
+    filled = {}
+    skipped_waits = 0
+    for index, item in enumerate(items):
+        if item[0] == 'driver':
+            filled = {}
+        elif item[1].get('op') == 'fill':
+            filled.update({('id', field[0]): field[2] for field in item[1]['fields']})
+        elif item[1].get('op') == 'wait' and _is_redundant(items, index, filled):
+            skipped_waits += 1
+            continue
+        optimized.append(item)
+
+    # Arrastos seguidos na mesma lista usam os mesmos elementos, como na execução manual; as
+    # esperas pela estabilização da lista entre eles passam a fazer parte do movimento anterior
+    merged = []
+    for item in optimized:
+        if item[0] == 'driver' and item[1]['kind'] == 'drag':
+            settle = []
+            while merged and merged[-1][0] == 'page' and merged[-1][1]['op'] == 'wait' and merged[-1][1]['kind'] == 'settled':
+                settle.insert(0, merged.pop()[1])
+            last = merged[-1][1] if merged and merged[-1][0] == 'driver' else None
+            if last and last['kind'] == 'drag' and last['locator'] == item[1]['locator']:
+                last['moves'][-1]['settle'] = settle
+                last['moves'].extend(item[1]['moves'])
+                continue
+            merged.extend(('page', action) for action in settle)
+        merged.append(item)
+
+    # União das ações do navegador vizinhas em lotes de script
+    ops = []
+    batch = None
+    for kind, item in merged:
+        if kind == 'page':
+            if batch is None:
+                batch = {'kind': 'script', 'actions': []}
+                ops.append(batch)
+            batch['actions'].append(item)
+        elif kind == 'log' and batch is not None:
+            batch['actions'].append({'op': 'log', 'message': item['message']})
+        else:
+            if kind == 'driver':
+                batch = None
+            ops.append(item)
+
+    stats = {
+        'steps': len(scenario.get('steps', [])),
+        'ops': len([op for op in ops if op['kind'] != 'log']),
+        'script_batches': len([op for op in ops if op['kind'] == 'script']),
+        'skipped_waits': skipped_waits,
+    }
+    return Plan(name, ops, stats)
+
+@functools.lru_cache(maxsize=None)
+def load_plan(path):
+    """
+    Carrega e compila um cenário, mantendo o plano em cache para as próximas execuções.
+    """
+    return compile_scenario(load_scenario(path))
+
+def substitute(value, variables):
+    """
+    Substitui as variáveis ${nome} em textos, listas e dicionários.
+    """
+    if isinstance(value, str):
+        for name, replacement in variables.items():
+            value = value.replace('${' + name + '}', str(replacement))
+        return value
+    if isinstance(value, list):
+        return [substitute(item, variables) for item in value]
+    if isinstance(value, tuple):
+        return tuple(substitute(item, variables) for item in value)
+    if isinstance(value, dict):
+        return {key: substitute(item, variables) for key, item in value.items()}
+    return value
+
+def _run_batch(driver, plan, actions, timeout, poll_interval):
+    """
+    Executa um lote de ações no navegador, retomando-o se a página for trocada no meio do lote
+    e digitando pelo teclado os campos que não aceitaram o valor pelo script.
+
+    Returns:
+        dict: Valores extraídos pelas ações extract do lote.
+    """
+    extracted = {}
+    start = 0
+    while start < len(actions):
+        pending = actions[start:]
+        token = uuid.uuid4().hex
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                result = driver.execute_async_script(RUNNER_SCRIPT, token, pending, int(timeout * 1000), int(poll_interval * 1000))
+                break
+            except WebDriverException as e:
+                if not any(error in str(e) for error in NAVIGATION_ERRORS) or time.monotonic() > deadline:
+                    raise
+                time.sleep(poll_interval)
+
+        executed = result['executed']
+        for action in pending[:executed]:
+            if action['op'] == 'log':
+                logger.info(action['message'])
+        if result.get('error'):
+            raise ScenarioError(plan.name, result['error'], pending[executed].get('description'))
+        if result.get('failed'):
+            fill = pending[executed]
+            try:
+                retype_failed_fields(driver, [tuple(field) for field in fill['fields']], result['failed'])
+            except ValueError as e:
+                raise ScenarioError(plan.name, str(e), fill['description'])
+            executed += 1
+        start += executed
+        extracted.update(result.get('extracted', {}))
+    return extracted
+
+def run_plan(driver, plan, variables=None, open_page=None, timeout=None, poll_interval=None):
+    """
+    Executa um plano compilado.
+
+    Args:
+        driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+        plan (Plan): Plano gerado por compile_scenario.
+        variables (dict, optional): Valores das variáveis ${nome} usadas no cenário.
+        open_page (callable, optional): Função usada na navegação (driver, url). Por padrão, driver.get.
+        timeout (float, optional): Tempo máximo de cada espera. Por padrão usa waits.WAIT_TIMEOUT.
+        poll_interval (float, optional): Intervalo entre verificações. Por padrão usa waits.WAIT_POLL_INTERVAL.
+
+    Returns:
+        dict: Valores extraídos pelos passos extract.
+
+    Raises:
+        ScenarioError: Se algum passo falhar.
+    """
+    variables = variables or {}
+    timeout = waits.WAIT_TIMEOUT if timeout is None else timeout
+    poll_interval = waits.WAIT_POLL_INTERVAL if poll_interval is None else poll_interval
+    extracted = {}
+
+    # O lote com mais esperas precisa caber no tempo máximo de script do ChromeDriver (30 s por padrão)
+    longest = max([len(op['actions']) for op in plan.ops if op['kind'] == 'script'] or [0])
+    if longest * timeout > 30:
+        driver.set_script_timeout(longest * timeout + 5)
+
+    for op in plan.ops:
+        op = substitute(op, variables)
+        kind = op['kind']
+        try:
+            if kind == 'script':
+                extracted.update(_run_batch(driver, plan, op['actions'], timeout, poll_interval))
+            elif kind == 'navigate':
+                (open_page or (lambda driver, url: driver.get(url)))(driver, op['url'])
+            elif kind == 'log':
+                logger.info(op['message'])
+            elif kind == 'keys':
+                for field_id, field_type, value in op['fields']:
+                    type_into(driver, field_id, field_type, value)
+            elif kind == 'drag':
+                items = driver.find_elements(LOCATOR_STRATEGIES[op['locator'][0]], op['locator'][1])
+                for move in op['moves']:
+                    ActionChains(driver).click_and_hold(items[move['from']]).move_to_element(items[move['to']]).release().perform()
+                    if move['settle']:
+                        _run_batch(driver, plan, move['settle'], timeout, poll_interval)
+            elif kind == 'switch_window':
+                driver.switch_to.window(driver.window_handles[op['index']])
+            elif kind == 'close_window':
+                driver.close()
+            elif kind == 'wait_windows':
+                wait_for(driver, waits.number_of_windows_to_be(op['count']), timeout=timeout,
+                         poll_interval=poll_interval, description=op['description'])
+        except ScenarioError:
+            raise
+        except Exception as e:
+            raise ScenarioError(plan.name, str(e), op.get('description') or kind)
+    return extracted
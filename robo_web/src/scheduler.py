@@ -0,0 +1,200 @@
+"""
+Agendador das etapas do robô web.
+
+As etapas declaram suas dependências (ex.: o login antes da Book Store) e, opcionalmente,
+a sessão do navegador em que devem rodar. Etapas independentes rodam em paralelo, cada
+uma em um WebDriver próprio, limitadas a `workers` navegadores abertos ao mesmo tempo.
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+logger = logging.getLogger('MeuSistemaLogger')
+
+class StepError(Exception):
+    """
+    Falha de uma etapa que já tratou e registrou o próprio erro (a mensagem é esse erro).
+    """
+
+class Step:
+    """
+    Etapa do robô.
+
+    Attributes:
+        name (str): Nome da etapa, usado nas dependências e no resultado.
+        func (callable): Função que recebe o driver e executa a etapa. A etapa falha se a
+            função lançar uma exceção ou retornar False (funções que tratam os próprios erros).
+        depends_on (tuple): Nomes das etapas que precisam terminar com sucesso antes desta.
+        session (str, optional): Nome da sessão do navegador. Etapas da mesma sessão rodam
+            uma de cada vez no mesmo driver (ex.: login e coleta de livros compartilham os
+            cookies); etapas sem sessão usam qualquer driver livre.
+    """
+    def __init__(self, name, func, depends_on=(), session=None):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.session = session
+
+class _DriverPool:
+    """
+    Drivers disponíveis para as etapas, limitados a `workers` instâncias.
+
+    Um driver usado por uma sessão nomeada fica vinculado a ela. Quando não é possível
+    criar mais drivers, as etapas usam também os drivers vinculados que estiverem livres.
+    """
+    def __init__(self, workers, sessions):
+        self.workers = workers
+        self.bound = dict(sessions)
+        self.provided = set(id(driver) for driver in sessions.values())
+        self.idle = list(sessions.values())
+        self.count = len(self.idle)
+        self.busy_sessions = set()
+        self.created = []
+
+    def acquire(self, session):
+        """
+        Reserva um driver para a etapa sem bloquear.
+
+        Returns:
+            tuple: (True, driver) se a etapa pode começar, com driver None quando um novo
+                driver deve ser criado; (False, None) se ainda não há driver livre.
+        """
+        if session is not None:
+            if session in self.busy_sessions:
+                return False, None
+            if session in self.bound:
+                driver = self.bound[session]
+                if driver not in self.idle:
+                    return False, None
+                self.idle.remove(driver)
+                self.busy_sessions.add(session)
+                return True, driver
+
+        unbound = [driver for driver in self.idle if driver not in self.bound.values()]
+        if unbound:
+            driver = unbound[0]
+        elif self.count < self.workers:
+            self.count += 1
+            driver = None
+        elif self.idle:
+            driver = self.idle[0]
+        else:
+            return False, None
+
+        if driver is not None:
+            self.idle.remove(driver)
+        if session is not None:
+            self.busy_sessions.add(session)
+            if driver is not None:
+                self.bound[session] = driver
+        return True, driver
+
+    def release(self, session, driver):
+        if session is not None:
+            self.busy_sessions.discard(session)
+        if driver is None:
+            # A criação do driver falhou: a vaga volta a ficar disponível
+            self.count -= 1
+            return
+        if id(driver) not in self.provided and driver not in self.created:
+            self.created.append(driver)
+        if session is not None:
+            self.bound[session] = driver
+        self.idle.append(driver)
+
+    def close(self):
+        """
+        Encerra os drivers criados pelo agendador (os recebidos em `sessions` são mantidos).
+        """
+        for driver in self.created:
+            try:
+                driver.quit()
+            except Exception as e:
+                logger.warning(f'Falha ao fechar um driver do agendador: {e}')
+
+def _run_step(step, driver, driver_factory):
+    start = time.perf_counter()
+    try:
+        if driver is None:
+            driver = driver_factory()
+        if step.func(driver) is False:
+            return {'status': 'failed', 'duration': time.perf_counter() - start,
+                    'error': 'A etapa registrou um erro (ver o relatório de erros)'}, driver
+        return {'status': 'ok', 'duration': time.perf_counter() - start, 'error': None}, driver
+    except Exception as e:
+        return {'status': 'failed', 'duration': time.perf_counter() - start, 'error': str(e)}, driver
+
+def run_steps(steps, driver_factory, workers=1, sessions=None):
+    """
+    Executa as etapas respeitando as dependências, com as independentes em paralelo.
+
+    Uma etapa cuja dependência falhou (exceção ou retorno False) ou foi pulada não é executada
+    (status 'skipped').
+    Com workers=1 e um driver em `sessions`, todas as etapas rodam em sequência nesse driver.
+
+    Args:
+        steps (list): Etapas (Step) na ordem de preferência de execução; as etapas com sessão
+            nomeada têm prioridade quando o driver da sessão fica livre.
+        driver_factory (callable): Função que cria um novo WebDriver.
+        workers (int): Quantidade máxima de drivers abertos ao mesmo tempo, incluindo os de `sessions`.
+        sessions (dict, optional): Drivers já abertos por nome de sessão (ex.: {'main': driver}).
+
+    Returns:
+        dict: Para cada etapa, um dicionário com status ('ok', 'failed' ou 'skipped'),
+            duração em segundos e mensagem de erro.
+
+    Raises:
+        ValueError: Se uma etapa depender de uma etapa inexistente ou houver nomes repetidos.
+    """
+    names = [step.name for step in steps]
+    if len(set(names)) != len(names):
+        raise ValueError('Há etapas com nomes repetidos')
+    for step in steps:
+        missing = [name for name in step.depends_on if name not in names]
+        if missing:
+            raise ValueError(f'A etapa {step.name} depende de etapas inexistentes: {missing}')
+
+    pool = _DriverPool(max(workers, len(sessions or {}), 1), sessions or {})
+    results = {}
+    pending = list(steps)
+    running = {}
+    with ThreadPoolExecutor(max_workers=pool.workers, thread_name_prefix='step') as executor:
+        try:
+            while pending or running:
+                # Etapas de sessões nomeadas escolhem primeiro, para que o driver da sessão
+                # não seja ocupado por uma etapa que poderia rodar em qualquer driver
+                for step in sorted(pending, key=lambda step: step.session is None):
+                    states = [results[name]['status'] if name in results else None for name in step.depends_on]
+                    if any(state in ('failed', 'skipped') for state in states):
+                        pending.remove(step)
+                        results[step.name] = {'status': 'skipped', 'duration': 0.0,
+                                              'error': 'Dependência não concluída: ' + ', '.join(step.depends_on)}
+                        continue
+                    if not all(state == 'ok' for state in states):
+                        continue
+                    available, driver = pool.acquire(step.session)
+                    if not available:
+                        continue
+                    pending.remove(step)
+                    logger.info(f'Iniciando a etapa {step.name}')
+                    running[executor.submit(_run_step, step, driver, driver_factory)] = step
+
+                if not running:
+                    # Só restam etapas com dependências circulares
+                    for step in pending:
+                        results[step.name] = {'status': 'skipped', 'duration': 0.0,
+                                              'error': 'Dependência circular: ' + ', '.join(step.depends_on)}
+                    break
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    result, driver = future.result()
+                    pool.release(step.session, driver)
+                    results[step.name] = result
+                    logger.info(f'Etapa {step.name} concluída ({result["status"]}, {result["duration"]:.2f} s)')
+        finally:
+            # Em uma interrupção, espera as etapas em andamento para fechar os drivers que elas criaram
+            for future in wait(running).done:
+                pool.release(running[future].session, future.result()[1])
+            pool.close()
+    return {step.name: results[step.name] for step in steps}
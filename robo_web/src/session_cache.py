@@ -0,0 +1,84 @@
+import json
+import os
+import threading
+import time
+import urllib.parse
+from datetime import datetime
+
+# Cookies gravados pelo DemoQA após o login
+SESSION_COOKIES = ('token', 'userID', 'userName', 'expires')
+
+class SessionCache:
+    """
+    Cache dos cookies de login por usuário, em um arquivo JSON local, com data de expiração.
+
+    A expiração vem do cookie 'expires' gravado pelo DemoQA; se ele não puder ser lido,
+    é usada a validade padrão (ttl).
+    """
+    def __init__(self, path, ttl=3600):
+        self.path = path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding='utf-8') as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self, sessions):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary_path = f'{self.path}.tmp'
+        # O arquivo contém tokens de acesso: somente o usuário atual pode lê-lo
+        with open(os.open(temporary_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600), 'w', encoding='utf-8') as file:
+            json.dump(sessions, file)
+        os.replace(temporary_path, self.path)
+
+    def get(self, username):
+        """
+        Retorna os cookies válidos do usuário, ou None se não houver sessão ou ela tiver expirado.
+        """
+        with self.lock:
+            session = self._load().get(username)
+        if not session or session['expires_at'] <= time.time():
+            return None
+        return session['cookies']
+
+    def put(self, username, cookies):
+        """
+        Grava os cookies de login do usuário.
+
+        Args:
+            username (str): Nome de usuário.
+            cookies (list): Cookies retornados por driver.get_cookies().
+        """
+        cookies = [cookie for cookie in cookies if cookie['name'] in SESSION_COOKIES]
+        if not any(cookie['name'] == 'token' for cookie in cookies):
+            return
+        with self.lock:
+            sessions = self._load()
+            sessions[username] = {'cookies': cookies, 'expires_at': self._expires_at(cookies)}
+            self._save(sessions)
+
+    def invalidate(self, username):
+        """
+        Remove a sessão do usuário do cache.
+        """
+        with self.lock:
+            sessions = self._load()
+            if sessions.pop(username, None) is not None:
+                self._save(sessions)
+
+    def _expires_at(self, cookies):
+        for cookie in cookies:
+            if cookie['name'] == 'expires':
+                try:
+                    value = urllib.parse.unquote(cookie['value']).replace('Z', '+00:00')
+                    return datetime.fromisoformat(value).timestamp()
+                except ValueError:
+                    pass
+        expiries = [cookie['expiry'] for cookie in cookies if cookie.get('expiry')]
+        return min(expiries) if expiries else time.time() + self.ttl
@@ -0,0 +1,154 @@
+"""
+Configurações do robô web lidas das variáveis de ambiente (arquivo .env).
+
+O módulo só lê os valores: não cria diretórios, não configura o logging e não importa o
+Selenium nem os drivers de banco de dados. O .env deve ser carregado antes da importação
+(ver src/cli.py), e web_automation importa todos os nomes daqui.
+"""
+import os
+
+# Diretórios de logs, dados e relatórios, criados na inicialização da execução (cli.initialize)
+log_directory = 'logs'
+reports_directory = 'reports'
+directories = [log_directory, 'data', reports_directory]
+
+# Log em arquivo: 'json' (JSON lines em logs/rpa_log.jsonl, padrão) ou 'text' (logs/rpa_log.log).
+# Mensagens e campos são limitados a LOG_MAX_CHARS caracteres; erros repetidos são registrados nas
+# primeiras LOG_SAMPLE_BURST ocorrências e depois um a cada LOG_SAMPLE_EVERY (0 em LOG_SAMPLE_BURST
+# desativa a amostragem). O relatório de erros mantém em memória as últimas ERROR_REPORT_CAPACITY mensagens.
+LOG_FORMAT = os.getenv('LOG_FORMAT', 'json')
+LOG_MAX_CHARS = int(os.getenv('LOG_MAX_CHARS', '2000'))
+LOG_QUEUE_SIZE = int(os.getenv('LOG_QUEUE_SIZE', '10000'))
+LOG_SAMPLE_BURST = int(os.getenv('LOG_SAMPLE_BURST', '5'))
+LOG_SAMPLE_EVERY = int(os.getenv('LOG_SAMPLE_EVERY', '100'))
+ERROR_REPORT_CAPACITY = int(os.getenv('ERROR_REPORT_CAPACITY', '200'))
+
+# Métricas das etapas (rpa_common.metrics): arquivo no formato do Prometheus (textfile collector do
+# node_exporter) e histórico das execuções em SQLite, usado pelo subcomando report (p50/p95 das últimas
+# METRICS_REPORT_RUNS execuções). Um caminho vazio desativa o destino.
+METRICS_TEXTFILE = os.getenv('METRICS_TEXTFILE', os.path.join(reports_directory, 'rpa_web.prom'))
+RUN_HISTORY_PATH = os.getenv('RUN_HISTORY_PATH', os.path.join('data', 'run_history.db'))
+METRICS_REPORT_RUNS = int(os.getenv('METRICS_REPORT_RUNS', '20'))
+
+# Configurações de conexão com o banco de dados a partir do .env
+SQL_SERVER = os.getenv('SQL_SERVER')
+SQL_DATABASE = 'DemoQA'
+SQL_USERNAME = os.getenv('SQL_USERNAME')
+SQL_PASSWORD = os.getenv('SQL_PASSWORD')
+
+# Backend do banco de dados ('sqlserver' ou 'sqlite'), modo de escrita ('row', 'batch' ou 'upsert') e tamanho do lote
+DB_BACKEND = os.getenv('DB_BACKEND', 'sqlserver')
+SQLITE_PATH = os.getenv('SQLITE_PATH', os.path.join('data', 'books.db'))
+DB_WRITE_MODE = os.getenv('DB_WRITE_MODE', 'upsert')
+DB_BATCH_SIZE = int(os.getenv('DB_BATCH_SIZE', '500'))
+
+# Quantidade máxima de páginas pendentes em cada destino (banco de dados e CSV) durante a coleta
+PIPELINE_QUEUE_SIZE = int(os.getenv('PIPELINE_QUEUE_SIZE', '4'))
+
+# Checkpoint da coleta de livros: retoma coletas interrompidas e não regrava páginas sem alteração
+CRAWL_CHECKPOINT = os.getenv('CRAWL_CHECKPOINT', '0') == '1'
+CHECKPOINT_PATH = os.getenv('CHECKPOINT_PATH', os.path.join('data', 'checkpoints.db'))
+
+# Cache das capas dos livros: baixa as capas em paralelo (COVER_DOWNLOAD_CONCURRENCY conexões), grava
+# cada uma uma única vez em COVER_CACHE_DIRECTORY e registra o hash e as dimensões em cada livro
+COVER_CACHE = os.getenv('COVER_CACHE', '0') == '1'
+COVER_CACHE_DIRECTORY = os.getenv('COVER_CACHE_DIRECTORY', os.path.join('data', 'covers'))
+COVER_CACHE_MAX_MB = int(os.getenv('COVER_CACHE_MAX_MB', '200'))
+COVER_DOWNLOAD_CONCURRENCY = int(os.getenv('COVER_DOWNLOAD_CONCURRENCY', '8'))
+
+# Exportação dos livros: formato ('csv', 'parquet' ou 'arrow'), compressão do CSV ('none', 'gzip' ou 'zstd')
+# e partição por data da execução (um novo arquivo por execução em EXPORT_DIRECTORY/run_date=<data>/)
+EXPORT_FORMAT = os.getenv('EXPORT_FORMAT', 'csv')
+EXPORT_COMPRESSION = os.getenv('EXPORT_COMPRESSION', 'none')
+EXPORT_PARTITIONED = os.getenv('EXPORT_PARTITIONED', '0') == '1'
+EXPORT_DIRECTORY = os.getenv('EXPORT_DIRECTORY', 'data')
+
+# Caminho para o ChromeDriver a partir do .env
+CHROME_DRIVER_PATH = os.getenv('CHROME_DRIVER_PATH')
+
+# Credenciais de login para o site DemoQA a partir do .env
+DEMOQA_USERNAME = os.getenv('DEMOQA_USERNAME')
+DEMOQA_PASSWORD = os.getenv('DEMOQA_PASSWORD')
+
+# Cache das sessões de login (cookies com expiração), para pular o login enquanto a sessão for válida
+SESSION_CACHE = os.getenv('SESSION_CACHE', '1') == '1'
+SESSION_CACHE_PATH = os.getenv('SESSION_CACHE_PATH', os.path.join('data', 'session_cache.json'))
+
+# Usa uma sessão pré-iniciada do pool de navegadores (src/browser_pool.py) em vez de iniciar o Chrome
+BROWSER_POOL = os.getenv('BROWSER_POOL', '0') == '1'
+
+# Estratégia de carregamento das páginas: 'normal' (evento load), 'eager' (DOMContentLoaded) ou 'none'
+PAGE_LOAD_STRATEGY = os.getenv('PAGE_LOAD_STRATEGY', 'eager')
+
+# Padrões de URL bloqueados no navegador (anúncios, rastreadores, fontes e capas dos livros).
+# BLOCKED_URL_PATTERNS no .env substitui a lista, separada por vírgulas; vazio desativa o bloqueio.
+DEFAULT_BLOCKED_URL_PATTERNS = [
+    '*googlesyndication.com*', '*doubleclick.net*', '*googletagmanager.com*', '*googletagservices.com*',
+    '*google-analytics.com*', '*adservice.google.*', '*amazon-adsystem.com*', '*ezoic*', '*ezojs.com*',
+    '*fonts.googleapis.com*', '*fonts.gstatic.com*', '*.woff', '*.woff2', '*.ttf', '*/images/bookimage*'
+]
+BLOCKED_URL_PATTERNS = os.getenv('BLOCKED_URL_PATTERNS')
+BLOCKED_URL_PATTERNS = (
+    DEFAULT_BLOCKED_URL_PATTERNS if BLOCKED_URL_PATTERNS is None
+    else [pattern.strip() for pattern in BLOCKED_URL_PATTERNS.split(',') if pattern.strip()]
+)
+
+# Endereço base do DemoQA (pode apontar para uma cópia local do site)
+DEMOQA_BASE_URL = os.getenv('DEMOQA_BASE_URL', 'https://demoqa.com').rstrip('/')
+
+# Página da Book Store Application
+BOOKS_URL = f'{DEMOQA_BASE_URL}/books'
+
+# Endpoint JSON da Book Store e coletor de livros: 'direct' (API, com o navegador como alternativa) ou 'browser'
+BOOKS_API_URL = os.getenv('BOOKS_API_URL', f'{DEMOQA_BASE_URL}/BookStore/v1/Books')
+BOOK_COLLECTOR = os.getenv('BOOK_COLLECTOR', 'browser')
+
+# Extração dos livros no navegador: 'script' (uma chamada por página, padrão) ou 'element' (uma chamada por campo)
+BOOK_EXTRACTION_MODE = os.getenv('BOOK_EXTRACTION_MODE', 'script')
+
+# Quantidade de sessões headless usadas na coleta paralela dos livros ('auto' usa a quantidade de núcleos)
+BOOK_COLLECTION_WORKERS = os.getenv('BOOK_COLLECTION_WORKERS', '1')
+BOOK_COLLECTION_WORKERS = (os.cpu_count() or 1) if BOOK_COLLECTION_WORKERS == 'auto' else int(BOOK_COLLECTION_WORKERS)
+
+# Profiler dos comandos do WebDriver: grava em reports/ o resumo por etapa, os PROFILE_TOP_N
+# comandos mais lentos e um arquivo Chrome Trace. Desativado, não adiciona custo aos comandos.
+WEBDRIVER_PROFILE = os.getenv('WEBDRIVER_PROFILE', '0') == '1'
+PROFILE_TOP_N = int(os.getenv('PROFILE_TOP_N', '10'))
+
+# Preenchimento do formulário "Practice Form": 'script' (em lote, padrão) ou 'keys' (campo a campo)
+FORM_FILL_MODE = os.getenv('FORM_FILL_MODE', 'script')
+
+# Campos do formulário "Practice Form" (id → valor, com o tipo quando não for texto)
+PRACTICE_FORM_FIELDS = {
+    'firstName': 'John',
+    'lastName': 'Doe',
+    'userEmail': 'john.doe@example.com',
+    'gender-radio-1': {'type': 'radio'},
+    'userNumber': '1234567890',
+    'dateOfBirthInput': {'type': 'datepicker', 'value': '22 Mar 1998'},
+    'subjectsInput': {'type': 'react-select', 'value': 'Math'},
+    'hobbies-checkbox-1': {'type': 'checkbox'},
+    'currentAddress': '123 Current St, Current City',
+    'react-select-3-input': {'type': 'react-select', 'value': 'NCR'},
+    'react-select-4-input': {'type': 'react-select', 'value': 'Delhi'},
+}
+
+# Execução dos fluxos: 'code' (funções interact_* e login_demoqa) ou 'scenario' (arquivos de
+# cenário em SCENARIOS_DIRECTORY, compilados em planos otimizados pelo módulo scenario)
+FLOW_ENGINE = os.getenv('FLOW_ENGINE', 'code')
+SCENARIOS_DIRECTORY = os.getenv('SCENARIOS_DIRECTORY', os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scenarios'))
+
+# Quantidade máxima de navegadores usados ao mesmo tempo pelas etapas do robô ('auto' usa a
+# quantidade de núcleos, limitada ao número de etapas). Com 1, as etapas rodam em sequência.
+SECTION_WORKERS = os.getenv('SECTION_WORKERS', 'auto')
+
+# Execução para várias contas: arquivo de credenciais (JSON ou CSV com username e password), quantidade
+# de contas em execução ao mesmo tempo e etapas executadas após o login de cada conta
+ACCOUNTS_FILE = os.getenv('ACCOUNTS_FILE')
+ACCOUNT_WORKERS = int(os.getenv('ACCOUNT_WORKERS', '2'))
+ACCOUNT_STEPS = [name.strip() for name in os.getenv('ACCOUNT_STEPS', 'elements,forms,alerts_frames_windows,widgets,interactions').split(',') if name.strip()]
+
+# Limite de navegações por segundo no total e por host (0 desativa) e rajada liberada antes do limite
+RATE_LIMIT = float(os.getenv('RATE_LIMIT', '0'))
+HOST_RATE_LIMIT = float(os.getenv('HOST_RATE_LIMIT', '0'))
+RATE_LIMIT_BURST = int(os.getenv('RATE_LIMIT_BURST', '1'))
@@ -0,0 +1,114 @@
+import os
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+
+# Tempo máximo e intervalo de verificação padrão das esperas, em segundos
+WAIT_TIMEOUT = float(os.getenv('WAIT_TIMEOUT', '10'))
+WAIT_POLL_INTERVAL = float(os.getenv('WAIT_POLL_INTERVAL', '0.1'))
+
+def wait_for(driver, condition, timeout=None, poll_interval=None, description=''):
+    """
+    Espera até que uma condição seja satisfeita, verificando-a em intervalos regulares.
+
+    Args:
+        driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+        condition (callable): Condição que recebe o driver e retorna um valor verdadeiro quando satisfeita.
+        timeout (float, optional): Tempo máximo de espera. Por padrão usa WAIT_TIMEOUT.
+        poll_interval (float, optional): Intervalo entre verificações. Por padrão usa WAIT_POLL_INTERVAL.
+        description (str): Descrição da condição, incluída na mensagem de TimeoutException.
+
+    Returns:
+        O valor retornado pela condição.
+    """
+    wait = WebDriverWait(
+        driver,
+        WAIT_TIMEOUT if timeout is None else timeout,
+        poll_frequency=WAIT_POLL_INTERVAL if poll_interval is None else poll_interval,
+        ignored_exceptions=(NoSuchElementException, StaleElementReferenceException)
+    )
+    return wait.until(condition, message=description)
+
+def value_equals(locator, value):
+    """
+    Condição: o valor do campo (input, textarea ou select) é igual ao esperado.
+    """
+    def condition(driver):
+        return driver.find_element(*locator).get_attribute('value') == value
+    return condition
+
+def value_contains(locator, text):
+    """
+    Condição: o valor do campo contém o texto esperado.
+    """
+    def condition(driver):
+        return text in (driver.find_element(*locator).get_attribute('value') or '')
+    return condition
+
+def in_viewport(element):
+    """
+    Condição: o elemento está inteiramente visível na área da janela após a rolagem.
+    """
+    def condition(driver):
+        return driver.execute_script(
+            'const rect = arguments[0].getBoundingClientRect();'
+            'return rect.top >= 0 && rect.bottom <= window.innerHeight;',
+            element
+        )
+    return condition
+
+def collapse_state(heading_locator, expanded):
+    """
+    Condição: a seção de accordion após o cabeçalho está aberta (expanded=True) ou fechada,
+    com a animação de transição concluída.
+    """
+    def condition(driver):
+        heading = driver.find_element(*heading_locator)
+        content = heading.find_element('xpath', 'following-sibling::div[1]')
+        classes = (content.get_attribute('class') or '').split()
+        if 'collapsing' in classes:
+            return False
+        return ('show' in classes) == expanded
+    return condition
+
+def text_present_in_any(locator, text):
+    """
+    Condição: algum dos elementos localizados contém o texto esperado.
+    """
+    def condition(driver):
+        return any(text in element.text for element in driver.find_elements(*locator))
+    return condition
+
+# Marca gravada na página atual antes de uma navegação, para distinguir a página nova da anterior
+PAGE_MARKER_SCRIPT = 'window.__roboPreviousPage = true;'
+
+def new_page_ready(driver):
+    """
+    Condição: a navegação trocou a página marcada com PAGE_MARKER_SCRIPT e o DOM da nova
+    página já foi carregado (readyState 'interactive' ou 'complete').
+    """
+    return driver.execute_script(
+        'return !window.__roboPreviousPage && document.readyState !== "loading";'
+    )
+
+class dom_settled:
+    """
+    Condição: o texto dos elementos localizados não mudou entre duas verificações seguidas,
+    indicando que a página terminou de reagir à última ação (ex.: arrastar e soltar).
+    """
+    def __init__(self, locator):
+        self.locator = locator
+        self.previous = None
+
+    def __call__(self, driver):
+        current = [element.text for element in driver.find_elements(*self.locator)]
+        settled = current == self.previous
+        self.previous = current
+        return settled
+
+# Condições do Selenium reexportadas para que os fluxos declarem suas esperas em um único lugar
+url_contains = EC.url_contains
+number_of_windows_to_be = EC.number_of_windows_to_be
+visibility_of_element_located = EC.visibility_of_element_located
+invisibility_of_element_located = EC.invisibility_of_element_located
+element_located_to_be_selected = EC.element_located_to_be_selected
@@ -1,108 +1,208 @@
 import os
-import logging
-import pandas as pd
-import pyodbc
+import sys
+import json
+import gzip
+import zlib
 import time
+import logging
+import threading
+import urllib.request
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
+from selenium.webdriver import ActionChains
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException, TimeoutException, ElementClickInterceptedException
-from dotenv import load_dotenv # type: ignore
+from selenium.common.exceptions import NoSuchElementException, TimeoutException, ElementClickInterceptedException, WebDriverException
 from datetime import datetime
 
-# Diretórios necessários
-directories = ['logs', 'data', 'reports']
+import waits
+from waits import wait_for
+from book_writer import create_backend, write_books, write_account_runs
+from pipeline import run_pipeline, DatabaseSink, PipelineError
+from exporters import create_exporter, CsvExporter
+from checkpoint import CheckpointStore, CheckpointedCrawl
+from session_cache import SessionCache
+from browser_pool import BrowserPoolClient, BrowserPoolError
+from profiler import create_profiler
+from scheduler import Step, StepError, run_steps
+from form_fill import fill_form
+from scenario import load_plan, run_plan, ScenarioError
+from accounts import load_accounts, RateLimiter, throttle, run_accounts, account_run_rows
+from covers import CoverCache, with_covers
+
+# Pacote compartilhado entre os robôs (rpa_common, na raiz do repositório)
+ROOT_DIRECTORY = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if ROOT_DIRECTORY not in sys.path:
+    sys.path.insert(0, ROOT_DIRECTORY)
+from rpa_common import ErrorReport, Metrics, save_run, truncate
+
+# Executado como script, o .env é carregado antes das configurações, como em cli.main: o
+# settings importado aqui é o mesmo que cli.main e o web_automation importado por ele usam
+if __name__ == '__main__':
+    from dotenv import load_dotenv # type: ignore
+    load_dotenv()
 
-# Criação dos diretórios, se não existirem
-for directory in directories:
-    if not os.path.exists(directory):
-        os.makedirs(directory)
+# Configurações lidas do .env (ver src/settings.py)
+from settings import *
 
-# Carregar variáveis de ambiente do arquivo .env
-load_dotenv()
+session_cache = SessionCache(SESSION_CACHE_PATH)
+profiler = create_profiler(WEBDRIVER_PROFILE)
 
-# Configurações de conexão com o banco de dados a partir do .env
-SQL_SERVER = os.getenv('SQL_SERVER')
-SQL_DATABASE = 'DemoQA'
-SQL_USERNAME = os.getenv('SQL_USERNAME')
-SQL_PASSWORD = os.getenv('SQL_PASSWORD')
+# Duração, resultado e contagens de cada etapa (rpa_common.metrics), gravados ao final de run_robot
+metrics = Metrics('web')
 
-# Caminho para o ChromeDriver a partir do .env
-CHROME_DRIVER_PATH = os.getenv('CHROME_DRIVER_PATH')
+logger = logging.getLogger('MeuSistemaLogger')
 
-# Credenciais de login para o site DemoQA a partir do .env
-DEMOQA_USERNAME = os.getenv('DEMOQA_USERNAME')
-DEMOQA_PASSWORD = os.getenv('DEMOQA_PASSWORD')
+# Relatório de erros da execução, gravado em reports/ à medida que os erros acontecem
+error_reports = ErrorReport(reports_directory, capacity=ERROR_REPORT_CAPACITY, max_chars=LOG_MAX_CHARS,
+                            sample_burst=LOG_SAMPLE_BURST, sample_every=LOG_SAMPLE_EVERY)
 
-# Caminho para o diretório de logs
-log_directory = 'logs'
-if not os.path.exists(log_directory):
-    os.makedirs(log_directory)
+def save_error_report():
+    """
+    Conclui o relatório de erros da execução na pasta reports.
 
-# Caminho para o diretório de reports
-reports_directory = 'reports'
-if not os.path.exists(reports_directory):
-    os.makedirs(reports_directory)
+    Returns:
+        str: Caminho do relatório.
+    """
+    return error_reports.close()
 
-# Configuração do logging
-logger = logging.getLogger('MeuSistemaLogger')
-logger.setLevel(logging.INFO)
+# Último erro registrado em cada thread: o erro de uma etapa que trata os próprios erros
+_thread_errors = threading.local()
 
-# Criar handlers para o logger
-file_handler = logging.FileHandler(os.path.join(log_directory, 'rpa_log.log'))
-console_handler = logging.StreamHandler()
+def add_error_report(error_message):
+    """
+    Adiciona uma mensagem de erro ao relatório (gravada em segundo plano).
 
-# Criar formatação e adicionar aos handlers
-formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-file_handler.setFormatter(formatter)
-console_handler.setFormatter(formatter)
+    Args:
+        error_message (str): Mensagem de erro a ser adicionada.
+    """
+    error_reports.add(error_message)
+    # As etapas tratam os próprios erros: o erro marca as etapas abertas na thread
+    metrics.mark_error()
+    _thread_errors.last = error_message
 
-# Adicionar handlers ao logger
-logger.addHandler(file_handler)
-logger.addHandler(console_handler)
+def open_page(driver, url):
+    """
+    Navega até a URL respeitando a estratégia de carregamento configurada.
 
-# Variável global para armazenar erros
-error_reports = []
+    Com PAGE_LOAD_STRATEGY 'none', driver.get retorna sem esperar a nova página; nesse caso
+    a função espera até que o DOM da nova página esteja carregado. Com 'eager' e 'normal',
+    o próprio driver.get já espera (DOMContentLoaded ou load, respectivamente).
 
-def save_error_report():
+    Args:
+        driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+        url (str): Endereço da página.
     """
-    Salva as mensagens de erro acumuladas em um arquivo de relatório na pasta reports.
+    if PAGE_LOAD_STRATEGY != 'none':
+        driver.get(url)
+        return
+    driver.execute_script(waits.PAGE_MARKER_SCRIPT)
+    driver.get(url)
+    wait_for(driver, waits.new_page_ready, description=f'página {url} carregada')
+
+def run_scenario(driver, name, variables=None):
     """
-    timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
-    report_filename = os.path.join(reports_directory, f'report_{timestamp}.report')
-    
-    with open(report_filename, 'w') as file:
-        if error_reports:
-            for error in error_reports:
-                file.write(error + '\n')
-        else:
-            file.write("Nenhum erro encontrado durante a execução.\n")
+    Executa um fluxo descrito em um arquivo de cenário (SCENARIOS_DIRECTORY/<nome>.json).
 
-def add_error_report(error_message):
+    O cenário é compilado uma única vez por execução do robô. Erros são registrados no log
+    e no relatório de erros, como nas funções interact_*.
+
+    Args:
+        driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+        name (str): Nome do cenário (ex.: 'elements').
+        variables (dict, optional): Valores das variáveis ${nome} do cenário, além de ${base_url}.
+
+    Returns:
+        bool: True se o cenário foi concluído sem erros.
     """
-    Adiciona uma mensagem de erro à lista de erros.
+    try:
+        plan = load_plan(os.path.join(SCENARIOS_DIRECTORY, f'{name}.json'))
+        run_plan(driver, plan, dict(variables or {}, base_url=DEMOQA_BASE_URL), open_page=open_page)
+        return True
+    except (ScenarioError, OSError, ValueError) as e:
+        error_message = f'Erro durante o cenário {name}: {e}'
+        logger.error(error_message)
+        add_error_report(error_message)
+        return False
+
+def flow(name, func):
+    """
+    Retorna a função que executa o fluxo conforme FLOW_ENGINE: a função interact_* ou o cenário de mesmo nome.
+    """
+    if FLOW_ENGINE == 'scenario':
+        # O cenário é medido com o nome da função que ele substitui
+        return metrics.timed(func.__name__)(partial(run_scenario, name=name))
+    return func
+
+def restore_session(driver, username):
+    """
+    Reaproveita a sessão de login do usuário, se ainda for válida, sem passar pela tela de login.
+
+    A sessão pode já estar ativa no navegador (sessões do pool mantêm os cookies) ou ser
+    restaurada a partir dos cookies guardados no cache de sessões.
 
     Args:
-        error_message (str): Mensagem de erro a ser adicionada.
+        driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+        username (str): Nome de usuário.
+
+    Returns:
+        bool: True se o usuário está logado ao final.
     """
-    error_reports.append(error_message)
+    cookies = session_cache.get(username)
+    if not cookies:
+        return False
+
+    open_page(driver, f'{DEMOQA_BASE_URL}/profile')
+    active_token = driver.get_cookie('token')
+    cached_token = next(cookie['value'] for cookie in cookies if cookie['name'] == 'token')
+    if not active_token or active_token['value'] != cached_token:
+        for cookie in cookies:
+            driver.add_cookie({key: value for key, value in cookie.items() if key in ('name', 'value', 'path', 'expiry', 'secure', 'httpOnly')})
+        open_page(driver, f'{DEMOQA_BASE_URL}/profile')
+
+    try:
+        wait_for(driver, waits.text_present_in_any((By.ID, 'userName-value'), username), timeout=5, description='perfil do usuário exibido')
+        return True
+    except TimeoutException:
+        session_cache.invalidate(username)
+        return False
 
+@metrics.timed()
 def login_demoqa(driver, username, password):
     """
     Realiza o login no site DemoQA.
 
+    Se SESSION_CACHE estiver ativo e houver uma sessão válida do usuário, o login pela
+    interface é pulado; após um login pela interface, os cookies da sessão são guardados.
+
     Args:
         driver (webdriver.Chrome): Instância do WebDriver do Chrome.
         username (str): Nome de usuário para login.
         password (str): Senha para login.
+
+    Returns:
+        bool: True se o login foi realizado (ou a sessão reaproveitada).
     """
     try:
+        if SESSION_CACHE and restore_session(driver, username):
+            logger.info('Sessão de login reaproveitada')
+            return True
+
+        if FLOW_ENGINE == 'scenario':
+            if not run_scenario(driver, 'login', {'username': username, 'password': password}):
+                return False
+            if SESSION_CACHE:
+                session_cache.put(username, driver.get_cookies())
+            return True
+
         logger.info('Iniciando processo de login')
-        driver.get('https://demoqa.com/login')
+        open_page(driver, f'{DEMOQA_BASE_URL}/login')
 
         # Encontrar e preencher os campos de login
         user_field = WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, 'userName')))
@@ -120,21 +220,30 @@ def login_demoqa(driver, username, password):
         # Esperar até que a URL contenha 'profile', indicando sucesso no login
         WebDriverWait(driver, 10).until(EC.url_contains('profile'))
         logger.info('Login realizado com sucesso')
+
+        if SESSION_CACHE:
+            session_cache.put(username, driver.get_cookies())
+        return True
     except Exception as e:
         error_message = f'Erro durante o login: {e}'
         logger.error(error_message)
         add_error_report(error_message)
+        return False
 
+@metrics.timed()
 def interact_with_elements(driver):
     """
     Interage com a seção "Elements" do DemoQA.
 
     Args:
         driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+
+    Returns:
+        bool: True se a etapa foi concluída sem erros.
     """
     try:
         logger.info('Interagindo com a seção Elements')
-        driver.get('https://demoqa.com/elements')
+        open_page(driver, f'{DEMOQA_BASE_URL}/elements')
         
         # Clicar no item "Text Box" no menu à esquerda
         text_box_menu_item = WebDriverWait(driver, 10).until(
@@ -149,18 +258,18 @@ def interact_with_elements(driver):
         email_field = driver.find_element(By.ID, 'userEmail')
         current_address_field = driver.find_element(By.ID, 'currentAddress')
         permanent_address_field = driver.find_element(By.ID, 'permanentAddress')
-        time.sleep(2)
+        wait_for(driver, waits.visibility_of_element_located((By.ID, 'permanentAddress')), description='campos do Text Box visíveis')
         
         full_name_field.send_keys('John Doe')
         email_field.send_keys('john.doe@example.com')
         current_address_field.send_keys('123 Current St, Current City')
         permanent_address_field.send_keys('456 Permanent St, Permanent City')
-        time.sleep(2)
+        wait_for(driver, waits.value_equals((By.ID, 'permanentAddress'), '456 Permanent St, Permanent City'), description='campos do Text Box preenchidos')
         
         # Rolar a página até o botão "Submit"
         submit_button = driver.find_element(By.ID, 'submit')
         driver.execute_script("arguments[0].scrollIntoView(true);", submit_button)
-        time.sleep(2)
+        wait_for(driver, waits.in_viewport(submit_button), description='botão Submit na área visível')
         
         # Esperar até que o botão "Submit" esteja presente e clicável
         WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.ID, 'submit')))
@@ -168,105 +277,135 @@ def interact_with_elements(driver):
         
         logger.info('Formulário preenchido e enviado com sucesso')
         
-        # Aguardar 2 segundos antes de sair da função
-        time.sleep(2)
+        # Aguardar a exibição do resultado antes de sair da função
+        wait_for(driver, waits.visibility_of_element_located((By.ID, 'output')), description='resultado do Text Box exibido')
+        return True
     except Exception as e:
         error_message = f'Erro durante a interação com Elements: {e}'
         logger.error(error_message)
         add_error_report(error_message)
+        return False
+
+def fill_practice_form_per_field(driver):
+    """
+    Preenche o formulário "Practice Form" campo a campo, com find_element, send_keys e click.
 
+    Args:
+        driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+    """
+    first_name_field = driver.find_element(By.ID, 'firstName')
+    driver.execute_script("arguments[0].scrollIntoView(true);", first_name_field)
+    first_name_field.send_keys('John')
+    wait_for(driver, waits.value_equals((By.ID, 'firstName'), 'John'), description='First Name preenchido')
+    
+    last_name_field = driver.find_element(By.ID, 'lastName')
+    driver.execute_script("arguments[0].scrollIntoView(true);", last_name_field)
+    last_name_field.send_keys('Doe')
+    wait_for(driver, waits.value_equals((By.ID, 'lastName'), 'Doe'), description='Last Name preenchido')
+
+    email_field = driver.find_element(By.ID, 'userEmail')
+    driver.execute_script("arguments[0].scrollIntoView(true);", email_field)
+    email_field.send_keys('john.doe@example.com')
+    wait_for(driver, waits.value_equals((By.ID, 'userEmail'), 'john.doe@example.com'), description='Email preenchido')
+
+    gender_radio_button = driver.find_element(By.XPATH, '//label[text()="Male"]')
+    driver.execute_script("arguments[0].scrollIntoView(true);", gender_radio_button)
+    gender_radio_button.click()
+    wait_for(driver, waits.element_located_to_be_selected((By.ID, 'gender-radio-1')), description='gênero selecionado')
+
+    mobile_field = driver.find_element(By.ID, 'userNumber')
+    driver.execute_script("arguments[0].scrollIntoView(true);", mobile_field)
+    mobile_field.send_keys('1234567890')
+    wait_for(driver, waits.value_equals((By.ID, 'userNumber'), '1234567890'), description='Mobile preenchido')
+
+    # Interagir com o seletor de data de nascimento
+    date_of_birth_field = driver.find_element(By.ID, 'dateOfBirthInput')
+    driver.execute_script("arguments[0].scrollIntoView(true);", date_of_birth_field)
+    date_of_birth_field.click()
+    wait_for(driver, waits.visibility_of_element_located((By.CLASS_NAME, 'react-datepicker__month-select')), description='seletor de data aberto')
+
+    # Selecionar mês e ano
+    month_select = driver.find_element(By.CLASS_NAME, 'react-datepicker__month-select')
+    month_select.click()
+    month_option = driver.find_element(By.XPATH, '//option[@value="2"]')  # Março é o mês 2 (0 indexado)
+    month_option.click()
+    wait_for(driver, waits.value_equals((By.CLASS_NAME, 'react-datepicker__month-select'), '2'), description='mês selecionado')
+
+    year_select = driver.find_element(By.CLASS_NAME, 'react-datepicker__year-select')
+    year_select.click()
+    year_option = driver.find_element(By.XPATH, '//option[@value="1998"]')
+    year_option.click()
+    wait_for(driver, waits.value_equals((By.CLASS_NAME, 'react-datepicker__year-select'), '1998'), description='ano selecionado')
+
+    # Selecionar dia
+    day_select = driver.find_element(By.XPATH, '//div[contains(@class, "react-datepicker__day--022") and not(contains(@class, "react-datepicker__day--outside-month"))]')
+    day_select.click()
+    wait_for(driver, waits.invisibility_of_element_located((By.CLASS_NAME, 'react-datepicker__month-select')), description='seletor de data fechado')
+    
+    subjects_field = driver.find_element(By.ID, 'subjectsInput')
+    driver.execute_script("arguments[0].scrollIntoView(true);", subjects_field)
+    subjects_field.send_keys('Math')
+    subjects_field.send_keys(Keys.RETURN)
+    wait_for(driver, waits.text_present_in_any((By.XPATH, '//div[contains(@class, "multi-value__label")]'), 'Math'), description='Subject adicionado')
+
+    hobbies_checkbox = driver.find_element(By.XPATH, '//label[text()="Sports"]')
+    driver.execute_script("arguments[0].scrollIntoView(true);", hobbies_checkbox)
+    hobbies_checkbox.click()
+    wait_for(driver, waits.element_located_to_be_selected((By.ID, 'hobbies-checkbox-1')), description='hobby selecionado')
+    
+    current_address_field = driver.find_element(By.ID, 'currentAddress')
+    driver.execute_script("arguments[0].scrollIntoView(true);", current_address_field)
+    current_address_field.send_keys('123 Current St, Current City')
+    wait_for(driver, waits.value_equals((By.ID, 'currentAddress'), '123 Current St, Current City'), description='Current Address preenchido')
+    
+    # Selecionar estado e cidade usando a caixa de seleção autocompletar
+    state_dropdown = driver.find_element(By.ID, 'react-select-3-input')
+    driver.execute_script("arguments[0].scrollIntoView(true);", state_dropdown)
+    state_dropdown.send_keys('NCR')
+    state_dropdown.send_keys(Keys.RETURN)
+    wait_for(driver, waits.text_present_in_any((By.XPATH, '//div[@id="state"]//div[contains(@class, "singleValue")]'), 'NCR'), description='estado selecionado')
+    
+    city_dropdown = driver.find_element(By.ID, 'react-select-4-input')
+    driver.execute_script("arguments[0].scrollIntoView(true);", city_dropdown)
+    city_dropdown.send_keys('Delhi')
+    city_dropdown.send_keys(Keys.RETURN)
+    wait_for(driver, waits.text_present_in_any((By.XPATH, '//div[@id="city"]//div[contains(@class, "singleValue")]'), 'Delhi'), description='cidade selecionada')
+
+def fill_practice_form_with_script(driver):
+    """
+    Preenche o formulário "Practice Form" em lote (PRACTICE_FORM_FIELDS): os campos simples em
+    uma única chamada execute_script e os react-select (Subjects, State e City) pelo teclado.
+
+    Args:
+        driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+    """
+    fill_form(driver, PRACTICE_FORM_FIELDS)
+    wait_for(driver, waits.text_present_in_any((By.XPATH, '//div[contains(@class, "multi-value__label")]'), 'Math'), description='Subject adicionado')
+    wait_for(driver, waits.text_present_in_any((By.XPATH, '//div[@id="city"]//div[contains(@class, "singleValue")]'), 'Delhi'), description='cidade selecionada')
+
+@metrics.timed()
 def interact_with_forms(driver):
     """
     Interage com a seção "Forms" do DemoQA.
 
     Args:
         driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+
+    Returns:
+        bool: True se a etapa foi concluída sem erros.
     """
     try:
         logger.info('Interagindo com a seção Forms')
-        driver.get('https://demoqa.com/automation-practice-form')
+        open_page(driver, f'{DEMOQA_BASE_URL}/automation-practice-form')
         
+        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.ID, 'firstName')))
+
         # Preencher os campos do formulário
-        first_name_field = WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.ID, 'firstName'))
-        )
-        driver.execute_script("arguments[0].scrollIntoView(true);", first_name_field)
-        first_name_field.send_keys('John')
-        time.sleep(2)
-        
-        last_name_field = driver.find_element(By.ID, 'lastName')
-        driver.execute_script("arguments[0].scrollIntoView(true);", last_name_field)
-        last_name_field.send_keys('Doe')
-        time.sleep(2)
+        if FORM_FILL_MODE == 'keys':
+            fill_practice_form_per_field(driver)
+        else:
+            fill_practice_form_with_script(driver)
 
-        email_field = driver.find_element(By.ID, 'userEmail')
-        driver.execute_script("arguments[0].scrollIntoView(true);", email_field)
-        email_field.send_keys('john.doe@example.com')
-        time.sleep(2)
-
-        gender_radio_button = driver.find_element(By.XPATH, '//label[text()="Male"]')
-        driver.execute_script("arguments[0].scrollIntoView(true);", gender_radio_button)
-        gender_radio_button.click()
-        time.sleep(2)
-
-        mobile_field = driver.find_element(By.ID, 'userNumber')
-        driver.execute_script("arguments[0].scrollIntoView(true);", mobile_field)
-        mobile_field.send_keys('1234567890')
-        time.sleep(2)
-
-        # Interagir com o seletor de data de nascimento
-        date_of_birth_field = driver.find_element(By.ID, 'dateOfBirthInput')
-        driver.execute_script("arguments[0].scrollIntoView(true);", date_of_birth_field)
-        date_of_birth_field.click()
-        time.sleep(2)
-
-        # Selecionar mês e ano
-        month_select = driver.find_element(By.CLASS_NAME, 'react-datepicker__month-select')
-        month_select.click()
-        month_option = driver.find_element(By.XPATH, '//option[@value="2"]')  # Março é o mês 2 (0 indexado)
-        month_option.click()
-        time.sleep(2)
-
-        year_select = driver.find_element(By.CLASS_NAME, 'react-datepicker__year-select')
-        year_select.click()
-        year_option = driver.find_element(By.XPATH, '//option[@value="1998"]')
-        year_option.click()
-        time.sleep(2)
-
-        # Selecionar dia
-        day_select = driver.find_element(By.XPATH, '//div[contains(@class, "react-datepicker__day--022") and not(contains(@class, "react-datepicker__day--outside-month"))]')
-        day_select.click()
-        time.sleep(2)
-        
-        subjects_field = driver.find_element(By.ID, 'subjectsInput')
-        driver.execute_script("arguments[0].scrollIntoView(true);", subjects_field)
-        subjects_field.send_keys('Math')
-        subjects_field.send_keys(Keys.RETURN)
-        time.sleep(2)
-
-        hobbies_checkbox = driver.find_element(By.XPATH, '//label[text()="Sports"]')
-        driver.execute_script("arguments[0].scrollIntoView(true);", hobbies_checkbox)
-        hobbies_checkbox.click()
-        time.sleep(2)
-        
-        current_address_field = driver.find_element(By.ID, 'currentAddress')
-        driver.execute_script("arguments[0].scrollIntoView(true);", current_address_field)
-        current_address_field.send_keys('123 Current St, Current City')
-        time.sleep(2)
-        
-        # Selecionar estado e cidade usando a caixa de seleção autocompletar
-        state_dropdown = driver.find_element(By.ID, 'react-select-3-input')
-        driver.execute_script("arguments[0].scrollIntoView(true);", state_dropdown)
-        state_dropdown.send_keys('NCR')
-        state_dropdown.send_keys(Keys.RETURN)
-        time.sleep(2)
-        
-        city_dropdown = driver.find_element(By.ID, 'react-select-4-input')
-        driver.execute_script("arguments[0].scrollIntoView(true);", city_dropdown)
-        city_dropdown.send_keys('Delhi')
-        city_dropdown.send_keys(Keys.RETURN)
-        time.sleep(2)
-        
         # Rolar a página até o botão "Submit"
         submit_button = driver.find_element(By.ID, 'submit')
         driver.execute_script("arguments[0].scrollIntoView(true);", submit_button)
@@ -274,165 +413,370 @@ def interact_with_forms(driver):
         # Esperar até que o botão "Submit" esteja presente e clicável
         WebDriverWait(driver, 10).until(EC.element_to_be_clickable((By.ID, 'submit')))
         submit_button.click()
-        time.sleep(2)
+        wait_for(driver, waits.visibility_of_element_located((By.ID, 'example-modal-sizes-title-lg')), description='confirmação do formulário exibida')
 
         logger.info('Formulário preenchido e enviado com sucesso')
+        return True
     except Exception as e:
         error_message = f'Erro durante a interação com Forms: {e}'
         logger.error(error_message)
         add_error_report(error_message)
+        return False
 
+@metrics.timed()
 def interact_with_alerts_frames_windows(driver):
     """
     Interage com a seção "Alerts, Frame & Windows" do DemoQA.
 
     Args:
         driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+
+    Returns:
+        bool: True se a etapa foi concluída sem erros.
     """
     try:
         logger.info('Interagindo com a seção Alerts, Frame & Windows')
-        driver.get('https://demoqa.com/alertsWindows')
-        time.sleep(2)
+        open_page(driver, f'{DEMOQA_BASE_URL}/alertsWindows')
         
         # Clicar no item "Browser Windows" no menu à esquerda
         browser_windows_menu_item = WebDriverWait(driver, 10).until(
             EC.element_to_be_clickable((By.XPATH, '//span[text()="Browser Windows"]'))
         )
         browser_windows_menu_item.click()
-        time.sleep(2)
+        wait_for(driver, waits.url_contains('browser-windows'), description='página Browser Windows aberta')
         
         # Clicar no botão "New Tab"
         new_tab_button = WebDriverWait(driver, 10).until(
             EC.element_to_be_clickable((By.ID, 'tabButton'))
         )
         new_tab_button.click()
-        time.sleep(2)
+        wait_for(driver, waits.number_of_windows_to_be(2), description='nova aba aberta')
         
         # Alternar para a nova aba
         driver.switch_to.window(driver.window_handles[1])
         logger.info('Nova aba aberta')
-        time.sleep(2)
+        wait_for(driver, waits.url_contains('sample'), description='página da nova aba carregada')
         
         # Fechar a nova aba
         driver.close()
         logger.info('Nova aba fechada')
-        time.sleep(2)
+        wait_for(driver, waits.number_of_windows_to_be(1), description='nova aba fechada')
         
         # Alternar de volta para a aba original
         driver.switch_to.window(driver.window_handles[0])
         logger.info('Retornado para a aba original')
         
         logger.info('Interação com Alerts, Frame & Windows concluída com sucesso')
+        return True
     except Exception as e:
         error_message = f'Erro durante a interação com Alerts, Frame & Windows: {e}'
         logger.error(error_message)
         add_error_report(error_message)
+        return False
 
+@metrics.timed()
 def interact_with_widgets(driver):
     """
     Interage com a seção "Widgets" do DemoQA.
 
     Args:
         driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+
+    Returns:
+        bool: True se a etapa foi concluída sem erros.
     """
     try:
         logger.info('Interagindo com a seção Widgets')
-        driver.get('https://demoqa.com/widgets')
-        time.sleep(2)
+        open_page(driver, f'{DEMOQA_BASE_URL}/widgets')
 
         # Clicar no item "Accordian" no menu à esquerda
         accordian_menu_item = WebDriverWait(driver, 10).until(
             EC.element_to_be_clickable((By.XPATH, '//span[text()="Accordian"]'))
         )
         accordian_menu_item.click()
-        time.sleep(2)
+        wait_for(driver, waits.url_contains('accordian'), description='página Accordian aberta')
         
         # Fechar "What is Lorem Ipsum?" que já está aberto
         lorem_ipsum_section = WebDriverWait(driver, 10).until(
             EC.element_to_be_clickable((By.ID, 'section1Heading'))
         )
         lorem_ipsum_section.click()  # Fechar
+        wait_for(driver, waits.collapse_state((By.ID, 'section1Heading'), expanded=False), description='seção 1 fechada')
         logger.info('Fechou "What is Lorem Ipsum?"')
-        time.sleep(2)
 
         # Expandir e fechar "Where does it come from?"
         where_from_section = driver.find_element(By.ID, 'section2Heading')
         where_from_section.click()
+        wait_for(driver, waits.collapse_state((By.ID, 'section2Heading'), expanded=True), description='seção 2 aberta')
         logger.info('Expandiu "Where does it come from?"')
-        time.sleep(2)
         where_from_section.click()
+        wait_for(driver, waits.collapse_state((By.ID, 'section2Heading'), expanded=False), description='seção 2 fechada')
         logger.info('Fechou "Where does it come from?"')
-        time.sleep(2)
 
         # Expandir e fechar "Why do we use it?"
         why_use_section = driver.find_element(By.ID, 'section3Heading')
         why_use_section.click()
+        wait_for(driver, waits.collapse_state((By.ID, 'section3Heading'), expanded=True), description='seção 3 aberta')
         logger.info('Expandiu "Why do we use it?"')
-        time.sleep(2)
         why_use_section.click()
+        wait_for(driver, waits.collapse_state((By.ID, 'section3Heading'), expanded=False), description='seção 3 fechada')
         logger.info('Fechou "Why do we use it?"')
-        time.sleep(2)
 
         logger.info('Interação com Widgets concluída com sucesso')
+        return True
     except Exception as e:
         error_message = f'Erro durante a interação com Widgets: {e}'
         logger.error(error_message)
         add_error_report(error_message)
+        return False
 
-from selenium.webdriver import ActionChains
-
+@metrics.timed()
 def interact_with_interactions(driver):
     """
     Interage com a seção "Interactions" do DemoQA.
 
     Args:
         driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+
+    Returns:
+        bool: True se a etapa foi concluída sem erros.
     """
     try:
         logger.info('Interagindo com a seção Interactions')
-        driver.get('https://demoqa.com/interaction')
-        time.sleep(2)
+        open_page(driver, f'{DEMOQA_BASE_URL}/interaction')
 
         # Clicar no item "Sortable" no menu à esquerda
         sortable_menu_item = WebDriverWait(driver, 10).until(
             EC.element_to_be_clickable((By.XPATH, '//span[text()="Sortable"]'))
         )
         sortable_menu_item.click()
-        time.sleep(2)
+        wait_for(driver, waits.url_contains('sortable'), description='página Sortable aberta')
         
         # Selecionar a aba "List"
         list_tab = WebDriverWait(driver, 10).until(
             EC.element_to_be_clickable((By.ID, 'demo-tab-list'))
         )
         list_tab.click()
-        time.sleep(2)
+        wait_for(driver, waits.visibility_of_element_located((By.ID, 'demo-tabpane-list')), description='aba List exibida')
 
         # Pegar os elementos da lista
-        items = driver.find_elements(By.XPATH, '//div[@id="demo-tabpane-list"]//div[@class="list-group-item list-group-item-action"]')
+        items_locator = (By.XPATH, '//div[@id="demo-tabpane-list"]//div[@class="list-group-item list-group-item-action"]')
+        items = driver.find_elements(*items_locator)
         
         # Criar uma instância de ActionChains
         actions = ActionChains(driver)
 
-        # Realizar a ação de arrastar e soltar
+        # Realizar a ação de arrastar e soltar, esperando a lista se estabilizar após cada movimento
         actions.click_and_hold(items[0]).move_to_element(items[2]).release().perform()
-        time.sleep(2)
+        wait_for(driver, waits.dom_settled(items_locator), description='lista estabilizada')
         actions.click_and_hold(items[1]).move_to_element(items[4]).release().perform()
-        time.sleep(2)
+        wait_for(driver, waits.dom_settled(items_locator), description='lista estabilizada')
         actions.click_and_hold(items[2]).move_to_element(items[5]).release().perform()
-        time.sleep(2)
+        wait_for(driver, waits.dom_settled(items_locator), description='lista estabilizada')
 
         logger.info('Interação com Interactions concluída com sucesso')
+        return True
     except Exception as e:
         error_message = f'Erro durante a interação com Interactions: {e}'
         logger.error(error_message)
         add_error_report(error_message)
+        return False
+
+# Script executado no navegador para extrair a tabela de livros da página atual
+# em uma única chamada. Retorna a primeira linha (usada para detectar a troca de
+# página), os livros serializados em JSON, se o botão "Next" está habilitado e o
+# próprio botão, clicado sem uma nova busca no ChromeDriver.
+BOOK_TABLE_SCRIPT = """
+const rows = document.querySelectorAll('.rt-tr-group');
+const books = [];
+for (const row of rows) {
+    const img = row.querySelector('img');
+    const title = row.querySelector('span[id]');
+    const cells = Array.from(row.querySelectorAll('div.rt-td[role="gridcell"]'))
+        .filter(cell => cell.className === 'rt-td');
+    if (img && title && cells.length >= 4) {
+        books.push({
+            image: img.src,
+            title: title.innerText.trim(),
+            author: cells[2].innerText.trim(),
+            publisher: cells[3].innerText.trim()
+        });
+    }
+}
+const next = Array.from(document.querySelectorAll('button'))
+    .find(button => button.textContent.trim() === 'Next');
+const hasNext = next ? !(next.disabled || next.className.includes('disabled')) : null;
+return [rows.length ? rows[0] : null, JSON.stringify(books), hasNext, next || null];
+"""
+
+def extract_books_with_script(driver):
+    """
+    Extrai os livros da página atual com uma única chamada execute_script.
+
+    Args:
+        driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+
+    Returns:
+        tuple: Primeira linha da tabela, lista de dicionários com os dados dos livros,
+        se existe próxima página e o botão "Next" (None quando o botão não foi encontrado).
+    """
+    first_row, books_json, has_next, next_button = driver.execute_script(BOOK_TABLE_SCRIPT)
+    return first_row, json.loads(books_json), has_next, next_button
+
+def extract_books_per_element(driver):
+    """
+    Extrai os livros da página atual consultando cada elemento individualmente.
+
+    Args:
+        driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+
+    Returns:
+        tuple: Primeira linha da tabela, lista de dicionários com os dados dos livros
+        e None duas vezes, pois o botão "Next" não é verificado neste modo.
+    """
+    page_books = []
+
+    # Encontrar todos os livros na tabela
+    books = driver.find_elements(By.CLASS_NAME, 'rt-tr-group')
+
+    for book in books:
+        try:
+            # Verificar se todos os campos necessários estão presentes
+            img_element = book.find_elements(By.XPATH, './/img')
+            title_element = book.find_elements(By.XPATH, './/span[@id]')
+            author_elements = book.find_elements(By.XPATH, './/div[@class="rt-td" and @role="gridcell"]')
+
+            if img_element and title_element and len(author_elements) >= 4:
+                image = img_element[0].get_attribute('src')
+                title = title_element[0].text
+                author = author_elements[2].text
+                publisher = author_elements[3].text
+
+                page_books.append({
+                    "image": image,
+                    "title": title,
+                    "author": author,
+                    "publisher": publisher
+                })
+        except (NoSuchElementException, TimeoutException) as e:
+            # O HTML do elemento vai apenas para o log, limitado a 500 caracteres
+            error_message = f'Erro ao coletar dados de um livro: {e.msg}'
+            logger.error(error_message, extra={'html': truncate(book.get_attribute('outerHTML'), 500)})
+            add_error_report(error_message)
+            continue
+
+    return (books[0] if books else None), page_books, None, None
+
+def get_total_book_pages(driver):
+    """
+    Lê o total de páginas exibido na paginação da tabela de livros.
+
+    Args:
+        driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+
+    Returns:
+        int: Total de páginas (1 se a paginação não for encontrada).
+    """
+    try:
+        total_pages = driver.find_element(By.CLASS_NAME, '-totalPages').text
+        return max(1, int(total_pages))
+    except (NoSuchElementException, ValueError):
+        return 1
+
+def go_to_book_page(driver, page):
+    """
+    Vai diretamente para uma página da tabela de livros usando o campo "jump to page".
+
+    Args:
+        driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+        page (int): Número da página (começando em 1).
+    """
+    first_row = driver.find_element(By.CLASS_NAME, 'rt-tr-group')
+    page_jump = driver.find_element(By.CSS_SELECTOR, '.-pageJump input')
+    if page_jump.get_attribute('value') == str(page):
+        return
+    page_jump.send_keys(Keys.CONTROL, 'a', Keys.NULL, str(page), Keys.RETURN)
+    WebDriverWait(driver, 10).until(EC.staleness_of(first_row))
+
+def iter_book_pages(driver, start_page=1, end_page=None, extraction_mode=None):
+    """
+    Percorre as páginas da tabela de livros, produzindo os livros de cada página.
 
-def collect_book_data(driver):
+    Args:
+        driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+        start_page (int): Primeira página a ser coletada (começando em 1).
+        end_page (int, optional): Última página a ser coletada. Se não informada,
+            a coleta segue até a última página disponível.
+        extraction_mode (str, optional): 'script' para extrair cada página com uma única
+            chamada execute_script ou 'element' para o caminho elemento a elemento.
+            Por padrão usa BOOK_EXTRACTION_MODE. Se o modo 'script' falhar, a coleta
+            continua no modo 'element'.
+
+    Yields:
+        tuple: Número da página e lista de dicionários com os dados dos livros da página.
+    """
+    extraction_mode = extraction_mode or BOOK_EXTRACTION_MODE
+    page_start = time.perf_counter()
+    open_page(driver, BOOKS_URL)
+    WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'rt-tr-group')))
+    if start_page > 1:
+        go_to_book_page(driver, start_page)
+
+    page = start_page
+    while True:
+        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'rt-tr-group')))
+
+        if extraction_mode == 'script':
+            try:
+                first_row, page_books, has_next, next_button = extract_books_with_script(driver)
+            except (WebDriverException, ValueError, TypeError) as e:
+                logger.warning(f'Falha na extração via script, usando extração por elemento: {e}')
+                extraction_mode = 'element'
+
+        if extraction_mode != 'script':
+            first_row, page_books, has_next, next_button = extract_books_per_element(driver)
+
+        # Tempo de cada página (espera, extração e navegação até ela) e livros por página
+        metrics.record('book_page', time.perf_counter() - page_start, books=len(page_books))
+        metrics.add('pages')
+        metrics.add('books', len(page_books))
+        yield page, page_books
+        page_start = time.perf_counter()
+
+        if end_page is not None and page >= end_page:
+            break
+
+        if has_next is False:
+            logger.info('Já está na última página de livros disponíveis.')
+            break
+
+        try:
+            # No modo 'script' o botão e o seu estado já vieram da extração; no modo 'element', são consultados aqui
+            if next_button is None:
+                next_button = driver.find_element(By.XPATH, '//button[text()="Next"]')
+                has_next = 'disabled' not in next_button.get_attribute('class')
+            if not has_next:
+                logger.info('Já está na última página de livros disponíveis.')
+                break  # Se o botão "Next" está desabilitado, saímos do loop
+            else:
+                next_button.click()  # Clicar no botão "Next"
+                WebDriverWait(driver, 10).until(EC.staleness_of(first_row))  # Esperar até que a página seja atualizada
+                page += 1
+        except NoSuchElementException:
+            logger.info('Botão "Next" não encontrado, terminando coleta.')
+            break  # Se o botão "Next" não for encontrado, saímos do loop
+        except ElementClickInterceptedException:
+            logger.info('Já está na última página de livros disponíveis.')
+            break  # Se o botão "Next" não for clicável, saímos do loop
+
+@metrics.timed()
+def collect_book_data(driver, extraction_mode=None):
     """
     Coleta dados dos livros disponíveis na seção "Book Store Application" do DemoQA.
 
     Args:
         driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+        extraction_mode (str, optional): Modo de extração repassado para iter_book_pages.
 
     Returns:
         list: Lista de dicionários contendo os dados dos livros.
@@ -440,105 +784,258 @@ def collect_book_data(driver):
     book_data = []
     try:
         logger.info('Iniciando coleta de dados dos livros')
-        driver.get('https://demoqa.com/books')
-        while True:
-            WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'rt-tr-group')))
+        for _, page_books in iter_book_pages(driver, extraction_mode=extraction_mode):
+            book_data.extend(page_books)
+        logger.info('Dados dos livros coletados com sucesso')
+    except Exception as e:
+        error_message = f'Erro na coleta de dados dos livros: {e}'
+        logger.error(error_message)
+        add_error_report(error_message)
+    return book_data
 
-            # Encontrar todos os livros na tabela
-            books = driver.find_elements(By.CLASS_NAME, 'rt-tr-group')
+def split_pages(total_pages, shards):
+    """
+    Divide as páginas em intervalos contíguos, um por sessão do navegador.
+
+    Args:
+        total_pages (int): Total de páginas da tabela de livros.
+        shards (int): Quantidade de intervalos desejada.
+
+    Returns:
+        list: Lista de tuplas (primeira página, última página).
+    """
+    shards = max(1, min(shards, total_pages))
+    size, remainder = divmod(total_pages, shards)
+    ranges = []
+    start = 1
+    for index in range(shards):
+        end = start + size - 1 + (1 if index < remainder else 0)
+        ranges.append((start, end))
+        start = end + 1
+    return ranges
+
+def merge_book_pages(pages):
+    """
+    Junta as páginas coletadas em ordem, removendo livros duplicados.
+
+    Args:
+        pages (list): Lista de tuplas (número da página, livros da página).
+
+    Returns:
+        list: Lista de dicionários contendo os dados dos livros.
+    """
+    book_data = []
+    seen = set()
+    for _, page_books in sorted(pages, key=lambda item: item[0]):
+        for book in page_books:
+            key = (book['title'], book['author'], book['publisher'])
+            if key not in seen:
+                seen.add(key)
+                book_data.append(book)
+    return book_data
+
+def _collect_book_shard(driver, start_page, end_page, extraction_mode):
+    """
+    Coleta um intervalo de páginas em uma sessão do navegador.
+
+    Returns:
+        list: Lista de tuplas (número da página, livros da página) coletadas.
+    """
+    pages = []
+    try:
+        logger.info(f'Coletando páginas {start_page} a {end_page} da Book Store')
+        pages.extend(iter_book_pages(driver, start_page, end_page, extraction_mode))
+    except Exception as e:
+        error_message = f'Erro na coleta das páginas {start_page} a {end_page} dos livros: {e}'
+        logger.error(error_message)
+        add_error_report(error_message)
+    return pages
 
-            for book in books:
+@metrics.timed()
+def collect_book_data_parallel(workers=None, extraction_mode=None, driver_factory=None):
+    """
+    Coleta os dados dos livros dividindo as páginas entre várias sessões headless do navegador.
+
+    Args:
+        workers (int, optional): Quantidade máxima de sessões. Por padrão usa BOOK_COLLECTION_WORKERS.
+        extraction_mode (str, optional): Modo de extração repassado para iter_book_pages.
+        driver_factory (callable, optional): Função que cria um novo WebDriver.
+            Por padrão cria um Chrome headless com create_driver.
+
+    Returns:
+        list: Lista de dicionários contendo os dados dos livros, na ordem das páginas e sem duplicados.
+    """
+    workers = workers or BOOK_COLLECTION_WORKERS
+    driver_factory = driver_factory or partial(create_driver, headless=True)
+    drivers = []
+    pages = []
+    try:
+        logger.info(f'Iniciando coleta paralela de dados dos livros com até {workers} sessões')
+
+        # A primeira sessão descobre o total de páginas antes de abrir as demais
+        drivers.append(driver_factory())
+        drivers[0].get(BOOKS_URL)
+        WebDriverWait(drivers[0], 10).until(EC.presence_of_element_located((By.CLASS_NAME, 'rt-tr-group')))
+        total_pages = get_total_book_pages(drivers[0])
+        sessions = min(workers, total_pages)
+
+        with ThreadPoolExecutor(max_workers=sessions) as executor:
+            # Sessões que falharem ao iniciar apenas reduzem o paralelismo
+            for future in [executor.submit(driver_factory) for _ in range(sessions - 1)]:
                 try:
-                    # Verificar se todos os campos necessários estão presentes
-                    img_element = book.find_elements(By.XPATH, './/img')
-                    title_element = book.find_elements(By.XPATH, './/span[@id]')
-                    author_elements = book.find_elements(By.XPATH, './/div[@class="rt-td" and @role="gridcell"]')
-
-                    if img_element and title_element and len(author_elements) >= 4:
-                        image = img_element[0].get_attribute('src')
-                        title = title_element[0].text
-                        author = author_elements[2].text
-                        publisher = author_elements[3].text
-
-                        book_data.append({
-                            "image": image,
-                            "title": title,
-                            "author": author,
-                            "publisher": publisher
-                        })
-                except (NoSuchElementException, TimeoutException) as e:
-                    error_message = f'Erro ao coletar dados de um livro: {e}\nHTML do elemento: {book.get_attribute("outerHTML")}\nStacktrace: {e.stacktrace}'
-                    logger.error(error_message)
-                    add_error_report(error_message)
-                    continue
-            
-            try:
-                # Verificar se o botão "Next" está habilitado
-                next_button = driver.find_element(By.XPATH, '//button[text()="Next"]')
-                if 'disabled' in next_button.get_attribute('class'):
-                    logger.info('Já está na última página de livros disponíveis.')
-                    break  # Se o botão "Next" está desabilitado, saímos do loop
-                else:
-                    next_button.click()  # Clicar no botão "Next"
-                    WebDriverWait(driver, 10).until(EC.staleness_of(books[0]))  # Esperar até que a página seja atualizada
-            except NoSuchElementException:
-                logger.info('Botão "Next" não encontrado, terminando coleta.')
-                break  # Se o botão "Next" não for encontrado, saímos do loop
-            except ElementClickInterceptedException:
-                logger.info('Já está na última página de livros disponíveis.')
-                break  # Se o botão "Next" não for clicável, saímos do loop
+                    drivers.append(future.result())
+                except Exception as e:
+                    logger.warning(f'Falha ao iniciar uma sessão do navegador: {e}')
+
+            shards = split_pages(total_pages, len(drivers))
+            results = executor.map(
+                lambda args: _collect_book_shard(args[0], args[1][0], args[1][1], extraction_mode),
+                zip(drivers, shards)
+            )
+            for shard_pages in results:
+                pages.extend(shard_pages)
 
+        # As sessões coletam em threads próprias: as contagens são somadas aqui
+        metrics.add('pages', len(pages))
         logger.info('Dados dos livros coletados com sucesso')
     except Exception as e:
-        error_message = f'Erro na coleta de dados dos livros: {e}'
+        error_message = f'Erro na coleta paralela de dados dos livros: {e}'
         logger.error(error_message)
         add_error_report(error_message)
+    finally:
+        for driver in drivers:
+            driver.quit()
+    book_data = merge_book_pages(pages)
+    metrics.add('books', len(book_data))
     return book_data
 
+def map_api_book(record):
+    """
+    Converte um registro do endpoint /BookStore/v1/Books para o formato coletado pelo navegador.
+
+    Args:
+        record (dict): Registro de livro retornado pela API.
+
+    Returns:
+        dict: Dicionário com as chaves image, title, author e publisher.
+    """
+    return {
+        "image": record.get('image'),  # A API não informa a capa: vazia, mantém a já gravada no upsert
+        "title": record.get('title'),
+        "author": record.get('author'),
+        "publisher": record.get('publisher')
+    }
+
+def fetch_book_data_api(url=None, timeout=10):
+    """
+    Busca o catálogo de livros diretamente no endpoint JSON da Book Store, sem o navegador.
+
+    Args:
+        url (str, optional): URL do endpoint. Por padrão usa BOOKS_API_URL.
+        timeout (float): Tempo máximo de espera pela resposta, em segundos.
+
+    Returns:
+        list: Lista de dicionários contendo os dados dos livros.
+
+    Raises:
+        OSError: Se a requisição ou a leitura da resposta falhar (inclui URLError e BadGzipFile).
+        http.client.HTTPException: Se a resposta chegar incompleta ou malformada.
+        EOFError, zlib.error: Se o corpo compactado estiver truncado ou corrompido.
+        ValueError: Se a resposta não for um catálogo válido.
+    """
+    request = urllib.request.Request(
+        url or BOOKS_API_URL,
+        headers={'Accept': 'application/json', 'Accept-Encoding': 'gzip'}
+    )
+    with urllib.request.urlopen(request, timeout=timeout) as response:
+        body = response.read()
+        if response.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+
+    records = json.loads(body).get('books')
+    if not records:
+        raise ValueError('A resposta da API não contém livros')
+    return [map_api_book(record) for record in records]
+
+def collects_single_page():
+    """
+    Indica se o coletor configurado entrega o catálogo inteiro como uma única página
+    (modo 'direct' ou coleta paralela), sem suporte a retomar a partir de uma página.
+    """
+    return BOOK_COLLECTOR == 'direct' or BOOK_COLLECTION_WORKERS > 1
+
+def iter_books(driver, start_page=1):
+    """
+    Gera as páginas de livros pelo coletor configurado em BOOK_COLLECTOR.
+
+    No modo 'direct' o catálogo é buscado na API JSON e o navegador só é usado se a API falhar.
+    No navegador, a coleta é paralela quando BOOK_COLLECTION_WORKERS é maior que 1; nesse caso
+    e no modo 'direct', o catálogo inteiro é entregue como uma única página.
+
+    Args:
+        driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+        start_page (int): Página a partir da qual a coleta pelo navegador começa (ao retomar uma coleta).
+
+    Yields:
+        tuple: Número da página e lista de dicionários com os dados dos livros da página.
+    """
+    if BOOK_COLLECTOR == 'direct':
+        book_data = None
+        try:
+            logger.info('Coletando dados dos livros pela API da Book Store')
+            book_data = fetch_book_data_api()
+            logger.info('Dados dos livros coletados pela API com sucesso')
+        except (OSError, http.client.HTTPException, EOFError, zlib.error, ValueError, AttributeError) as e:
+            logger.warning(f'Falha ao coletar os livros pela API, usando o navegador: {e}')
+        if book_data:
+            yield 1, book_data
+            return
+
+    if BOOK_COLLECTION_WORKERS > 1:
+        yield 1, collect_book_data_parallel()
+        return
+
+    logger.info('Iniciando coleta de dados dos livros')
+    yield from iter_book_pages(driver, start_page=start_page)
+    logger.info('Dados dos livros coletados com sucesso')
+
+def get_database_backend():
+    """
+    Cria o backend de banco de dados configurado em DB_BACKEND.
+
+    Returns:
+        SQLServerBackend | SQLiteBackend: Backend de gravação dos livros.
+    """
+    return create_backend(
+        DB_BACKEND,
+        server=SQL_SERVER,
+        database=SQL_DATABASE,
+        username=SQL_USERNAME,
+        password=SQL_PASSWORD,
+        path=SQLITE_PATH
+    )
+
+@metrics.timed()
 def save_to_database(book_data):
     """
-    Salva os dados dos livros em um banco de dados SQL Server.
+    Salva os dados dos livros no banco de dados configurado (SQL Server por padrão).
+
+    No modo 'upsert' (padrão), livros já gravados são identificados por título e autor
+    e apenas as linhas novas ou alteradas são escritas.
 
     Args:
         book_data (list): Lista de dicionários contendo os dados dos livros.
     """
     try:
-        conn = pyodbc.connect(
-            f'DRIVER={{ODBC Driver 18 for SQL Server}};'
-            f'SERVER={SQL_SERVER};'
-            f'DATABASE={SQL_DATABASE};'
-            f'UID={SQL_USERNAME};'
-            f'PWD={SQL_PASSWORD};'
-            'TrustServerCertificate=yes;'
-        )
-        cursor = conn.cursor()
-
-        cursor.execute('''
-            IF NOT EXISTS (SELECT * FROM sysobjects WHERE name='Books' and xtype='U')
-            CREATE TABLE Books (
-                id INT IDENTITY(1,1) PRIMARY KEY,
-                image NVARCHAR(MAX),
-                title NVARCHAR(255),
-                author NVARCHAR(255),
-                publisher NVARCHAR(255)
-            )
-        ''')
-
-        for book in book_data:
-            cursor.execute('''
-                INSERT INTO Books (image, title, author, publisher)
-                VALUES (?, ?, ?, ?)
-            ''', book['image'], book['title'], book['author'], book['publisher'])
-
-        conn.commit()
-        cursor.close()
-        conn.close()
-        logger.info('Dados salvos no banco de dados com sucesso')
+        written = write_books(get_database_backend(), book_data, mode=DB_WRITE_MODE, batch_size=DB_BATCH_SIZE)
+        metrics.add('rows', written)
+        logger.info(f'Dados salvos no banco de dados com sucesso ({written} linhas gravadas)')
     except Exception as e:
         error_message = f'Erro ao salvar dados no banco de dados: {e}'
         logger.error(error_message)
         add_error_report(error_message)
 
+@metrics.timed()
 def export_to_csv(book_data):
     """
     Exporta os dados dos livros para um arquivo CSV.
@@ -547,54 +1044,362 @@ def export_to_csv(book_data):
         book_data (list): Lista de dicionários contendo os dados dos livros.
     """
     try:
-        df = pd.DataFrame(book_data)
-        df.to_csv('data/books.csv', index=False)
+        exporter = CsvExporter(os.path.join('data', 'books.csv'))
+        try:
+            exporter.write(book_data)
+        finally:
+            exporter.close()
+        metrics.add('rows', exporter.rows)
         logger.info('Dados exportados para CSV com sucesso')
     except Exception as e:
         error_message = f'Erro ao exportar dados para CSV: {e}'
         logger.error(error_message)
         add_error_report(error_message)
 
-if __name__ == '__main__':
-    driver = None
+@metrics.timed()
+def run_book_pipeline(driver):
+    """
+    Coleta os livros e os grava no banco de dados e no arquivo exportado à medida que cada página é coletada.
+
+    O banco de dados e o exportador (EXPORT_FORMAT, src/exporters.py) consomem as páginas em paralelo com a coleta, por meio de filas
+    limitadas a PIPELINE_QUEUE_SIZE páginas. Com CRAWL_CHECKPOINT ativo, uma coleta interrompida
+    é retomada da primeira página não gravada, e páginas cujo conteúdo não mudou desde a última
+    execução não são regravadas no banco de dados. Com COVER_CACHE ativo, as capas de cada
+    página são baixadas para o cache antes da gravação.
+
+    Args:
+        driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+
+    Returns:
+        dict: Quantidade de páginas coletadas e de linhas gravadas por destino, ou None em caso de erro.
+    """
+    checkpoint = CheckpointedCrawl(CheckpointStore(CHECKPOINT_PATH), 'books') if CRAWL_CHECKPOINT else None
+    start_page = checkpoint.start_page if checkpoint else 1
+    if start_page > 1 and collects_single_page():
+        # O catálogo inteiro vem como a página 1: acrescentá-lo ao arquivo exportado duplicaria as linhas
+        logger.info(f'Coleta interrompida na página {start_page} recomeçada do início: o coletor entrega o catálogo inteiro de uma vez')
+        start_page = 1
+    elif start_page > 1:
+        logger.info(f'Retomando a coleta de livros a partir da página {start_page}')
+
     try:
-        logger.info('Inicializando o WebDriver do Chrome')
-        
-        # Configuração para suprimir mensagens de erro do ChromeDriver
-        chrome_options = Options()
-        chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
-        
-        service = Service(CHROME_DRIVER_PATH)
-        driver = webdriver.Chrome(service=service, options=chrome_options)
+        exporter = create_exporter(EXPORT_FORMAT, EXPORT_DIRECTORY, compression=EXPORT_COMPRESSION,
+                                   partitioned=EXPORT_PARTITIONED, append=start_page > 1)
+    except Exception as e:
+        error_message = f'Erro ao configurar a exportação dos livros: {e}'
+        logger.error(error_message)
+        add_error_report(error_message)
+        if checkpoint:
+            checkpoint.store.close()
+        return None
+
+    sinks = [
+        DatabaseSink(get_database_backend(), mode=DB_WRITE_MODE, batch_size=DB_BATCH_SIZE),
+        exporter
+    ]
+    pages = iter_books(driver, start_page)
+    if COVER_CACHE:
+        cover_cache = CoverCache(COVER_CACHE_DIRECTORY, max_bytes=COVER_CACHE_MAX_MB * 1024 * 1024)
+        pages = with_covers(pages, cover_cache, concurrency=COVER_DOWNLOAD_CONCURRENCY)
+    try:
+        if checkpoint:
+            stats = run_pipeline(checkpoint.mark(pages), sinks, queue_size=PIPELINE_QUEUE_SIZE,
+                                 on_page_written=checkpoint.page_written)
+            checkpoint.finish()
+            stats['unchanged_pages'] = checkpoint.skipped
+        else:
+            stats = run_pipeline(pages, sinks, queue_size=PIPELINE_QUEUE_SIZE)
+        for sink in sinks:
+            metrics.add(f'rows_{sink.name}', sink.rows)
+        logger.info(f'Livros coletados e gravados: {stats}')
+        return stats
+    except PipelineError as e:
+        error_message = f'Erro no pipeline de livros ({e.stage}): {e.error}'
+        logger.error(error_message)
+        add_error_report(error_message)
+        return None
+    finally:
+        if checkpoint:
+            checkpoint.store.close()
 
-        logger.info('WebDriver inicializado com sucesso')
+def block_requests(driver, patterns=None):
+    """
+    Bloqueia no navegador as requisições cujas URLs correspondem aos padrões (CDP Network.setBlockedURLs).
 
-        # Realizar login e coleta de dados
-        login_demoqa(driver, DEMOQA_USERNAME, DEMOQA_PASSWORD)
-        
-        # Interagir com cada seção
-        interact_with_elements(driver)
-        interact_with_forms(driver)
-        interact_with_alerts_frames_windows(driver)
-        interact_with_widgets(driver)
-        interact_with_interactions(driver)
-        
-        # Coletar dados da Book Store Application
-        book_data = collect_book_data(driver)
-        
-        # Salvar dados no banco de dados
-        save_to_database(book_data)
-        
-        # Exportar dados para CSV
-        export_to_csv(book_data)
+    O comando é enviado pelo endpoint executeCdpCommand do ChromeDriver, que atende tanto
+    instâncias locais quanto sessões do pool (webdriver.Remote).
 
-        logger.info(f'Dados coletados: {book_data}')
+    Args:
+        driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+        patterns (list, optional): Padrões de URL com curinga '*'. Por padrão usa BLOCKED_URL_PATTERNS.
+    """
+    patterns = BLOCKED_URL_PATTERNS if patterns is None else patterns
+    driver.execute('executeCdpCommand', {'cmd': 'Network.enable', 'params': {}})
+    driver.execute('executeCdpCommand', {'cmd': 'Network.setBlockedURLs', 'params': {'urls': list(patterns)}})
+
+def create_driver(headless=False, page_load_strategy=None, blocked_url_patterns=None):
+    """
+    Cria uma instância do WebDriver do Chrome.
+
+    Args:
+        headless (bool): Se True, o navegador é iniciado sem interface gráfica.
+        page_load_strategy (str, optional): 'normal', 'eager' ou 'none'. Por padrão usa PAGE_LOAD_STRATEGY.
+        blocked_url_patterns (list, optional): Padrões de URL bloqueados. Por padrão usa
+            BLOCKED_URL_PATTERNS; uma lista vazia desativa o bloqueio.
+
+    Returns:
+        webdriver.Chrome: Instância do WebDriver do Chrome.
+    """
+    # Configuração para suprimir mensagens de erro do ChromeDriver
+    chrome_options = Options()
+    chrome_options.add_experimental_option('excludeSwitches', ['enable-logging'])
+    chrome_options.page_load_strategy = page_load_strategy or PAGE_LOAD_STRATEGY
+    if headless:
+        chrome_options.add_argument('--headless=new')
+
+    service = Service(CHROME_DRIVER_PATH)
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+
+    patterns = BLOCKED_URL_PATTERNS if blocked_url_patterns is None else blocked_url_patterns
+    if patterns:
+        block_requests(driver, patterns)
+    return profiler.attach(driver)
+
+def run_profiled_step(name, func, driver):
+    """
+    Executa uma etapa do robô marcando os seus comandos no profiler.
+
+    Args:
+        name (str): Nome da etapa.
+        func (callable): Função da etapa, que recebe o driver.
+        driver (webdriver.Chrome): Instância do WebDriver do Chrome.
+
+    Raises:
+        StepError: Se a etapa retornar False, com o erro que ela registrou no relatório (o
+            erro do resultado da etapa e da linha da conta em AccountRuns).
+    """
+    _thread_errors.last = None
+    with profiler.step(name):
+        success = func(driver)
+    if success is False and _thread_errors.last:
+        raise StepError(_thread_errors.last)
+    return success
+
+def build_steps(username, password):
+    """
+    Monta as etapas do robô para uma conta.
+
+    Login e coleta dos livros compartilham a sessão principal; as seções são independentes
+    e podem rodar em paralelo, cada uma em seu próprio navegador.
+
+    Args:
+        username (str): Nome de usuário para login.
+        password (str): Senha para login.
+
+    Returns:
+        list: Etapas (scheduler.Step), com os comandos de cada uma marcados no profiler. Cada
+            etapa retorna False quando registra um erro, o que a marca como 'failed' (o login
+            com falha pula a coleta dos livros).
+    """
+    steps = [
+        Step('login', lambda driver: login_demoqa(driver, username, password), session='main'),
+        Step('elements', flow('elements', interact_with_elements)),
+        Step('forms', flow('forms', interact_with_forms)),
+        Step('alerts_frames_windows', flow('alerts_frames_windows', interact_with_alerts_frames_windows)),
+        Step('widgets', flow('widgets', interact_with_widgets)),
+        Step('interactions', flow('interactions', interact_with_interactions)),
+        # Coletar dados da Book Store Application, salvando no banco de dados e no CSV durante a coleta
+        # (run_book_pipeline retorna None em caso de erro)
+        Step('books', lambda driver: run_book_pipeline(driver) is not None, depends_on=('login',), session='main'),
+    ]
+    for step in steps:
+        step.func = partial(run_profiled_step, step.name, step.func)
+    return steps
+
+def run_account(account, steps=None, limiter=None, driver_factory=None):
+    """
+    Executa o login e as etapas selecionadas para uma conta, em um navegador próprio.
+
+    As etapas rodam em sequência no mesmo navegador; o paralelismo fica entre as contas.
+
+    Args:
+        account (dict): Conta com 'username' e 'password'.
+        steps (list, optional): Nomes das etapas executadas após o login. Por padrão usa ACCOUNT_STEPS.
+        limiter (accounts.RateLimiter, optional): Limitador aplicado às navegações do navegador.
+        driver_factory (callable, optional): Função que cria o driver. Por padrão, Chrome headless.
+
+    Returns:
+        dict: Resultado de cada etapa, no formato de scheduler.run_steps.
+    """
+    selected = ACCOUNT_STEPS if steps is None else steps
+    driver_factory = driver_factory or partial(create_driver, headless=True)
+    driver = driver_factory()
+    if limiter is not None:
+        throttle(driver, limiter)
+    try:
+        account_steps = [step for step in build_steps(account['username'], account['password'])
+                         if step.name == 'login' or step.name in selected]
+        return run_steps(account_steps, driver_factory, workers=1, sessions={'main': driver})
+    finally:
+        driver.quit()
+
+def run_for_accounts(path, workers=None, steps=None):
+    """
+    Executa o robô para todas as contas do arquivo de credenciais e grava o resultado de
+    cada etapa na tabela AccountRuns, identificado pela conta.
+
+    Args:
+        path (str): Arquivo de contas (ver accounts.load_accounts).
+        workers (int, optional): Contas em execução ao mesmo tempo. Por padrão usa ACCOUNT_WORKERS.
+        steps (list, optional): Etapas executadas após o login. Por padrão usa ACCOUNT_STEPS.
+
+    Returns:
+        dict: Resultado das etapas por usuário.
+    """
+    accounts = load_accounts(path)
+    limiter = RateLimiter(RATE_LIMIT, HOST_RATE_LIMIT, RATE_LIMIT_BURST)
+    workers = ACCOUNT_WORKERS if workers is None else workers
+    logger.info(f'Executando {len(accounts)} contas com {workers} navegadores')
+
+    run_at = datetime.now()
+    start = time.perf_counter()
+    results = run_accounts(accounts, partial(run_account, steps=steps, limiter=limiter), workers=workers)
+    elapsed = time.perf_counter() - start
+
+    for username, account_results in results.items():
+        for name, result in account_results.items():
+            if result['status'] != 'ok':
+                error_message = f'Conta {username}: etapa {name} não concluída ({result["status"]}): {result["error"]}'
+                logger.error(error_message)
+                add_error_report(error_message)
+    logger.info(f'{len(accounts)} contas em {elapsed:.1f} s ({len(accounts) / elapsed * 60:.1f} contas por minuto); '
+                f'{limiter.requests} navegações, {limiter.waited:.1f} s de espera pelo limite de requisições')
+
+    try:
+        written = write_account_runs(get_database_backend(), account_run_rows(results, run_at.isoformat(sep=' ', timespec='seconds')))
+        logger.info(f'Resultado das contas salvo no banco de dados ({written} linhas gravadas)')
+    except Exception as e:
+        error_message = f'Erro ao salvar o resultado das contas no banco de dados: {e}'
+        logger.error(error_message)
+        add_error_report(error_message)
+    return results
+
+def open_main_driver():
+    """
+    Inicializa o navegador principal: uma sessão emprestada do pool (BROWSER_POOL) ou um novo Chrome.
+
+    Returns:
+        tuple: Driver e cliente do pool (None quando o Chrome foi iniciado localmente).
+    """
+    if BROWSER_POOL:
+        try:
+            pool_client = BrowserPoolClient()
+            driver = profiler.attach(pool_client.lease(page_load_strategy=PAGE_LOAD_STRATEGY))
+            if BLOCKED_URL_PATTERNS:
+                block_requests(driver)
+            return driver, pool_client
+        except BrowserPoolError as e:
+            logger.warning(f'Pool de navegadores indisponível, iniciando o Chrome: {e}')
+    return create_driver(), None
+
+def close_main_driver(driver, pool_client):
+    """
+    Devolve a sessão ao pool ou fecha o navegador principal.
+    """
+    if driver and pool_client:
+        pool_client.release(driver)
+        pool_client.close()
+        logger.info('Sessão do navegador devolvida ao pool')
+    elif driver:
+        driver.quit()
+        logger.info('WebDriver fechado')
+
+def select_steps(steps, names):
+    """
+    Mantém apenas as etapas selecionadas, removendo as dependências de etapas fora da
+    seleção (a coleta dos livros não exige o login).
+
+    Args:
+        steps (list): Etapas (scheduler.Step).
+        names (list, optional): Nomes das etapas. Se None, mantém todas.
+
+    Returns:
+        list: Etapas selecionadas.
+    """
+    if names is None:
+        return steps
+    selected = [step for step in steps if step.name in names]
+    for step in selected:
+        step.depends_on = tuple(name for name in step.depends_on if name in names)
+    return selected
+
+def run_robot(step_names=None):
+    """
+    Executa o robô: login, seções interact_* e coleta dos livros, ou apenas as etapas de
+    step_names (ex.: ['books'] no subcomando collect-only). Com ACCOUNTS_FILE e sem seleção
+    de etapas, executa o robô para todas as contas do arquivo.
+
+    Os erros são registrados no log e no relatório de erros, gravado em reports/ ao final.
+    As métricas das etapas são gravadas em METRICS_TEXTFILE e no histórico RUN_HISTORY_PATH.
+
+    Args:
+        step_names (list, optional): Nomes das etapas executadas. Por padrão, todas.
+
+    Returns:
+        bool: True se a execução terminou sem erros.
+    """
+    driver = None
+    pool_client = None
+    metrics.start_run()
+    try:
+        if ACCOUNTS_FILE and step_names is None:
+            # Várias contas: cada conta roda em seu próprio navegador headless
+            run_for_accounts(ACCOUNTS_FILE)
+        else:
+            logger.info('Inicializando o WebDriver do Chrome')
+            driver, pool_client = open_main_driver()
+            logger.info('WebDriver inicializado com sucesso')
+
+            steps = select_steps(build_steps(DEMOQA_USERNAME, DEMOQA_PASSWORD), step_names)
+            workers = min(os.cpu_count() or 1, len(steps)) if SECTION_WORKERS == 'auto' else int(SECTION_WORKERS)
+            results = run_steps(steps, create_driver, workers=workers, sessions={'main': driver})
+            for name, result in results.items():
+                if result['status'] != 'ok':
+                    error_message = f'Etapa {name} não concluída ({result["status"]}): {result["error"]}'
+                    logger.error(error_message)
+                    add_error_report(error_message)
+            logger.info('Duração das etapas: ' + ', '.join(f'{name} {result["duration"]:.1f} s' for name, result in results.items()))
     except Exception as e:
         error_message = f'Erro na execução principal: {e}'
         logger.error(error_message)
         add_error_report(error_message)
     finally:
-        if driver:
-            driver.quit()
-            logger.info('WebDriver fechado')
+        close_main_driver(driver, pool_client)
+        if profiler.enabled:
+            report_path, trace_path = profiler.write(reports_directory, top=PROFILE_TOP_N)
+            logger.info(f'Perfil dos comandos do WebDriver gravado em {report_path} e {trace_path}')
         save_error_report()
+        save_metrics(not error_reports)
+    return not error_reports
+
+def save_metrics(success):
+    """
+    Conclui as métricas da execução e as grava no arquivo do Prometheus e no histórico de execuções.
+
+    Falhas na gravação são apenas registradas no log: não afetam o resultado da execução.
+
+    Args:
+        success (bool): Se a execução terminou sem erros.
+    """
+    metrics.finish_run(success)
+    try:
+        paths = save_run(metrics, textfile_path=METRICS_TEXTFILE, history_path=RUN_HISTORY_PATH)
+        if paths:
+            logger.info(f'Métricas das etapas gravadas em {", ".join(paths)}')
+    except Exception as e:
+        logger.warning(f'Erro ao gravar as métricas das etapas: {e}')
+
+if __name__ == '__main__':
+    # Equivale a `python src/cli.py run` (o .env já foi carregado antes das configurações)
+    from cli import main
+    sys.exit(main(['run'] + sys.argv[1:]))
@@ -0,0 +1,5 @@
+"""
+Código compartilhado pelos robôs web (robo_web) e desktop (robo_desktop).
+"""
+from rpa_common.logs import setup_logging, ErrorReport, JsonLinesFormatter, RepeatSampler, truncate
+from rpa_common.metrics import Metrics, RunHistory, format_report, print_report, save_run
@@ -0,0 +1,333 @@
+"""
+Logging e relatório de erros compartilhados pelos robôs web e desktop.
+
+- setup_logging: o logger recebe apenas um QueueHandler; a formatação e a escrita em
+  arquivo e no console acontecem na thread de um QueueListener, fora do caminho das
+  etapas do robô. A fila é limitada: se encher, os registros excedentes são descartados
+  e contados, em vez de bloquear o robô.
+- JsonLinesFormatter: um objeto JSON por linha, com os campos extras do registro
+  (logger.error(..., extra={'html': ...})) e todos os textos limitados a max_chars.
+- RepeatSampler: erros repetidos (mesma mensagem, com os números normalizados) são
+  registrados nas primeiras `burst` ocorrências e depois uma vez a cada `every`.
+- ErrorReport: relatório de erros gravado em reports/ à medida que os erros acontecem
+  (também por um QueueListener), com as últimas `capacity` mensagens em memória.
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import re
+import threading
+from collections import OrderedDict, deque
+from datetime import datetime
+
+# Atributos padrão de um LogRecord (os demais são campos extras)
+_RECORD_ATTRIBUTES = set(logging.makeLogRecord({}).__dict__) | {'message', 'asctime', 'taskName'}
+
+_NUMBERS = re.compile(r'\d+')
+
+def truncate(value, max_chars):
+    """
+    Limita um texto a max_chars caracteres, indicando quantos foram removidos.
+    """
+    value = str(value)
+    if max_chars and len(value) > max_chars:
+        return f'{value[:max_chars]}... (+{len(value) - max_chars} caracteres)'
+    return value
+
+class RepeatSampler:
+    """
+    Amostragem de mensagens repetidas.
+
+    As mensagens são agrupadas pelo texto com os números normalizados (limitado a 120
+    caracteres). Cada grupo passa nas primeiras `burst` ocorrências e depois uma vez a
+    cada `every`. No máximo max_keys grupos são mantidos (os mais antigos são descartados).
+
+    Args:
+        burst (int): Ocorrências registradas antes da amostragem. 0 desativa a amostragem.
+        every (int): Depois de burst, registra uma a cada every ocorrências.
+        max_keys (int): Quantidade máxima de grupos acompanhados.
+    """
+    def __init__(self, burst=5, every=100, max_keys=1000):
+        self.burst = burst
+        self.every = max(1, every)
+        self.max_keys = max_keys
+        self.counts = OrderedDict()
+        self.suppressed = 0
+        self.lock = threading.Lock()
+
+    def allow(self, message):
+        """
+        Returns:
+            int: Ocorrências do grupo até agora se a mensagem deve ser registrada, ou 0.
+        """
+        if not self.burst:
+            return 1
+        key = _NUMBERS.sub('#', message[:120])
+        with self.lock:
+            count = self.counts.pop(key, 0) + 1
+            self.counts[key] = count
+            if len(self.counts) > self.max_keys:
+                self.counts.popitem(last=False)
+            if count <= self.burst or (count - self.burst) % self.every == 0:
+                return count
+            self.suppressed += 1
+            return 0
+
+class SamplingFilter(logging.Filter):
+    """
+    Aplica o RepeatSampler aos registros a partir de `level` (por padrão, erros).
+    Registros amostrados recebem o campo repeated com o total de ocorrências.
+    """
+    def __init__(self, sampler, level=logging.ERROR):
+        super().__init__()
+        self.sampler = sampler
+        self.level = level
+
+    def filter(self, record):
+        if record.levelno < self.level:
+            return True
+        count = self.sampler.allow(record.getMessage())
+        if count > self.sampler.burst:
+            record.repeated = count
+        return count > 0
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    Formata cada registro como um objeto JSON em uma linha, com os textos limitados a max_chars.
+    """
+    def __init__(self, max_chars=2000):
+        super().__init__()
+        self.max_chars = max_chars
+
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': truncate(record.getMessage(), self.max_chars),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = truncate(record.exc_text, self.max_chars)
+        for name, value in record.__dict__.items():
+            if name not in _RECORD_ATTRIBUTES and name not in entry:
+                entry[name] = value if isinstance(value, (int, float, bool)) or value is None else truncate(value, self.max_chars)
+        return json.dumps(entry, ensure_ascii=False)
+
+class _BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler que limita as mensagens a max_chars antes de enfileirá-las e descarta
+    os registros quando a fila está cheia, em vez de bloquear.
+    """
+    def __init__(self, log_queue, max_chars):
+        super().__init__(log_queue)
+        self.max_chars = max_chars
+        self.dropped = 0
+
+    def prepare(self, record):
+        record = super().prepare(record)
+        record.msg = record.message = truncate(record.msg, self.max_chars)
+        for name, value in record.__dict__.items():
+            if name not in _RECORD_ATTRIBUTES and isinstance(value, str):
+                setattr(record, name, truncate(value, self.max_chars))
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+class LoggingPipeline:
+    """
+    Handlers de um logger atendidos por um QueueListener (ver setup_logging).
+
+    Attributes:
+        handler (logging.handlers.QueueHandler): Handler ligado ao logger.
+        listener (logging.handlers.QueueListener): Thread que escreve os registros.
+        sampler (RepeatSampler): Amostragem dos erros repetidos.
+    """
+    def __init__(self, logger, handler, listener, sampler):
+        self.logger = logger
+        self.handler = handler
+        self.listener = listener
+        self.sampler = sampler
+
+    @property
+    def dropped(self):
+        return self.handler.dropped
+
+    def stop(self):
+        """
+        Escreve os registros pendentes e encerra a thread do listener.
+        """
+        if self.listener is None:
+            return
+        if self.handler.dropped or self.sampler.suppressed:
+            self.logger.warning(f'Registros descartados com a fila cheia: {self.handler.dropped}; '
+                                f'erros repetidos omitidos: {self.sampler.suppressed}')
+        self.logger.removeHandler(self.handler)
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+        self.listener = None
+
+def setup_logging(logger, log_path, log_format='json', level=logging.INFO, max_chars=2000, queue_size=10000,
+                  sample_burst=5, sample_every=100, console=True):
+    """
+    Configura o logger para escrever em arquivo e no console por um QueueListener.
+
+    Args:
+        logger (logging.Logger): Logger configurado.
+        log_path (str): Arquivo de log, sem extensão ('.jsonl' no formato json, '.log' no formato text).
+        log_format (str): 'json' (JSON lines no arquivo) ou 'text' (formato texto do robô).
+        level (int): Nível mínimo do logger.
+        max_chars (int): Tamanho máximo da mensagem e de cada campo extra.
+        queue_size (int): Registros pendentes antes do descarte.
+        sample_burst (int): Erros repetidos registrados antes da amostragem (0 desativa).
+        sample_every (int): Depois de sample_burst, registra um a cada sample_every erros repetidos.
+        console (bool): Também escreve no console, no formato texto.
+
+    Returns:
+        LoggingPipeline: Pipeline configurado; stop() é chamado automaticamente ao final do processo.
+
+    Raises:
+        ValueError: Se o formato não for 'json' nem 'text'.
+    """
+    if log_format not in ('json', 'text'):
+        raise ValueError(f'Formato de log não suportado: {log_format}')
+    directory = os.path.dirname(log_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    text_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_handler = logging.FileHandler(log_path + ('.jsonl' if log_format == 'json' else '.log'), encoding='utf-8')
+    file_handler.setFormatter(JsonLinesFormatter(max_chars) if log_format == 'json' else text_formatter)
+    handlers = [file_handler]
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(text_formatter)
+        handlers.append(console_handler)
+
+    sampler = RepeatSampler(sample_burst, sample_every)
+    queue_handler = _BoundedQueueHandler(queue.Queue(maxsize=queue_size), max_chars)
+    queue_handler.addFilter(SamplingFilter(sampler))
+    listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.setLevel(level)
+    logger.addHandler(queue_handler)
+    listener.start()
+
+    pipeline = LoggingPipeline(logger, queue_handler, listener, sampler)
+    atexit.register(pipeline.stop)
+    return pipeline
+
+class ErrorReport:
+    """
+    Relatório de erros gravado à medida que os erros acontecem.
+
+    O arquivo <directory>/report_<data>.report é criado no primeiro erro e cada mensagem é
+    escrita (e descarregada no disco) pela thread de um QueueListener, então uma falha do
+    robô não perde os erros já registrados. Em memória ficam apenas as últimas `capacity`
+    mensagens. Erros repetidos passam pela amostragem do RepeatSampler.
+
+    len(report) é a quantidade de erros registrados desde a criação; iterar percorre as
+    últimas mensagens.
+
+    Args:
+        directory (str): Diretório dos relatórios.
+        capacity (int): Mensagens mantidas em memória.
+        max_chars (int): Tamanho máximo de cada mensagem.
+        sample_burst (int): Erros repetidos gravados antes da amostragem (0 desativa).
+        sample_every (int): Depois de sample_burst, grava um a cada sample_every erros repetidos.
+        queue_size (int): Mensagens pendentes de gravação antes do descarte.
+    """
+    def __init__(self, directory, capacity=200, max_chars=2000, sample_burst=5, sample_every=100, queue_size=10000):
+        self.directory = directory
+        self.capacity = capacity
+        self.max_chars = max_chars
+        self.sample_burst = sample_burst
+        self.sample_every = sample_every
+        self.queue_size = queue_size
+        self.lock = threading.Lock()
+        self.recent = deque(maxlen=self.capacity)
+        self.count = 0
+        self.dropped = 0
+        self.sampler = RepeatSampler(self.sample_burst, self.sample_every)
+        self.path = None
+        self.queue = None
+        self.listener = None
+
+    def _new_path(self):
+        os.makedirs(self.directory, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
+        return os.path.join(self.directory, f'report_{timestamp}.report')
+
+    def _start(self):
+        self.path = self._new_path()
+        handler = logging.FileHandler(self.path, encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self.queue = queue.Queue(maxsize=self.queue_size)
+        self.listener = logging.handlers.QueueListener(self.queue, handler)
+        self.listener.start()
+        atexit.register(self.close)
+
+    def add(self, message):
+        """
+        Registra uma mensagem de erro (gravada em segundo plano).
+        """
+        message = truncate(message, self.max_chars)
+        with self.lock:
+            self.count += 1
+            self.recent.append(message)
+            count = self.sampler.allow(message)
+            if not count:
+                return
+            if self.listener is None:
+                self._start()
+            if count > self.sampler.burst:
+                message = f'{message} (repetido {count} vezes)'
+            try:
+                self.queue.put_nowait(logging.makeLogRecord({'msg': message, 'levelno': logging.ERROR}))
+            except queue.Full:
+                self.dropped += 1
+
+    def close(self):
+        """
+        Conclui o relatório: grava o resumo (ou a ausência de erros) e encerra a thread de
+        gravação. Um novo erro depois disso inicia outro relatório.
+
+        Returns:
+            str: Caminho do relatório.
+        """
+        with self.lock:
+            if self.listener is None:
+                if not self.count:
+                    self.path = self._new_path()
+                    with open(self.path, 'w', encoding='utf-8') as file:
+                        file.write('Nenhum erro encontrado durante a execução.\n')
+                return self.path
+            if self.sampler.suppressed or self.dropped:
+                self.queue.put(logging.makeLogRecord({
+                    'msg': f'Total de erros: {self.count} ({self.sampler.suppressed} repetidos omitidos, '
+                           f'{self.dropped} descartados com a fila cheia)'
+                }))
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+            self.listener = None
+            atexit.unregister(self.close)
+            return self.path
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return iter(list(self.recent))
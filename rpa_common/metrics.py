@@ -0,0 +1,408 @@
+"""
+Métricas das etapas dos robôs web e desktop.
+
+- Metrics: registra um span por chamada de cada etapa (duração, resultado e contagens,
+  como livros por página e linhas gravadas). As etapas são marcadas com o decorador
+  metrics.timed() ou com o bloco `with metrics.span(nome)`; metrics.add() soma uma
+  contagem ao span aberto na thread e metrics.mark_error() marca os spans abertos como
+  'error' (chamado pelo add_error_report dos robôs, já que as etapas tratam os próprios erros).
+- write_prometheus: grava as métricas da execução no formato texto do Prometheus, para o
+  textfile collector do node_exporter (o arquivo é substituído de forma atômica).
+- RunHistory: histórico das execuções em um arquivo SQLite local; stage_report calcula
+  p50/p95 de cada etapa nas últimas N execuções e format_report monta a tabela do
+  subcomando report.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+
+class Span:
+    """
+    Uma chamada de uma etapa: início relativo à execução, duração, resultado e contagens.
+    """
+    __slots__ = ('name', 'start', 'duration', 'outcome', 'counts')
+
+    def __init__(self, name, start):
+        self.name = name
+        self.start = start
+        self.duration = 0.0
+        self.outcome = 'ok'
+        self.counts = {}
+
+class Metrics:
+    """
+    Coleta os spans das etapas de uma execução do robô.
+
+    Os spans abertos são mantidos por thread, então etapas executadas em paralelo (seções
+    em navegadores próprios, contas) são medidas de forma independente.
+
+    Args:
+        robot (str): Nome do robô ('web' ou 'desktop'), usado nos rótulos e no histórico.
+    """
+    def __init__(self, robot):
+        self.robot = robot
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.start_run()
+
+    def start_run(self):
+        """
+        Inicia uma nova execução, descartando os spans registrados até aqui.
+        """
+        with self.lock:
+            self.spans = []
+        self.started_at = datetime.now()
+        self.origin = time.perf_counter()
+        self.duration = None
+        self.outcome = None
+
+    def finish_run(self, success):
+        """
+        Conclui a execução, registrando a duração total e o resultado.
+        """
+        self.duration = time.perf_counter() - self.origin
+        self.outcome = 'ok' if success else 'error'
+
+    def _stack(self):
+        stack = getattr(self.local, 'stack', None)
+        if stack is None:
+            stack = self.local.stack = []
+        return stack
+
+    def _open(self, name):
+        span = Span(name, time.perf_counter() - self.origin)
+        self._stack().append(span)
+        return span
+
+    def _close(self, span):
+        self.local.stack.pop()
+        span.duration = time.perf_counter() - self.origin - span.start
+        with self.lock:
+            self.spans.append(span)
+
+    @contextmanager
+    def span(self, name):
+        """
+        Mede o bloco como uma chamada da etapa. Uma exceção que sai do bloco marca o span como 'error'.
+
+        Yields:
+            Span: O span aberto.
+        """
+        span = self._open(name)
+        try:
+            yield span
+        except BaseException:
+            span.outcome = 'error'
+            raise
+        finally:
+            self._close(span)
+
+    def timed(self, name=None):
+        """
+        Decorador que mede cada chamada da função como um span (por padrão com o nome da função).
+        """
+        def decorator(func):
+            span_name = name or func.__name__
+
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                # Equivale a `with self.span(span_name)`, sem o custo do gerador do contextmanager
+                span = self._open(span_name)
+                try:
+                    return func(*args, **kwargs)
+                except BaseException:
+                    span.outcome = 'error'
+                    raise
+                finally:
+                    self._close(span)
+            return wrapper
+        return decorator
+
+    def add(self, key, value=1):
+        """
+        Soma value à contagem key do span aberto mais interno da thread (sem span aberto, não faz nada).
+        """
+        stack = self._stack()
+        if stack:
+            counts = stack[-1].counts
+            counts[key] = counts.get(key, 0) + value
+
+    def mark_error(self):
+        """
+        Marca como 'error' todos os spans abertos na thread.
+        """
+        for span in self._stack():
+            span.outcome = 'error'
+
+    def record(self, name, duration, outcome='ok', **counts):
+        """
+        Registra um span já medido (ex.: o tempo de cada página de um gerador).
+        """
+        span = Span(name, time.perf_counter() - self.origin - duration)
+        span.duration = duration
+        span.outcome = outcome
+        span.counts = counts
+        with self.lock:
+            self.spans.append(span)
+
+    def summary(self):
+        """
+        Agrupa os spans da execução por etapa.
+
+        Returns:
+            dict: Para cada etapa, quantidade de chamadas por resultado, duração total e
+                máxima e a soma de cada contagem.
+        """
+        result = {}
+        with self.lock:
+            spans = list(self.spans)
+        for span in spans:
+            entry = result.setdefault(span.name, {'calls': {}, 'duration': 0.0, 'max': 0.0, 'counts': {}})
+            entry['calls'][span.outcome] = entry['calls'].get(span.outcome, 0) + 1
+            entry['duration'] += span.duration
+            entry['max'] = max(entry['max'], span.duration)
+            for key, value in span.counts.items():
+                entry['counts'][key] = entry['counts'].get(key, 0) + value
+        return result
+
+    def prometheus_text(self):
+        """
+        Monta as métricas da execução no formato texto do Prometheus (gauges da última execução).
+        """
+        robot = _label(self.robot)
+        summary = self.summary()
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            for labels, value in samples:
+                lines.append(f'{name}{{{labels}}} {value}')
+
+        metric('rpa_stage_duration_seconds', 'gauge', 'Duração total das chamadas da etapa na última execução.',
+               [(f'robot="{robot}",stage="{_label(stage)}"', entry['duration']) for stage, entry in summary.items()])
+        metric('rpa_stage_max_duration_seconds', 'gauge', 'Duração da chamada mais lenta da etapa na última execução.',
+               [(f'robot="{robot}",stage="{_label(stage)}"', entry['max']) for stage, entry in summary.items()])
+        metric('rpa_stage_calls', 'gauge', 'Chamadas da etapa na última execução, por resultado.',
+               [(f'robot="{robot}",stage="{_label(stage)}",outcome="{_label(outcome)}"', calls)
+                for stage, entry in summary.items() for outcome, calls in sorted(entry['calls'].items())])
+        metric('rpa_stage_items', 'gauge', 'Itens processados pela etapa na última execução (livros, linhas, páginas...).',
+               [(f'robot="{robot}",stage="{_label(stage)}",item="{_label(key)}"', value)
+                for stage, entry in summary.items() for key, value in sorted(entry['counts'].items())])
+        if self.duration is not None:
+            metric('rpa_run_duration_seconds', 'gauge', 'Duração da última execução.', [(f'robot="{robot}"', self.duration)])
+            metric('rpa_run_success', 'gauge', '1 se a última execução terminou sem erros.',
+                   [(f'robot="{robot}"', 1 if self.outcome == 'ok' else 0)])
+        metric('rpa_run_timestamp_seconds', 'gauge', 'Início da última execução (Unix).',
+               [(f'robot="{robot}"', f'{self.started_at.timestamp():.3f}')])
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """
+        Grava as métricas no arquivo do textfile collector, substituindo-o de forma atômica
+        (o node_exporter nunca lê um arquivo pela metade).
+
+        Returns:
+            str: Caminho do arquivo.
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary_path = f'{path}.{os.getpid()}.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as file:
+            file.write(self.prometheus_text())
+        os.replace(temporary_path, path)
+        return path
+
+def _label(value):
+    """
+    Escapa um valor de rótulo do Prometheus.
+    """
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def percentile(values, fraction):
+    """
+    Percentil com interpolação linear entre os valores ordenados (fraction entre 0 e 1).
+    """
+    values = sorted(values)
+    if not values:
+        return None
+    position = (len(values) - 1) * fraction
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+class RunHistory:
+    """
+    Histórico das execuções dos robôs em um arquivo SQLite local: uma linha por execução
+    (tabela runs) e uma por span (tabela spans, com as contagens em JSON).
+    """
+    def __init__(self, path):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.execute('''
+                CREATE TABLE IF NOT EXISTS runs (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    robot TEXT NOT NULL,
+                    started_at TEXT NOT NULL,
+                    duration REAL,
+                    outcome TEXT
+                )
+            ''')
+            self.connection.execute('''
+                CREATE TABLE IF NOT EXISTS spans (
+                    run_id INTEGER NOT NULL REFERENCES runs (id),
+                    stage TEXT NOT NULL,
+                    start REAL NOT NULL,
+                    duration REAL NOT NULL,
+                    outcome TEXT NOT NULL,
+                    counts TEXT
+                )
+            ''')
+            self.connection.execute('CREATE INDEX IF NOT EXISTS ix_runs_robot ON runs (robot, id)')
+            self.connection.execute('CREATE INDEX IF NOT EXISTS ix_spans_run ON spans (run_id, stage)')
+
+    def append(self, metrics):
+        """
+        Grava a execução e os seus spans em uma única transação.
+
+        Returns:
+            int: Identificador da execução no histórico.
+        """
+        with metrics.lock:
+            spans = list(metrics.spans)
+        with self.connection:
+            cursor = self.connection.execute(
+                'INSERT INTO runs (robot, started_at, duration, outcome) VALUES (?, ?, ?, ?)',
+                (metrics.robot, metrics.started_at.isoformat(sep=' ', timespec='seconds'), metrics.duration, metrics.outcome)
+            )
+            run_id = cursor.lastrowid
+            self.connection.executemany(
+                'INSERT INTO spans (run_id, stage, start, duration, outcome, counts) VALUES (?, ?, ?, ?, ?, ?)',
+                [(run_id, span.name, span.start, span.duration, span.outcome,
+                  json.dumps(span.counts) if span.counts else None) for span in spans]
+            )
+        return run_id
+
+    def stage_report(self, robot, runs=20):
+        """
+        Calcula as estatísticas de cada etapa nas últimas execuções do robô.
+
+        Args:
+            robot (str): Nome do robô.
+            runs (int): Quantidade de execuções consideradas (as mais recentes).
+
+        Returns:
+            dict: 'runs' (quantidade, p50/p95 da duração total e execuções com erro) e
+                'stages', lista com, para cada etapa, as execuções em que apareceu, as
+                chamadas, as chamadas com erro, p50/p95/máximo da duração das chamadas e
+                a média por execução de cada contagem.
+        """
+        run_rows = self.connection.execute(
+            'SELECT id, duration, outcome FROM runs WHERE robot = ? ORDER BY id DESC LIMIT ?', (robot, runs)
+        ).fetchall()
+        durations = [duration for _, duration, _ in run_rows if duration is not None]
+        report = {
+            'runs': {
+                'count': len(run_rows),
+                'p50': percentile(durations, 0.5),
+                'p95': percentile(durations, 0.95),
+                'errors': sum(1 for _, _, outcome in run_rows if outcome != 'ok'),
+            },
+            'stages': [],
+        }
+        if not run_rows:
+            return report
+
+        stages = {}
+        placeholders = ', '.join('?' * len(run_rows))
+        for run_id, stage, duration, outcome, counts in self.connection.execute(
+            f'SELECT run_id, stage, duration, outcome, counts FROM spans WHERE run_id IN ({placeholders}) ORDER BY run_id',
+            [run_id for run_id, _, _ in run_rows]
+        ):
+            entry = stages.setdefault(stage, {'runs': set(), 'durations': [], 'errors': 0, 'counts': {}})
+            entry['runs'].add(run_id)
+            entry['durations'].append(duration)
+            entry['errors'] += outcome != 'ok'
+            for key, value in json.loads(counts).items() if counts else ():
+                entry['counts'][key] = entry['counts'].get(key, 0) + value
+
+        for stage, entry in stages.items():
+            report['stages'].append({
+                'stage': stage,
+                'runs': len(entry['runs']),
+                'calls': len(entry['durations']),
+                'errors': entry['errors'],
+                'p50': percentile(entry['durations'], 0.5),
+                'p95': percentile(entry['durations'], 0.95),
+                'max': max(entry['durations']),
+                'counts': {key: value / len(entry['runs']) for key, value in sorted(entry['counts'].items())},
+            })
+        report['stages'].sort(key=lambda stage: stage['p95'], reverse=True)
+        return report
+
+    def close(self):
+        self.connection.close()
+
+def format_report(report, robot):
+    """
+    Monta o relatório em texto de RunHistory.stage_report.
+    """
+    runs = report['runs']
+    if not runs['count']:
+        return f'Nenhuma execução do robô {robot} no histórico.\n'
+    lines = [
+        f'Últimas {runs["count"]} execuções do robô {robot}: duração p50 {runs["p50"] or 0:.2f} s, '
+        f'p95 {runs["p95"] or 0:.2f} s, {runs["errors"]} com erro',
+        '',
+        f'{"etapa":<38}{"execuções":>10}{"chamadas":>10}{"erros":>7}{"p50 (s)":>10}{"p95 (s)":>10}{"máx. (s)":>10}  itens por execução',
+    ]
+    for stage in report['stages']:
+        counts = ', '.join(f'{key} {value:g}' for key, value in stage['counts'].items())
+        lines.append(f'{stage["stage"]:<38}{stage["runs"]:>10}{stage["calls"]:>10}{stage["errors"]:>7}'
+                     f'{stage["p50"]:>10.3f}{stage["p95"]:>10.3f}{stage["max"]:>10.3f}  {counts}')
+    return '\n'.join(lines) + '\n'
+
+def print_report(path, robot, runs=20):
+    """
+    Mostra o relatório das últimas execuções do histórico, sem criar o arquivo se ele não existir.
+
+    Returns:
+        int: Código de saída.
+    """
+    if not os.path.exists(path):
+        print(f'Histórico de execuções não encontrado: {path}')
+        return 0
+    history = RunHistory(path)
+    try:
+        print(format_report(history.stage_report(robot, runs), robot), end='')
+    finally:
+        history.close()
+    return 0
+
+def save_run(metrics, textfile_path=None, history_path=None):
+    """
+    Grava as métricas da execução concluída no arquivo do Prometheus e no histórico (caminhos vazios são ignorados).
+
+    Returns:
+        list: Caminhos gravados.
+    """
+    written = []
+    if textfile_path:
+        written.append(metrics.write_prometheus(textfile_path))
+    if history_path:
+        history = RunHistory(history_path)
+        try:
+            history.append(metrics)
+        finally:
+            history.close()
+        written.append(history_path)
+    return written